@@ -19,12 +19,38 @@ class SecurityConfig(PluginConfig):
         "virtual_ext_page": "left",
         "interface_ext_page": "full_width",
         "address_ext_page": "right",
+        "address_set_closure": True,
+        "address_set_path_limit": 100,
+        "address_set_hierarchy_batch_limit": 1000,
+        "policy_context_cache_timeout": 900,
+        "effective_address_table": False,
+        "address_set_impact_object_limit": 10000,
+        "security_tab_badge": "sync",
+        "zone_policy_matrix_cache_timeout": 900,
+        "export_chunk_size": 2000,
+        "change_feed_limit": 1000,
+        "change_feed_lag": 10,
+        "policy_lookup_batch_limit": 10000,
+        "policy_analysis_cache_timeout": 900,
+        "address_aggregation_cache_timeout": 900,
+        "nat_simulation_batch_limit": 100000,
+        "nat_pool_analysis_cache_timeout": 900,
     }
 
     def ready(self):
         super().ready()
 
         import netbox_security.signals.nat_pool_member
+        import netbox_security.signals.address_set
+        import netbox_security.signals.address
+        import netbox_security.signals.policy_context_cache
+        import netbox_security.signals.effective_address
+        import netbox_security.signals.security_counters
+        import netbox_security.signals.zone_policy_matrix
+        import netbox_security.signals.policy_engine
+        import netbox_security.signals.address_aggregation
+        import netbox_security.signals.nat_engine
+        import netbox_security.signals.span_object
 
 
 config = SecurityConfig  # noqa
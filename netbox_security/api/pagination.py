@@ -0,0 +1,158 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Func, Value
+from django.utils.translation import gettext as _
+from netbox.api.pagination import OptionalLimitOffsetPagination
+from netbox.config import get_config
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+__all__ = ("KeysetPagination",)
+
+
+class KeysetPagination(OptionalLimitOffsetPagination):
+    """
+    NetBox's limit/offset pagination with an opt-in keyset (cursor) mode.
+
+    Passing the cursor query parameter, empty for the first page, pages on an
+    (ordering, pk) key instead of an offset, so every page costs the same
+    however deep into the collection it is. The ordering parameter may name the
+    ID or a non-null field of the model with an index on (field, id), optionally
+    prefixed with "-"; without it the objects are ordered by ID. The next page
+    is selected with a row comparison, (field, id) > (value, pk), which the
+    database answers from that index. Filters apply as usual. Keyset pages carry no
+    count and only link to the next page, which is built from the last object
+    of the current one.
+    """
+
+    cursor_query_param = "cursor"
+    keyset = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            self.keyset = False
+            return super().paginate_queryset(queryset, request, view)
+        self.keyset = True
+        self.request = request
+
+        field, descending = self._get_ordering_field(queryset, request)
+        field_name = field.attname if field is not None else "pk"
+        self.limit = self.get_limit(request) or get_config().PAGINATE_COUNT
+        position = self._decode_cursor(request.query_params[self.cursor_query_param])
+
+        if descending:
+            ordering = (f"-{field_name}", "-pk")
+        else:
+            ordering = (field_name, "pk")
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = self._filter_after(queryset, field, descending, *position)
+
+        # One extra row tells whether there is a next page.
+        results = list(queryset[: self.limit + 1])
+        self.next_position = None
+        if len(results) > self.limit:
+            results = results[: self.limit]
+            last = results[-1]
+            self.next_position = (getattr(last, field_name), last.pk)
+        return results
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self._encode_cursor(self.next_position),
+        )
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        return None
+
+    @staticmethod
+    def _get_ordering_field(queryset, request):
+        ordering = request.query_params.get("ordering") or "pk"
+        descending = ordering.startswith("-")
+        field_name = ordering.lstrip("-")
+        if field_name in ("pk", "id"):
+            return None, descending
+        meta = queryset.model._meta
+        try:
+            field = meta.get_field(field_name)
+        except FieldDoesNotExist:
+            field = None
+        keyset_fields = {
+            index.fields[0]
+            for index in meta.indexes
+            if len(index.fields) == 2 and index.fields[1] in ("id", meta.pk.name)
+        }
+        if (
+            field is None
+            or not field.concrete
+            or field.is_relation
+            or field.null
+            or field.name not in keyset_fields
+        ):
+            raise ValidationError(
+                {
+                    "ordering": _(
+                        "Cursor pagination can only order by the ID or by a field "
+                        "indexed together with it ({fields}), optionally prefixed "
+                        "with '-'."
+                    ).format(fields=", ".join(sorted(keyset_fields)) or "-")
+                }
+            )
+        return field, descending
+
+    @staticmethod
+    def _filter_after(queryset, field, descending, value, pk):
+        """Return queryset limited to the objects after (value, pk)."""
+        if field is None:
+            return (
+                queryset.filter(pk__lt=pk) if descending else queryset.filter(pk__gt=pk)
+            )
+        # A row comparison rather than "field > value OR (field = value AND
+        # pk > pk)", so the database seeks the (field, id) index directly.
+        lookup = "lt" if descending else "gt"
+        return queryset.alias(
+            keyset_position=Func(
+                F(field.attname), F("pk"), function="ROW", output_field=field
+            )
+        ).filter(
+            **{
+                f"keyset_position__{lookup}": Func(
+                    Value(value, output_field=field),
+                    Value(pk),
+                    function="ROW",
+                    output_field=field,
+                )
+            }
+        )
+
+    @staticmethod
+    def _encode_cursor(position):
+        value = json.dumps(position, cls=DjangoJSONEncoder, default=str)
+        return urlsafe_b64encode(value.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor):
+        if not cursor:
+            return None
+        try:
+            value, pk = json.loads(urlsafe_b64decode(cursor.encode()))
+            return value, int(pk)
+        except (TypeError, ValueError):
+            raise ValidationError({"cursor": _("Invalid cursor.")})
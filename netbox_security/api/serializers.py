@@ -1,5 +1,6 @@
 from .serializers_.custom_prefix import *
 from .serializers_.address import *
+from .serializers_.address_aggregation import *
 from .serializers_.address_set import *
 from .serializers_.address_list import *
 from .serializers_.application_item import *
@@ -14,3 +15,11 @@ from .serializers_.nat_rule import *
 from .serializers_.firewall_filter import *
 from .serializers_.firewall_filter_rule import *
 from .serializers_.policer import *
+from .serializers_.address_set_hierarchy import *
+from .serializers_.address_set_impact import *
+from .serializers_.zone_policy_matrix import *
+from .serializers_.change_feed import *
+from .serializers_.policy_lookup import *
+from .serializers_.policy_analysis import *
+from .serializers_.nat_simulation import *
+from .serializers_.nat_pool_analysis import *
@@ -0,0 +1,61 @@
+from django.utils.functional import cached_property
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers
+
+from netbox_security.utilities import get_aggregated_prefixes
+
+__all__ = (
+    "AggregatedPrefixesField",
+    "AggregatedPrefixesMixin",
+    "AggregatedPrefixesSerializer",
+)
+
+
+class AggregatedPrefixesSerializer(serializers.Serializer):
+    ipv4 = serializers.ListField(child=serializers.CharField())
+    ipv6 = serializers.ListField(child=serializers.CharField())
+
+
+@extend_schema_field(AggregatedPrefixesSerializer)
+class AggregatedPrefixesField(serializers.Field):
+    """Read-only minimal covering prefixes of an AddressSet or AddressList.
+
+    When a list is serialized, the prefixes of every object of the page are read
+    together on the first one.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        kwargs["source"] = "*"
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        model = type(value)
+        prefixes = self.context.setdefault(
+            f"aggregated_prefixes:{model._meta.model_name}", {}
+        )
+        if value.pk not in prefixes:
+            objects = [value]
+            list_serializer = getattr(self.parent, "parent", None)
+            if (
+                isinstance(list_serializer, serializers.ListSerializer)
+                and list_serializer.instance is not None
+            ):
+                objects = list_serializer.instance
+            prefixes.update(get_aggregated_prefixes(model, [obj.pk for obj in objects]))
+        return prefixes[value.pk]
+
+
+class AggregatedPrefixesMixin:
+    """Serializes aggregated_prefixes only when it is requested with ?fields=.
+
+    Aggregating resolves every nested Address Set of each object, which plain
+    list and detail requests should not pay for.
+    """
+
+    @cached_property
+    def fields(self):
+        fields = super().fields
+        if "aggregated_prefixes" not in (self._requested_fields or ()):
+            fields.pop("aggregated_prefixes", None)
+        return fields
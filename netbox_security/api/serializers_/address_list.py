@@ -10,13 +10,17 @@ from netbox.api.serializers import NetBoxModelSerializer
 from utilities.api import get_serializer_for_model
 
 from netbox_security.models import AddressList, AddressListAssignment
+from netbox_security.api.serializers import (
+    AggregatedPrefixesField,
+    AggregatedPrefixesMixin,
+)
 from netbox_security.constants import (
     ADDRESS_ASSIGNMENT_MODELS,
     ADDRESS_LIST_ASSIGNMENT_MODELS,
 )
 
 
-class AddressListSerializer(NetBoxModelSerializer):
+class AddressListSerializer(AggregatedPrefixesMixin, NetBoxModelSerializer):
     url = HyperlinkedIdentityField(
         view_name="plugins-api:netbox_security-api:addresslist-detail"
     )
@@ -24,6 +28,7 @@ class AddressListSerializer(NetBoxModelSerializer):
         queryset=ContentType.objects.filter(ADDRESS_LIST_ASSIGNMENT_MODELS)
     )
     assigned_object = SerializerMethodField(read_only=True)
+    aggregated_prefixes = AggregatedPrefixesField()
 
     class Meta:
         model = AddressList
@@ -35,6 +40,7 @@ class AddressListSerializer(NetBoxModelSerializer):
             "assigned_object_type",
             "assigned_object_id",
             "assigned_object",
+            "aggregated_prefixes",
             "created",
             "last_updated",
         )
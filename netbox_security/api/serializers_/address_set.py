@@ -15,7 +15,11 @@ from utilities.api import get_serializer_for_model
 from tenancy.api.serializers import TenantSerializer
 
 from netbox_security.models import AddressSet, AddressSetAssignment
-from netbox_security.api.serializers import AddressSerializer
+from netbox_security.api.serializers import (
+    AddressSerializer,
+    AggregatedPrefixesField,
+    AggregatedPrefixesMixin,
+)
 from netbox_security.constants import ADDRESS_ASSIGNMENT_MODELS
 
 
@@ -54,7 +58,7 @@ class NestedAddressSetSerializer(WritableNestedSerializer):
         )
 
 
-class AddressSetSerializer(PrimaryModelSerializer):
+class AddressSetSerializer(AggregatedPrefixesMixin, PrimaryModelSerializer):
     url = HyperlinkedIdentityField(
         view_name="plugins-api:netbox_security-api:addressset-detail"
     )
@@ -65,6 +69,7 @@ class AddressSetSerializer(PrimaryModelSerializer):
         nested=True, many=True, required=False, read_only=False
     )
     tenant = TenantSerializer(nested=True, required=False, allow_null=True)
+    aggregated_prefixes = AggregatedPrefixesField()
 
     class Meta:
         model = AddressSet
@@ -76,6 +81,7 @@ class AddressSetSerializer(PrimaryModelSerializer):
             "identifier",
             "addresses",
             "address_sets",
+            "aggregated_prefixes",
             "description",
             "tenant",
             "comments",
@@ -0,0 +1,78 @@
+from rest_framework import serializers
+
+__all__ = (
+    "AddressSetHierarchyRequestSerializer",
+    "AddressSetHierarchyGraphNodeSerializer",
+    "AddressSetHierarchyGraphSerializer",
+    "AddressSetHierarchyPathPageSerializer",
+    "AddressSetHierarchyPolicyPathSerializer",
+    "AddressSetHierarchySerializer",
+)
+
+
+class AddressSetHierarchyRequestSerializer(serializers.Serializer):
+    app_label = serializers.CharField()
+    model = serializers.CharField()
+    object_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+    )
+    path_offset = serializers.IntegerField(min_value=0, default=0)
+    path_limit = serializers.IntegerField(min_value=1, required=False)
+
+
+class AddressSetHierarchyGraphNodeSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    path_count = serializers.IntegerField()
+    address_ids = serializers.ListField(child=serializers.IntegerField())
+
+
+class AddressSetHierarchyGraphSerializer(serializers.Serializer):
+    nodes = AddressSetHierarchyGraphNodeSerializer(many=True)
+    edges = serializers.ListField(
+        child=serializers.ListField(child=serializers.IntegerField())
+    )
+
+
+class AddressSetHierarchyPathPageSerializer(serializers.Serializer):
+    offset = serializers.IntegerField()
+    limit = serializers.IntegerField()
+    path_count = serializers.IntegerField()
+    row_count = serializers.IntegerField()
+    has_next = serializers.BooleanField()
+
+
+class AddressSetHierarchyPolicyPathSerializer(serializers.Serializer):
+    policy_id = serializers.IntegerField()
+    policy_name = serializers.CharField()
+    policy_index = serializers.IntegerField()
+    policy_actions = serializers.ListField(child=serializers.CharField())
+    direction = serializers.CharField()
+    source_zone_id = serializers.IntegerField()
+    destination_zone_id = serializers.IntegerField()
+    source_zone_name = serializers.CharField()
+    destination_zone_name = serializers.CharField()
+    address_list_id = serializers.IntegerField()
+    address_list_name = serializers.CharField()
+    context_model = serializers.CharField()
+    context_object_id = serializers.IntegerField()
+
+
+class AddressSetHierarchySerializer(serializers.Serializer):
+    assigned_object_id = serializers.IntegerField(allow_null=True)
+    address_ids = serializers.ListField(child=serializers.IntegerField())
+    inherited_address_ids = serializers.ListField(child=serializers.IntegerField())
+    direct_address_set_ids = serializers.ListField(child=serializers.IntegerField())
+    all_address_set_ids = serializers.ListField(child=serializers.IntegerField())
+    address_set_paths = serializers.ListField(
+        child=serializers.ListField(child=serializers.IntegerField())
+    )
+    address_set_name_paths = serializers.ListField(
+        child=serializers.ListField(child=serializers.CharField())
+    )
+    address_set_graph = AddressSetHierarchyGraphSerializer()
+    address_set_path_page = AddressSetHierarchyPathPageSerializer()
+    address_list_ids = serializers.ListField(child=serializers.IntegerField())
+    address_list_names = serializers.ListField(child=serializers.CharField())
+    policy_paths = AddressSetHierarchyPolicyPathSerializer(many=True)
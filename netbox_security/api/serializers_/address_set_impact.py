@@ -0,0 +1,33 @@
+from rest_framework import serializers
+
+__all__ = (
+    "AddressSetImpactPolicyLinkSerializer",
+    "AddressSetImpactSerializer",
+)
+
+
+class AddressSetImpactPolicyLinkSerializer(serializers.Serializer):
+    policy_id = serializers.IntegerField()
+    address_list_id = serializers.IntegerField()
+    direction = serializers.CharField()
+
+
+class AddressSetImpactSerializer(serializers.Serializer):
+    address_set_id = serializers.IntegerField()
+    ancestor_address_set_ids = serializers.ListField(child=serializers.IntegerField())
+    descendant_address_set_ids = serializers.ListField(child=serializers.IntegerField())
+    address_ids = serializers.ListField(child=serializers.IntegerField())
+    assigned_object_ids = serializers.DictField(
+        child=serializers.ListField(child=serializers.IntegerField())
+    )
+    inherited_object_ids = serializers.DictField(
+        child=serializers.ListField(child=serializers.IntegerField())
+    )
+    inherited_object_ids_complete = serializers.BooleanField()
+    address_list_ids = serializers.ListField(child=serializers.IntegerField())
+    policy_ids = serializers.ListField(child=serializers.IntegerField())
+    policy_links = AddressSetImpactPolicyLinkSerializer(many=True)
+    security_zone_ids = serializers.ListField(child=serializers.IntegerField())
+    device_ids = serializers.ListField(child=serializers.IntegerField())
+    virtual_device_context_ids = serializers.ListField(child=serializers.IntegerField())
+    virtual_machine_ids = serializers.ListField(child=serializers.IntegerField())
@@ -0,0 +1,29 @@
+from rest_framework import serializers
+
+__all__ = (
+    "ChangeFeedModelSerializer",
+    "ChangeFeedRequestSerializer",
+    "ChangeFeedSerializer",
+)
+
+
+class ChangeFeedRequestSerializer(serializers.Serializer):
+    since = serializers.IntegerField(min_value=0, required=False)
+    since_time = serializers.DateTimeField(required=False)
+    limit = serializers.IntegerField(min_value=1, required=False)
+
+
+class ChangeFeedModelSerializer(serializers.Serializer):
+    app_label = serializers.CharField()
+    model = serializers.CharField()
+    url = serializers.CharField(allow_null=True)
+    created = serializers.ListField(child=serializers.IntegerField())
+    updated = serializers.ListField(child=serializers.IntegerField())
+    deleted = serializers.ListField(child=serializers.IntegerField())
+
+
+class ChangeFeedSerializer(serializers.Serializer):
+    since = serializers.IntegerField(allow_null=True)
+    next = serializers.IntegerField()
+    has_more = serializers.BooleanField()
+    changes = ChangeFeedModelSerializer(many=True)
@@ -0,0 +1,53 @@
+from rest_framework import serializers
+
+__all__ = (
+    "NatPoolAnalysisOverlapSerializer",
+    "NatPoolAnalysisPoolSerializer",
+    "NatPoolAnalysisRuleSerializer",
+    "NatPoolAnalysisSerializer",
+)
+
+
+class NatPoolAnalysisObjectSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+
+
+class NatPoolAnalysisMemberSerializer(NatPoolAnalysisObjectSerializer):
+    pool = NatPoolAnalysisObjectSerializer()
+
+
+class NatPoolAnalysisPoolSerializer(NatPoolAnalysisObjectSerializer):
+    pool_type = serializers.CharField()
+    status = serializers.CharField()
+    member_count = serializers.IntegerField()
+    address_count = serializers.IntegerField()
+    port_capacity = serializers.IntegerField()
+    rule_count = serializers.IntegerField()
+    translated_address_count = serializers.IntegerField(allow_null=True)
+    exhausted = serializers.BooleanField()
+
+
+class NatPoolAnalysisOverlapSerializer(serializers.Serializer):
+    type = serializers.CharField()
+    member = NatPoolAnalysisMemberSerializer()
+    other_member = NatPoolAnalysisMemberSerializer()
+    start = serializers.IPAddressField()
+    end = serializers.IPAddressField()
+
+
+class NatPoolAnalysisRuleSerializer(serializers.Serializer):
+    reason = serializers.CharField()
+    rule = NatPoolAnalysisObjectSerializer()
+    rule_set = NatPoolAnalysisObjectSerializer()
+    field = serializers.CharField()
+    pool = NatPoolAnalysisObjectSerializer()
+
+
+class NatPoolAnalysisSerializer(serializers.Serializer):
+    pool_count = serializers.IntegerField()
+    member_count = serializers.IntegerField()
+    counts = serializers.DictField(child=serializers.IntegerField())
+    pools = NatPoolAnalysisPoolSerializer(many=True)
+    overlaps = NatPoolAnalysisOverlapSerializer(many=True)
+    rules = NatPoolAnalysisRuleSerializer(many=True)
@@ -0,0 +1,60 @@
+from ipam.constants import SERVICE_PORT_MAX, SERVICE_PORT_MIN
+from rest_framework import serializers
+
+from netbox_security.choices import RuleDirectionChoices
+
+__all__ = (
+    "NatSimulationBatchSerializer",
+    "NatSimulationFlowSerializer",
+    "NatSimulationResultSerializer",
+    "NatSimulationTranslationSerializer",
+)
+
+
+class NatSimulationFlowSerializer(serializers.Serializer):
+    source = serializers.IPAddressField()
+    destination = serializers.IPAddressField()
+    source_port = serializers.IntegerField(
+        min_value=SERVICE_PORT_MIN, max_value=SERVICE_PORT_MAX, required=False
+    )
+    destination_port = serializers.IntegerField(
+        min_value=SERVICE_PORT_MIN, max_value=SERVICE_PORT_MAX, required=False
+    )
+    source_zone = serializers.IntegerField(min_value=1, required=False)
+    destination_zone = serializers.IntegerField(min_value=1, required=False)
+    direction = serializers.ChoiceField(
+        choices=RuleDirectionChoices.values(), required=False
+    )
+
+
+class NatSimulationBatchSerializer(serializers.Serializer):
+    flows = NatSimulationFlowSerializer(many=True, allow_empty=False)
+
+
+class NatSimulationRuleSetSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    nat_type = serializers.CharField()
+    direction = serializers.CharField()
+
+
+class NatSimulationObjectSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+
+
+class NatSimulationTranslationSerializer(serializers.Serializer):
+    stage = serializers.CharField()
+    rule_set = NatSimulationRuleSetSerializer()
+    rule = NatSimulationObjectSerializer()
+    pool = NatSimulationObjectSerializer(allow_null=True)
+    interface = serializers.BooleanField()
+    translated = serializers.BooleanField()
+
+
+class NatSimulationResultSerializer(serializers.Serializer):
+    source = serializers.IPAddressField()
+    destination = serializers.IPAddressField()
+    source_port = serializers.IntegerField(allow_null=True)
+    destination_port = serializers.IntegerField(allow_null=True)
+    translations = NatSimulationTranslationSerializer(many=True)
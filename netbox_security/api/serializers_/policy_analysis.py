@@ -0,0 +1,28 @@
+from rest_framework import serializers
+
+__all__ = (
+    "PolicyAnalysisFindingSerializer",
+    "PolicyAnalysisPolicySerializer",
+    "PolicyAnalysisSerializer",
+)
+
+
+class PolicyAnalysisPolicySerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    index = serializers.IntegerField()
+    actions = serializers.ListField(child=serializers.CharField())
+
+
+class PolicyAnalysisFindingSerializer(serializers.Serializer):
+    type = serializers.CharField()
+    source_zone_id = serializers.IntegerField()
+    destination_zone_id = serializers.IntegerField()
+    policy = PolicyAnalysisPolicySerializer()
+    related_policy = PolicyAnalysisPolicySerializer()
+
+
+class PolicyAnalysisSerializer(serializers.Serializer):
+    policy_count = serializers.IntegerField()
+    counts = serializers.DictField(child=serializers.IntegerField())
+    findings = PolicyAnalysisFindingSerializer(many=True)
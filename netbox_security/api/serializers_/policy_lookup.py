@@ -0,0 +1,50 @@
+from django.utils.translation import gettext as _
+from ipam.constants import SERVICE_PORT_MAX, SERVICE_PORT_MIN
+from rest_framework import serializers
+
+from netbox_security.choices import ProtocolChoices
+
+__all__ = (
+    "PolicyLookupBatchSerializer",
+    "PolicyLookupFlowSerializer",
+    "PolicyLookupPolicySerializer",
+    "PolicyLookupResultSerializer",
+)
+
+
+class PolicyLookupFlowSerializer(serializers.Serializer):
+    source_zone = serializers.IntegerField(min_value=1)
+    destination_zone = serializers.IntegerField(min_value=1)
+    source = serializers.IPAddressField()
+    destination = serializers.IPAddressField()
+    protocol = serializers.CharField(required=False, allow_blank=True)
+    source_port = serializers.IntegerField(
+        min_value=SERVICE_PORT_MIN, max_value=SERVICE_PORT_MAX, required=False
+    )
+    destination_port = serializers.IntegerField(
+        min_value=SERVICE_PORT_MIN, max_value=SERVICE_PORT_MAX, required=False
+    )
+
+    def validate_protocol(self, value):
+        value = value.upper()
+        if value and value not in ProtocolChoices.values():
+            raise serializers.ValidationError(
+                _("Unknown protocol: {protocol}").format(protocol=value)
+            )
+        return value
+
+
+class PolicyLookupBatchSerializer(serializers.Serializer):
+    flows = PolicyLookupFlowSerializer(many=True, allow_empty=False)
+
+
+class PolicyLookupPolicySerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    index = serializers.IntegerField()
+
+
+class PolicyLookupResultSerializer(serializers.Serializer):
+    policy = PolicyLookupPolicySerializer(allow_null=True)
+    actions = serializers.ListField(child=serializers.CharField())
+    permitted = serializers.BooleanField()
@@ -0,0 +1,26 @@
+from rest_framework import serializers
+
+__all__ = (
+    "ZonePolicyMatrixCellSerializer",
+    "ZonePolicyMatrixSerializer",
+    "ZonePolicyMatrixZoneSerializer",
+)
+
+
+class ZonePolicyMatrixZoneSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+
+
+class ZonePolicyMatrixCellSerializer(serializers.Serializer):
+    source_zone_id = serializers.IntegerField()
+    destination_zone_id = serializers.IntegerField()
+    count = serializers.IntegerField()
+    actions = serializers.DictField(child=serializers.IntegerField())
+
+
+class ZonePolicyMatrixSerializer(serializers.Serializer):
+    zones = ZonePolicyMatrixZoneSerializer(many=True)
+    cells = ZonePolicyMatrixCellSerializer(many=True)
+    policy_count = serializers.IntegerField()
+    max_count = serializers.IntegerField()
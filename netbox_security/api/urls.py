@@ -1,3 +1,4 @@
+from django.urls import path
 from netbox.api.routers import NetBoxRouter
 
 from .views import (
@@ -31,6 +32,10 @@ from .views import (
     FirewallFilterRuleViewSet,
     FirewallRuleFromSettingViewSet,
     FirewallRuleThenSettingViewSet,
+    AddressSetHierarchyView,
+    ChangeFeedView,
+    PolicyLookupView,
+    NatSimulationView,
 )
 
 app_name = "netbox_security"
@@ -67,4 +72,13 @@ router.register("nat-rule-assignments", NatRuleAssignmentViewSet)
 router.register("firewall-filter-assignments", FirewallFilterAssignmentViewSet)
 router.register("policer-assignments", PolicerAssignmentViewSet)
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path(
+        "address-set-hierarchy/",
+        AddressSetHierarchyView.as_view(),
+        name="address_set_hierarchy",
+    ),
+    path("changes/", ChangeFeedView.as_view(), name="change_feed"),
+    path("policy-lookup/", PolicyLookupView.as_view(), name="policy_lookup"),
+    path("nat-simulation/", NatSimulationView.as_view(), name="nat_simulation"),
+]
@@ -1,7 +1,16 @@
+from django.contrib.contenttypes.models import ContentType
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
 from rest_framework.routers import APIRootView
+from rest_framework.views import APIView
+from netbox.api.authentication import IsAuthenticatedOrLoginNotRequired
 from netbox.api.viewsets import NetBoxModelViewSet
+from netbox.plugins import get_plugin_config
 from django.db.models import Count
 
+from .pagination import KeysetPagination
 from .serializers import (
     CustomPrefixSerializer,
     AddressListSerializer,
@@ -32,6 +41,20 @@ from .serializers import (
     FirewallFilterRuleSerializer,
     FirewallRuleFromSettingSerializer,
     FirewallRuleThenSettingSerializer,
+    AddressSetHierarchyRequestSerializer,
+    AddressSetHierarchySerializer,
+    AddressSetImpactSerializer,
+    ZonePolicyMatrixSerializer,
+    ChangeFeedRequestSerializer,
+    ChangeFeedSerializer,
+    PolicyLookupBatchSerializer,
+    PolicyLookupFlowSerializer,
+    PolicyLookupResultSerializer,
+    PolicyAnalysisSerializer,
+    NatSimulationBatchSerializer,
+    NatSimulationFlowSerializer,
+    NatSimulationResultSerializer,
+    NatPoolAnalysisSerializer,
 )
 
 from netbox_security.models import (
@@ -97,6 +120,19 @@ from netbox_security.filtersets import (
     FirewallFilterRuleFromSettingFilterSet,
     FirewallFilterRuleThenSettingFilterSet,
 )
+from netbox_security.utilities import (
+    get_address_set_hierarchies,
+    get_address_set_impact,
+    get_change_feed,
+    get_nat_engine,
+    get_nat_pool_analysis,
+    get_policy_analysis,
+    get_policy_engine,
+    get_zone_policy_matrix,
+    iter_aggregated_prefixes,
+    iter_ndjson,
+    restrict_address_set_hierarchies,
+)
 
 
 class NetBoxSecurityRootView(APIRootView):
@@ -104,100 +140,152 @@ class NetBoxSecurityRootView(APIRootView):
         return "NetBoxSecurity"
 
 
-class CustomPrefixViewSet(NetBoxModelViewSet):
+class NetBoxSecurityModelViewSet(NetBoxModelViewSet):
+    """NetBoxModelViewSet whose lists also support keyset (cursor) pagination."""
+
+    pagination_class = KeysetPagination
+
+
+class NdjsonExportMixin:
+    """Adds an export action streaming the filtered list as newline-delimited JSON."""
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        """
+        Stream every object matching the list filters as one JSON document per line,
+        with related objects given by their primary keys.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            iter_ndjson(queryset), content_type="application/x-ndjson"
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{queryset.model._meta.model_name}.ndjson"'
+        )
+        return response
+
+
+class AggregatedPrefixesExportMixin:
+    """Adds an export action streaming the aggregated prefixes of the filtered list."""
+
+    @action(detail=False, methods=["get"], url_path="aggregated-prefixes")
+    def aggregated_prefixes(self, request):
+        """
+        Stream the minimal covering IPv4 and IPv6 prefixes of every object matching
+        the list filters as one JSON document per line.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            iter_aggregated_prefixes(queryset), content_type="application/x-ndjson"
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{queryset.model._meta.model_name}_prefixes.ndjson"'
+        )
+        return response
+
+
+class CustomPrefixViewSet(NetBoxSecurityModelViewSet):
     queryset = CustomPrefix.objects.all()
     serializer_class = CustomPrefixSerializer
     filterset_class = CustomPrefixFilterSet
 
 
-class AddressListViewSet(NetBoxModelViewSet):
+class AddressListViewSet(
+    AggregatedPrefixesExportMixin, NdjsonExportMixin, NetBoxSecurityModelViewSet
+):
     queryset = AddressList.objects.all()
     serializer_class = AddressListSerializer
     filterset_class = AddressListFilterSet
 
 
-class AddressListAssignmentViewSet(NetBoxModelViewSet):
+class AddressListAssignmentViewSet(NetBoxSecurityModelViewSet):
     queryset = AddressListAssignment.objects.all()
     serializer_class = AddressListAssignmentSerializer
     filterset_class = AddressListAssignmentFilterSet
 
 
-class AddressSetViewSet(NetBoxModelViewSet):
+class AddressSetViewSet(
+    AggregatedPrefixesExportMixin, NdjsonExportMixin, NetBoxSecurityModelViewSet
+):
     queryset = AddressSet.objects.prefetch_related("tenant", "tags")
     serializer_class = AddressSetSerializer
     filterset_class = AddressSetFilterSet
 
-
-class AddressSetAssignmentViewSet(NetBoxModelViewSet):
+    @action(detail=True, methods=["get"], url_path="impact")
+    def impact(self, request, pk=None):
+        """
+        Return the nested sets, Addresses, IPAM objects, Address Lists, policies and
+        devices affected by a change to this Address Set.
+        """
+        address_set = self.get_object()
+        return Response(
+            AddressSetImpactSerializer(
+                get_address_set_impact(address_set.pk, user=request.user)
+            ).data
+        )
+
+
+class AddressSetAssignmentViewSet(NetBoxSecurityModelViewSet):
     queryset = AddressSetAssignment.objects.all()
     serializer_class = AddressSetAssignmentSerializer
     filterset_class = AddressSetAssignmentFilterSet
 
 
-class AddressViewSet(NetBoxModelViewSet):
+class AddressViewSet(NdjsonExportMixin, NetBoxSecurityModelViewSet):
     queryset = Address.objects.prefetch_related("tenant", "tags")
     serializer_class = AddressSerializer
     filterset_class = AddressFilterSet
 
 
-class AddressAssignmentViewSet(NetBoxModelViewSet):
+class AddressAssignmentViewSet(NetBoxSecurityModelViewSet):
     queryset = AddressAssignment.objects.all()
     serializer_class = AddressAssignmentSerializer
     filterset_class = AddressAssignmentFilterSet
 
 
-class ApplicationItemViewSet(NetBoxModelViewSet):
+class ApplicationItemViewSet(NetBoxSecurityModelViewSet):
     queryset = ApplicationItem.objects.prefetch_related("tags")
     serializer_class = ApplicationItemSerializer
     filterset_class = ApplicationItemFilterSet
 
 
-class ApplicationViewSet(NetBoxModelViewSet):
+class ApplicationViewSet(NetBoxSecurityModelViewSet):
     queryset = Application.objects.prefetch_related("tenant", "tags")
     serializer_class = ApplicationSerializer
     filterset_class = ApplicationFilterSet
 
 
-class ApplicationAssignmentViewSet(NetBoxModelViewSet):
+class ApplicationAssignmentViewSet(NetBoxSecurityModelViewSet):
     queryset = ApplicationAssignment.objects.all()
     serializer_class = ApplicationAssignmentSerializer
     filterset_class = ApplicationAssignmentFilterSet
 
 
-class ApplicationSetViewSet(NetBoxModelViewSet):
+class ApplicationSetViewSet(NetBoxSecurityModelViewSet):
     queryset = ApplicationSet.objects.prefetch_related("tenant", "tags")
     serializer_class = ApplicationSetSerializer
     filterset_class = ApplicationSetFilterSet
 
 
-class ApplicationSetAssignmentViewSet(NetBoxModelViewSet):
+class ApplicationSetAssignmentViewSet(NetBoxSecurityModelViewSet):
     queryset = ApplicationSetAssignment.objects.all()
     serializer_class = ApplicationSetAssignmentSerializer
     filterset_class = ApplicationSetAssignmentFilterSet
 
 
-class SecurityZoneViewSet(NetBoxModelViewSet):
-    queryset = SecurityZone.objects.prefetch_related("tenant", "tags").annotate(
-        source_policy_count=Count(
-            "source_zone_policies",
-            distinct=True,
-        ),
-        destination_policy_count=Count(
-            "destination_zone_policies",
-            distinct=True,
-        ),
-    )
+class SecurityZoneViewSet(NetBoxSecurityModelViewSet):
+    queryset = SecurityZone.annotated_queryset().prefetch_related("tenant", "tags")
     serializer_class = SecurityZoneSerializer
     filterset_class = SecurityZoneFilterSet
 
 
-class SecurityZoneAssignmentViewSet(NetBoxModelViewSet):
+class SecurityZoneAssignmentViewSet(NetBoxSecurityModelViewSet):
     queryset = SecurityZoneAssignment.objects.all()
     serializer_class = SecurityZoneAssignmentSerializer
     filterset_class = SecurityZoneAssignmentFilterSet
 
 
-class SecurityZonePolicyViewSet(NetBoxModelViewSet):
+class SecurityZonePolicyViewSet(NdjsonExportMixin, NetBoxSecurityModelViewSet):
     queryset = SecurityZonePolicy.objects.prefetch_related(
         "source_zone",
         "destination_zone",
@@ -208,22 +296,62 @@ class SecurityZonePolicyViewSet(NetBoxModelViewSet):
     serializer_class = SecurityZonePolicySerializer
     filterset_class = SecurityZonePolicyFilterSet
 
-
-class NatPoolViewSet(NetBoxModelViewSet):
+    @action(detail=False, methods=["get"], url_path="matrix")
+    def matrix(self, request):
+        """
+        Return the number of policies, in total and per action, between every pair
+        of Security Zones with policies. Supports the policy list filters.
+        """
+        return Response(
+            ZonePolicyMatrixSerializer(
+                get_zone_policy_matrix(self.filter_queryset(self.get_queryset()))
+            ).data
+        )
+
+    @action(detail=False, methods=["get"], url_path="analysis")
+    def analysis(self, request):
+        """
+        Return the policies shadowed by, redundant with or correlated with another
+        policy of the same pair of Security Zones. Supports the policy list filters.
+        """
+        return Response(
+            PolicyAnalysisSerializer(
+                get_policy_analysis(self.filter_queryset(self.get_queryset()))
+            ).data
+        )
+
+
+class NatPoolViewSet(NetBoxSecurityModelViewSet):
     queryset = NatPool.objects.prefetch_related("tags").annotate(
         member_count=Count("natpoolmember_pools")
     )
     serializer_class = NatPoolSerializer
     filterset_class = NatPoolFilterSet
 
-
-class NatPoolAssignmentViewSet(NetBoxModelViewSet):
+    @action(detail=False, methods=["get"], url_path="analysis")
+    def analysis(self, request):
+        """
+        Return the overlapping members, address and port capacity of the NAT Pools,
+        and the active rules pointing at inactive or empty pools. Supports the pool
+        list filters; members, rules and rule sets the user cannot view are left
+        out.
+        """
+        return Response(
+            NatPoolAnalysisSerializer(
+                get_nat_pool_analysis(
+                    self.filter_queryset(self.get_queryset()), user=request.user
+                )
+            ).data
+        )
+
+
+class NatPoolAssignmentViewSet(NetBoxSecurityModelViewSet):
     queryset = NatPoolAssignment.objects.all()
     serializer_class = NatPoolAssignmentSerializer
     filterset_class = NatPoolAssignmentFilterSet
 
 
-class NatPoolMemberViewSet(NetBoxModelViewSet):
+class NatPoolMemberViewSet(NetBoxSecurityModelViewSet):
     queryset = NatPoolMember.objects.prefetch_related(
         "pool", "address", "prefix", "address_range", "tags"
     )
@@ -231,7 +359,7 @@ class NatPoolMemberViewSet(NetBoxModelViewSet):
     filterset_class = NatPoolMemberFilterSet
 
 
-class NatRuleSetViewSet(NetBoxModelViewSet):
+class NatRuleSetViewSet(NetBoxSecurityModelViewSet):
     queryset = NatRuleSet.objects.prefetch_related("tags").annotate(
         rule_count=Count("natrule_rules")
     )
@@ -239,13 +367,13 @@ class NatRuleSetViewSet(NetBoxModelViewSet):
     filterset_class = NatRuleSetFilterSet
 
 
-class NatRuleSetAssignmentViewSet(NetBoxModelViewSet):
+class NatRuleSetAssignmentViewSet(NetBoxSecurityModelViewSet):
     queryset = NatRuleSetAssignment.objects.all()
     serializer_class = NatRuleSetAssignmentSerializer
     filterset_class = NatRuleSetAssignmentFilterSet
 
 
-class NatRuleViewSet(NetBoxModelViewSet):
+class NatRuleViewSet(NdjsonExportMixin, NetBoxSecurityModelViewSet):
     queryset = NatRule.objects.prefetch_related(
         "source_addresses",
         "destination_addresses",
@@ -262,25 +390,25 @@ class NatRuleViewSet(NetBoxModelViewSet):
     filterset_class = NatRuleFilterSet
 
 
-class NatRuleAssignmentViewSet(NetBoxModelViewSet):
+class NatRuleAssignmentViewSet(NetBoxSecurityModelViewSet):
     queryset = NatRuleAssignment.objects.all()
     serializer_class = NatRuleAssignmentSerializer
     filterset_class = NatRuleAssignmentFilterSet
 
 
-class PolicerViewSet(NetBoxModelViewSet):
+class PolicerViewSet(NetBoxSecurityModelViewSet):
     queryset = Policer.objects.all()
     serializer_class = PolicerSerializer
     filterset_class = PolicerFilterSet
 
 
-class PolicerAssignmentViewSet(NetBoxModelViewSet):
+class PolicerAssignmentViewSet(NetBoxSecurityModelViewSet):
     queryset = PolicerAssignment.objects.all()
     serializer_class = PolicerAssignmentSerializer
     filterset_class = PolicerAssignmentFilterSet
 
 
-class FirewallFilterViewSet(NetBoxModelViewSet):
+class FirewallFilterViewSet(NetBoxSecurityModelViewSet):
     queryset = FirewallFilter.objects.prefetch_related("tenant", "tags").annotate(
         rule_count=Count("firewallfilterrule_rules")
     )
@@ -288,25 +416,274 @@ class FirewallFilterViewSet(NetBoxModelViewSet):
     filterset_class = FirewallFilterFilterSet
 
 
-class FirewallFilterAssignmentViewSet(NetBoxModelViewSet):
+class FirewallFilterAssignmentViewSet(NetBoxSecurityModelViewSet):
     queryset = FirewallFilterAssignment.objects.all()
     serializer_class = FirewallFilterAssignmentSerializer
     filterset_class = FirewallFilterAssignmentFilterSet
 
 
-class FirewallFilterRuleViewSet(NetBoxModelViewSet):
+class FirewallFilterRuleViewSet(NdjsonExportMixin, NetBoxSecurityModelViewSet):
     queryset = FirewallFilterRule.objects.prefetch_related("tags")
     serializer_class = FirewallFilterRuleSerializer
     filterset_class = FirewallFilterRuleFilterSet
 
 
-class FirewallRuleFromSettingViewSet(NetBoxModelViewSet):
+class FirewallRuleFromSettingViewSet(NetBoxSecurityModelViewSet):
     queryset = FirewallRuleFromSetting.objects.all()
     serializer_class = FirewallRuleFromSettingSerializer
     filterset_class = FirewallFilterRuleFromSettingFilterSet
 
 
-class FirewallRuleThenSettingViewSet(NetBoxModelViewSet):
+class FirewallRuleThenSettingViewSet(NetBoxSecurityModelViewSet):
     queryset = FirewallRuleThenSetting.objects.all()
     serializer_class = FirewallRuleThenSettingSerializer
     filterset_class = FirewallFilterRuleThenSettingFilterSet
+
+
+class AddressSetHierarchyView(APIView):
+    """
+    Resolve the Address Set hierarchy and policy context for many objects of one model.
+
+    GET accepts app_label, model and one or more object_id query parameters; POST
+    accepts {"app_label": ..., "model": ..., "object_ids": [...]}, with up to
+    address_set_hierarchy_batch_limit objects. Objects the user cannot view are
+    omitted from the results, as are the Addresses, Address Sets, Address Lists,
+    policies and zones of their hierarchy. Address Set paths are paginated with
+    path_offset and path_limit, the latter capped by the address_set_path_limit
+    plugin setting.
+    """
+
+    permission_classes = [IsAuthenticatedOrLoginNotRequired]
+
+    def get_view_name(self):
+        return "Address Set Hierarchy"
+
+    def get(self, request):
+        serializer = AddressSetHierarchyRequestSerializer(
+            data={
+                "app_label": request.query_params.get("app_label"),
+                "model": request.query_params.get("model"),
+                "object_ids": request.query_params.getlist("object_id"),
+                **{
+                    key: request.query_params[key]
+                    for key in ("path_offset", "path_limit")
+                    if key in request.query_params
+                },
+            }
+        )
+        return self._resolve(request, serializer)
+
+    def post(self, request):
+        serializer = AddressSetHierarchyRequestSerializer(data=request.data)
+        return self._resolve(request, serializer)
+
+    def _resolve(self, request, serializer):
+        limit = get_plugin_config(
+            "netbox_security", "address_set_hierarchy_batch_limit"
+        )
+        object_ids = serializer.initial_data.get("object_ids")
+        if isinstance(object_ids, list) and len(object_ids) > limit:
+            raise ValidationError(
+                {"object_ids": [f"At most {limit} objects can be resolved at once."]}
+            )
+        serializer.is_valid(raise_exception=True)
+        app_label = serializer.validated_data["app_label"]
+        model = serializer.validated_data["model"]
+
+        content_type = ContentType.objects.filter(
+            app_label=app_label, model=model
+        ).first()
+        model_class = content_type.model_class() if content_type else None
+        if not model_class:
+            return Response(
+                {"model": [f"Unknown object type: {app_label}.{model}"]},
+                status=400,
+            )
+
+        object_ids = list(dict.fromkeys(serializer.validated_data["object_ids"]))
+        queryset = model_class.objects.filter(pk__in=object_ids)
+        if hasattr(queryset, "restrict"):
+            queryset = queryset.restrict(request.user, "view")
+        permitted_ids = set(queryset.values_list("pk", flat=True))
+        object_ids = [
+            object_id for object_id in object_ids if object_id in permitted_ids
+        ]
+
+        max_path_limit = get_plugin_config("netbox_security", "address_set_path_limit")
+        hierarchies = get_address_set_hierarchies(
+            app_label,
+            model,
+            object_ids,
+            path_offset=serializer.validated_data["path_offset"],
+            path_limit=min(
+                serializer.validated_data.get("path_limit", max_path_limit),
+                max_path_limit,
+            ),
+        )
+        hierarchies = restrict_address_set_hierarchies(hierarchies, request.user)
+        return Response(
+            {
+                "app_label": app_label,
+                "model": model,
+                "results": AddressSetHierarchySerializer(
+                    [hierarchies[object_id] for object_id in object_ids], many=True
+                ).data,
+            }
+        )
+
+
+class ChangeFeedView(APIView):
+    """
+    List the IDs of the plugin objects created, updated or deleted since a cursor.
+
+    Accepts since, the "next" value returned by the previous request, or since_time,
+    a timestamp, for the first request. limit caps the number of changelog entries
+    read per request and is itself capped by the change_feed_limit plugin setting;
+    follow "next" while "has_more" is true. Entries younger than the change_feed_lag
+    plugin setting are left for a later request.
+    """
+
+    permission_classes = [IsAuthenticatedOrLoginNotRequired]
+
+    def get_view_name(self):
+        return "Change Feed"
+
+    def get(self, request):
+        serializer = ChangeFeedRequestSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        max_limit = get_plugin_config("netbox_security", "change_feed_limit")
+        try:
+            change_feed = get_change_feed(
+                request.user,
+                since=serializer.validated_data.get("since"),
+                since_time=serializer.validated_data.get("since_time"),
+                limit=min(serializer.validated_data.get("limit", max_limit), max_limit),
+            )
+        except ValueError as error:
+            raise ValidationError({"since_time": [str(error)]})
+        return Response(ChangeFeedSerializer(change_feed).data)
+
+
+class PolicyLookupView(APIView):
+    """
+    Find the first Security Zone Policy matching a flow between two zones.
+
+    GET accepts source_zone, destination_zone, source, destination and optionally
+    protocol, source_port and destination_port query parameters and returns the
+    result of one flow. POST accepts {"flows": [...]} with up to
+    policy_lookup_batch_limit flows of the same fields and returns their results
+    in order. Only policies the user may view are considered.
+    """
+
+    permission_classes = [IsAuthenticatedOrLoginNotRequired]
+
+    def get_view_name(self):
+        return "Policy Lookup"
+
+    def get(self, request):
+        serializer = PolicyLookupFlowSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        engine = self._get_engine(request)
+        return Response(
+            PolicyLookupResultSerializer(
+                engine.lookup(**self._get_flow(serializer.validated_data))
+            ).data
+        )
+
+    def post(self, request):
+        limit = get_plugin_config("netbox_security", "policy_lookup_batch_limit")
+        flows = request.data.get("flows") if hasattr(request.data, "get") else None
+        if isinstance(flows, list) and len(flows) > limit:
+            raise ValidationError(
+                {"flows": [f"At most {limit} flows can be looked up at once."]}
+            )
+        serializer = PolicyLookupBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        flows = serializer.validated_data["flows"]
+        engine = self._get_engine(request)
+        # The results are plain data already; serializing thousands of them one by
+        # one would cost more than the lookups themselves.
+        return Response(
+            {"results": engine.lookup_many(self._get_flow(flow) for flow in flows)}
+        )
+
+    @staticmethod
+    def _get_engine(request):
+        if not request.user.has_perm("netbox_security.view_securityzonepolicy"):
+            raise PermissionDenied()
+        return get_policy_engine(
+            SecurityZonePolicy.objects.restrict(request.user, "view")
+        )
+
+    @staticmethod
+    def _get_flow(data):
+        return {
+            "source_zone_id": data["source_zone"],
+            "destination_zone_id": data["destination_zone"],
+            "source": data["source"],
+            "destination": data["destination"],
+            "protocol": data.get("protocol") or None,
+            "source_port": data.get("source_port"),
+            "destination_port": data.get("destination_port"),
+        }
+
+
+class NatSimulationView(APIView):
+    """
+    Simulate the NAT translation of a flow by the NAT Rule Sets and NAT Rules.
+
+    GET accepts source and destination and optionally source_port,
+    destination_port, source_zone, destination_zone and direction query
+    parameters and returns the post-NAT flow. POST accepts {"flows": [...]} with up
+    to nat_simulation_batch_limit flows of the same fields and returns their
+    results in order. Only rules the user may view are considered.
+    """
+
+    permission_classes = [IsAuthenticatedOrLoginNotRequired]
+
+    def get_view_name(self):
+        return "NAT Simulation"
+
+    def get(self, request):
+        serializer = NatSimulationFlowSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        engine = self._get_engine(request)
+        return Response(
+            NatSimulationResultSerializer(
+                engine.simulate(**self._get_flow(serializer.validated_data))
+            ).data
+        )
+
+    def post(self, request):
+        limit = get_plugin_config("netbox_security", "nat_simulation_batch_limit")
+        flows = request.data.get("flows") if hasattr(request.data, "get") else None
+        if isinstance(flows, list) and len(flows) > limit:
+            raise ValidationError(
+                {"flows": [f"At most {limit} flows can be simulated at once."]}
+            )
+        serializer = NatSimulationBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        flows = serializer.validated_data["flows"]
+        engine = self._get_engine(request)
+        # As for the policy lookup, the results are returned as plain data.
+        return Response(
+            {"results": engine.simulate_many(self._get_flow(flow) for flow in flows)}
+        )
+
+    @staticmethod
+    def _get_engine(request):
+        if not request.user.has_perm("netbox_security.view_natrule"):
+            raise PermissionDenied()
+        return get_nat_engine(NatRule.objects.restrict(request.user, "view"))
+
+    @staticmethod
+    def _get_flow(data):
+        return {
+            "source": data["source"],
+            "destination": data["destination"],
+            "source_port": data.get("source_port"),
+            "destination_port": data.get("destination_port"),
+            "source_zone_id": data.get("source_zone"),
+            "destination_zone_id": data.get("destination_zone"),
+            "direction": data.get("direction"),
+        }
@@ -24,6 +24,7 @@ from netbox_security.models import (
 from netbox_security.mixins import (
     AssignmentFilterSet,
 )
+from netbox_security.utilities import get_effective_address_ids
 
 __all__ = (
     "AddressFilterSet",
@@ -121,6 +122,22 @@ class AddressFilterSet(TenancyFilterSet, PrimaryModelFilterSet):
         queryset=IPRange.objects.all(),
         label=_("IP Ranges"),
     )
+    effective_prefix_id = MultiValueNumberFilter(
+        method="filter_effective_prefix",
+        label=_("Direct or inherited by Prefix (ID)"),
+    )
+    effective_ip_address_id = MultiValueNumberFilter(
+        method="filter_effective_ip_address",
+        label=_("Direct or inherited by IP Address (ID)"),
+    )
+    effective_ip_range_id = MultiValueNumberFilter(
+        method="filter_effective_ip_range",
+        label=_("Direct or inherited by IP Range (ID)"),
+    )
+    effective_custom_prefix_id = MultiValueNumberFilter(
+        method="filter_effective_custom_prefix",
+        label=_("Direct or inherited by Custom Prefix (ID)"),
+    )
 
     class Meta:
         model = Address
@@ -138,6 +155,30 @@ class AddressFilterSet(TenancyFilterSet, PrimaryModelFilterSet):
         )
         return queryset.filter(qs_filter)
 
+    def _filter_effective(self, queryset, app_label, model, value):
+        direct_by_object, inherited_by_object = get_effective_address_ids(
+            app_label, model, value
+        )
+        address_ids = set()
+        for ids_by_object in (direct_by_object, inherited_by_object):
+            for object_address_ids in ids_by_object.values():
+                address_ids.update(object_address_ids)
+        return queryset.filter(pk__in=address_ids)
+
+    def filter_effective_prefix(self, queryset, name, value):
+        return self._filter_effective(queryset, "ipam", "prefix", value)
+
+    def filter_effective_ip_address(self, queryset, name, value):
+        return self._filter_effective(queryset, "ipam", "ipaddress", value)
+
+    def filter_effective_ip_range(self, queryset, name, value):
+        return self._filter_effective(queryset, "ipam", "iprange", value)
+
+    def filter_effective_custom_prefix(self, queryset, name, value):
+        return self._filter_effective(
+            queryset, "netbox_security", "customprefix", value
+        )
+
 
 @register_filterset
 class AddressAssignmentFilterSet(AssignmentFilterSet):
@@ -0,0 +1,103 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from netbox_security.utilities.benchmark import (
+    BENCHMARK_GROUPS,
+    compare_benchmark_results,
+    run_security_benchmarks,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time and count the queries of the plugin's views, API endpoints and resolvers"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--username",
+            help="User to request views and API endpoints as (default: the first superuser)",
+        )
+        parser.add_argument(
+            "--group",
+            action="append",
+            choices=BENCHMARK_GROUPS,
+            help="Only run this group of benchmarks; may be repeated",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=5,
+            help="Measured runs per benchmark (default: 5)",
+        )
+        parser.add_argument(
+            "--sample-size",
+            type=int,
+            default=3,
+            help="Objects sampled per model for the resolver and tab benchmarks (default: 3)",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the JSON results to this file instead of standard output",
+        )
+        parser.add_argument(
+            "--compare",
+            help="JSON results of an earlier run to compare against",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=1.25,
+            help="Median time ratio above which --compare reports a regression (default: 1.25)",
+        )
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.filter(is_active=True)
+        if options["username"]:
+            user = users.filter(username=options["username"]).first()
+        else:
+            user = users.filter(is_superuser=True).order_by("pk").first()
+        if user is None:
+            raise CommandError("No active user to run the benchmarks as.")
+
+        results = run_security_benchmarks(
+            user,
+            groups=options["group"] or BENCHMARK_GROUPS,
+            sample_size=options["sample_size"],
+            iterations=options["iterations"],
+        )
+
+        output = json.dumps(results, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as output_file:
+                output_file.write(output)
+            self.stdout.write(
+                self.style.SUCCESS(f"Results written to {options['output']}.")
+            )
+        elif not options["compare"]:
+            self.stdout.write(output)
+
+        if options["compare"]:
+            with open(options["compare"]) as baseline_file:
+                baseline = json.load(baseline_file)
+            comparison = compare_benchmark_results(
+                baseline, results, threshold=options["threshold"]
+            )
+            for (
+                name,
+                before,
+                after,
+                ratio,
+                queries_before,
+                queries_after,
+                regressed,
+            ) in comparison:
+                line = (
+                    f"{name}: {before:.1f}ms -> {after:.1f}ms ({ratio:.2f}x), "
+                    f"{queries_before} -> {queries_after} queries"
+                )
+                self.stdout.write(self.style.ERROR(line) if regressed else line)
+            if any(row[-1] for row in comparison):
+                raise CommandError("Benchmark regressions detected.")
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+
+from netbox_security.utilities.dataset import (
+    DATASET_DEFAULTS,
+    delete_security_dataset,
+    generate_security_dataset,
+)
+
+
+class Command(BaseCommand):
+    help = "Generate (or delete) a synthetic large-scale dataset for benchmarking"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tag",
+            default="benchmark",
+            help="Name prefix and Tag of the generated objects (default: benchmark)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed, so that the same volumes produce the same dataset",
+        )
+        parser.add_argument(
+            "--delete",
+            action="store_true",
+            help="Delete the dataset generated with --tag instead of creating one",
+        )
+        for name, default in DATASET_DEFAULTS.items():
+            parser.add_argument(
+                f"--{name.replace('_', '-')}",
+                dest=name,
+                type=int,
+                default=default,
+                help=f"Number of {name.replace('_', ' ')} (default: {default})",
+            )
+
+    def handle(self, *args, **options):
+        if options["delete"]:
+            self.stdout.write(f"Deleting dataset {options['tag']}...")
+            counts = delete_security_dataset(options["tag"])
+        else:
+            self.stdout.write(f"Generating dataset {options['tag']}...")
+            counts = generate_security_dataset(
+                options["tag"],
+                options["seed"],
+                **{name: options[name] for name in DATASET_DEFAULTS},
+            )
+        for name, count in counts.items():
+            self.stdout.write(f"{name.replace('_', ' ').capitalize()}: {count}")
+        self.stdout.write(self.style.SUCCESS("Done."))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from netbox_security.utilities import (
+    clear_policy_context_cache,
+    get_policy_context_cache_stats,
+)
+
+
+class Command(BaseCommand):
+    help = "Show (or clear) the security policy context cache statistics"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Invalidate every cached policy context and reset the counters",
+        )
+
+    def handle(self, *args, **options):
+        stats = get_policy_context_cache_stats()
+        self.stdout.write(f"Hits: {stats['hits']}")
+        self.stdout.write(f"Misses: {stats['misses']}")
+        self.stdout.write(f"Hit ratio: {stats['hit_ratio']:.1%}")
+
+        if options["clear"]:
+            clear_policy_context_cache()
+            self.stdout.write(self.style.SUCCESS("Policy context cache cleared."))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from netbox_security.utilities import (
+    check_address_set_closure,
+    rebuild_address_set_closure,
+)
+
+
+class Command(BaseCommand):
+    help = "Rebuild (or verify) the transitive closure table for nested Address Sets"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only compare the stored closure table against the Address Set hierarchy",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            drift = check_address_set_closure()
+            for label, pairs in drift.items():
+                self.stdout.write(
+                    f"{label.replace('_', ' ').capitalize()}: {len(pairs)}"
+                )
+                for ancestor_id, descendant_id in pairs[:20]:
+                    self.stdout.write(f"  {ancestor_id} -> {descendant_id}")
+            if any(drift.values()):
+                raise CommandError(
+                    "Address Set closure table is out of date; run without --check to rebuild it."
+                )
+            self.stdout.write(
+                self.style.SUCCESS("Address Set closure table is consistent.")
+            )
+            return
+
+        self.stdout.write("Rebuilding Address Set closure table...")
+        row_count = rebuild_address_set_closure()
+        self.stdout.write(
+            self.style.SUCCESS(f"Done. {row_count} closure rows written.")
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from netbox_security.utilities import rebuild_effective_addresses
+
+
+class Command(BaseCommand):
+    help = "Rebuild the table of direct and inherited Addresses for IPAM objects"
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding effective Address table...")
+        row_count = rebuild_effective_addresses()
+        self.stdout.write(
+            self.style.SUCCESS(f"Done. {row_count} effective Address rows written.")
+        )
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from netbox_security.utilities import (
+    check_security_counters,
+    rebuild_security_counters,
+)
+
+
+class Command(BaseCommand):
+    help = "Rebuild (or verify) the Security tab counters of IP Addresses, Prefixes and IP Ranges"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only compare the stored counters against the related objects",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            drift = check_security_counters()
+            for (app_label, model), object_ids in drift.items():
+                self.stdout.write(f"{app_label}.{model}: {len(object_ids)}")
+                for object_id in object_ids[:20]:
+                    self.stdout.write(f"  {object_id}")
+            if any(drift.values()):
+                raise CommandError(
+                    "Security counters are out of date; run without --check to rebuild them."
+                )
+            self.stdout.write(self.style.SUCCESS("Security counters are consistent."))
+            return
+
+        self.stdout.write("Rebuilding security counters...")
+        row_count = rebuild_security_counters()
+        self.stdout.write(
+            self.style.SUCCESS(f"Done. {row_count} counter rows written.")
+        )
@@ -0,0 +1,103 @@
+from collections import defaultdict, deque
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_address_set_closure(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+
+    AddressSet = apps.get_model("netbox_security", "AddressSet")
+    AddressSetClosure = apps.get_model("netbox_security", "AddressSetClosure")
+    Through = AddressSet.address_sets.through
+
+    parent_map = defaultdict(set)
+    for parent_id, child_id in Through.objects.using(db_alias).values_list(
+        "from_addressset_id", "to_addressset_id"
+    ):
+        parent_map[child_id].add(parent_id)
+
+    rows = []
+    for address_set_id in AddressSet.objects.using(db_alias).values_list(
+        "pk", flat=True
+    ):
+        rows.append(
+            AddressSetClosure(
+                ancestor_id=address_set_id, descendant_id=address_set_id, depth=0
+            )
+        )
+        seen = {address_set_id}
+        queue = deque([(address_set_id, 0)])
+        while queue:
+            current_id, depth = queue.popleft()
+            for parent_id in parent_map.get(current_id, ()):
+                if parent_id in seen:
+                    continue
+                seen.add(parent_id)
+                rows.append(
+                    AddressSetClosure(
+                        ancestor_id=parent_id,
+                        descendant_id=address_set_id,
+                        depth=depth + 1,
+                    )
+                )
+                queue.append((parent_id, depth + 1))
+
+    AddressSetClosure.objects.using(db_alias).bulk_create(rows, batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("netbox_security", "0029_securityzone_allow_intra_zone"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AddressSetClosure",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False
+                    ),
+                ),
+                ("depth", models.PositiveIntegerField()),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="descendant_closure",
+                        to="netbox_security.addressset",
+                    ),
+                ),
+                (
+                    "descendant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ancestor_closure",
+                        to="netbox_security.addressset",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Address Set Closure",
+                "verbose_name_plural": "Address Set Closures",
+                "indexes": [
+                    models.Index(
+                        fields=["descendant", "ancestor", "depth"],
+                        name="netbox_secu_descend_157f1f_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("ancestor", "descendant"),
+                        name="netbox_security_addresssetclosure_unique_pair",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(
+            populate_address_set_closure, reverse_code=migrations.RunPython.noop
+        ),
+    ]
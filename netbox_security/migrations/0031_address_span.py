@@ -0,0 +1,107 @@
+from django.db import migrations, models
+
+
+def _span(model_name, obj):
+    if model_name in ("prefix", "customprefix"):
+        return int(obj.prefix.first), int(obj.prefix.last), int(obj.prefix.version)
+    if model_name == "ipaddress":
+        ip = int(obj.address.ip)
+        return ip, ip, int(obj.address.version)
+    if model_name == "iprange":
+        return (
+            int(obj.start_address.ip),
+            int(obj.end_address.ip),
+            int(obj.start_address.version),
+        )
+    return None
+
+
+def populate_address_spans(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+
+    Address = apps.get_model("netbox_security", "Address")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+
+    for app_label, model_name in (
+        ("ipam", "prefix"),
+        ("ipam", "iprange"),
+        ("ipam", "ipaddress"),
+        ("netbox_security", "customprefix"),
+    ):
+        content_type = (
+            ContentType.objects.using(db_alias)
+            .filter(app_label=app_label, model=model_name)
+            .first()
+        )
+        if not content_type:
+            continue
+
+        addresses = list(
+            Address.objects.using(db_alias).filter(
+                assigned_object_type_id=content_type.pk
+            )
+        )
+        if not addresses:
+            continue
+
+        model = apps.get_model(app_label, model_name)
+        objects = model.objects.using(db_alias).in_bulk(
+            {address.assigned_object_id for address in addresses}
+        )
+        for address in addresses:
+            span = _span(model_name, objects.get(address.assigned_object_id))
+            if span:
+                address.span_start, address.span_end, address.span_version = span
+
+        Address.objects.using(db_alias).bulk_update(
+            addresses, ["span_start", "span_end", "span_version"], batch_size=1000
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("netbox_security", "0030_addresssetclosure"),
+        ("ipam", "0086_gfk_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="address",
+            name="span_version",
+            field=models.PositiveSmallIntegerField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="address",
+            name="span_start",
+            field=models.DecimalField(
+                blank=True, decimal_places=0, editable=False, max_digits=39, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="address",
+            name="span_end",
+            field=models.DecimalField(
+                blank=True, decimal_places=0, editable=False, max_digits=39, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="address",
+            index=models.Index(
+                fields=["assigned_object_type", "assigned_object_id"],
+                name="netbox_secu_assigne_e0968a_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="address",
+            index=models.Index(
+                fields=["span_version", "span_start", "span_end"],
+                name="netbox_secu_span_ve_646ac4_idx",
+            ),
+        ),
+        migrations.RunPython(
+            populate_address_spans, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,56 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("netbox_security", "0031_address_span"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EffectiveAddress",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False
+                    ),
+                ),
+                ("assigned_object_id", models.PositiveBigIntegerField()),
+                ("inherited", models.BooleanField(default=False)),
+                (
+                    "address",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="effective_assignments",
+                        to="netbox_security.address",
+                    ),
+                ),
+                (
+                    "assigned_object_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Effective Address",
+                "verbose_name_plural": "Effective Addresses",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "assigned_object_type",
+                            "assigned_object_id",
+                            "address",
+                        ),
+                        name="netbox_security_effectiveaddress_unique_object_address",
+                    )
+                ],
+            },
+        ),
+    ]
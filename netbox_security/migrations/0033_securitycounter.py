@@ -0,0 +1,146 @@
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+COUNTER_MODELS = {
+    "ipaddress": ("address", "source_addresses", "destination_addresses"),
+    "prefix": ("prefix", "source_prefixes", "destination_prefixes"),
+    "iprange": ("address_range", "source_ranges", "destination_ranges"),
+}
+
+
+def populate_security_counters(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    Address = apps.get_model("netbox_security", "Address")
+    AddressAssignment = apps.get_model("netbox_security", "AddressAssignment")
+    NatPoolMember = apps.get_model("netbox_security", "NatPoolMember")
+    NatRule = apps.get_model("netbox_security", "NatRule")
+    SecurityCounter = apps.get_model("netbox_security", "SecurityCounter")
+
+    zone_ct = (
+        ContentType.objects.using(db_alias)
+        .filter(app_label="netbox_security", model="securityzone")
+        .first()
+    )
+    rows = []
+    for model, (member_field, *rule_fields) in COUNTER_MODELS.items():
+        content_type = (
+            ContentType.objects.using(db_alias)
+            .filter(app_label="ipam", model=model)
+            .first()
+        )
+        if content_type is None:
+            continue
+        counters = defaultdict(
+            lambda: {
+                "nat_pool_member_count": 0,
+                "nat_rule_count": 0,
+                "address_count": 0,
+                "security_zone_count": 0,
+            }
+        )
+
+        for object_id, count in (
+            NatPoolMember.objects.using(db_alias)
+            .filter(**{f"{member_field}_id__isnull": False})
+            .values_list(f"{member_field}_id")
+            .annotate(count=Count("pk"))
+            .order_by()
+        ):
+            counters[object_id]["nat_pool_member_count"] = count
+
+        nat_rules = defaultdict(set)
+        for field_name in rule_fields:
+            Through = getattr(NatRule, field_name).through
+            for rule_id, object_id in Through.objects.using(db_alias).values_list(
+                "natrule_id", f"{model}_id"
+            ):
+                nat_rules[object_id].add(rule_id)
+        for object_id, rule_ids in nat_rules.items():
+            counters[object_id]["nat_rule_count"] = len(rule_ids)
+
+        for object_id, count in (
+            Address.objects.using(db_alias)
+            .filter(assigned_object_type=content_type, assigned_object_id__isnull=False)
+            .values_list("assigned_object_id")
+            .annotate(count=Count("pk"))
+            .order_by()
+        ):
+            counters[object_id]["address_count"] = count
+
+        if zone_ct is not None:
+            for object_id, count in (
+                AddressAssignment.objects.using(db_alias)
+                .filter(
+                    assigned_object_type=zone_ct,
+                    address__assigned_object_type=content_type,
+                    address__assigned_object_id__isnull=False,
+                )
+                .values_list("address__assigned_object_id")
+                .annotate(count=Count("assigned_object_id", distinct=True))
+                .order_by()
+            ):
+                counters[object_id]["security_zone_count"] = count
+
+        rows.extend(
+            SecurityCounter(
+                assigned_object_type=content_type,
+                assigned_object_id=object_id,
+                **values,
+            )
+            for object_id, values in counters.items()
+        )
+
+    SecurityCounter.objects.using(db_alias).bulk_create(rows, batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("netbox_security", "0032_effectiveaddress"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SecurityCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False
+                    ),
+                ),
+                ("assigned_object_id", models.PositiveBigIntegerField()),
+                ("nat_pool_member_count", models.PositiveIntegerField(default=0)),
+                ("nat_rule_count", models.PositiveIntegerField(default=0)),
+                ("address_count", models.PositiveIntegerField(default=0)),
+                ("security_zone_count", models.PositiveIntegerField(default=0)),
+                (
+                    "assigned_object_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Security Counter",
+                "verbose_name_plural": "Security Counters",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("assigned_object_type", "assigned_object_id"),
+                        name="netbox_security_securitycounter_unique_object",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(
+            populate_security_counters, reverse_code=migrations.RunPython.noop
+        ),
+    ]
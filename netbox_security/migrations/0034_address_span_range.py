@@ -0,0 +1,44 @@
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+def _span_range():
+    return django.db.models.expressions.Func(
+        models.F("span_start"),
+        models.F("span_end"),
+        models.Value("[]"),
+        function="numrange",
+        output_field=django.contrib.postgres.fields.ranges.DecimalRangeField(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("netbox_security", "0033_securitycounter"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="address",
+            name="netbox_secu_span_ve_646ac4_idx",
+        ),
+        migrations.AddIndex(
+            model_name="address",
+            index=django.contrib.postgres.indexes.GistIndex(
+                _span_range(),
+                condition=models.Q(("span_version", 4)),
+                name="netbox_secu_span_v4_gist",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="address",
+            index=django.contrib.postgres.indexes.GistIndex(
+                _span_range(),
+                condition=models.Q(("span_version", 6)),
+                name="netbox_secu_span_v6_gist",
+            ),
+        ),
+    ]
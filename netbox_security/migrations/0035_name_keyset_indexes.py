@@ -0,0 +1,59 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("netbox_security", "0034_address_span_range"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="address",
+            index=models.Index(
+                fields=["name", "id"], name="netbox_secu_name_b13e6c_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="addressset",
+            index=models.Index(
+                fields=["name", "id"], name="netbox_secu_name_6a8863_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="addresslist",
+            index=models.Index(
+                fields=["name", "id"], name="netbox_secu_name_ddcc31_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="securityzone",
+            index=models.Index(
+                fields=["name", "id"], name="netbox_secu_name_6b3f6a_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="securityzonepolicy",
+            index=models.Index(
+                fields=["name", "id"], name="netbox_secu_name_79adee_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="natruleset",
+            index=models.Index(
+                fields=["name", "id"], name="netbox_secu_name_a43098_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="natrule",
+            index=models.Index(
+                fields=["name", "id"], name="netbox_secu_name_f2d87e_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="firewallfilterrule",
+            index=models.Index(
+                fields=["name", "id"], name="netbox_secu_name_66cf00_idx"
+            ),
+        ),
+    ]
@@ -14,3 +14,4 @@ from .address_set import *
 from .address import *
 from .address_list import *
 from .policer import *
+from .security_counter import *
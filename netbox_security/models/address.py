@@ -2,6 +2,8 @@ from django.urls import reverse
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
+from django.contrib.postgres.fields import DecimalRangeField
+from django.contrib.postgres.indexes import GistIndex
 from django.core.exceptions import ValidationError
 from netbox.models import PrimaryModel, NetBoxModel
 from netbox.models.features import ContactsMixin
@@ -17,7 +19,23 @@ from netbox_security.constants import (
 from netbox_security.models import SecurityZone, CustomPrefix
 from netbox_security.validators import validate_fqdn
 
-__all__ = ("Address", "AddressAssignment", "AddressIndex")
+__all__ = ("Address", "AddressAssignment", "AddressIndex", "EffectiveAddress")
+
+
+def span_range():
+    """Return the inclusive numrange of the span_start and span_end of an Address.
+
+    A B-tree cannot answer containment of a span, so each IP version has a GiST
+    index on this expression; queries must filter on the same expression, and on
+    span_version, for it to be used.
+    """
+    return models.Func(
+        models.F("span_start"),
+        models.F("span_end"),
+        models.Value("[]"),
+        function="numrange",
+        output_field=DecimalRangeField(),
+    )
 
 
 class Address(ContactsMixin, PrimaryModel):
@@ -55,6 +73,27 @@ class Address(ContactsMixin, PrimaryModel):
         blank=True,
         null=True,
     )
+    # Numeric span of the assigned object, maintained by signals and used to
+    # answer "which addresses contain this span" through the span_range() index.
+    span_version = models.PositiveSmallIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+    )
+    span_start = models.DecimalField(
+        max_digits=39,
+        decimal_places=0,
+        blank=True,
+        null=True,
+        editable=False,
+    )
+    span_end = models.DecimalField(
+        max_digits=39,
+        decimal_places=0,
+        blank=True,
+        null=True,
+        editable=False,
+    )
 
     class Meta:
         verbose_name_plural = _("Addresses")
@@ -63,6 +102,20 @@ class Address(ContactsMixin, PrimaryModel):
             "name",
             "identifier",
         ]
+        indexes = (
+            models.Index(fields=("assigned_object_type", "assigned_object_id")),
+            models.Index(fields=("name", "id")),
+            GistIndex(
+                span_range(),
+                name="netbox_secu_span_v4_gist",
+                condition=models.Q(span_version=4),
+            ),
+            GistIndex(
+                span_range(),
+                name="netbox_secu_span_v6_gist",
+                condition=models.Q(span_version=6),
+            ),
+        )
         constraints = [
             models.CheckConstraint(
                 condition=(
@@ -103,6 +156,44 @@ class Address(ContactsMixin, PrimaryModel):
             )
 
 
+class EffectiveAddress(models.Model):
+    """
+    Direct and inherited Addresses of every address-bearing IPAM object.
+
+    One row exists for every Address assigned to an object (inherited=False) and
+    for every Address it inherits from a containing Prefix or Custom Prefix
+    (inherited=True). Rows are maintained by signals while the
+    effective_address_table plugin setting is enabled and can be rebuilt with
+    the rebuild_effective_addresses management command.
+    """
+
+    assigned_object_type = models.ForeignKey(
+        to="contenttypes.ContentType",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    assigned_object_id = models.PositiveBigIntegerField()
+    address = models.ForeignKey(
+        to="netbox_security.Address",
+        on_delete=models.CASCADE,
+        related_name="effective_assignments",
+    )
+    inherited = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=("assigned_object_type", "assigned_object_id", "address"),
+                name="%(app_label)s_%(class)s_unique_object_address",
+            ),
+        )
+        verbose_name = _("Effective Address")
+        verbose_name_plural = _("Effective Addresses")
+
+    def __str__(self):
+        return f"{self.assigned_object_type_id}:{self.assigned_object_id} -> {self.address_id}"
+
+
 class AddressAssignment(NetBoxModel):
     assigned_object_type = models.ForeignKey(
         to="contenttypes.ContentType",
@@ -36,7 +36,10 @@ class AddressList(NetBoxModel):
 
     class Meta:
         verbose_name_plural = _("Address Lists")
-        indexes = (models.Index(fields=("assigned_object_type", "assigned_object_id")),)
+        indexes = (
+            models.Index(fields=("assigned_object_type", "assigned_object_id")),
+            models.Index(fields=("name", "id")),
+        )
         ordering = ("name", "assigned_object_id")
         constraints = (
             models.UniqueConstraint(
@@ -11,7 +11,12 @@ from netbox.search import SearchIndex, register_search
 from netbox_security.constants import ADDRESS_ASSIGNMENT_MODELS
 from netbox_security.models import SecurityZone
 
-__all__ = ("AddressSet", "AddressSetAssignment", "AddressSetIndex")
+__all__ = (
+    "AddressSet",
+    "AddressSetAssignment",
+    "AddressSetClosure",
+    "AddressSetIndex",
+)
 
 
 class AddressSet(ContactsMixin, PrimaryModel):
@@ -46,6 +51,7 @@ class AddressSet(ContactsMixin, PrimaryModel):
             "name",
             "identifier",
         ]
+        indexes = (models.Index(fields=("name", "id")),)
 
     def __str__(self):
         return self.name
@@ -93,6 +99,43 @@ class AddressSetAssignment(NetBoxModel):
         return None
 
 
+class AddressSetClosure(models.Model):
+    """
+    Transitive closure of nested AddressSet membership.
+
+    One row exists for every (ancestor, descendant) pair reachable through
+    AddressSet.address_sets, plus a depth 0 row for each set itself. Rows are
+    maintained by signals and can be rebuilt with the
+    rebuild_address_set_closure management command.
+    """
+
+    ancestor = models.ForeignKey(
+        to="netbox_security.AddressSet",
+        on_delete=models.CASCADE,
+        related_name="descendant_closure",
+    )
+    descendant = models.ForeignKey(
+        to="netbox_security.AddressSet",
+        on_delete=models.CASCADE,
+        related_name="ancestor_closure",
+    )
+    depth = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = (models.Index(fields=("descendant", "ancestor", "depth")),)
+        constraints = (
+            models.UniqueConstraint(
+                fields=("ancestor", "descendant"),
+                name="%(app_label)s_%(class)s_unique_pair",
+            ),
+        )
+        verbose_name = _("Address Set Closure")
+        verbose_name_plural = _("Address Set Closures")
+
+    def __str__(self):
+        return f"{self.ancestor_id} -> {self.descendant_id} ({self.depth})"
+
+
 @register_search
 class AddressSetIndex(SearchIndex):
     model = AddressSet
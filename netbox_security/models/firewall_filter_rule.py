@@ -100,6 +100,7 @@ class FirewallFilterRule(ContactsMixin, PrimaryModel):
     class Meta:
         verbose_name = "Firewall Filter Rule"
         ordering = ["index", "name"]
+        indexes = (models.Index(fields=("name", "id")),)
 
     def __str__(self):
         return f"{self.name}"
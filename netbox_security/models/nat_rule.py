@@ -115,6 +115,7 @@ class NatRule(ContactsMixin, PortsMixin, PrimaryModel):
             "rule_set",
             "name",
         ]
+        indexes = (models.Index(fields=("name", "id")),)
 
     def __str__(self):
         return f"{self.name}"
@@ -57,6 +57,7 @@ class NatRuleSet(ContactsMixin, PrimaryModel):
         ordering = [
             "name",
         ]
+        indexes = (models.Index(fields=("name", "id")),)
 
     def __str__(self):
         return self.name
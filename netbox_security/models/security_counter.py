@@ -0,0 +1,48 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+__all__ = ("SecurityCounter",)
+
+
+class SecurityCounter(models.Model):
+    """
+    Number of security objects related to an IP Address, Prefix or IP Range.
+
+    Read by the Security tab badges instead of counting on every request. Rows
+    are maintained by signals, objects without related security objects have no
+    row, and the table can be rebuilt with the rebuild_security_counters
+    management command.
+    """
+
+    assigned_object_type = models.ForeignKey(
+        to="contenttypes.ContentType",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    assigned_object_id = models.PositiveBigIntegerField()
+    nat_pool_member_count = models.PositiveIntegerField(default=0)
+    nat_rule_count = models.PositiveIntegerField(default=0)
+    address_count = models.PositiveIntegerField(default=0)
+    security_zone_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=("assigned_object_type", "assigned_object_id"),
+                name="%(app_label)s_%(class)s_unique_object",
+            ),
+        )
+        verbose_name = _("Security Counter")
+        verbose_name_plural = _("Security Counters")
+
+    def __str__(self):
+        return f"{self.assigned_object_type_id}:{self.assigned_object_id}"
+
+    @property
+    def related_total_count(self):
+        return (
+            self.nat_pool_member_count
+            + self.nat_rule_count
+            + self.address_count
+            + self.security_zone_count
+        )
@@ -79,6 +79,7 @@ class SecurityZonePolicy(ContactsMixin, PrimaryModel):
         verbose_name_plural = _("Security Zone Policies")
         ordering = ["index", "name"]
         unique_together = ["name", "identifier", "source_zone", "destination_zone"]
+        indexes = (models.Index(fields=("name", "id")),)
 
     def __str__(self):
         return self.name
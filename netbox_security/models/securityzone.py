@@ -9,6 +9,7 @@ from netbox.search import SearchIndex, register_search
 from netbox.models import PrimaryModel, NetBoxModel
 from virtualization.models import VirtualMachine
 from netbox.models.features import ContactsMixin
+from utilities.query import count_related
 from dcim.models import Device, VirtualDeviceContext, Interface
 
 from netbox_security.constants import ZONE_ASSIGNMENT_MODELS
@@ -48,6 +49,7 @@ class SecurityZone(ContactsMixin, PrimaryModel):
             "name",
             "identifier",
         ]
+        indexes = (models.Index(fields=("name", "id")),)
 
     def __str__(self):
         return self.name
@@ -87,26 +89,18 @@ class SecurityZone(ContactsMixin, PrimaryModel):
 
     @classmethod
     def annotated_queryset(cls):
-        """Construct an efficient queryset for this model and related data."""
-        return (
-            cls.objects.defer("id")
-            .prefetch_related("source_zone_policies", "destination_zone_policies")
-            .annotate(
-                source_policy_count=models.Count(
-                    "source_zone_policies",
-                    filter=models.Q(
-                        source_zone_policies__source_zone=models.F("pk"),
-                    ),
-                    distinct=True,
-                ),
-                destination_policy_count=models.Count(
-                    "destination_zone_policies",
-                    filter=models.Q(
-                        destination_zone_policies__destination_zone=models.F("pk"),
-                    ),
-                    distinct=True,
-                ),
-            )
+        """Construct an efficient queryset for this model and related data.
+
+        Policy counts are correlated subqueries, so listing zones never loads
+        their policies and the two counts do not multiply each other's joins.
+        """
+        from .security_zone_policy import SecurityZonePolicy
+
+        return cls.objects.annotate(
+            source_policy_count=count_related(SecurityZonePolicy, "source_zone"),
+            destination_policy_count=count_related(
+                SecurityZonePolicy, "destination_zone"
+            ),
         )
 
 
@@ -159,6 +159,18 @@ security_menu_items = (
                 "mdi mdi-upload",
                 permissions=["netbox_security.add_securityzonepolicy"],
             ),
+            PluginMenuButton(
+                "plugins:netbox_security:securityzonepolicy_matrix",
+                _("Matrix"),
+                "mdi mdi-grid",
+                permissions=["netbox_security.view_securityzonepolicy"],
+            ),
+            PluginMenuButton(
+                "plugins:netbox_security:securityzonepolicy_analysis",
+                _("Analysis"),
+                "mdi mdi-layers-search",
+                permissions=["netbox_security.view_securityzonepolicy"],
+            ),
         ),
     ),
 )
@@ -180,6 +192,12 @@ pool_menu_items = (
                 "mdi mdi-upload",
                 permissions=["netbox_security.add_natpool"],
             ),
+            PluginMenuButton(
+                "plugins:netbox_security:natpool_analysis",
+                _("Analysis"),
+                "mdi mdi-layers-search",
+                permissions=["netbox_security.view_natpool"],
+            ),
         ),
     ),
     PluginMenuItem(
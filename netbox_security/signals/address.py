@@ -0,0 +1,28 @@
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+from netbox_security.models import Address
+from netbox_security.utilities.spans import get_object_span
+
+SPAN_FIELDS = ("span_start", "span_end", "span_version")
+
+
+@receiver(pre_save, sender=Address)
+def set_address_span_pre_save(instance, raw=False, **kwargs):
+    if not raw and instance.pk:
+        # Keep the stored assignment and span so receivers can also update
+        # whatever the Address was previously attached to. Always needed, as the
+        # security counters of the previous object change as well.
+        instance._previous_address = (
+            Address.objects.filter(pk=instance.pk)
+            .only("assigned_object_type", "assigned_object_id", *SPAN_FIELDS)
+            .first()
+        )
+
+    span = None
+    if not raw and instance.assigned_object_type_id and instance.assigned_object_id:
+        span = get_object_span(instance.assigned_object)
+    instance.span_start, instance.span_end, instance.span_version = span or (
+        None,
+        None,
+        None,
+    )
@@ -0,0 +1,84 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+from netbox.plugins import get_plugin_config
+from netbox_security.models import Address, AddressList, AddressSet
+from netbox_security.utilities.address_aggregation import (
+    bump_address_aggregation_generations,
+    get_address_aggregation_keys,
+)
+
+
+def _cache_enabled(raw=False):
+    return not raw and get_plugin_config(
+        "netbox_security", "address_aggregation_cache_timeout"
+    )
+
+
+@receiver(post_save, sender=Address)
+def invalidate_address_aggregation(instance, raw=False, **kwargs):
+    if _cache_enabled(raw):
+        bump_address_aggregation_generations(
+            *get_address_aggregation_keys(address_ids=[instance.pk])
+        )
+
+
+@receiver(pre_delete, sender=Address)
+@receiver(pre_delete, sender=AddressSet)
+def collect_address_aggregation_pre_delete(sender, instance, **kwargs):
+    if not _cache_enabled():
+        return
+    # The memberships are gone by post_delete, so the aggregations containing
+    # the object are collected now and invalidated once it is deleted.
+    if sender is Address:
+        keys = get_address_aggregation_keys(address_ids=[instance.pk])
+    else:
+        keys = get_address_aggregation_keys(address_set_ids=[instance.pk])
+    instance._address_aggregation_keys = keys
+
+
+@receiver(post_delete, sender=Address)
+@receiver(post_delete, sender=AddressSet)
+def invalidate_address_aggregation_post_delete(instance, **kwargs):
+    bump_address_aggregation_generations(
+        *getattr(instance, "_address_aggregation_keys", ())
+    )
+
+
+@receiver(post_save, sender=AddressList)
+def invalidate_address_list_aggregation(instance, raw=False, **kwargs):
+    if _cache_enabled(raw):
+        # The list may have been assigned to another Address or Address Set.
+        bump_address_aggregation_generations(
+            *get_address_aggregation_keys(address_list_ids=[instance.pk])
+        )
+
+
+@receiver(m2m_changed, sender=AddressSet.addresses.through)
+@receiver(m2m_changed, sender=AddressSet.address_sets.through)
+def invalidate_address_set_aggregation_m2m_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not _cache_enabled():
+        return
+    if not reverse:
+        # The instance is the Address Set whose members changed.
+        if action in ("post_add", "post_remove", "post_clear"):
+            keys = get_address_aggregation_keys(address_set_ids=[instance.pk])
+        else:
+            return
+    elif action == "pre_clear":
+        # The sets the instance is about to leave are only known now.
+        if sender is AddressSet.addresses.through:
+            keys = get_address_aggregation_keys(address_ids=[instance.pk])
+        else:
+            keys = get_address_aggregation_keys(address_set_ids=[instance.pk])
+    elif action in ("post_add", "post_remove") and pk_set:
+        keys = get_address_aggregation_keys(address_set_ids=pk_set)
+    else:
+        return
+    bump_address_aggregation_generations(*keys)
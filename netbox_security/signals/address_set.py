@@ -0,0 +1,42 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from netbox_security.models import AddressSet, AddressSetClosure
+from netbox_security.utilities.address_set_closure import (
+    get_address_set_descendant_ids,
+    refresh_address_set_closure,
+)
+
+
+@receiver(post_save, sender=AddressSet)
+def add_address_set_closure_post_save(instance, created, raw=False, **kwargs):
+    if created and not raw:
+        AddressSetClosure.objects.get_or_create(
+            ancestor=instance, descendant=instance, defaults={"depth": 0}
+        )
+
+
+@receiver(m2m_changed, sender=AddressSet.address_sets.through)
+def update_address_set_closure_m2m_changed(instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse or action == "post_clear":
+        # The instance is the nested (child) side, or all of its children were
+        # dropped; in both cases everything below the instance is affected.
+        refresh_address_set_closure({instance.pk})
+    elif pk_set:
+        refresh_address_set_closure(pk_set)
+
+
+@receiver(pre_delete, sender=AddressSet)
+def collect_address_set_closure_pre_delete(instance, **kwargs):
+    instance._closure_descendant_ids = get_address_set_descendant_ids(
+        {instance.pk}, include_self=False
+    )
+
+
+@receiver(post_delete, sender=AddressSet)
+def update_address_set_closure_post_delete(instance, **kwargs):
+    descendant_ids = getattr(instance, "_closure_descendant_ids", set())
+    descendant_ids.discard(instance.pk)
+    if descendant_ids:
+        refresh_address_set_closure(descendant_ids)
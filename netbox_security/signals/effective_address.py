@@ -0,0 +1,49 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from netbox_security.models import Address
+from netbox_security.utilities.effective_addresses import (
+    effective_address_table_enabled,
+    refresh_effective_addresses,
+    refresh_effective_addresses_within_spans,
+)
+
+
+def _stored_span(address):
+    if address.span_version is None:
+        return None
+    return address.span_start, address.span_end, address.span_version
+
+
+def _assignment(address):
+    return (
+        address.assigned_object_type_id,
+        address.assigned_object_id,
+        _stored_span(address),
+    )
+
+
+@receiver(post_save, sender=Address)
+def update_effective_addresses_address_post_save(instance, raw=False, **kwargs):
+    if raw or not effective_address_table_enabled():
+        return
+    addresses = [instance]
+    previous = getattr(instance, "_previous_address", None)
+    if previous is not None:
+        if _assignment(previous) == _assignment(instance):
+            # Renaming or describing an Address changes no EffectiveAddress row.
+            return
+        addresses.append(previous)
+
+    for address in addresses:
+        if address.assigned_object_type_id and address.assigned_object_id:
+            refresh_effective_addresses(
+                ContentType.objects.get_for_id(address.assigned_object_type_id),
+                [address.assigned_object_id],
+            )
+    refresh_effective_addresses_within_spans(
+        {_stored_span(address) for address in addresses} - {None}
+    )
+
+
+# Deleting an Address removes its EffectiveAddress rows through the foreign key.
@@ -0,0 +1,30 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from netbox_security.models import NatPool, NatPoolMember, NatRule, NatRuleSet
+from netbox_security.utilities.nat_engine import bump_nat_engine_generation
+
+
+@receiver(post_save, sender=NatRuleSet)
+@receiver(post_delete, sender=NatRuleSet)
+@receiver(post_save, sender=NatRule)
+@receiver(post_delete, sender=NatRule)
+@receiver(post_save, sender=NatPool)
+@receiver(post_delete, sender=NatPool)
+@receiver(post_save, sender=NatPoolMember)
+@receiver(post_delete, sender=NatPoolMember)
+def invalidate_nat_engine(raw=False, **kwargs):
+    if not raw:
+        bump_nat_engine_generation()
+
+
+@receiver(m2m_changed, sender=NatRuleSet.source_zones.through)
+@receiver(m2m_changed, sender=NatRuleSet.destination_zones.through)
+@receiver(m2m_changed, sender=NatRule.source_addresses.through)
+@receiver(m2m_changed, sender=NatRule.destination_addresses.through)
+@receiver(m2m_changed, sender=NatRule.source_prefixes.through)
+@receiver(m2m_changed, sender=NatRule.destination_prefixes.through)
+@receiver(m2m_changed, sender=NatRule.source_ranges.through)
+@receiver(m2m_changed, sender=NatRule.destination_ranges.through)
+def invalidate_nat_engine_m2m_changed(action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_nat_engine_generation()
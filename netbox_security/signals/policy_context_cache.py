@@ -0,0 +1,224 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from netbox.plugins import get_plugin_config
+from netbox_security.models import (
+    Address,
+    AddressList,
+    AddressSet,
+    SecurityZone,
+    SecurityZonePolicy,
+)
+from netbox_security.signals.address import SPAN_FIELDS
+from netbox_security.utilities.address_set_closure import (
+    get_address_membership_model,
+    get_address_set_descendants,
+)
+from netbox_security.utilities.policy_context_cache import (
+    bump_policy_context_graph_generation,
+    bump_policy_context_object_generation,
+    bump_policy_context_span_generations,
+)
+
+
+def _cache_enabled(raw=False):
+    return not raw and get_plugin_config(
+        "netbox_security", "policy_context_cache_timeout"
+    )
+
+
+def _stored_span(address):
+    if address.span_version is None:
+        return None
+    return address.span_start, address.span_end, address.span_version
+
+
+def _invalidate_addresses(addresses):
+    """Invalidate the contexts of the Addresses: their objects' and inherited ones."""
+    spans = []
+    for address in addresses:
+        bump_policy_context_object_generation(
+            address.assigned_object_type_id, address.assigned_object_id
+        )
+        spans.append(_stored_span(address))
+    bump_policy_context_span_generations(*spans)
+
+
+def _get_addresses(address_set_ids=(), address_ids=()):
+    """Return the given Addresses and the members of the sets, at any depth."""
+    address_ids = set(address_ids)
+    if address_set_ids:
+        descendant_ids = set().union(
+            *get_address_set_descendants(set(address_set_ids)).values()
+        )
+        through_model, address_set_column, address_column = (
+            get_address_membership_model()
+        )
+        address_ids.update(
+            through_model.objects.filter(
+                **{f"{address_set_column}__in": list(descendant_ids)}
+            ).values_list(address_column, flat=True)
+        )
+    if not address_ids:
+        return []
+    return list(
+        Address.objects.filter(pk__in=address_ids).only(
+            "assigned_object_type", "assigned_object_id", *SPAN_FIELDS
+        )
+    )
+
+
+def _get_address_list_addresses(address_lists):
+    """Return the Addresses behind AddressList assigned object rows."""
+    address_ct = ContentType.objects.get_for_model(Address)
+    address_set_ct = ContentType.objects.get_for_model(AddressSet)
+    address_ids = set()
+    address_set_ids = set()
+    for content_type_id, object_id in address_lists:
+        if content_type_id == address_ct.pk:
+            address_ids.add(object_id)
+        elif content_type_id == address_set_ct.pk:
+            address_set_ids.add(object_id)
+    return _get_addresses(address_set_ids, address_ids)
+
+
+def _get_policy_addresses(policies):
+    """Return the Addresses behind the source and destination lists of the policies."""
+    address_list_ids = set()
+    for relation in (
+        SecurityZonePolicy.source_address,
+        SecurityZonePolicy.destination_address,
+    ):
+        address_list_ids.update(
+            relation.through.objects.filter(
+                securityzonepolicy__in=policies
+            ).values_list("addresslist_id", flat=True)
+        )
+    return _get_address_list_addresses(
+        AddressList.objects.filter(pk__in=address_list_ids).values_list(
+            "assigned_object_type_id", "assigned_object_id"
+        )
+    )
+
+
+def _get_affected_addresses(sender, instance):
+    """Return the Addresses whose contexts include the given object."""
+    if sender is AddressSet:
+        return _get_addresses([instance.pk])
+    if sender is AddressList:
+        return _get_address_list_addresses(
+            [(instance.assigned_object_type_id, instance.assigned_object_id)]
+        )
+    if sender is SecurityZonePolicy:
+        return _get_policy_addresses([instance.pk])
+    return _get_policy_addresses(
+        SecurityZonePolicy.objects.filter(
+            Q(source_zone=instance) | Q(destination_zone=instance)
+        )
+    )
+
+
+@receiver(post_save, sender=Address)
+@receiver(post_delete, sender=Address)
+def invalidate_address_policy_context(instance, raw=False, **kwargs):
+    if not _cache_enabled(raw):
+        return
+    addresses = [instance]
+    previous = getattr(instance, "_previous_address", None)
+    if previous is not None:
+        addresses.append(previous)
+    _invalidate_addresses(addresses)
+
+
+@receiver(m2m_changed, sender=AddressSet.addresses.through)
+def invalidate_address_set_membership_policy_context(
+    instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear") or not _cache_enabled():
+        return
+    if reverse:
+        _invalidate_addresses([instance])
+    elif action == "post_clear":
+        # The removed members are no longer known at this point.
+        bump_policy_context_graph_generation()
+    elif pk_set:
+        _invalidate_addresses(
+            Address.objects.filter(pk__in=pk_set).only(
+                "assigned_object_type", "assigned_object_id", *SPAN_FIELDS
+            )
+        )
+
+
+@receiver(pre_save, sender=AddressList)
+def collect_address_list_policy_context(instance, raw=False, **kwargs):
+    if _cache_enabled(raw) and instance.pk:
+        # The list may be moved to another Address or Address Set.
+        previous = AddressList.objects.filter(pk=instance.pk).first()
+        if previous is not None:
+            instance._policy_context_addresses = _get_affected_addresses(
+                AddressList, previous
+            )
+
+
+@receiver(pre_delete, sender=AddressSet)
+@receiver(pre_delete, sender=AddressList)
+@receiver(pre_delete, sender=SecurityZonePolicy)
+def collect_policy_context_pre_delete(sender, instance, **kwargs):
+    if _cache_enabled():
+        # The memberships and policy links are gone by post_delete.
+        instance._policy_context_addresses = _get_affected_addresses(sender, instance)
+
+
+@receiver(post_save, sender=AddressSet)
+@receiver(post_save, sender=AddressList)
+@receiver(post_save, sender=SecurityZonePolicy)
+@receiver(post_save, sender=SecurityZone)
+def invalidate_policy_context_post_save(sender, instance, raw=False, **kwargs):
+    if _cache_enabled(raw):
+        _invalidate_addresses(
+            [
+                *getattr(instance, "_policy_context_addresses", ()),
+                *_get_affected_addresses(sender, instance),
+            ]
+        )
+
+
+@receiver(post_delete, sender=AddressSet)
+@receiver(post_delete, sender=AddressList)
+@receiver(post_delete, sender=SecurityZonePolicy)
+def invalidate_policy_context_post_delete(instance, **kwargs):
+    # Policies deleted along with a zone send their own signals.
+    _invalidate_addresses(getattr(instance, "_policy_context_addresses", ()))
+
+
+@receiver(m2m_changed, sender=AddressSet.address_sets.through)
+@receiver(m2m_changed, sender=SecurityZonePolicy.source_address.through)
+@receiver(m2m_changed, sender=SecurityZonePolicy.destination_address.through)
+def invalidate_policy_context_graph_m2m_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear") or not _cache_enabled():
+        return
+    if reverse:
+        # The instance is the nested set or the Address List.
+        _invalidate_addresses(_get_affected_addresses(type(instance), instance))
+    elif action == "post_clear":
+        # The removed members are no longer known at this point.
+        bump_policy_context_graph_generation()
+    elif pk_set and sender is AddressSet.address_sets.through:
+        _invalidate_addresses(_get_addresses(pk_set))
+    elif pk_set:
+        _invalidate_addresses(
+            _get_address_list_addresses(
+                AddressList.objects.filter(pk__in=pk_set).values_list(
+                    "assigned_object_type_id", "assigned_object_id"
+                )
+            )
+        )
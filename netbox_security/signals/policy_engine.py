@@ -0,0 +1,45 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from netbox_security.models import (
+    Address,
+    AddressList,
+    AddressSet,
+    Application,
+    ApplicationItem,
+    ApplicationSet,
+    SecurityZonePolicy,
+)
+from netbox_security.utilities.policy_engine import bump_policy_engine_generation
+
+
+@receiver(post_save, sender=SecurityZonePolicy)
+@receiver(post_delete, sender=SecurityZonePolicy)
+@receiver(post_save, sender=AddressList)
+@receiver(post_delete, sender=AddressList)
+@receiver(post_save, sender=AddressSet)
+@receiver(post_delete, sender=AddressSet)
+@receiver(post_save, sender=Address)
+@receiver(post_delete, sender=Address)
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+@receiver(post_save, sender=ApplicationSet)
+@receiver(post_delete, sender=ApplicationSet)
+@receiver(post_save, sender=ApplicationItem)
+@receiver(post_delete, sender=ApplicationItem)
+def invalidate_policy_engine(raw=False, **kwargs):
+    if not raw:
+        bump_policy_engine_generation()
+
+
+@receiver(m2m_changed, sender=SecurityZonePolicy.source_address.through)
+@receiver(m2m_changed, sender=SecurityZonePolicy.destination_address.through)
+@receiver(m2m_changed, sender=SecurityZonePolicy.applications.through)
+@receiver(m2m_changed, sender=SecurityZonePolicy.application_sets.through)
+@receiver(m2m_changed, sender=AddressSet.addresses.through)
+@receiver(m2m_changed, sender=AddressSet.address_sets.through)
+@receiver(m2m_changed, sender=ApplicationSet.applications.through)
+@receiver(m2m_changed, sender=ApplicationSet.application_sets.through)
+@receiver(m2m_changed, sender=Application.application_items.through)
+def invalidate_policy_engine_m2m_changed(action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_policy_engine_generation()
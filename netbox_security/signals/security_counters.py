@@ -0,0 +1,170 @@
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from ipam.models import IPAddress, IPRange, Prefix
+from netbox_security.models import (
+    Address,
+    AddressAssignment,
+    NatPoolMember,
+    NatRule,
+    SecurityCounter,
+    SecurityZone,
+)
+from netbox_security.utilities.security_counters import (
+    COUNTER_MODELS,
+    refresh_security_counters,
+)
+
+# NatPoolMember field and NatRule relations per IPAM model, keyed by field name.
+NAT_POOL_MEMBER_FIELDS = {fields[0]: key for key, fields in COUNTER_MODELS.items()}
+NAT_RULE_FIELDS = {
+    field_name: key
+    for key, fields in COUNTER_MODELS.items()
+    for field_name in fields[1:]
+}
+
+
+def _refresh_objects(objects):
+    """Refresh counters for an iterable of (content_type_id, object_id) pairs."""
+    object_ids = defaultdict(set)
+    for content_type_id, object_id in objects:
+        if content_type_id and object_id:
+            content_type = ContentType.objects.get_for_id(content_type_id)
+            object_ids[(content_type.app_label, content_type.model)].add(object_id)
+    for (app_label, model), ids in object_ids.items():
+        refresh_security_counters(app_label, model, ids)
+
+
+@receiver(post_save, sender=Address)
+@receiver(post_delete, sender=Address)
+def update_security_counters_address(instance, raw=False, **kwargs):
+    if raw:
+        return
+    addresses = [instance]
+    previous = getattr(instance, "_previous_address", None)
+    if previous is not None:
+        addresses.append(previous)
+    _refresh_objects(
+        (address.assigned_object_type_id, address.assigned_object_id)
+        for address in addresses
+    )
+
+
+@receiver(pre_save, sender=AddressAssignment)
+def track_security_counters_address_assignment(instance, raw=False, **kwargs):
+    if not raw and instance.pk:
+        instance._previous_address_id = (
+            AddressAssignment.objects.filter(pk=instance.pk)
+            .values_list("address_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=AddressAssignment)
+@receiver(post_delete, sender=AddressAssignment)
+def update_security_counters_address_assignment(instance, raw=False, **kwargs):
+    # Only assignments to Security Zones are counted.
+    if raw or instance.assigned_object_type_id != (
+        ContentType.objects.get_for_model(SecurityZone).pk
+    ):
+        return
+    address_ids = {instance.address_id, getattr(instance, "_previous_address_id", None)}
+    _refresh_objects(
+        Address.objects.filter(pk__in=address_ids - {None}).values_list(
+            "assigned_object_type_id", "assigned_object_id"
+        )
+    )
+
+
+def _get_nat_pool_member_objects(member):
+    return {
+        (
+            ContentType.objects.get_by_natural_key(*key).pk,
+            getattr(member, f"{field}_id"),
+        )
+        for field, key in NAT_POOL_MEMBER_FIELDS.items()
+    }
+
+
+@receiver(pre_save, sender=NatPoolMember)
+def track_security_counters_nat_pool_member(instance, raw=False, **kwargs):
+    if not raw and instance.pk:
+        previous = NatPoolMember.objects.filter(pk=instance.pk).first()
+        if previous is not None:
+            instance._previous_counter_objects = _get_nat_pool_member_objects(previous)
+
+
+@receiver(post_save, sender=NatPoolMember)
+@receiver(post_delete, sender=NatPoolMember)
+def update_security_counters_nat_pool_member(instance, raw=False, **kwargs):
+    if raw:
+        return
+    _refresh_objects(
+        _get_nat_pool_member_objects(instance)
+        | getattr(instance, "_previous_counter_objects", set())
+    )
+
+
+def _get_nat_rule_objects(rule, field_names=NAT_RULE_FIELDS):
+    return {
+        (ContentType.objects.get_by_natural_key(*NAT_RULE_FIELDS[field_name]).pk, pk)
+        for field_name in field_names
+        for pk in getattr(rule, field_name).values_list("pk", flat=True)
+    }
+
+
+def _update_security_counters_nat_rule_m2m(field_name):
+    app_label, model = NAT_RULE_FIELDS[field_name]
+
+    def receiver_function(instance, action, reverse, pk_set, **kwargs):
+        if reverse:
+            if action in ("post_add", "post_remove", "post_clear"):
+                refresh_security_counters(app_label, model, [instance.pk])
+        elif action == "pre_clear":
+            instance._cleared_counter_objects = _get_nat_rule_objects(
+                instance, [field_name]
+            )
+        elif action == "post_clear":
+            _refresh_objects(getattr(instance, "_cleared_counter_objects", ()))
+        elif action in ("post_add", "post_remove") and pk_set:
+            refresh_security_counters(app_label, model, pk_set)
+
+    return receiver_function
+
+
+for _field_name in NAT_RULE_FIELDS:
+    m2m_changed.connect(
+        _update_security_counters_nat_rule_m2m(_field_name),
+        sender=getattr(NatRule, _field_name).through,
+        weak=False,
+        dispatch_uid=f"netbox_security_security_counters_natrule_{_field_name}",
+    )
+
+
+@receiver(pre_delete, sender=NatRule)
+def track_security_counters_nat_rule(instance, **kwargs):
+    # The M2M rows are removed without m2m_changed signals.
+    instance._previous_counter_objects = _get_nat_rule_objects(instance)
+
+
+@receiver(post_delete, sender=NatRule)
+def update_security_counters_nat_rule(instance, **kwargs):
+    _refresh_objects(getattr(instance, "_previous_counter_objects", ()))
+
+
+@receiver(post_delete, sender=Prefix)
+@receiver(post_delete, sender=IPRange)
+@receiver(post_delete, sender=IPAddress)
+def delete_security_counter(sender, instance, **kwargs):
+    SecurityCounter.objects.filter(
+        assigned_object_type=ContentType.objects.get_for_model(sender),
+        assigned_object_id=instance.pk,
+    ).delete()
@@ -0,0 +1,177 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from ipam.models import IPAddress, IPRange, Prefix
+from netbox.plugins import get_plugin_config
+from netbox_security.models import (
+    Address,
+    CustomPrefix,
+    EffectiveAddress,
+    NatPoolMember,
+    NatRule,
+)
+from netbox_security.utilities.address_aggregation import (
+    bump_address_aggregation_generations,
+    get_address_aggregation_keys,
+)
+from netbox_security.utilities.effective_addresses import (
+    effective_address_table_enabled,
+    refresh_effective_addresses,
+    refresh_effective_addresses_within_spans,
+)
+from netbox_security.utilities.nat_engine import bump_nat_engine_generation
+from netbox_security.utilities.policy_context_cache import (
+    bump_policy_context_object_generation,
+    bump_policy_context_span_generations,
+)
+from netbox_security.utilities.policy_engine import bump_policy_engine_generation
+from netbox_security.utilities.spans import get_object_span
+
+# The NatRule members and NatPoolMember field referencing each IPAM model.
+NAT_REFERENCES = {
+    IPAddress: ("source_addresses", "destination_addresses", "address"),
+    Prefix: ("source_prefixes", "destination_prefixes", "prefix"),
+    IPRange: ("source_ranges", "destination_ranges", "address_range"),
+}
+
+
+def _get_stored_object(sender, pk):
+    """Return the stored object, annotated with what references it.
+
+    has_addresses tells whether Addresses are assigned to it, nat_referenced
+    whether a NatRule or NatPoolMember uses it; both are read with the object
+    in a single query.
+    """
+    annotations = {
+        "has_addresses": Exists(
+            Address.objects.filter(
+                assigned_object_type=ContentType.objects.get_for_model(sender),
+                assigned_object_id=OuterRef("pk"),
+            )
+        ),
+    }
+    if sender in NAT_REFERENCES:
+        source_field, destination_field, member_field = NAT_REFERENCES[sender]
+        annotations["nat_referenced"] = ExpressionWrapper(
+            Q(
+                Exists(
+                    NatRule.objects.filter(
+                        Q(**{source_field: OuterRef("pk")})
+                        | Q(**{destination_field: OuterRef("pk")})
+                    )
+                )
+            )
+            | Q(Exists(NatPoolMember.objects.filter(**{member_field: OuterRef("pk")}))),
+            output_field=BooleanField(),
+        )
+    return sender.objects.filter(pk=pk).annotate(**annotations).first()
+
+
+def _get_assigned_address_ids(content_type, pk):
+    return list(
+        Address.objects.filter(
+            assigned_object_type=content_type, assigned_object_id=pk
+        ).values_list("pk", flat=True)
+    )
+
+
+def _invalidate_address_aggregations(content_type, pk):
+    if get_plugin_config("netbox_security", "address_aggregation_cache_timeout"):
+        address_ids = _get_assigned_address_ids(content_type, pk)
+        if address_ids:
+            bump_address_aggregation_generations(
+                *get_address_aggregation_keys(address_ids=address_ids)
+            )
+
+
+@receiver(pre_save, sender=Prefix)
+@receiver(pre_save, sender=IPRange)
+@receiver(pre_save, sender=IPAddress)
+@receiver(pre_save, sender=CustomPrefix)
+@receiver(pre_delete, sender=Prefix)
+@receiver(pre_delete, sender=IPRange)
+@receiver(pre_delete, sender=IPAddress)
+@receiver(pre_delete, sender=CustomPrefix)
+def collect_span_object(sender, instance, raw=False, **kwargs):
+    if not raw and instance.pk:
+        # The rule members are removed along with a deleted object, without
+        # m2m_changed, and the previous span is gone once it is saved.
+        instance._stored_span_object = _get_stored_object(sender, instance.pk)
+
+
+@receiver(post_save, sender=Prefix)
+@receiver(post_save, sender=IPRange)
+@receiver(post_save, sender=IPAddress)
+@receiver(post_save, sender=CustomPrefix)
+def update_span_object_post_save(sender, instance, raw=False, **kwargs):
+    """Propagate a saved span object to everything derived from its span.
+
+    The assigned Address spans, the policy and NAT engines and the address
+    aggregations only depend on the span, so they are only updated when it
+    changed. Inheritance also depends on the VRF, so the policy contexts and
+    effective Addresses of objects within the span are refreshed on every save
+    of an object with Addresses assigned.
+    """
+    if raw:
+        return
+    content_type = ContentType.objects.get_for_model(sender)
+    stored = getattr(instance, "_stored_span_object", None)
+    span = get_object_span(instance)
+    previous_span = get_object_span(stored) if stored is not None else None
+    span_changed = stored is not None and previous_span != span
+    has_addresses = stored is not None and stored.has_addresses
+
+    if has_addresses and span_changed:
+        start, end, version = span
+        Address.objects.filter(
+            assigned_object_type=content_type, assigned_object_id=instance.pk
+        ).update(span_start=start, span_end=end, span_version=version)
+        bump_policy_engine_generation()
+        _invalidate_address_aggregations(content_type, instance.pk)
+    if span_changed and getattr(stored, "nat_referenced", False):
+        bump_nat_engine_generation()
+
+    if get_plugin_config("netbox_security", "policy_context_cache_timeout"):
+        bump_policy_context_object_generation(content_type.pk, instance.pk)
+        if has_addresses:
+            # Objects inheriting from this one's Addresses sit inside the old
+            # or new span.
+            bump_policy_context_span_generations(previous_span, span)
+
+    if effective_address_table_enabled():
+        # The object itself may now inherit from other prefixes, e.g. after
+        # moving to another VRF.
+        refresh_effective_addresses(content_type, [instance.pk])
+        if has_addresses:
+            refresh_effective_addresses_within_spans({previous_span, span})
+
+
+@receiver(post_delete, sender=Prefix)
+@receiver(post_delete, sender=IPRange)
+@receiver(post_delete, sender=IPAddress)
+@receiver(post_delete, sender=CustomPrefix)
+def update_span_object_post_delete(sender, instance, **kwargs):
+    content_type = ContentType.objects.get_for_model(sender)
+    stored = getattr(instance, "_stored_span_object", None)
+    span = get_object_span(instance)
+    has_addresses = stored is not None and stored.has_addresses
+
+    if has_addresses:
+        bump_policy_engine_generation()
+        _invalidate_address_aggregations(content_type, instance.pk)
+    if getattr(stored, "nat_referenced", False):
+        bump_nat_engine_generation()
+
+    if get_plugin_config("netbox_security", "policy_context_cache_timeout"):
+        bump_policy_context_object_generation(content_type.pk, instance.pk)
+        if has_addresses:
+            bump_policy_context_span_generations(span)
+
+    if effective_address_table_enabled():
+        EffectiveAddress.objects.filter(
+            assigned_object_type=content_type,
+            assigned_object_id=instance.pk,
+        ).delete()
+        if has_addresses:
+            refresh_effective_addresses_within_spans({span})
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from netbox_security.models import SecurityZone, SecurityZonePolicy
+from netbox_security.utilities.zone_policy_matrix import (
+    clear_zone_policy_matrix_cache,
+)
+
+
+@receiver(post_save, sender=SecurityZonePolicy)
+@receiver(post_delete, sender=SecurityZonePolicy)
+@receiver(post_save, sender=SecurityZone)
+@receiver(post_delete, sender=SecurityZone)
+def invalidate_zone_policy_matrix(raw=False, **kwargs):
+    if not raw:
+        clear_zone_policy_matrix_cache()
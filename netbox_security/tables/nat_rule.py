@@ -9,11 +9,17 @@ from netbox.tables.columns import (
     ManyToManyColumn,
 )
 
+from dcim.models import Interface
+from ipam.models import IPAddress, IPRange, Prefix
 from netbox_security.models import NatRule, NatRuleAssignment
 
 __all__ = (
     "NatRuleTable",
     "NatRuleAssignmentTable",
+    "NatRuleIPAddressTable",
+    "NatRulePrefixTable",
+    "NatRuleIPRangeTable",
+    "NatRuleInterfaceTable",
 )
 
 
@@ -123,3 +129,71 @@ class NatRuleAssignmentTable(NetBoxTable):
         model = NatRuleAssignment
         fields = ("id", "rule", "assigned_object")
         default_columns = ("rule", "assigned_object")
+
+
+# Slim tables of the objects a NAT Rule matches on, loaded on demand on the
+# NAT Rule view.
+class NatRuleIPAddressTable(NetBoxTable):
+    address = tables.Column(linkify=True, verbose_name=_("IP Address"))
+    vrf = tables.Column(linkify=True, verbose_name=_("VRF"))
+    status = ChoiceFieldColumn(verbose_name=_("Status"))
+    tenant = tables.Column(linkify=True, verbose_name=_("Tenant"))
+    actions = ActionsColumn(actions=())
+
+    class Meta(NetBoxTable.Meta):
+        model = IPAddress
+        fields = ("id", "address", "vrf", "status", "tenant", "description")
+        default_columns = ("address", "vrf", "status", "tenant", "description")
+
+
+class NatRulePrefixTable(NetBoxTable):
+    prefix = tables.Column(linkify=True, verbose_name=_("Prefix"))
+    vrf = tables.Column(linkify=True, verbose_name=_("VRF"))
+    status = ChoiceFieldColumn(verbose_name=_("Status"))
+    tenant = tables.Column(linkify=True, verbose_name=_("Tenant"))
+    actions = ActionsColumn(actions=())
+
+    class Meta(NetBoxTable.Meta):
+        model = Prefix
+        fields = ("id", "prefix", "vrf", "status", "tenant", "description")
+        default_columns = ("prefix", "vrf", "status", "tenant", "description")
+
+
+class NatRuleIPRangeTable(NetBoxTable):
+    start_address = tables.Column(linkify=True, verbose_name=_("Start Address"))
+    end_address = tables.Column(verbose_name=_("End Address"))
+    vrf = tables.Column(linkify=True, verbose_name=_("VRF"))
+    status = ChoiceFieldColumn(verbose_name=_("Status"))
+    tenant = tables.Column(linkify=True, verbose_name=_("Tenant"))
+    actions = ActionsColumn(actions=())
+
+    class Meta(NetBoxTable.Meta):
+        model = IPRange
+        fields = (
+            "id",
+            "start_address",
+            "end_address",
+            "vrf",
+            "status",
+            "tenant",
+            "description",
+        )
+        default_columns = (
+            "start_address",
+            "end_address",
+            "vrf",
+            "status",
+            "tenant",
+            "description",
+        )
+
+
+class NatRuleInterfaceTable(NetBoxTable):
+    device = tables.Column(linkify=True, verbose_name=_("Device"))
+    name = tables.Column(linkify=True, verbose_name=_("Interface"))
+    actions = ActionsColumn(actions=())
+
+    class Meta(NetBoxTable.Meta):
+        model = Interface
+        fields = ("id", "device", "name", "description")
+        default_columns = ("device", "name", "description")
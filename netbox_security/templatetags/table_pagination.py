@@ -0,0 +1,57 @@
+from django import template
+
+register = template.Library()
+
+
+@register.inclusion_tag("netbox_security/inc/table_paginator.html", takes_context=True)
+def table_paginator(context, table):
+    """Render previous/next links for a table paged through its own page parameter."""
+    return page_paginator(
+        context, getattr(table, "page", None), table.prefixed_page_field
+    )
+
+
+@register.inclusion_tag("netbox_security/inc/table_paginator.html", takes_context=True)
+def page_paginator(context, page, page_field="page"):
+    """Render previous/next links for a Django Page selected by page_field."""
+    if page is None or not page.has_other_pages():
+        return {"page": None}
+
+    request = context["request"]
+
+    def page_url(number):
+        query = request.GET.copy()
+        query[page_field] = number
+        return f"?{query.urlencode()}"
+
+    return {
+        "page": page,
+        "previous_url": (
+            page_url(page.previous_page_number()) if page.has_previous() else None
+        ),
+        "next_url": page_url(page.next_page_number()) if page.has_next() else None,
+    }
+
+
+@register.inclusion_tag(
+    "netbox_security/inc/address_set_path_paginator.html", takes_context=True
+)
+def address_set_path_paginator(context, page):
+    """Render previous/next links for the Address Set hierarchy rows of a policy context."""
+    if not page["has_previous"] and not page["has_next"]:
+        return {"page": None}
+
+    request = context["request"]
+
+    def page_url(number):
+        query = request.GET.copy()
+        query["path_page"] = number
+        return f"?{query.urlencode()}"
+
+    return {
+        "page": page,
+        "previous_url": (
+            page_url(page["previous_number"]) if page["has_previous"] else None
+        ),
+        "next_url": page_url(page["next_number"]) if page["has_next"] else None,
+    }
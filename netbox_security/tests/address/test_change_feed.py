@@ -0,0 +1,122 @@
+import uuid
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+
+from core.choices import ObjectChangeActionChoices
+from core.models import ObjectType
+from netbox_security.models import Address, SecurityZone
+from netbox_security.utilities import get_change_feed
+from users.models import ObjectPermission
+from utilities.testing import APITestCase
+
+
+class ChangeFeedTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.addresses = Address.objects.bulk_create(
+            Address(name=f"feed-address-{index}") for index in range(3)
+        )
+        cls.zone = SecurityZone.objects.create(name="feed-zone")
+
+    def setUp(self):
+        super().setUp()
+        settings_override = override_settings(
+            PLUGINS_CONFIG={
+                **settings.PLUGINS_CONFIG,
+                "netbox_security": {
+                    **settings.PLUGINS_CONFIG["netbox_security"],
+                    "change_feed_lag": 0,
+                },
+            }
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _log(self, obj, action):
+        change = obj.to_objectchange(action)
+        change.user = self.user
+        change.request_id = uuid.uuid4()
+        change.save()
+        return change
+
+    def test_change_feed(self):
+        self.user.is_superuser = True
+        self.user.save()
+        address_0, address_1, address_2 = self.addresses
+        first = self._log(address_0, ObjectChangeActionChoices.ACTION_CREATE)
+        self._log(address_0, ObjectChangeActionChoices.ACTION_UPDATE)
+        self._log(address_1, ObjectChangeActionChoices.ACTION_UPDATE)
+        self._log(address_2, ObjectChangeActionChoices.ACTION_CREATE)
+        self._log(address_2, ObjectChangeActionChoices.ACTION_DELETE)
+        last = self._log(self.zone, ObjectChangeActionChoices.ACTION_DELETE)
+
+        feed = get_change_feed(self.user, since=first.pk - 1)
+        self.assertEqual(feed["next"], last.pk)
+        self.assertFalse(feed["has_more"])
+        address_changes, zone_changes = feed["changes"]
+        self.assertEqual(address_changes["model"], "address")
+        self.assertEqual(address_changes["created"], [address_0.pk])
+        self.assertEqual(address_changes["updated"], [address_1.pk])
+        self.assertEqual(address_changes["deleted"], [])
+        self.assertEqual(zone_changes["deleted"], [self.zone.pk])
+
+        feed = get_change_feed(self.user, since=first.pk - 1, limit=2)
+        self.assertTrue(feed["has_more"])
+        self.assertEqual(feed["changes"][0]["created"], [address_0.pk])
+
+        feed = get_change_feed(self.user, since=last.pk)
+        self.assertEqual(feed["next"], last.pk)
+        self.assertEqual(feed["changes"], [])
+
+    def test_change_feed_is_restricted(self):
+        first = self._log(self.addresses[0], ObjectChangeActionChoices.ACTION_UPDATE)
+        self._log(self.zone, ObjectChangeActionChoices.ACTION_DELETE)
+        self.add_permissions("netbox_security.view_address")
+
+        url = reverse("plugins-api:netbox_security-api:change_feed")
+        response = self.client.get(url, {"since": first.pk - 1}, **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(
+            [changes["model"] for changes in response.data["changes"]], ["address"]
+        )
+        self.assertEqual(response.data["changes"][0]["updated"], [self.addresses[0].pk])
+
+    def test_deleted_objects_need_unconstrained_permission(self):
+        first = self._log(self.zone, ObjectChangeActionChoices.ACTION_DELETE)
+        permission = ObjectPermission.objects.create(
+            name="feed-zone-constrained",
+            actions=["view"],
+            constraints={"name": "feed-other-zone"},
+        )
+        permission.object_types.add(ObjectType.objects.get_for_model(SecurityZone))
+        permission.users.add(self.user)
+
+        feed = get_change_feed(self.user, since=first.pk - 1)
+        self.assertEqual(feed["changes"], [])
+
+    def test_recent_entries_are_held_back(self):
+        self.user.is_superuser = True
+        self.user.save()
+        first = self._log(self.addresses[0], ObjectChangeActionChoices.ACTION_UPDATE)
+
+        feed = get_change_feed(self.user, since=first.pk - 1, lag=60)
+        self.assertEqual(feed["next"], first.pk - 1)
+        self.assertEqual(feed["changes"], [])
+
+    def test_since_time_beyond_changelog_is_limited(self):
+        self.user.is_superuser = True
+        self.user.save()
+        since_time = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+        feed = get_change_feed(self.user, since_time=since_time, limit=10)
+        address_changes, zone_changes = feed["changes"]
+        self.assertEqual(
+            address_changes["updated"], [address.pk for address in self.addresses]
+        )
+        self.assertEqual(zone_changes["updated"], [self.zone.pk])
+
+        with self.assertRaises(ValueError):
+            get_change_feed(self.user, since_time=since_time, limit=2)
@@ -0,0 +1,169 @@
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase, override_settings
+from netaddr import IPNetwork
+
+from ipam.models import IPAddress, Prefix, VRF
+from netbox_security.models import Address, CustomPrefix, EffectiveAddress
+from netbox_security.utilities import (
+    get_address_set_hierarchy,
+    rebuild_effective_addresses,
+)
+
+
+def effective_address_settings():
+    return {
+        **settings.PLUGINS_CONFIG,
+        "netbox_security": {
+            **settings.PLUGINS_CONFIG["netbox_security"],
+            "effective_address_table": True,
+        },
+    }
+
+
+def effective_rows(obj):
+    return set(
+        EffectiveAddress.objects.filter(
+            assigned_object_type=ContentType.objects.get_for_model(obj),
+            assigned_object_id=obj.pk,
+        ).values_list("address_id", "inherited")
+    )
+
+
+class EffectiveAddressTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with override_settings(PLUGINS_CONFIG=effective_address_settings()):
+            cls.vrf = VRF.objects.create(name="effective-vrf")
+            cls.parent_prefix = Prefix.objects.create(prefix=IPNetwork("10.80.0.0/16"))
+            cls.prefix = Prefix.objects.create(prefix=IPNetwork("10.80.1.0/24"))
+            cls.ip_address = IPAddress.objects.create(
+                address=IPNetwork("10.80.1.10/24")
+            )
+            cls.custom_prefix = CustomPrefix.objects.create(
+                prefix=IPNetwork("10.80.2.0/24")
+            )
+            cls.parent_address = Address.objects.create(
+                name="effective-parent-address",
+                assigned_object_type=ContentType.objects.get_for_model(Prefix),
+                assigned_object_id=cls.parent_prefix.pk,
+            )
+            cls.prefix_address = Address.objects.create(
+                name="effective-prefix-address",
+                assigned_object_type=ContentType.objects.get_for_model(Prefix),
+                assigned_object_id=cls.prefix.pk,
+            )
+
+    def setUp(self):
+        settings_override = override_settings(
+            PLUGINS_CONFIG=effective_address_settings()
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_rows_maintained_on_create(self):
+        self.assertEqual(
+            effective_rows(self.prefix),
+            {(self.prefix_address.pk, False), (self.parent_address.pk, True)},
+        )
+        self.assertEqual(
+            effective_rows(self.ip_address),
+            {(self.prefix_address.pk, True), (self.parent_address.pk, True)},
+        )
+        self.assertEqual(
+            effective_rows(self.parent_prefix), {(self.parent_address.pk, False)}
+        )
+
+    def test_vrf_move_updates_rows(self):
+        self.prefix.vrf = self.vrf
+        self.prefix.save()
+
+        self.assertEqual(effective_rows(self.prefix), {(self.prefix_address.pk, False)})
+        # The IP address stays in the global table and no longer sees the prefix
+        self.assertEqual(
+            effective_rows(self.ip_address), {(self.parent_address.pk, True)}
+        )
+
+    def test_address_moves_and_deletes(self):
+        self.prefix_address.assigned_object_id = self.parent_prefix.pk
+        self.prefix_address.save()
+
+        self.assertEqual(
+            effective_rows(self.prefix),
+            {
+                (self.prefix_address.pk, True),
+                (self.parent_address.pk, True),
+            },
+        )
+
+        self.parent_address.delete()
+
+        self.assertEqual(effective_rows(self.prefix), {(self.prefix_address.pk, True)})
+
+    def test_rename_keeps_rows(self):
+        row_ids = set(EffectiveAddress.objects.values_list("pk", flat=True))
+
+        self.parent_address.name = "effective-renamed-address"
+        self.parent_address.save()
+
+        # The rows are not recomputed, which would replace them.
+        self.assertEqual(
+            set(EffectiveAddress.objects.values_list("pk", flat=True)), row_ids
+        )
+
+    def test_prefix_delete_removes_rows(self):
+        prefix_pk = self.prefix.pk
+        self.prefix.delete()
+
+        self.assertFalse(
+            EffectiveAddress.objects.filter(
+                assigned_object_type=ContentType.objects.get_for_model(Prefix),
+                assigned_object_id=prefix_pk,
+            ).exists()
+        )
+
+    def test_rebuild_matches_incremental_rows(self):
+        rows = set(
+            EffectiveAddress.objects.values_list(
+                "assigned_object_type_id",
+                "assigned_object_id",
+                "address_id",
+                "inherited",
+            )
+        )
+
+        rebuild_effective_addresses()
+
+        self.assertEqual(
+            set(
+                EffectiveAddress.objects.values_list(
+                    "assigned_object_type_id",
+                    "assigned_object_id",
+                    "address_id",
+                    "inherited",
+                )
+            ),
+            rows,
+        )
+
+    def test_resolver_reads_table(self):
+        from_table = get_address_set_hierarchy(
+            app_label="ipam", model="ipaddress", object_id=self.ip_address.pk
+        )
+        with self.settings(
+            PLUGINS_CONFIG={
+                **settings.PLUGINS_CONFIG,
+                "netbox_security": {
+                    **settings.PLUGINS_CONFIG["netbox_security"],
+                    "effective_address_table": False,
+                },
+            }
+        ):
+            resolved = get_address_set_hierarchy(
+                app_label="ipam", model="ipaddress", object_id=self.ip_address.pk
+            )
+
+        self.assertEqual(from_table["address_ids"], resolved["address_ids"])
+        self.assertEqual(
+            from_table["inherited_address_ids"], resolved["inherited_address_ids"]
+        )
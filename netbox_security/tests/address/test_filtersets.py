@@ -25,6 +25,7 @@ from netbox_security.filtersets import (
 class AddressFiterSetTestCase(TestCase, ChangeLoggedFilterSetTests):
     queryset = Address.objects.all()
     filterset = AddressFilterSet
+    ignore_fields = ("span_version", "span_start", "span_end")
 
     @classmethod
     def setUpTestData(cls):
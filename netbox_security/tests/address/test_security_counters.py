@@ -0,0 +1,89 @@
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from netaddr import IPNetwork
+
+from ipam.models import Prefix
+from netbox_security.models import (
+    Address,
+    AddressAssignment,
+    NatPool,
+    NatPoolMember,
+    NatRule,
+    NatRuleSet,
+    SecurityCounter,
+    SecurityZone,
+)
+from netbox_security.utilities import (
+    check_security_counters,
+    get_security_counter,
+    rebuild_security_counters,
+)
+
+
+class SecurityCounterTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.prefix = Prefix.objects.create(prefix=IPNetwork("10.80.0.0/24"))
+        cls.other_prefix = Prefix.objects.create(prefix=IPNetwork("10.81.0.0/24"))
+        cls.zone = SecurityZone.objects.create(name="counter-zone")
+        cls.rule_set = NatRuleSet.objects.create(name="counter-rule-set")
+        cls.pool = NatPool.objects.create(name="counter-pool")
+
+    def _counts(self, prefix=None):
+        counter = get_security_counter(prefix or self.prefix)
+        return (
+            counter.nat_pool_member_count,
+            counter.nat_rule_count,
+            counter.address_count,
+            counter.security_zone_count,
+        )
+
+    def test_counters_follow_related_objects(self):
+        self.assertEqual(self._counts(), (0, 0, 0, 0))
+
+        address = Address.objects.create(
+            name="counter-address",
+            assigned_object_type=ContentType.objects.get_for_model(Prefix),
+            assigned_object_id=self.prefix.pk,
+        )
+        AddressAssignment.objects.create(
+            address=address,
+            assigned_object_type=ContentType.objects.get_for_model(SecurityZone),
+            assigned_object_id=self.zone.pk,
+        )
+        self.assertEqual(self._counts(), (0, 0, 1, 1))
+
+        rule = NatRule.objects.create(name="counter-rule", rule_set=self.rule_set)
+        rule.source_prefixes.add(self.prefix)
+        rule.destination_prefixes.add(self.prefix)
+        NatPoolMember.objects.create(
+            name="counter-member", pool=self.pool, prefix=self.prefix
+        )
+        self.assertEqual(self._counts(), (1, 1, 1, 1))
+        self.assertEqual(get_security_counter(self.prefix).related_total_count, 4)
+
+        # Moving the Address updates both the previous and the new object.
+        address.assigned_object_id = self.other_prefix.pk
+        address.save()
+        self.assertEqual(self._counts(), (1, 1, 0, 0))
+        self.assertEqual(self._counts(self.other_prefix), (0, 0, 1, 1))
+
+        rule.delete()
+        self.assertEqual(self._counts(), (1, 0, 0, 0))
+        self.assertEqual(check_security_counters()[("ipam", "prefix")], [])
+
+    def test_rebuild_repairs_drift(self):
+        Address.objects.create(
+            name="counter-drift-address",
+            assigned_object_type=ContentType.objects.get_for_model(Prefix),
+            assigned_object_id=self.prefix.pk,
+        )
+        SecurityCounter.objects.all().delete()
+        self.assertEqual(
+            check_security_counters()[("ipam", "prefix")], [self.prefix.pk]
+        )
+
+        rebuild_security_counters()
+
+        self.assertEqual(check_security_counters()[("ipam", "prefix")], [])
+        self.assertEqual(self._counts(), (0, 0, 1, 0))
@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.test import override_settings
+from django.urls import reverse
+from netaddr import IPNetwork
+
+from ipam.models import Prefix
+from netbox_security.models import Address
+from netbox_security.views.tabs import _security_tab_badge
+from utilities.testing import TestCase
+
+
+def _badge_settings(mode):
+    return override_settings(
+        PLUGINS_CONFIG={
+            **settings.PLUGINS_CONFIG,
+            "netbox_security": {
+                **settings.PLUGINS_CONFIG.get("netbox_security", {}),
+                "security_tab_badge": mode,
+            },
+        }
+    )
+
+
+class SecurityTabBadgeTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.prefix = Prefix.objects.create(prefix=IPNetwork("10.90.0.0/24"))
+        Address.objects.create(
+            name="badge-address",
+            assigned_object_type=ContentType.objects.get_for_model(Prefix),
+            assigned_object_id=cls.prefix.pk,
+        )
+
+    def _get_url(self, pk):
+        return reverse(
+            "plugins:netbox_security:security_tab_badge",
+            kwargs={"app_label": "ipam", "model": "prefix", "pk": pk},
+        )
+
+    def test_sync_badge_returns_count(self):
+        with _badge_settings("sync"):
+            self.assertEqual(_security_tab_badge("ipam", "prefix")(self.prefix), 1)
+
+    def test_deferred_badge_returns_placeholder(self):
+        with _badge_settings("deferred"):
+            badge = _security_tab_badge("ipam", "prefix")(self.prefix)
+
+        self.assertIn(f'hx-get="{self._get_url(self.prefix.pk)}"', badge)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_badge_endpoint(self):
+        response = self.client.get(self._get_url(self.prefix.pk))
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.content.decode(), "1")
+
+        self.assertHttpStatus(self.client.get(self._get_url(0)), 404)
+        self.assertHttpStatus(
+            self.client.get(
+                reverse(
+                    "plugins:netbox_security:security_tab_badge",
+                    kwargs={"app_label": "dcim", "model": "site", "pk": 1},
+                )
+            ),
+            404,
+        )
+
+    def test_badge_endpoint_requires_permission(self):
+        response = self.client.get(self._get_url(self.prefix.pk))
+        self.assertHttpStatus(response, 404)
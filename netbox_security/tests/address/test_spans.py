@@ -0,0 +1,110 @@
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from netaddr import IPNetwork
+
+from ipam.models import IPAddress, Prefix
+from netbox_security.models import Address, CustomPrefix
+from netbox_security.utilities.address_set_hierarchy import (
+    _get_parent_customprefix_address_ids,
+    _get_parent_ipam_address_ids,
+    _get_span_address_rows,
+)
+
+
+class AddressSpanTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.prefix = Prefix.objects.create(prefix=IPNetwork("10.20.0.0/16"))
+        cls.custom_prefix = CustomPrefix.objects.create(
+            prefix=IPNetwork("10.20.1.0/24")
+        )
+        cls.prefix_address = Address.objects.create(
+            name="prefix-address",
+            assigned_object_type=ContentType.objects.get_for_model(Prefix),
+            assigned_object_id=cls.prefix.pk,
+        )
+        cls.custom_prefix_address = Address.objects.create(
+            name="custom-prefix-address",
+            assigned_object_type=ContentType.objects.get_for_model(CustomPrefix),
+            assigned_object_id=cls.custom_prefix.pk,
+        )
+        cls.dns_address = Address.objects.create(
+            name="dns-address", dns_name="www.example.com"
+        )
+
+    def test_span_set_on_save(self):
+        self.prefix_address.refresh_from_db()
+        self.assertEqual(self.prefix_address.span_version, 4)
+        self.assertEqual(
+            int(self.prefix_address.span_start), int(IPNetwork("10.20.0.0/16").first)
+        )
+        self.assertEqual(
+            int(self.prefix_address.span_end), int(IPNetwork("10.20.0.0/16").last)
+        )
+
+        self.dns_address.refresh_from_db()
+        self.assertIsNone(self.dns_address.span_version)
+        self.assertIsNone(self.dns_address.span_start)
+
+    def test_span_follows_assigned_object(self):
+        self.prefix.prefix = IPNetwork("10.30.0.0/16")
+        self.prefix.save()
+
+        self.prefix_address.refresh_from_db()
+        self.assertEqual(
+            int(self.prefix_address.span_start), int(IPNetwork("10.30.0.0/16").first)
+        )
+
+    def test_containing_address_lookup(self):
+        ip_address = IPAddress.objects.create(address=IPNetwork("10.20.1.5/24"))
+        outside = IPAddress.objects.create(address=IPNetwork("10.99.1.5/24"))
+
+        self.assertEqual(
+            _get_parent_customprefix_address_ids(ip_address),
+            [self.custom_prefix_address.pk],
+        )
+        self.assertEqual(_get_parent_customprefix_address_ids(outside), [])
+        self.assertEqual(
+            _get_parent_ipam_address_ids(self.custom_prefix),
+            [self.prefix_address.pk],
+        )
+
+    def test_containing_lookup_matches_version(self):
+        # ::/96 spans the same integers as the whole IPv4 address space.
+        ipv6_prefix = Prefix.objects.create(prefix=IPNetwork("::/96"))
+        ipv6_address = Address.objects.create(
+            name="ipv6-address",
+            assigned_object_type=ContentType.objects.get_for_model(Prefix),
+            assigned_object_id=ipv6_prefix.pk,
+        )
+        ip_address = IPAddress.objects.create(address=IPNetwork("10.20.1.5/24"))
+
+        self.assertNotIn(ipv6_address.pk, _get_parent_ipam_address_ids(ip_address))
+        self.assertIn(self.prefix_address.pk, _get_parent_ipam_address_ids(ip_address))
+
+    def test_span_address_rows_only_read_containing_addresses(self):
+        sibling = Prefix.objects.create(prefix=IPNetwork("10.21.0.0/16"))
+        Address.objects.create(
+            name="sibling-address",
+            assigned_object_type=ContentType.objects.get_for_model(Prefix),
+            assigned_object_id=sibling.pk,
+        )
+        targets = {
+            1: (
+                int(IPNetwork("10.20.1.0/25").first),
+                int(IPNetwork("10.20.1.0/25").last),
+                4,
+            ),
+            2: (
+                int(IPNetwork("2001:db8::/64").first),
+                int(IPNetwork("2001:db8::/64").last),
+                6,
+            ),
+        }
+        rows = _get_span_address_rows(
+            (("ipam", "prefix"), ("netbox_security", "customprefix")), targets
+        )
+        self.assertEqual(
+            sorted(address_id for address_id, _, _ in rows),
+            sorted([self.prefix_address.pk, self.custom_prefix_address.pk]),
+        )
@@ -0,0 +1,137 @@
+import json
+
+from netaddr import IPNetwork
+from django.urls import reverse
+
+from ipam.models import IPRange
+from netbox_security.models import Address, AddressList, AddressSet, CustomPrefix
+from netbox_security.utilities import aggregate_spans, get_aggregated_prefixes
+from utilities.testing import APITestCase
+
+
+class AddressAggregationTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        def create_address(name, assigned_object):
+            return Address.objects.create(
+                name=f"aggregation-{name}", assigned_object=assigned_object
+            )
+
+        cls.low_half = create_address(
+            "low", CustomPrefix.objects.create(prefix=IPNetwork("10.3.0.0/25"))
+        )
+        high_half = create_address(
+            "high", CustomPrefix.objects.create(prefix=IPNetwork("10.3.0.128/25"))
+        )
+        inside = create_address(
+            "inside", CustomPrefix.objects.create(prefix=IPNetwork("10.3.0.5/32"))
+        )
+        cls.ip_range = IPRange.objects.create(
+            start_address="10.3.1.0/24", end_address="10.3.1.4/24"
+        )
+        range_address = create_address("range", cls.ip_range)
+        ipv6 = create_address(
+            "ipv6", CustomPrefix.objects.create(prefix=IPNetwork("2001:db8::/48"))
+        )
+        dns = Address.objects.create(name="aggregation-dns", dns_name="example.com")
+
+        cls.child = AddressSet.objects.create(name="aggregation-child")
+        cls.child.addresses.set([high_half, inside, range_address])
+        cls.parent = AddressSet.objects.create(name="aggregation-parent")
+        cls.parent.addresses.set([cls.low_half, ipv6, dns])
+        cls.parent.address_sets.add(cls.child)
+        cls.address_list = AddressList.objects.create(
+            name="aggregation-list", assigned_object=cls.parent
+        )
+
+    def test_aggregate_spans(self):
+        self.assertEqual(
+            aggregate_spans(
+                [
+                    (4, 167772161, 167772170),
+                    (4, 167772171, 167772175),
+                    (6, 0, (1 << 64) - 1),
+                ]
+            ),
+            {
+                "ipv4": ["10.0.0.1/32", "10.0.0.2/31", "10.0.0.4/30", "10.0.0.8/29"],
+                "ipv6": ["::/64"],
+            },
+        )
+
+    def test_get_aggregated_prefixes(self):
+        expected = {
+            "ipv4": ["10.3.0.0/24", "10.3.1.0/30", "10.3.1.4/32"],
+            "ipv6": ["2001:db8::/48"],
+        }
+        prefixes = get_aggregated_prefixes(AddressSet, [self.parent.pk, self.child.pk])
+        self.assertEqual(prefixes[self.parent.pk], expected)
+        self.assertEqual(
+            prefixes[self.child.pk]["ipv4"],
+            ["10.3.0.128/25", "10.3.1.0/30", "10.3.1.4/32"],
+        )
+        self.assertEqual(
+            get_aggregated_prefixes(AddressList, [self.address_list.pk]),
+            {self.address_list.pk: expected},
+        )
+
+    def test_cache_is_invalidated(self):
+        get_aggregated_prefixes(AddressSet, [self.parent.pk])
+        get_aggregated_prefixes(AddressList, [self.address_list.pk])
+        with self.assertNumQueries(0):
+            get_aggregated_prefixes(AddressSet, [self.parent.pk])
+
+        # A change to a member of a nested set reaches the parent and its lists.
+        self.ip_range.end_address = "10.3.1.7/24"
+        self.ip_range.save()
+        self.assertEqual(
+            get_aggregated_prefixes(AddressSet, [self.parent.pk])[self.parent.pk][
+                "ipv4"
+            ],
+            ["10.3.0.0/24", "10.3.1.0/29"],
+        )
+
+        self.parent.addresses.remove(self.low_half)
+        self.assertEqual(
+            get_aggregated_prefixes(AddressList, [self.address_list.pk])[
+                self.address_list.pk
+            ]["ipv4"],
+            ["10.3.0.5/32", "10.3.0.128/25", "10.3.1.0/29"],
+        )
+
+    def test_api(self):
+        self.add_permissions("netbox_security.view_addressset")
+        url = reverse("plugins-api:netbox_security-api:addressset-list")
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertNotIn("aggregated_prefixes", response.data["results"][0])
+
+        response = self.client.get(
+            url, {"fields": "id,aggregated_prefixes"}, **self.header
+        )
+        self.assertHttpStatus(response, 200)
+        prefixes = {
+            result["id"]: result["aggregated_prefixes"]
+            for result in response.data["results"]
+        }
+        self.assertEqual(prefixes[self.parent.pk]["ipv6"], ["2001:db8::/48"])
+
+        response = self.client.get(
+            reverse("plugins-api:netbox_security-api:addressset-aggregated-prefixes"),
+            {"name": "aggregation-child"},
+            **self.header,
+        )
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [
+                {
+                    "id": self.child.pk,
+                    "name": "aggregation-child",
+                    "ipv4": ["10.3.0.128/25", "10.3.1.0/30", "10.3.1.4/32"],
+                    "ipv6": [],
+                }
+            ],
+        )
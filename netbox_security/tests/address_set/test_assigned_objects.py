@@ -0,0 +1,98 @@
+from django.contrib.contenttypes.models import ContentType
+from django.test import override_settings
+
+from dcim.models import Device, DeviceRole, DeviceType, Manufacturer, Site
+from netbox_security.models import AddressSet, AddressSetAssignment, SecurityZone
+from netbox_security.utilities import get_assigned_objects
+from utilities.testing import TestCase
+
+
+class AssignedObjectsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        site = Site.objects.create(name="assigned-site", slug="assigned-site")
+        device_type = DeviceType.objects.create(
+            model="assigned-type",
+            slug="assigned-type",
+            manufacturer=Manufacturer.objects.create(
+                name="assigned-manufacturer", slug="assigned-manufacturer"
+            ),
+        )
+        role = DeviceRole.objects.create(name="assigned-role", slug="assigned-role")
+        cls.devices = [
+            Device.objects.create(
+                name=f"assigned-device-{index}",
+                status="active",
+                site=site,
+                role=role,
+                device_type=device_type,
+            )
+            for index in range(3)
+        ]
+        cls.zone = SecurityZone.objects.create(name="assigned-zone")
+        cls.address_set = AddressSet.objects.create(name="assigned-set")
+        other_set = AddressSet.objects.create(name="assigned-other-set")
+
+        device_ct = ContentType.objects.get_for_model(Device)
+        AddressSetAssignment.objects.bulk_create(
+            [
+                *(
+                    AddressSetAssignment(
+                        address_set=cls.address_set,
+                        assigned_object_type=device_ct,
+                        assigned_object_id=device.pk,
+                    )
+                    for device in cls.devices
+                ),
+                AddressSetAssignment(
+                    address_set=cls.address_set,
+                    assigned_object_type=ContentType.objects.get_for_model(
+                        SecurityZone
+                    ),
+                    assigned_object_id=cls.zone.pk,
+                ),
+                AddressSetAssignment(
+                    address_set=other_set,
+                    assigned_object_type=device_ct,
+                    assigned_object_id=cls.devices[0].pk,
+                ),
+            ]
+        )
+
+    def test_get_assigned_objects(self):
+        ContentType.objects.get_for_models(Device, SecurityZone)
+        # One query for the assigned models and one per listed model.
+        with self.assertNumQueries(3):
+            assigned_objects = get_assigned_objects(
+                AddressSetAssignment, "address_set", self.address_set
+            )
+            devices = list(assigned_objects[Device])
+            zones = list(assigned_objects[SecurityZone])
+
+        self.assertEqual(devices, self.devices)
+        self.assertEqual(zones, [self.zone])
+
+    def test_get_assigned_objects_pages_in_database(self):
+        assigned_objects = get_assigned_objects(
+            AddressSetAssignment, "address_set", self.address_set
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(list(assigned_objects[Device][1:2]), [self.devices[1]])
+
+    def test_get_assigned_objects_is_restricted(self):
+        assigned_objects = get_assigned_objects(
+            AddressSetAssignment, "address_set", self.address_set, self.user
+        )
+        self.assertFalse(assigned_objects[Device].exists())
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_assignment_tables_are_paginated(self):
+        response = self.client.get(
+            self.address_set.get_absolute_url(), {"per_page": 2, "device_page": 2}
+        )
+        self.assertHttpStatus(response, 200)
+        content = response.content.decode()
+        self.assertIn("assigned-device-2", content)
+        self.assertNotIn("assigned-device-0", content)
+        self.assertIn("assigned-zone", content)
+        self.assertIn("device_page=1", content)
@@ -0,0 +1,150 @@
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from netaddr import IPNetwork
+
+from ipam.models import Prefix
+from netbox_security.models import Address, AddressSet, AddressSetClosure
+from netbox_security.utilities import (
+    check_address_set_closure,
+    get_address_set_hierarchy,
+    rebuild_address_set_closure,
+)
+
+
+def closure_pairs():
+    return {
+        (ancestor_id, descendant_id): depth
+        for ancestor_id, descendant_id, depth in AddressSetClosure.objects.values_list(
+            "ancestor_id", "descendant_id", "depth"
+        )
+    }
+
+
+class AddressSetClosureTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.root = AddressSet.objects.create(name="root")
+        cls.middle = AddressSet.objects.create(name="middle")
+        cls.leaf = AddressSet.objects.create(name="leaf")
+        cls.root.address_sets.add(cls.middle)
+        cls.middle.address_sets.add(cls.leaf)
+
+    def test_self_rows_created(self):
+        pairs = closure_pairs()
+        for address_set in (self.root, self.middle, self.leaf):
+            self.assertEqual(pairs[(address_set.pk, address_set.pk)], 0)
+
+    def test_transitive_rows_on_add(self):
+        pairs = closure_pairs()
+        self.assertEqual(pairs[(self.root.pk, self.middle.pk)], 1)
+        self.assertEqual(pairs[(self.middle.pk, self.leaf.pk)], 1)
+        self.assertEqual(pairs[(self.root.pk, self.leaf.pk)], 2)
+        self.assertFalse(any(check_address_set_closure().values()))
+
+    def test_reverse_add(self):
+        other_root = AddressSet.objects.create(name="other-root")
+        self.middle.addressset_address_sets.add(other_root)
+
+        pairs = closure_pairs()
+        self.assertEqual(pairs[(other_root.pk, self.middle.pk)], 1)
+        self.assertEqual(pairs[(other_root.pk, self.leaf.pk)], 2)
+
+    def test_remove_drops_transitive_rows(self):
+        self.root.address_sets.remove(self.middle)
+
+        pairs = closure_pairs()
+        self.assertNotIn((self.root.pk, self.middle.pk), pairs)
+        self.assertNotIn((self.root.pk, self.leaf.pk), pairs)
+        self.assertEqual(pairs[(self.middle.pk, self.leaf.pk)], 1)
+
+    def test_clear_drops_transitive_rows(self):
+        self.middle.address_sets.clear()
+
+        pairs = closure_pairs()
+        self.assertNotIn((self.middle.pk, self.leaf.pk), pairs)
+        self.assertNotIn((self.root.pk, self.leaf.pk), pairs)
+        self.assertEqual(pairs[(self.root.pk, self.middle.pk)], 1)
+
+    def test_shared_set_keeps_shortest_depth(self):
+        self.root.address_sets.add(self.leaf)
+
+        self.assertEqual(closure_pairs()[(self.root.pk, self.leaf.pk)], 1)
+
+        self.root.address_sets.remove(self.leaf)
+
+        self.assertEqual(closure_pairs()[(self.root.pk, self.leaf.pk)], 2)
+
+    def test_delete_intermediate_set(self):
+        self.middle.delete()
+
+        pairs = closure_pairs()
+        self.assertNotIn((self.root.pk, self.leaf.pk), pairs)
+        self.assertEqual(pairs[(self.leaf.pk, self.leaf.pk)], 0)
+        self.assertFalse(any(check_address_set_closure().values()))
+
+    def test_check_and_rebuild(self):
+        AddressSetClosure.objects.filter(
+            ancestor=self.root, descendant=self.leaf
+        ).delete()
+
+        drift = check_address_set_closure()
+        self.assertEqual(drift["missing"], [(self.root.pk, self.leaf.pk)])
+
+        rebuild_address_set_closure()
+
+        self.assertFalse(any(check_address_set_closure().values()))
+
+    def test_cycle_is_tolerated(self):
+        self.leaf.address_sets.add(self.root)
+
+        pairs = closure_pairs()
+        self.assertEqual(pairs[(self.leaf.pk, self.root.pk)], 1)
+        self.assertEqual(pairs[(self.root.pk, self.root.pk)], 0)
+        self.assertFalse(any(check_address_set_closure().values()))
+
+
+class AddressSetClosureHierarchyTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.prefix = Prefix.objects.create(prefix=IPNetwork("10.10.0.0/24"))
+        cls.address = Address.objects.create(
+            name="closure-address",
+            assigned_object_type=ContentType.objects.get(
+                app_label="ipam",
+                model="prefix",
+            ),
+            assigned_object_id=cls.prefix.pk,
+        )
+        cls.address_sets = [
+            AddressSet.objects.create(name=f"level-{level}") for level in range(8)
+        ]
+        for parent, child in zip(cls.address_sets, cls.address_sets[1:]):
+            parent.address_sets.add(child)
+        cls.address_sets[-1].addresses.add(cls.address)
+
+    def test_closure_resolver_matches_level_walk(self):
+        with_closure = get_address_set_hierarchy(
+            app_label="ipam",
+            model="prefix",
+            object_id=self.prefix.pk,
+            use_closure=True,
+        )
+        without_closure = get_address_set_hierarchy(
+            app_label="ipam",
+            model="prefix",
+            object_id=self.prefix.pk,
+            use_closure=False,
+        )
+
+        self.assertEqual(
+            with_closure["all_address_set_ids"],
+            sorted(address_set.pk for address_set in self.address_sets),
+        )
+        self.assertEqual(
+            with_closure["all_address_set_ids"],
+            without_closure["all_address_set_ids"],
+        )
+        self.assertEqual(
+            with_closure["address_set_paths"],
+            without_closure["address_set_paths"],
+        )
@@ -0,0 +1,56 @@
+import json
+
+from django.contrib.contenttypes.models import ContentType
+from django.urls import reverse
+
+from extras.models import Tag
+from netbox_security.models import Address, AddressSet
+from netbox_security.utilities import get_export_rows
+from utilities.testing import APITestCase
+
+
+class ExportTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.addresses = Address.objects.bulk_create(
+            Address(name=f"export-address-{index}") for index in range(3)
+        )
+        cls.tag = Tag.objects.create(name="export-tag", slug="export-tag")
+        cls.parent = AddressSet.objects.create(name="export-parent")
+        cls.child = AddressSet.objects.create(name="export-child")
+        cls.parent.addresses.set(cls.addresses[:2])
+        cls.parent.address_sets.add(cls.child)
+        cls.parent.tags.add(cls.tag)
+
+    def test_get_export_rows(self):
+        ContentType.objects.get_for_model(AddressSet)
+        with self.assertNumQueries(1):
+            rows = list(get_export_rows(AddressSet.objects.all(), chunk_size=1))
+
+        self.assertEqual(
+            [row["name"] for row in rows], ["export-parent", "export-child"]
+        )
+        parent, child = rows
+        self.assertEqual(
+            parent["addresses"], [address.pk for address in self.addresses[:2]]
+        )
+        self.assertEqual(parent["address_sets"], [self.child.pk])
+        self.assertEqual(parent["tags"], [self.tag.pk])
+        self.assertIsNone(parent["tenant_id"])
+        self.assertEqual(child["addresses"], [])
+
+    def test_export(self):
+        self.add_permissions("netbox_security.view_addressset")
+        url = reverse("plugins-api:netbox_security-api:addressset-export")
+
+        response = self.client.get(url, {"name": "export-child"}, **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["id"], self.child.pk)
+
+    def test_export_is_restricted(self):
+        url = reverse("plugins-api:netbox_security-api:addressset-export")
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, 403)
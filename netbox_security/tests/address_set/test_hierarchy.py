@@ -1,5 +1,8 @@
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 from netaddr import IPNetwork
 
 from ipam.models import Prefix
@@ -10,7 +13,12 @@ from netbox_security.models import (
     SecurityZone,
     SecurityZonePolicy,
 )
-from netbox_security.utilities import get_address_set_hierarchy
+from netbox_security.utilities import (
+    get_address_set_hierarchies,
+    get_address_set_hierarchy,
+    get_address_set_hierarchy_counts,
+)
+from utilities.testing import APITestCase
 
 
 class AddressSetHierarchyTestCase(TestCase):
@@ -121,6 +129,31 @@ class AddressSetHierarchyTestCase(TestCase):
             self.assertIn("address_list", row)
         self.assertTrue(any(row["context_object"] for row in result["policy_paths"]))
 
+    def test_counts_match_full_hierarchy(self):
+        child_prefix = Prefix.objects.create(prefix=IPNetwork("10.1.0.0/25"))
+
+        for prefix in (self.prefix, child_prefix):
+            result = get_address_set_hierarchy(
+                app_label="ipam",
+                model="prefix",
+                object_id=prefix.pk,
+            )
+            counts = get_address_set_hierarchy_counts(
+                app_label="ipam",
+                model="prefix",
+                object_id=prefix.pk,
+            )
+
+            self.assertEqual(counts["address_count"], len(result["address_objects"]))
+            self.assertEqual(
+                counts["inherited_address_count"],
+                len(result["inherited_address_objects"]),
+            )
+            self.assertEqual(counts["policy_path_count"], len(result["policy_paths"]))
+
+        self.assertEqual(counts["inherited_address_count"], 1)
+        self.assertEqual(counts["policy_path_count"], 2)
+
     def test_returns_empty_for_unassigned_ipam_object(self):
         unassigned_prefix = Prefix.objects.create(prefix=IPNetwork("10.2.0.0/24"))
 
@@ -156,3 +189,235 @@ class AddressSetHierarchyTestCase(TestCase):
         self.assertEqual(result["address_set_hierarchy_rows"], [])
         self.assertEqual(result["address_list_ids"], [])
         self.assertEqual(result["policy_paths"], [])
+
+
+class AddressSetHierarchiesTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        prefix_ct = ContentType.objects.get_for_model(Prefix)
+
+        cls.parent_prefix = Prefix.objects.create(prefix=IPNetwork("10.50.0.0/16"))
+        cls.prefixes = [
+            Prefix.objects.create(prefix=IPNetwork(f"10.50.{index}.0/24"))
+            for index in range(4)
+        ]
+        cls.parent_address = Address.objects.create(
+            name="parent-address",
+            assigned_object_type=prefix_ct,
+            assigned_object_id=cls.parent_prefix.pk,
+        )
+        cls.child_address = Address.objects.create(
+            name="child-address",
+            assigned_object_type=prefix_ct,
+            assigned_object_id=cls.prefixes[0].pk,
+        )
+
+        cls.root_set = AddressSet.objects.create(name="batch-root-set")
+        cls.leaf_set = AddressSet.objects.create(name="batch-leaf-set")
+        cls.root_set.address_sets.add(cls.leaf_set)
+        cls.leaf_set.addresses.add(cls.parent_address, cls.child_address)
+
+        address_list = AddressList.objects.create(
+            name="batch-list",
+            assigned_object_type=ContentType.objects.get_for_model(AddressSet),
+            assigned_object_id=cls.root_set.pk,
+        )
+        policy = SecurityZonePolicy.objects.create(
+            name="batch-policy",
+            index=10,
+            source_zone=SecurityZone.objects.create(name="batch-source-zone"),
+            destination_zone=SecurityZone.objects.create(name="batch-destination-zone"),
+            policy_actions=["permit"],
+        )
+        policy.source_address.add(address_list)
+
+    def test_batch_matches_single_object_results(self):
+        object_ids = [self.parent_prefix.pk, *(prefix.pk for prefix in self.prefixes)]
+
+        results = get_address_set_hierarchies("ipam", "prefix", object_ids)
+
+        self.assertEqual(list(results), object_ids)
+        for object_id in object_ids:
+            self.assertEqual(
+                results[object_id],
+                get_address_set_hierarchy(
+                    app_label="ipam", model="prefix", object_id=object_id
+                ),
+            )
+
+        self.assertEqual(
+            results[self.prefixes[1].pk]["inherited_address_ids"],
+            [self.parent_address.pk],
+        )
+        self.assertEqual(
+            results[self.prefixes[0].pk]["address_ids"], [self.child_address.pk]
+        )
+        self.assertEqual(results[self.parent_prefix.pk]["inherited_address_ids"], [])
+
+    def test_batch_query_count_is_constant(self):
+        object_ids = [self.parent_prefix.pk, *(prefix.pk for prefix in self.prefixes)]
+        # Warm the ContentType cache so it does not skew the first measurement
+        get_address_set_hierarchies("ipam", "prefix", object_ids)
+
+        with CaptureQueriesContext(connection) as single:
+            get_address_set_hierarchies("ipam", "prefix", [self.prefixes[1].pk])
+        with CaptureQueriesContext(connection) as batch:
+            get_address_set_hierarchies("ipam", "prefix", object_ids)
+
+        self.assertEqual(len(batch), len(single))
+
+    def test_batch_unknown_content_type(self):
+        results = get_address_set_hierarchies("not_real", "missing", [1, 2])
+
+        self.assertEqual(list(results), [1, 2])
+        self.assertIsNone(results[1]["assigned_object_id"])
+        self.assertEqual(results[2]["policy_paths"], [])
+
+
+class AddressSetHierarchyPathsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.prefix = Prefix.objects.create(prefix=IPNetwork("10.60.0.0/24"))
+        cls.address = Address.objects.create(
+            name="diamond-address",
+            assigned_object_type=ContentType.objects.get_for_model(Prefix),
+            assigned_object_id=cls.prefix.pk,
+        )
+
+        # Six layers of two sets each, every set nested in both sets of the
+        # layer above: 2 ** 6 paths lead from the top layer to the leaf.
+        cls.layers = [
+            [
+                AddressSet.objects.create(name=f"layer-{level}-{side}")
+                for side in ("a", "b")
+            ]
+            for level in range(6)
+        ]
+        cls.leaf_set = AddressSet.objects.create(name="diamond-leaf")
+        for parents, children in zip(cls.layers, [*cls.layers[1:], [cls.leaf_set]]):
+            for parent in parents:
+                parent.address_sets.add(*children)
+        cls.leaf_set.addresses.add(cls.address)
+
+    def get_hierarchy(self, **kwargs):
+        return get_address_set_hierarchy(
+            app_label="ipam",
+            model="prefix",
+            object_id=self.prefix.pk,
+            **kwargs,
+        )
+
+    def test_graph_path_counts(self):
+        result = self.get_hierarchy()
+
+        nodes = {node["id"]: node for node in result["address_set_graph"]["nodes"]}
+        self.assertEqual(len(nodes), 13)
+        self.assertEqual(len(result["address_set_graph"]["edges"]), 22)
+        self.assertEqual(nodes[self.leaf_set.pk]["path_count"], 64)
+        self.assertEqual(nodes[self.leaf_set.pk]["address_ids"], [self.address.pk])
+        self.assertEqual(nodes[self.layers[0][0].pk]["path_count"], 1)
+        self.assertEqual(result["address_set_path_page"]["path_count"], 64)
+        self.assertEqual(result["address_set_path_page"]["row_count"], 64)
+
+    def test_paths_are_paginated(self):
+        first_page = self.get_hierarchy(path_limit=10)
+        self.assertEqual(len(first_page["address_set_paths"]), 10)
+        self.assertEqual(len(first_page["address_set_hierarchy_rows"]), 10)
+        self.assertTrue(first_page["address_set_path_page"]["has_next"])
+
+        all_paths = self.get_hierarchy(path_limit=100)["address_set_paths"]
+        self.assertEqual(len(all_paths), 64)
+        self.assertEqual(all_paths, sorted(all_paths))
+        self.assertEqual(all_paths[:10], first_page["address_set_paths"])
+
+        last_page = self.get_hierarchy(path_offset=60, path_limit=10)
+        self.assertEqual(last_page["address_set_paths"], all_paths[60:])
+        self.assertFalse(last_page["address_set_path_page"]["has_next"])
+
+    def test_paths_follow_hierarchy_rows(self):
+        # With two Addresses per path, a page of rows covers half as many paths.
+        second_address = Address.objects.create(
+            name="diamond-second-address",
+            assigned_object_type=ContentType.objects.get_for_model(Prefix),
+            assigned_object_id=self.prefix.pk,
+        )
+        self.leaf_set.addresses.add(second_address)
+        all_paths = self.get_hierarchy(path_limit=200)["address_set_paths"]
+
+        page = self.get_hierarchy(path_offset=120, path_limit=10)
+        self.assertEqual(page["address_set_path_page"]["row_count"], 128)
+        self.assertEqual(len(page["address_set_hierarchy_rows"]), 8)
+        self.assertEqual(page["address_set_paths"], all_paths[60:])
+        self.assertFalse(page["address_set_path_page"]["has_next"])
+
+
+class AddressSetHierarchyAPITestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.prefix = Prefix.objects.create(prefix=IPNetwork("10.2.0.0/24"))
+        address = Address.objects.create(
+            name="api-prefix-address",
+            assigned_object_type=ContentType.objects.get_for_model(Prefix),
+            assigned_object_id=cls.prefix.pk,
+        )
+        address_set = AddressSet.objects.create(name="api-set")
+        address_set.addresses.add(address)
+        address_list = AddressList.objects.create(
+            name="api-list",
+            assigned_object_type=ContentType.objects.get_for_model(AddressSet),
+            assigned_object_id=address_set.pk,
+        )
+        policy = SecurityZonePolicy.objects.create(
+            name="api-policy",
+            index=1,
+            source_zone=SecurityZone.objects.create(name="api-source-zone"),
+            destination_zone=SecurityZone.objects.create(name="api-destination-zone"),
+            policy_actions=["permit"],
+        )
+        policy.source_address.add(address_list)
+
+    def _get(self):
+        return self.client.get(
+            reverse("plugins-api:netbox_security-api:address_set_hierarchy"),
+            {"app_label": "ipam", "model": "prefix", "object_id": self.prefix.pk},
+            **self.header,
+        )
+
+    def test_hides_objects_without_view_permission(self):
+        self.add_permissions("ipam.view_prefix")
+        response = self._get()
+        self.assertHttpStatus(response, 200)
+        (result,) = response.data["results"]
+        self.assertEqual(result["address_ids"], [])
+        self.assertEqual(result["all_address_set_ids"], [])
+        self.assertEqual(result["address_set_paths"], [])
+        self.assertEqual(result["address_list_names"], [])
+        self.assertEqual(result["policy_paths"], [])
+
+        self.add_permissions(
+            "netbox_security.view_address",
+            "netbox_security.view_addressset",
+            "netbox_security.view_addresslist",
+            "netbox_security.view_securityzonepolicy",
+            "netbox_security.view_securityzone",
+        )
+        (result,) = self._get().data["results"]
+        self.assertEqual(result["address_set_name_paths"], [["api-set"]])
+        self.assertEqual(result["address_list_names"], ["api-list"])
+        self.assertEqual(
+            [path["policy_name"] for path in result["policy_paths"]], ["api-policy"]
+        )
+
+    def test_batch_limit(self):
+        self.add_permissions("ipam.view_prefix")
+        response = self.client.post(
+            reverse("plugins-api:netbox_security-api:address_set_hierarchy"),
+            {
+                "app_label": "ipam",
+                "model": "prefix",
+                "object_ids": list(range(1, 1002)),
+            },
+            format="json",
+            **self.header,
+        )
+        self.assertHttpStatus(response, 400)
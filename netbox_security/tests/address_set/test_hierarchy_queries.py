@@ -0,0 +1,221 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from netaddr import IPNetwork
+
+from ipam.models import Prefix
+from netbox_security.models import (
+    Address,
+    AddressList,
+    AddressSet,
+    SecurityZone,
+    SecurityZonePolicy,
+)
+from netbox_security.utilities import (
+    get_address_set_hierarchies,
+    get_address_set_hierarchy,
+)
+
+SIZES = (1, 10, 50)
+DEPTHS = (1, 5, 20)
+
+
+class AddressSetHierarchyQueryCountTestCase(TestCase):
+    """
+    Seeds one hierarchy of the same shape per size and checks that resolving it
+    runs the same number of queries whatever the number of sets, lists and policies.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        prefix_ct = ContentType.objects.get_for_model(Prefix)
+        address_ct = ContentType.objects.get_for_model(Address)
+        address_set_ct = ContentType.objects.get_for_model(AddressSet)
+        source_zone = SecurityZone.objects.create(name="query-source-zone")
+        destination_zone = SecurityZone.objects.create(name="query-destination-zone")
+
+        cls.prefixes = {}
+        for index, size in enumerate(SIZES):
+            prefix = Prefix.objects.create(prefix=IPNetwork(f"10.60.{index}.0/24"))
+            cls.prefixes[size] = prefix
+            address = Address.objects.create(
+                name=f"query-address-{size}",
+                assigned_object_type=prefix_ct,
+                assigned_object_id=prefix.pk,
+            )
+
+            leaf_sets = AddressSet.objects.bulk_create(
+                AddressSet(name=f"query-leaf-{size}-{number}") for number in range(size)
+            )
+            parent_sets = AddressSet.objects.bulk_create(
+                AddressSet(name=f"query-parent-{size}-{number}")
+                for number in range(size)
+            )
+            for leaf_set in leaf_sets:
+                leaf_set.addresses.add(address)
+            for parent_set in parent_sets:
+                parent_set.address_sets.add(*leaf_sets)
+
+            address_lists = AddressList.objects.bulk_create(
+                AddressList(
+                    name=f"query-list-{size}-{number}",
+                    assigned_object_type=address_set_ct,
+                    assigned_object_id=address_set.pk,
+                )
+                for number, address_set in enumerate(parent_sets)
+            )
+            address_lists.append(
+                AddressList.objects.create(
+                    name=f"query-address-list-{size}",
+                    assigned_object_type=address_ct,
+                    assigned_object_id=address.pk,
+                )
+            )
+
+            for number in range(size):
+                policy = SecurityZonePolicy.objects.create(
+                    name=f"query-policy-{size}-{number}",
+                    index=number,
+                    source_zone=source_zone,
+                    destination_zone=destination_zone,
+                    policy_actions=["permit"],
+                )
+                policy.source_address.add(address_lists[number])
+                policy.destination_address.add(address_lists[-1])
+
+    def _resolve(self, size, **kwargs):
+        return get_address_set_hierarchy(
+            app_label="ipam",
+            model="prefix",
+            object_id=self.prefixes[size].pk,
+            **kwargs,
+        )
+
+    @staticmethod
+    def _touch(result):
+        # Everything a template renders from the result, including related objects.
+        for address in result["address_objects"]:
+            str(address)
+        for row in result["address_set_hierarchy_rows"]:
+            str(row["address"])
+            [str(address_set) for address_set in row["path"]]
+        for address_list in result["address_list_objects"]:
+            str(address_list)
+        for path in result["policy_paths"]:
+            str(path["context_object"])
+            str(path["address_list"].assigned_object)
+            path["source_zone"].name
+            path["destination_zone"].name
+
+    def _get_baseline(self, **kwargs):
+        # Warm the ContentType cache so it does not skew the measurement
+        self._resolve(SIZES[0], **kwargs)
+        with CaptureQueriesContext(connection) as baseline:
+            self._touch(self._resolve(SIZES[0], **kwargs))
+        return len(baseline)
+
+    def test_hierarchy_sizes(self):
+        for size in SIZES:
+            result = self._resolve(size)
+            self.assertEqual(len(result["all_address_set_ids"]), size * 2)
+            self.assertEqual(len(result["address_list_ids"]), size + 1)
+            self.assertEqual(len(result["policy_paths"]), size * 2)
+            self.assertEqual(result["address_set_path_page"]["path_count"], size * size)
+
+    def test_query_count_with_closure(self):
+        baseline = self._get_baseline(use_closure=True)
+        for size in SIZES:
+            with self.subTest(size=size), self.assertNumQueries(baseline):
+                self._touch(self._resolve(size, use_closure=True, path_limit=1000))
+
+    def test_query_count_with_default_settings(self):
+        baseline = self._get_baseline()
+        for size in SIZES:
+            with self.subTest(size=size), self.assertNumQueries(baseline):
+                self._touch(self._resolve(size))
+
+    def test_query_count_of_batch(self):
+        object_ids = [prefix.pk for prefix in self.prefixes.values()]
+        get_address_set_hierarchies("ipam", "prefix", object_ids[:1])
+        with CaptureQueriesContext(connection) as baseline:
+            for result in get_address_set_hierarchies(
+                "ipam", "prefix", object_ids[:1]
+            ).values():
+                self._touch(result)
+
+        with self.assertNumQueries(len(baseline)):
+            results = get_address_set_hierarchies("ipam", "prefix", object_ids)
+            for result in results.values():
+                self._touch(result)
+
+
+class AddressSetHierarchyDepthQueryCountTestCase(TestCase):
+    """
+    Seeds one chain of nested sets per depth and checks that resolving it with
+    the closure table runs the same number of queries however deep the chain is.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        prefix_ct = ContentType.objects.get_for_model(Prefix)
+        address_set_ct = ContentType.objects.get_for_model(AddressSet)
+        zone = SecurityZone.objects.create(name="depth-zone")
+
+        cls.prefixes = {}
+        for index, depth in enumerate(DEPTHS):
+            prefix = Prefix.objects.create(prefix=IPNetwork(f"10.61.{index}.0/24"))
+            cls.prefixes[depth] = prefix
+            address = Address.objects.create(
+                name=f"depth-address-{depth}",
+                assigned_object_type=prefix_ct,
+                assigned_object_id=prefix.pk,
+            )
+
+            address_set = AddressSet.objects.create(name=f"depth-{depth}-0")
+            address_set.addresses.add(address)
+            for level in range(1, depth):
+                parent_set = AddressSet.objects.create(name=f"depth-{depth}-{level}")
+                parent_set.address_sets.add(address_set)
+                address_set = parent_set
+
+            address_list = AddressList.objects.create(
+                name=f"depth-list-{depth}",
+                assigned_object_type=address_set_ct,
+                assigned_object_id=address_set.pk,
+            )
+            policy = SecurityZonePolicy.objects.create(
+                name=f"depth-policy-{depth}",
+                index=index,
+                source_zone=zone,
+                destination_zone=zone,
+                policy_actions=["permit"],
+            )
+            policy.source_address.add(address_list)
+
+    def _resolve(self, depth):
+        result = get_address_set_hierarchy(
+            app_label="ipam",
+            model="prefix",
+            object_id=self.prefixes[depth].pk,
+            use_closure=True,
+        )
+        AddressSetHierarchyQueryCountTestCase._touch(result)
+        return result
+
+    def test_hierarchy_depths(self):
+        for depth in DEPTHS:
+            result = self._resolve(depth)
+            self.assertEqual(len(result["all_address_set_ids"]), depth)
+            self.assertEqual(len(result["address_set_paths"][0]), depth)
+            self.assertEqual(len(result["policy_paths"]), 1)
+
+    def test_query_count_with_closure(self):
+        # Warm the ContentType cache so it does not skew the measurement
+        self._resolve(DEPTHS[0])
+        with CaptureQueriesContext(connection) as baseline:
+            self._resolve(DEPTHS[0])
+
+        for depth in DEPTHS:
+            with self.subTest(depth=depth), self.assertNumQueries(len(baseline)):
+                self._resolve(depth)
@@ -0,0 +1,225 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase, override_settings
+from netaddr import IPNetwork
+
+from core.models import ObjectType
+from dcim.models import Device, DeviceRole, DeviceType, Manufacturer, Site
+from ipam.models import Prefix
+from netbox_security.models import (
+    Address,
+    AddressList,
+    AddressSet,
+    AddressSetAssignment,
+    SecurityZone,
+    SecurityZoneAssignment,
+    SecurityZonePolicy,
+)
+from netbox_security.utilities import get_address_set_impact
+from users.models import ObjectPermission
+
+
+class AddressSetImpactTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        prefix_ct = ContentType.objects.get_for_model(Prefix)
+        device_ct = ContentType.objects.get_by_natural_key("dcim", "device")
+
+        cls.parent_prefix = Prefix.objects.create(prefix=IPNetwork("10.70.0.0/16"))
+        cls.child_prefix = Prefix.objects.create(prefix=IPNetwork("10.70.1.0/24"))
+        cls.other_prefix = Prefix.objects.create(prefix=IPNetwork("10.71.0.0/24"))
+        cls.address = Address.objects.create(
+            name="impact-address",
+            assigned_object_type=prefix_ct,
+            assigned_object_id=cls.parent_prefix.pk,
+        )
+        cls.nested_address = Address.objects.create(
+            name="impact-nested-address",
+            assigned_object_type=prefix_ct,
+            assigned_object_id=cls.other_prefix.pk,
+        )
+
+        cls.root_set = AddressSet.objects.create(name="impact-root-set")
+        cls.shared_set = AddressSet.objects.create(name="impact-shared-set")
+        cls.child_set = AddressSet.objects.create(name="impact-child-set")
+        cls.unrelated_set = AddressSet.objects.create(name="impact-unrelated-set")
+        cls.root_set.address_sets.add(cls.shared_set)
+        cls.shared_set.address_sets.add(cls.child_set)
+        cls.shared_set.addresses.add(cls.address)
+        cls.child_set.addresses.add(cls.nested_address)
+
+        address_set_ct = ContentType.objects.get_for_model(AddressSet)
+        cls.root_list = AddressList.objects.create(
+            name="impact-root-list",
+            assigned_object_type=address_set_ct,
+            assigned_object_id=cls.root_set.pk,
+        )
+        cls.child_list = AddressList.objects.create(
+            name="impact-child-list",
+            assigned_object_type=address_set_ct,
+            assigned_object_id=cls.child_set.pk,
+        )
+
+        cls.source_zone = SecurityZone.objects.create(name="impact-source-zone")
+        cls.destination_zone = SecurityZone.objects.create(
+            name="impact-destination-zone"
+        )
+        cls.policy = SecurityZonePolicy.objects.create(
+            name="impact-policy",
+            index=10,
+            source_zone=cls.source_zone,
+            destination_zone=cls.destination_zone,
+            policy_actions=["permit"],
+        )
+        cls.policy.destination_address.add(cls.root_list)
+        cls.child_policy = SecurityZonePolicy.objects.create(
+            name="impact-child-policy",
+            index=20,
+            source_zone=cls.source_zone,
+            destination_zone=cls.destination_zone,
+            policy_actions=["permit"],
+        )
+        cls.child_policy.source_address.add(cls.child_list)
+
+        site = Site.objects.create(name="impact-site", slug="impact-site")
+        device_type = DeviceType.objects.create(
+            model="impact-type",
+            slug="impact-type",
+            manufacturer=Manufacturer.objects.create(
+                name="impact-manufacturer", slug="impact-manufacturer"
+            ),
+        )
+        role = DeviceRole.objects.create(name="impact-role", slug="impact-role")
+        cls.zone_device, cls.set_device = (
+            Device.objects.create(
+                name=name,
+                status="active",
+                site=site,
+                role=role,
+                device_type=device_type,
+            )
+            for name in ("impact-zone-device", "impact-set-device")
+        )
+        SecurityZoneAssignment.objects.create(
+            zone=cls.destination_zone,
+            assigned_object_type=device_ct,
+            assigned_object_id=cls.zone_device.pk,
+        )
+        AddressSetAssignment.objects.create(
+            address_set=cls.root_set,
+            assigned_object_type=device_ct,
+            assigned_object_id=cls.set_device.pk,
+        )
+
+    def test_impact_of_shared_set(self):
+        for use_closure in (True, False):
+            with self.subTest(use_closure=use_closure):
+                impact = get_address_set_impact(
+                    self.shared_set.pk, use_closure=use_closure
+                )
+
+                self.assertEqual(impact["ancestor_address_set_ids"], [self.root_set.pk])
+                self.assertEqual(
+                    impact["descendant_address_set_ids"], [self.child_set.pk]
+                )
+                self.assertEqual(
+                    impact["address_ids"],
+                    sorted([self.address.pk, self.nested_address.pk]),
+                )
+                self.assertEqual(
+                    impact["assigned_object_ids"],
+                    {
+                        "ipam.prefix": sorted(
+                            [self.parent_prefix.pk, self.other_prefix.pk]
+                        )
+                    },
+                )
+                self.assertEqual(
+                    impact["inherited_object_ids"],
+                    {"ipam.prefix": [self.child_prefix.pk]},
+                )
+                self.assertTrue(impact["inherited_object_ids_complete"])
+                # Lists on nested sets do not change with the shared set.
+                self.assertEqual(impact["address_list_ids"], [self.root_list.pk])
+                self.assertEqual(impact["policy_ids"], [self.policy.pk])
+                self.assertEqual(
+                    impact["policy_links"],
+                    [
+                        {
+                            "policy_id": self.policy.pk,
+                            "address_list_id": self.root_list.pk,
+                            "direction": "destination",
+                        }
+                    ],
+                )
+                self.assertEqual(
+                    impact["security_zone_ids"],
+                    sorted([self.source_zone.pk, self.destination_zone.pk]),
+                )
+                self.assertEqual(
+                    impact["device_ids"],
+                    sorted([self.zone_device.pk, self.set_device.pk]),
+                )
+                self.assertEqual(impact["virtual_machine_ids"], [])
+
+    def test_inherited_objects_are_capped(self):
+        plugins_config = {
+            **settings.PLUGINS_CONFIG,
+            "netbox_security": {
+                **settings.PLUGINS_CONFIG["netbox_security"],
+                "address_set_impact_object_limit": 1,
+            },
+        }
+        with override_settings(PLUGINS_CONFIG=plugins_config):
+            impact = get_address_set_impact(self.shared_set.pk)
+
+        # Only the parent prefix, the first candidate, is checked.
+        self.assertEqual(impact["inherited_object_ids"], {})
+        self.assertFalse(impact["inherited_object_ids_complete"])
+
+    def test_impact_of_unreferenced_set(self):
+        impact = get_address_set_impact(self.unrelated_set.pk)
+
+        self.assertEqual(impact["address_ids"], [])
+        self.assertEqual(impact["assigned_object_ids"], {})
+        self.assertEqual(impact["policy_links"], [])
+        self.assertEqual(impact["device_ids"], [])
+
+    def test_impact_is_restricted(self):
+        user = get_user_model().objects.create_user(username="impact-user")
+        for model, constraints in (
+            (AddressSet, {"name__in": ["impact-shared-set", "impact-root-set"]}),
+            (Address, {"name": "impact-address"}),
+            (Prefix, {"prefix": "10.70.0.0/16"}),
+            (AddressList, {"name": "impact-child-list"}),
+            (SecurityZonePolicy, None),
+            (SecurityZone, {"name": "impact-source-zone"}),
+            (Device, {"name": "impact-set-device"}),
+        ):
+            permission = ObjectPermission.objects.create(
+                name=f"impact-{model._meta.model_name}",
+                actions=["view"],
+                constraints=constraints,
+            )
+            permission.object_types.add(ObjectType.objects.get_for_model(model))
+            permission.users.add(user)
+
+        impact = get_address_set_impact(self.shared_set.pk, user=user)
+
+        self.assertEqual(impact["ancestor_address_set_ids"], [self.root_set.pk])
+        self.assertEqual(impact["descendant_address_set_ids"], [])
+        self.assertEqual(impact["address_ids"], [self.address.pk])
+        self.assertEqual(
+            impact["assigned_object_ids"], {"ipam.prefix": [self.parent_prefix.pk]}
+        )
+        self.assertEqual(impact["inherited_object_ids"], {})
+        # The root list is hidden, and so are the policy and link through it.
+        self.assertEqual(impact["address_list_ids"], [])
+        self.assertEqual(impact["policy_ids"], [self.policy.pk])
+        self.assertEqual(impact["policy_links"], [])
+        self.assertEqual(impact["security_zone_ids"], [self.source_zone.pk])
+        self.assertEqual(impact["device_ids"], [self.set_device.pk])
+
+    def test_impact_of_missing_set(self):
+        self.assertIsNone(get_address_set_impact(0))
@@ -0,0 +1,161 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Model
+from django.test import TestCase
+from netaddr import IPNetwork
+
+from ipam.models import Prefix
+from netbox_security.models import (
+    Address,
+    AddressList,
+    AddressSet,
+    SecurityZone,
+    SecurityZonePolicy,
+)
+from netbox_security.utilities.address_set_hierarchy import (
+    dehydrate_address_set_hierarchy,
+)
+from netbox_security.utilities import (
+    clear_policy_context_cache,
+    get_cached_address_set_hierarchy,
+    get_policy_context_cache_stats,
+)
+
+
+class PolicyContextCacheTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        prefix_ct = ContentType.objects.get_for_model(Prefix)
+        cls.parent_prefix = Prefix.objects.create(prefix=IPNetwork("10.70.0.0/16"))
+        cls.prefix = Prefix.objects.create(prefix=IPNetwork("10.70.1.0/24"))
+        cls.other_prefix = Prefix.objects.create(prefix=IPNetwork("172.16.0.0/24"))
+        cls.parent_address = Address.objects.create(
+            name="cache-parent-address",
+            assigned_object_type=prefix_ct,
+            assigned_object_id=cls.parent_prefix.pk,
+        )
+        cls.other_address = Address.objects.create(
+            name="cache-other-address",
+            assigned_object_type=prefix_ct,
+            assigned_object_id=cls.other_prefix.pk,
+        )
+        cls.address_set = AddressSet.objects.create(name="cache-set")
+
+    def setUp(self):
+        clear_policy_context_cache()
+
+    def get_context(self, prefix):
+        return get_cached_address_set_hierarchy(
+            app_label="ipam", model="prefix", object_id=prefix.pk
+        )
+
+    def test_second_lookup_is_a_hit(self):
+        first = self.get_context(self.prefix)
+        second = self.get_context(self.prefix)
+
+        self.assertEqual(first["inherited_address_ids"], [self.parent_address.pk])
+        self.assertEqual(second["inherited_address_ids"], [self.parent_address.pk])
+        stats = get_policy_context_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_hit_rehydrates_objects(self):
+        self.address_set.addresses.add(self.parent_address)
+        first = self.get_context(self.prefix)
+        second = self.get_context(self.prefix)
+
+        self.assertEqual(second["inherited_address_objects"], [self.parent_address])
+        self.assertEqual(
+            [
+                (row["path"], row["address"])
+                for row in second["address_set_hierarchy_rows"]
+            ],
+            [
+                (row["path"], row["address"])
+                for row in first["address_set_hierarchy_rows"]
+            ],
+        )
+
+    def test_cached_entry_holds_no_model_instances(self):
+        self.address_set.addresses.add(self.parent_address)
+
+        def iter_values(value):
+            if isinstance(value, dict):
+                value = value.values()
+            if isinstance(value, (list, tuple, type({}.values()))):
+                for item in value:
+                    yield from iter_values(item)
+            else:
+                yield value
+
+        entry = dehydrate_address_set_hierarchy(self.get_context(self.prefix))
+        self.assertFalse(any(isinstance(value, Model) for value in iter_values(entry)))
+
+    def test_membership_change_invalidates_inheriting_objects(self):
+        self.get_context(self.prefix)
+        self.get_context(self.other_prefix)
+
+        self.address_set.addresses.add(self.parent_address)
+
+        self.assertEqual(
+            self.get_context(self.prefix)["all_address_set_ids"],
+            [self.address_set.pk],
+        )
+        # The other prefix lies outside the changed Address's span
+        self.get_context(self.other_prefix)
+        stats = get_policy_context_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 3))
+
+    def test_nesting_change_invalidates_nested_contexts(self):
+        self.address_set.addresses.add(self.parent_address)
+        self.get_context(self.prefix)
+        self.get_context(self.other_prefix)
+
+        parent_set = AddressSet.objects.create(name="cache-parent-set")
+        parent_set.address_sets.add(self.address_set)
+
+        self.assertEqual(
+            self.get_context(self.prefix)["all_address_set_ids"],
+            sorted([self.address_set.pk, parent_set.pk]),
+        )
+        self.get_context(self.other_prefix)
+        stats = get_policy_context_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 3))
+
+    def test_policy_change_invalidates_only_its_addresses(self):
+        self.address_set.addresses.add(self.parent_address)
+        address_list = AddressList.objects.create(
+            name="cache-list",
+            assigned_object_type=ContentType.objects.get_for_model(AddressSet),
+            assigned_object_id=self.address_set.pk,
+        )
+        policy = SecurityZonePolicy.objects.create(
+            name="cache-policy",
+            index=10,
+            source_zone=SecurityZone.objects.create(name="cache-source-zone"),
+            destination_zone=SecurityZone.objects.create(name="cache-destination-zone"),
+            policy_actions=["permit"],
+        )
+        self.get_context(self.prefix)
+        self.get_context(self.other_prefix)
+
+        policy.source_address.add(address_list)
+        policy.index = 20
+        policy.save()
+
+        self.assertEqual(
+            [
+                path["policy_id"]
+                for path in self.get_context(self.prefix)["policy_paths"]
+            ],
+            [policy.pk],
+        )
+        # The other prefix has no Address behind the policy's lists.
+        self.get_context(self.other_prefix)
+        stats = get_policy_context_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 3))
+
+    def test_address_delete_invalidates_context(self):
+        self.get_context(self.prefix)
+
+        self.parent_address.delete()
+
+        self.assertEqual(self.get_context(self.prefix)["inherited_address_ids"], [])
@@ -0,0 +1,56 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from extras.models import Tag
+from netbox_security.models import Address, AddressSet, SecurityZonePolicy
+from netbox_security.utilities.benchmark import run_security_benchmarks
+
+VOLUMES = {
+    "prefixes": 2,
+    "custom_prefixes": 2,
+    "addresses": 10,
+    "address_sets": 6,
+    "nesting_depth": 3,
+    "address_lists": 4,
+    "zones": 2,
+    "policies": 5,
+    "nat_rule_sets": 1,
+    "nat_rules": 3,
+    "firewall_filter_rules": 3,
+}
+
+
+class SecurityDatasetTestCase(TestCase):
+    """Generates, benchmarks and deletes a small dataset."""
+
+    def test_generate_benchmark_and_delete(self):
+        # Shares the name prefix of the dataset but was not generated.
+        kept_set = AddressSet.objects.create(name="smoke-address-set-kept")
+
+        call_command(
+            "generate_security_dataset", tag="smoke", stdout=StringIO(), **VOLUMES
+        )
+        tag = Tag.objects.get(slug="smoke-dataset")
+        self.assertEqual(Address.objects.filter(tags=tag).count(), 10)
+        self.assertEqual(AddressSet.objects.filter(tags=tag).count(), 6)
+        self.assertEqual(SecurityZonePolicy.objects.filter(tags=tag).count(), 5)
+
+        user = get_user_model().objects.create_superuser(username="smoke")
+        results = run_security_benchmarks(
+            user, groups=("hierarchy", "lists", "api"), sample_size=1, iterations=1
+        )
+        self.assertTrue(results["results"])
+        for result in results["results"].values():
+            self.assertEqual(result["iterations"], 1)
+
+        call_command(
+            "generate_security_dataset", tag="smoke", delete=True, stdout=StringIO()
+        )
+        self.assertFalse(Address.objects.filter(name__startswith="smoke-").exists())
+        self.assertEqual(
+            list(AddressSet.objects.filter(name__startswith="smoke-")), [kept_set]
+        )
+        self.assertFalse(Tag.objects.filter(slug="smoke-dataset").exists())
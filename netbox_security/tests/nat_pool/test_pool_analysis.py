@@ -0,0 +1,210 @@
+from netaddr import IPNetwork
+from django.test import override_settings
+from django.urls import reverse
+
+from ipam.choices import IPAddressStatusChoices
+from core.models import ObjectType
+from ipam.models import IPAddress, IPRange, Prefix
+from netbox_security.choices import NatTypeChoices, RuleDirectionChoices
+from netbox_security.models import NatPool, NatPoolMember, NatRule, NatRuleSet
+from netbox_security.utilities import get_nat_pool_analysis
+from users.models import ObjectPermission
+from utilities.testing import TestCase
+
+
+class NatPoolAnalysisTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.shared = NatPool.objects.create(name="analysis-shared")
+        cls.low = NatPoolMember.objects.create(
+            name="analysis-low",
+            pool=cls.shared,
+            prefix=Prefix.objects.create(prefix=IPNetwork("10.70.0.0/29")),
+            source_ports=[1000, 1001],
+        )
+        cls.high = NatPoolMember.objects.create(
+            name="analysis-high",
+            pool=cls.shared,
+            address_range=IPRange.objects.create(
+                start_address=IPNetwork("10.70.0.4/24"),
+                end_address=IPNetwork("10.70.0.9/24"),
+            ),
+        )
+        cls.single = NatPool.objects.create(name="analysis-single")
+        cls.address = NatPoolMember.objects.create(
+            name="analysis-address",
+            pool=cls.single,
+            address=IPAddress.objects.create(address=IPNetwork("10.70.0.6/24")),
+        )
+        cls.deprecated = NatPool.objects.create(
+            name="analysis-deprecated",
+            status=IPAddressStatusChoices.STATUS_DEPRECATED,
+        )
+        NatPoolMember.objects.create(
+            name="analysis-deprecated",
+            pool=cls.deprecated,
+            address=IPAddress.objects.create(address=IPNetwork("192.0.2.10/24")),
+        )
+        cls.empty = NatPool.objects.create(name="analysis-empty")
+
+        source = NatRuleSet.objects.create(
+            name="analysis-source",
+            nat_type=NatTypeChoices.TYPE_SOURCE,
+            direction=RuleDirectionChoices.DIRECTION_OUTBOUND,
+        )
+        cls.outbound = NatRule.objects.create(
+            name="outbound", rule_set=source, pool=cls.shared
+        )
+        cls.outbound.source_prefixes.add(
+            Prefix.objects.create(prefix=IPNetwork("10.80.0.0/24"))
+        )
+        cls.retired = NatRule.objects.create(
+            name="retired", rule_set=source, pool=cls.deprecated
+        )
+        cls.unassigned = NatRule.objects.create(
+            name="unassigned", rule_set=source, source_pool=cls.empty
+        )
+        static = NatRuleSet.objects.create(
+            name="analysis-static",
+            nat_type=NatTypeChoices.TYPE_STATIC,
+            direction=RuleDirectionChoices.DIRECTION_INBOUND,
+        )
+        servers = NatRule.objects.create(
+            name="servers", rule_set=static, destination_pool=cls.single
+        )
+        servers.destination_prefixes.add(
+            Prefix.objects.create(prefix=IPNetwork("203.0.113.0/30"))
+        )
+
+    def test_analysis(self):
+        analysis = get_nat_pool_analysis()
+        self.assertEqual(
+            analysis["counts"],
+            {
+                "within_pool": 1,
+                "between_pools": 2,
+                "empty": 1,
+                "inactive": 1,
+                "exhausted": 1,
+            },
+        )
+        self.assertEqual(
+            {
+                (
+                    overlap["type"],
+                    overlap["member"]["id"],
+                    overlap["other_member"]["id"],
+                    overlap["start"],
+                    overlap["end"],
+                )
+                for overlap in analysis["overlaps"]
+            },
+            {
+                ("within_pool", self.low.pk, self.high.pk, "10.70.0.4", "10.70.0.7"),
+                (
+                    "between_pools",
+                    self.low.pk,
+                    self.address.pk,
+                    "10.70.0.6",
+                    "10.70.0.6",
+                ),
+                (
+                    "between_pools",
+                    self.high.pk,
+                    self.address.pk,
+                    "10.70.0.6",
+                    "10.70.0.6",
+                ),
+            },
+        )
+
+        pools = {pool["id"]: pool for pool in analysis["pools"]}
+        shared = pools[self.shared.pk]
+        self.assertEqual(shared["address_count"], 10)
+        self.assertEqual(shared["port_capacity"], 8 * 2 + 6 * 64512)
+        self.assertEqual(
+            (shared["rule_count"], shared["translated_address_count"]), (1, 256)
+        )
+        self.assertFalse(shared["exhausted"])
+        # Static NAT maps the four destination addresses onto a single address.
+        single = pools[self.single.pk]
+        self.assertEqual(single["translated_address_count"], 4)
+        self.assertTrue(single["exhausted"])
+        self.assertEqual(pools[self.empty.pk]["address_count"], 0)
+
+        self.assertEqual(
+            [
+                (rule["reason"], rule["rule"]["id"], rule["field"])
+                for rule in analysis["rules"]
+            ],
+            [
+                ("inactive", self.retired.pk, "pool"),
+                ("empty", self.unassigned.pk, "source_pool"),
+            ],
+        )
+
+    def test_analysis_is_recomputed(self):
+        get_nat_pool_analysis()
+        self.address.status = IPAddressStatusChoices.STATUS_DEPRECATED
+        self.address.save()
+        analysis = get_nat_pool_analysis()
+        self.assertEqual(analysis["counts"]["between_pools"], 0)
+        self.assertEqual(analysis["counts"]["empty"], 2)
+
+    def test_filtered_analysis(self):
+        analysis = get_nat_pool_analysis(
+            NatPool.objects.filter(pk__in=[self.single.pk, self.empty.pk])
+        )
+        self.assertEqual(analysis["pool_count"], 2)
+        self.assertEqual(analysis["overlaps"], [])
+        self.assertEqual(len(analysis["rules"]), 1)
+
+    def test_analysis_is_restricted(self):
+        # The unrestricted analysis is cached and must not be served here.
+        get_nat_pool_analysis()
+        for model, constraints in (
+            (NatPool, None),
+            (NatPoolMember, {"name": "analysis-low"}),
+            (NatRule, {"name": "servers"}),
+            (NatRuleSet, None),
+        ):
+            permission = ObjectPermission.objects.create(
+                name=f"analysis-{model._meta.model_name}",
+                actions=["view"],
+                constraints=constraints,
+            )
+            permission.object_types.add(ObjectType.objects.get_for_model(model))
+            permission.users.add(self.user)
+
+        analysis = get_nat_pool_analysis(
+            NatPool.objects.restrict(self.user, "view"), user=self.user
+        )
+        self.assertEqual(analysis["member_count"], 1)
+        self.assertEqual(analysis["overlaps"], [])
+        self.assertEqual(
+            [
+                (rule["reason"], rule["rule"]["name"], rule["field"])
+                for rule in analysis["rules"]
+            ],
+            [("empty", "servers", "destination_pool")],
+        )
+        pools = {pool["id"]: pool for pool in analysis["pools"]}
+        self.assertEqual(pools[self.shared.pk]["rule_count"], 0)
+
+        response = self.client.get(reverse("plugins:netbox_security:natpool_analysis"))
+        self.assertHttpStatus(response, 200)
+        self.assertNotContains(response, "analysis-high")
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_analysis_api_and_view(self):
+        response = self.client.get(
+            reverse("plugins-api:netbox_security-api:natpool-analysis"),
+            {"name": ["analysis-shared", "analysis-single"]},
+        )
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.data["pool_count"], 2)
+        self.assertEqual(response.data["counts"]["between_pools"], 2)
+
+        response = self.client.get(reverse("plugins:netbox_security:natpool_analysis"))
+        self.assertHttpStatus(response, 200)
+        self.assertContains(response, "analysis-shared")
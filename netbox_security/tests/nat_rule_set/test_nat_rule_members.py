@@ -0,0 +1,68 @@
+from django.test import override_settings
+from django.urls import reverse
+from netaddr import IPNetwork
+
+from ipam.models import Prefix
+from netbox_security.models import NatRule
+from utilities.testing import TestCase
+
+
+class NatRuleMembersViewTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.rule = NatRule.objects.create(name="members-rule")
+        cls.prefixes = Prefix.objects.bulk_create(
+            Prefix(prefix=IPNetwork(f"10.120.{index}.0/24")) for index in range(30)
+        )
+        cls.rule.source_prefixes.set(cls.prefixes)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_rule_view_does_not_render_members(self):
+        response = self.client.get(self.rule.get_absolute_url())
+        self.assertHttpStatus(response, 200)
+        content = response.content.decode()
+        self.assertNotIn("10.120.0.0/24", content)
+        self.assertIn(
+            reverse(
+                "plugins:netbox_security:natrule_source_prefixes",
+                kwargs={"pk": self.rule.pk},
+            ),
+            content,
+        )
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_members_are_paginated(self):
+        url = reverse(
+            "plugins:netbox_security:natrule_source_prefixes",
+            kwargs={"pk": self.rule.pk},
+        )
+        response = self.client.get(url, {"per_page": 10}, HTTP_HX_REQUEST="true")
+        self.assertHttpStatus(response, 200)
+        content = response.content.decode()
+        self.assertIn("10.120.0.0/24", content)
+        self.assertNotIn("10.120.10.0/24", content)
+
+        response = self.client.get(
+            url, {"per_page": 10, "page": 2}, HTTP_HX_REQUEST="true"
+        )
+        self.assertIn("10.120.10.0/24", response.content.decode())
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_member_sections(self):
+        for section in (
+            "source_addresses",
+            "destination_addresses",
+            "destination_prefixes",
+            "source_ranges",
+            "destination_ranges",
+            "interfaces",
+        ):
+            with self.subTest(section=section):
+                response = self.client.get(
+                    reverse(
+                        f"plugins:netbox_security:natrule_{section}",
+                        kwargs={"pk": self.rule.pk},
+                    ),
+                    HTTP_HX_REQUEST="true",
+                )
+                self.assertHttpStatus(response, 200)
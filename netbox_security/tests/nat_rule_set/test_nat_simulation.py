@@ -0,0 +1,189 @@
+from netaddr import IPNetwork
+from django.test import override_settings
+from django.urls import reverse
+
+from ipam.models import IPRange, Prefix
+from netbox_security.choices import (
+    CustomInterfaceChoices,
+    NatTypeChoices,
+    RuleDirectionChoices,
+    RuleStatusChoices,
+)
+from netbox_security.models import (
+    NatPool,
+    NatPoolMember,
+    NatRule,
+    NatRuleSet,
+    SecurityZone,
+)
+from netbox_security.utilities import compile_nat_engine, get_nat_engine
+from utilities.testing import TestCase
+
+
+class NatSimulationTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.untrust = SecurityZone.objects.create(name="simulation-untrust")
+
+        def create_pool(name, prefix, **kwargs):
+            pool = NatPool.objects.create(name=f"simulation-{name}")
+            NatPoolMember.objects.create(
+                name=f"simulation-{name}",
+                pool=pool,
+                prefix=Prefix.objects.create(prefix=IPNetwork(prefix)),
+                **kwargs,
+            )
+            return pool
+
+        servers = create_pool("servers", "10.50.0.0/28")
+        ssh = create_pool("ssh", "10.60.0.5/32", destination_ports=[22])
+        public = create_pool("public", "192.0.2.1/32")
+
+        static = NatRuleSet.objects.create(
+            name="simulation-a-static",
+            nat_type=NatTypeChoices.TYPE_STATIC,
+            direction=RuleDirectionChoices.DIRECTION_INBOUND,
+        )
+        destination = NatRuleSet.objects.create(
+            name="simulation-b-destination",
+            nat_type=NatTypeChoices.TYPE_DESTINATION,
+            direction=RuleDirectionChoices.DIRECTION_INBOUND,
+        )
+        destination.source_zones.add(cls.untrust)
+        source = NatRuleSet.objects.create(
+            name="simulation-c-source",
+            nat_type=NatTypeChoices.TYPE_SOURCE,
+            direction=RuleDirectionChoices.DIRECTION_OUTBOUND,
+        )
+
+        cls.web = NatRule.objects.create(
+            name="web", rule_set=static, destination_pool=servers
+        )
+        cls.web.destination_prefixes.add(
+            Prefix.objects.create(prefix=IPNetwork("203.0.113.0/28"))
+        )
+        cls.ssh = NatRule.objects.create(
+            name="ssh",
+            rule_set=destination,
+            destination_pool=ssh,
+            destination_ports=[2222],
+        )
+        cls.ssh.destination_ranges.add(
+            IPRange.objects.create(
+                start_address=IPNetwork("198.51.100.1/24"),
+                end_address=IPNetwork("198.51.100.3/24"),
+            )
+        )
+        clients = Prefix.objects.create(prefix=IPNetwork("10.0.0.0/8"))
+        cls.no_nat = NatRule.objects.create(
+            name="a-no-nat",
+            rule_set=source,
+            custom_interface=CustomInterfaceChoices.NAT_OFF,
+        )
+        cls.no_nat.source_prefixes.add(
+            Prefix.objects.create(prefix=IPNetwork("10.0.9.0/24"))
+        )
+        cls.outbound = NatRule.objects.create(
+            name="b-outbound", rule_set=source, pool=public
+        )
+        cls.outbound.source_prefixes.add(clients)
+        cls.reserved = NatRule.objects.create(
+            name="0-reserved",
+            rule_set=source,
+            pool=servers,
+            status=RuleStatusChoices.STATUS_RESERVED,
+        )
+
+    def test_simulate(self):
+        engine = compile_nat_engine()
+        self.assertEqual(engine.rule_count, 4)
+
+        # Static NAT keeps the offset of the address within the matched prefix.
+        result = engine.simulate("192.0.2.50", "203.0.113.7", 1000, 443)
+        self.assertEqual(result["destination"], "10.50.0.7")
+        self.assertEqual(result["destination_port"], 443)
+        (translation,) = result["translations"]
+        self.assertEqual(translation["rule"]["id"], self.web.pk)
+        self.assertTrue(translation["translated"])
+
+        # Destination NAT needs the flow to come from the untrust zone.
+        result = engine.simulate(
+            "192.0.2.50", "198.51.100.2", 1000, 2222, source_zone_id=self.untrust.pk
+        )
+        self.assertEqual(
+            (result["destination"], result["destination_port"]), ("10.60.0.5", 22)
+        )
+        result = engine.simulate("192.0.2.50", "198.51.100.2", 1000, 2222)
+        self.assertEqual(result["destination"], "198.51.100.2")
+        self.assertEqual(result["translations"], [])
+
+        # Source NAT, skipping the reserved rule.
+        result = engine.simulate("10.1.2.3", "8.8.8.8", 1000, 53)
+        self.assertEqual(result["source"], "192.0.2.1")
+        self.assertEqual(result["translations"][0]["rule"]["id"], self.outbound.pk)
+
+        result = engine.simulate("10.0.9.3", "8.8.8.8", 1000, 53)
+        self.assertEqual(result["source"], "10.0.9.3")
+        self.assertEqual(result["translations"][0]["rule"]["id"], self.no_nat.pk)
+        self.assertFalse(result["translations"][0]["translated"])
+
+        result = engine.simulate(
+            "10.1.2.3", "8.8.8.8", direction=RuleDirectionChoices.DIRECTION_INBOUND
+        )
+        self.assertEqual(result["translations"], [])
+
+    def test_engine_is_recompiled(self):
+        engine = get_nat_engine()
+        self.assertIs(get_nat_engine(), engine)
+        self.outbound.status = RuleStatusChoices.STATUS_DEPRECATED
+        self.outbound.save()
+        engine = get_nat_engine()
+        self.assertEqual(engine.rule_count, 3)
+        self.assertEqual(engine.simulate("10.1.2.3", "8.8.8.8")["source"], "10.1.2.3")
+
+    def test_engine_follows_ipam_spans(self):
+        engine = get_nat_engine()
+        clients = Prefix.objects.get(prefix="10.0.0.0/8")
+        clients.description = "unchanged span"
+        clients.save()
+        self.assertIs(get_nat_engine(), engine)
+
+        clients.prefix = IPNetwork("10.0.0.0/16")
+        clients.save()
+        engine = get_nat_engine()
+        self.assertEqual(engine.simulate("10.1.2.3", "8.8.8.8")["source"], "10.1.2.3")
+
+        IPRange.objects.get(start_address="198.51.100.1/24").delete()
+        self.assertIsNot(get_nat_engine(), engine)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_simulation_api(self):
+        url = reverse("plugins-api:netbox_security-api:nat_simulation")
+        flow = {
+            "source": "10.1.2.3",
+            "destination": "203.0.113.7",
+            "destination_port": 443,
+        }
+
+        response = self.client.get(url, flow)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.data["source"], "192.0.2.1")
+        self.assertEqual(response.data["destination"], "10.50.0.7")
+        self.assertEqual(
+            [translation["stage"] for translation in response.data["translations"]],
+            ["destination", "source"],
+        )
+
+        response = self.client.post(
+            url,
+            {"flows": [flow, {**flow, "source": "172.16.0.1"}]},
+            content_type="application/json",
+        )
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(
+            [result["source"] for result in response.data["results"]],
+            ["192.0.2.1", "172.16.0.1"],
+        )
+
+        response = self.client.get(url, {**flow, "direction": "sideways"})
+        self.assertHttpStatus(response, 400)
@@ -0,0 +1,65 @@
+from django.urls import reverse
+
+from netbox_security.models import SecurityZone
+from utilities.testing import APITestCase
+
+
+class CursorPaginationTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SecurityZone.objects.bulk_create(
+            SecurityZone(
+                name=f"cursor-zone-{index:02}",
+                description="even" if index % 2 == 0 else "odd",
+            )
+            for index in range(7)
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.add_permissions("netbox_security.view_securityzone")
+        self.url = reverse("plugins-api:netbox_security-api:securityzone-list")
+
+    def _get_all(self, params):
+        names = []
+        url = self.url
+        while url:
+            response = self.client.get(url, params, **self.header)
+            self.assertHttpStatus(response, 200)
+            self.assertNotIn("count", response.data)
+            names.extend(zone["name"] for zone in response.data["results"])
+            url, params = response.data["next"], None
+        return names
+
+    def test_cursor_pages(self):
+        names = self._get_all({"cursor": "", "limit": 3})
+        self.assertEqual(names, [f"cursor-zone-{index:02}" for index in range(7)])
+
+    def test_cursor_ordering(self):
+        names = self._get_all({"cursor": "", "limit": 2, "ordering": "-name"})
+        self.assertEqual(
+            names, [f"cursor-zone-{index:02}" for index in reversed(range(7))]
+        )
+
+    def test_cursor_filter(self):
+        names = self._get_all(
+            {"cursor": "", "limit": 2, "description": "odd", "ordering": "name"}
+        )
+        self.assertEqual(names, ["cursor-zone-01", "cursor-zone-03", "cursor-zone-05"])
+
+    def test_cursor_invalid_ordering(self):
+        response = self.client.get(
+            self.url, {"cursor": "", "ordering": "tenant__name"}, **self.header
+        )
+        self.assertHttpStatus(response, 400)
+
+    def test_cursor_unindexed_ordering(self):
+        response = self.client.get(
+            self.url, {"cursor": "", "ordering": "description"}, **self.header
+        )
+        self.assertHttpStatus(response, 400)
+
+    def test_offset_pagination(self):
+        response = self.client.get(self.url, {"limit": 3}, **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.data["count"], 7)
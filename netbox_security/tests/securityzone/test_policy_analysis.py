@@ -0,0 +1,164 @@
+from netaddr import IPNetwork
+from django.test import override_settings
+from django.urls import reverse
+
+from core.models import ObjectType
+
+from netbox_security.models import (
+    Address,
+    AddressList,
+    AddressSet,
+    Application,
+    CustomPrefix,
+    SecurityZone,
+    SecurityZonePolicy,
+)
+from netbox_security.utilities import get_policy_analysis
+from netbox_security.utilities.benchmark import _get_overlapping_policies
+from netbox_security.utilities.policy_analysis import analyze_zone_pair
+from users.models import ObjectPermission
+from utilities.testing import TestCase
+
+
+class PolicyAnalysisTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.zone_a, cls.zone_b = (
+            SecurityZone.objects.create(name=f"analysis-zone-{name}") for name in "ab"
+        )
+        addresses = {
+            name: Address.objects.create(
+                name=f"analysis-{name}",
+                assigned_object=CustomPrefix.objects.create(prefix=IPNetwork(prefix)),
+            )
+            for name, prefix in (
+                ("clients", "10.2.0.0/16"),
+                ("servers", "172.17.5.0/24"),
+                ("dns", "172.17.5.53/32"),
+            )
+        }
+        servers_set = AddressSet.objects.create(name="analysis-servers")
+        servers_set.addresses.add(addresses["servers"])
+        clients, servers, dns = (
+            AddressList.objects.create(name=f"analysis-{name}", assigned_object=obj)
+            for name, obj in (
+                ("clients", addresses["clients"]),
+                ("servers", servers_set),
+                ("dns", addresses["dns"]),
+            )
+        )
+        https = Application.objects.create(
+            name="analysis-https", protocol=["TCP"], destination_ports=[443]
+        )
+        dns_application = Application.objects.create(
+            name="analysis-dns", protocol=["UDP", "TCP"], destination_ports=[53]
+        )
+
+        def create_policy(index, actions, destinations, applications=()):
+            policy = SecurityZonePolicy.objects.create(
+                name=f"analysis-policy-{index}",
+                index=index,
+                source_zone=cls.zone_a,
+                destination_zone=cls.zone_b,
+                policy_actions=actions,
+            )
+            policy.source_address.set([clients])
+            policy.destination_address.set(destinations)
+            policy.applications.set(applications)
+            return policy
+
+        cls.deny_dns = create_policy(1, ["deny"], [dns], [dns_application])
+        cls.permit_web = create_policy(2, ["permit"], [servers], [https])
+        # Matches the same flows as permit_web.
+        cls.permit_web_again = create_policy(3, ["permit", "log"], [servers], [https])
+        # The /32 is inside the servers set, so permit_web decides all its flows.
+        cls.deny_dns_web = create_policy(4, ["deny"], [dns], [https])
+        # Overlaps the two deny policies without being covered by either.
+        cls.permit_dns = create_policy(5, ["permit"], [dns])
+
+    def test_analysis(self):
+        analysis = get_policy_analysis()
+        self.assertEqual(analysis["policy_count"], 5)
+        self.assertEqual(
+            analysis["counts"], {"shadowed": 1, "redundant": 1, "correlated": 2}
+        )
+        self.assertEqual(
+            [
+                (
+                    finding["type"],
+                    finding["policy"]["id"],
+                    finding["related_policy"]["id"],
+                )
+                for finding in analysis["findings"]
+            ],
+            [
+                ("redundant", self.permit_web_again.pk, self.permit_web.pk),
+                ("shadowed", self.deny_dns_web.pk, self.permit_web.pk),
+                ("correlated", self.permit_dns.pk, self.deny_dns.pk),
+                ("correlated", self.permit_dns.pk, self.deny_dns_web.pk),
+            ],
+        )
+        finding = analysis["findings"][0]
+        self.assertEqual(finding["source_zone_id"], self.zone_a.pk)
+        self.assertEqual(finding["destination_zone_id"], self.zone_b.pk)
+
+    def test_analysis_is_recomputed(self):
+        self.assertEqual(get_policy_analysis()["counts"]["shadowed"], 1)
+        self.deny_dns_web.policy_actions = ["permit"]
+        self.deny_dns_web.save()
+        counts = get_policy_analysis()["counts"]
+        self.assertEqual(counts["shadowed"], 0)
+        self.assertEqual(counts["redundant"], 2)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_analysis_view(self):
+        response = self.client.get(
+            reverse("plugins:netbox_security:securityzonepolicy_analysis")
+        )
+        self.assertHttpStatus(response, 200)
+        self.assertContains(response, self.deny_dns_web.name)
+
+        response = self.client.get(
+            reverse("plugins:netbox_security:securityzonepolicy_analysis"),
+            {"per_page": 3, "page": 2},
+        )
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(len(response.context["findings"]), 1)
+        self.assertContains(response, "Page 2 of 2")
+
+        response = self.client.get(
+            reverse("plugins-api:netbox_security-api:securityzonepolicy-analysis"),
+            {"index": [1, 5]},
+        )
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.data["policy_count"], 2)
+        self.assertEqual(response.data["counts"]["correlated"], 1)
+
+    def test_analysis_view_hides_zones(self):
+        for model, constraints in (
+            (SecurityZonePolicy, None),
+            (SecurityZone, {"name": self.zone_a.name}),
+        ):
+            permission = ObjectPermission.objects.create(
+                name=f"analysis-{model._meta.model_name}",
+                actions=["view"],
+                constraints=constraints,
+            )
+            permission.object_types.add(ObjectType.objects.get_for_model(model))
+            permission.users.add(self.user)
+
+        response = self.client.get(
+            reverse("plugins:netbox_security:securityzonepolicy_analysis")
+        )
+        self.assertHttpStatus(response, 200)
+        finding = response.context["findings"][0]
+        self.assertEqual(finding["source_zone"], self.zone_a)
+        self.assertIsNone(finding["destination_zone"])
+        self.assertContains(response, self.zone_a.get_absolute_url())
+        self.assertNotContains(response, self.zone_b.name)
+
+    def test_overlapping_policies(self):
+        # Every pair overlaps partially, and every other pair differs in action.
+        findings = list(analyze_zone_pair(_get_overlapping_policies(10)))
+        self.assertEqual(len(findings), 25)
+        self.assertEqual({finding for finding, _, _ in findings}, {"correlated"})
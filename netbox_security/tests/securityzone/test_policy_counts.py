@@ -0,0 +1,47 @@
+from django.test import TestCase
+
+from netbox_security.models import SecurityZone, SecurityZonePolicy
+
+
+class SecurityZonePolicyCountTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.zones = SecurityZone.objects.bulk_create(
+            SecurityZone(name=f"count-zone-{index}") for index in range(3)
+        )
+        zone_a, zone_b, zone_c = cls.zones
+        for index, (source_zone, destination_zone) in enumerate(
+            (
+                (zone_a, zone_b),
+                (zone_a, zone_b),
+                (zone_a, zone_c),
+                (zone_b, zone_a),
+                (zone_c, zone_a),
+                (zone_c, zone_a),
+            )
+        ):
+            SecurityZonePolicy.objects.create(
+                name=f"count-policy-{index}",
+                index=index,
+                source_zone=source_zone,
+                destination_zone=destination_zone,
+                policy_actions=["permit"],
+            )
+
+    def test_policy_counts(self):
+        counts = {
+            zone.name: (zone.source_policy_count, zone.destination_policy_count)
+            for zone in SecurityZone.annotated_queryset()
+        }
+        self.assertEqual(
+            counts,
+            {
+                "count-zone-0": (3, 3),
+                "count-zone-1": (1, 2),
+                "count-zone-2": (2, 1),
+            },
+        )
+
+    def test_policies_are_not_prefetched(self):
+        with self.assertNumQueries(1):
+            list(SecurityZone.annotated_queryset())
@@ -0,0 +1,176 @@
+from netaddr import IPNetwork
+from django.contrib.contenttypes.models import ContentType
+from django.test import override_settings
+from django.urls import reverse
+
+from netbox_security.models import (
+    Address,
+    AddressList,
+    AddressSet,
+    Application,
+    ApplicationSet,
+    CustomPrefix,
+    SecurityZone,
+    SecurityZonePolicy,
+)
+from netbox_security.utilities import compile_policy_engine, get_policy_engine
+from utilities.testing import TestCase
+
+
+class PolicyLookupTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.zone_a, cls.zone_b = (
+            SecurityZone.objects.create(name=f"lookup-zone-{name}") for name in "ab"
+        )
+        addresses = {
+            name: Address.objects.create(
+                name=f"lookup-{name}",
+                assigned_object=CustomPrefix.objects.create(prefix=IPNetwork(prefix)),
+            )
+            for name, prefix in (
+                ("clients", "10.1.0.0/16"),
+                ("servers", "172.16.5.0/24"),
+                ("dns", "172.16.5.53/32"),
+            )
+        }
+        inner = AddressSet.objects.create(name="lookup-inner")
+        inner.addresses.add(addresses["servers"])
+        outer = AddressSet.objects.create(name="lookup-outer")
+        outer.address_sets.add(inner)
+        clients, servers, dns = (
+            AddressList.objects.create(name=f"lookup-{name}", assigned_object=obj)
+            for name, obj in (
+                ("clients", addresses["clients"]),
+                ("servers", outer),
+                ("dns", addresses["dns"]),
+            )
+        )
+        https = Application.objects.create(
+            name="lookup-https", protocol=["TCP"], destination_ports=[443]
+        )
+        web = ApplicationSet.objects.create(name="lookup-web")
+        web.applications.add(https)
+        dns_application = Application.objects.create(
+            name="lookup-dns", protocol=["UDP", "TCP"], destination_ports=[53]
+        )
+
+        def create_policy(index, actions, sources, destinations, **applications):
+            policy = SecurityZonePolicy.objects.create(
+                name=f"lookup-policy-{index}",
+                index=index,
+                source_zone=cls.zone_a,
+                destination_zone=cls.zone_b,
+                policy_actions=actions,
+            )
+            policy.source_address.set(sources)
+            policy.destination_address.set(destinations)
+            for name, objects in applications.items():
+                getattr(policy, name).set(objects)
+            return policy
+
+        cls.deny_dns = create_policy(
+            1, ["deny"], [clients], [dns], applications=[dns_application]
+        )
+        cls.permit_web = create_policy(
+            2, ["permit"], [clients], [servers], application_sets=[web]
+        )
+        cls.permit_any = create_policy(3, ["permit", "log"], [clients], [dns])
+
+    def test_lookup(self):
+        ContentType.objects.get_for_models(Address, AddressSet)
+        with self.assertNumQueries(14):
+            engine = compile_policy_engine()
+
+        def lookup(destination, protocol, destination_port=None, **kwargs):
+            return engine.lookup(
+                kwargs.get("source_zone_id", self.zone_a.pk),
+                self.zone_b.pk,
+                "10.1.2.3",
+                destination,
+                protocol,
+                destination_port=destination_port,
+            )
+
+        result = lookup("172.16.5.9", "tcp", 443)
+        self.assertEqual(result["policy"]["id"], self.permit_web.pk)
+        self.assertTrue(result["permitted"])
+
+        # The /32 is inside the servers set as well, but the deny comes first.
+        result = lookup("172.16.5.53", "udp", 53)
+        self.assertEqual(result["policy"]["id"], self.deny_dns.pk)
+        self.assertFalse(result["permitted"])
+
+        result = lookup("172.16.5.53", "tcp", 443)
+        self.assertEqual(result["policy"]["id"], self.permit_web.pk)
+        result = lookup("172.16.5.53", "icmp")
+        self.assertEqual(result["policy"]["id"], self.permit_any.pk)
+        self.assertEqual(result["actions"], ["permit", "log"])
+
+        for result in (
+            lookup("172.16.5.9", "tcp", 80),
+            lookup("172.16.6.9", "tcp", 443),
+            lookup("172.16.5.9", "tcp", 443, source_zone_id=self.zone_b.pk),
+        ):
+            self.assertIsNone(result["policy"])
+            self.assertFalse(result["permitted"])
+
+    def test_engine_is_recompiled(self):
+        engine = get_policy_engine()
+        self.assertIs(get_policy_engine(), engine)
+        self.permit_any.policy_actions = ["deny"]
+        self.permit_any.save()
+        self.assertIsNot(get_policy_engine(), engine)
+
+    def test_restricted_engine_masks_policies(self):
+        engine = get_policy_engine()
+        with self.assertNumQueries(1):
+            restricted = get_policy_engine(
+                SecurityZonePolicy.objects.exclude(pk=self.deny_dns.pk)
+            )
+        self.assertIs(get_policy_engine(), engine)
+        self.assertEqual(restricted.policy_count, 2)
+        result = restricted.lookup(
+            self.zone_a.pk, self.zone_b.pk, "10.1.2.3", "172.16.5.53", "udp", None, 53
+        )
+        self.assertEqual(result["policy"]["id"], self.permit_any.pk)
+
+    def test_engine_ignores_unchanged_spans(self):
+        engine = get_policy_engine()
+        prefix = CustomPrefix.objects.get(prefix="10.1.0.0/16")
+        prefix.description = "unchanged span"
+        prefix.save()
+        self.assertIs(get_policy_engine(), engine)
+        prefix.prefix = IPNetwork("10.2.0.0/16")
+        prefix.save()
+        self.assertIsNot(get_policy_engine(), engine)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_lookup_api(self):
+        url = reverse("plugins-api:netbox_security-api:policy_lookup")
+        flow = {
+            "source_zone": self.zone_a.pk,
+            "destination_zone": self.zone_b.pk,
+            "source": "10.1.2.3",
+            "destination": "172.16.5.9",
+            "protocol": "tcp",
+            "destination_port": 443,
+        }
+
+        response = self.client.get(url, flow)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.data["policy"]["id"], self.permit_web.pk)
+
+        response = self.client.post(
+            url,
+            {"flows": [flow, {**flow, "destination_port": 80}]},
+            content_type="application/json",
+        )
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(
+            [result["permitted"] for result in response.data["results"]],
+            [True, False],
+        )
+
+        response = self.client.get(url, {**flow, "protocol": "bogus"})
+        self.assertHttpStatus(response, 400)
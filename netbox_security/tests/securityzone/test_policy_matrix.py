@@ -0,0 +1,118 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+
+from netbox_security.models import SecurityZone, SecurityZonePolicy
+from netbox_security.utilities import get_zone_policy_matrix
+from netbox_security.utilities.zone_policy_matrix import CACHE_KEY
+from utilities.testing import TestCase
+
+
+class ZonePolicyMatrixTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.zone_a, cls.zone_b, cls.zone_c = (
+            SecurityZone.objects.create(name=f"matrix-zone-{name}")
+            for name in ("a", "b", "c")
+        )
+        SecurityZone.objects.create(name="matrix-zone-unused")
+        for index, (source_zone, destination_zone, policy_actions) in enumerate(
+            (
+                (cls.zone_a, cls.zone_b, ["permit"]),
+                (cls.zone_a, cls.zone_b, ["permit", "log"]),
+                (cls.zone_a, cls.zone_b, ["deny"]),
+                (cls.zone_c, cls.zone_a, ["permit"]),
+            )
+        ):
+            SecurityZonePolicy.objects.create(
+                name=f"matrix-policy-{index}",
+                index=index,
+                source_zone=source_zone,
+                destination_zone=destination_zone,
+                policy_actions=policy_actions,
+            )
+
+    def setUp(self):
+        super().setUp()
+        cache.delete(CACHE_KEY)
+
+    def test_matrix(self):
+        with self.assertNumQueries(1):
+            matrix = get_zone_policy_matrix()
+
+        self.assertEqual(
+            [zone["name"] for zone in matrix["zones"]],
+            ["matrix-zone-a", "matrix-zone-b", "matrix-zone-c"],
+        )
+        self.assertEqual(matrix["policy_count"], 4)
+        self.assertEqual(matrix["max_count"], 3)
+        cells = {
+            (cell["source_zone_id"], cell["destination_zone_id"]): cell
+            for cell in matrix["cells"]
+        }
+        self.assertEqual(
+            set(cells),
+            {(self.zone_a.pk, self.zone_b.pk), (self.zone_c.pk, self.zone_a.pk)},
+        )
+        cell = cells[(self.zone_a.pk, self.zone_b.pk)]
+        self.assertEqual(cell["count"], 3)
+        self.assertEqual(cell["actions"]["permit"], 2)
+        self.assertEqual(cell["actions"]["log"], 1)
+        self.assertEqual(cell["actions"]["deny"], 1)
+        self.assertEqual(cell["actions"]["reject"], 0)
+
+    def test_matrix_cache_invalidation(self):
+        get_zone_policy_matrix()
+        with self.assertNumQueries(0):
+            get_zone_policy_matrix()
+
+        SecurityZonePolicy.objects.create(
+            name="matrix-policy-new",
+            index=10,
+            source_zone=self.zone_b,
+            destination_zone=self.zone_c,
+            policy_actions=["permit"],
+        )
+        self.assertEqual(get_zone_policy_matrix()["policy_count"], 5)
+
+    def test_filtered_matrix_is_not_cached(self):
+        get_zone_policy_matrix()
+        matrix = get_zone_policy_matrix(
+            SecurityZonePolicy.objects.filter(source_zone=self.zone_c)
+        )
+        self.assertEqual(matrix["policy_count"], 1)
+        self.assertEqual(get_zone_policy_matrix()["policy_count"], 4)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_matrix_view(self):
+        response = self.client.get(
+            reverse("plugins:netbox_security:securityzonepolicy_matrix")
+        )
+        self.assertHttpStatus(response, 200)
+        self.assertIn(
+            f"source_zone_id={self.zone_a.pk}&amp;destination_zone_id={self.zone_b.pk}",
+            response.content.decode(),
+        )
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_matrix_view_escapes_zone_names(self):
+        zone = SecurityZone.objects.create(name="matrix-<zone>")
+        SecurityZonePolicy.objects.create(
+            name="matrix-policy-escaped",
+            index=10,
+            source_zone=zone,
+            destination_zone=self.zone_a,
+            policy_actions=["permit"],
+        )
+        response = self.client.get(
+            reverse("plugins:netbox_security:securityzonepolicy_matrix")
+        )
+        self.assertHttpStatus(response, 200)
+        self.assertContains(response, "matrix-&lt;zone&gt; &rarr; matrix-zone-a")
+        self.assertNotContains(response, "matrix-<zone>")
+
+    def test_matrix_view_requires_permission(self):
+        response = self.client.get(
+            reverse("plugins:netbox_security:securityzonepolicy_matrix")
+        )
+        self.assertHttpStatus(response, 403)
@@ -0,0 +1,100 @@
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.test import override_settings
+from django.urls import reverse
+
+from dcim.models import Device, DeviceRole, DeviceType, Manufacturer, Site
+from netbox_security.models import (
+    NatPool,
+    NatPoolAssignment,
+    SecurityZone,
+    SecurityZoneAssignment,
+)
+from netbox_security.utilities import get_security_assignments
+from utilities.testing import TestCase
+
+
+class DeviceSecurityTabTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        site = Site.objects.create(name="tab-site", slug="tab-site")
+        device_type = DeviceType.objects.create(
+            model="tab-type",
+            slug="tab-type",
+            manufacturer=Manufacturer.objects.create(
+                name="tab-manufacturer", slug="tab-manufacturer"
+            ),
+        )
+        role = DeviceRole.objects.create(name="tab-role", slug="tab-role")
+        cls.device, cls.other_device = (
+            Device.objects.create(
+                name=name,
+                status="active",
+                site=site,
+                role=role,
+                device_type=device_type,
+            )
+            for name in ("tab-device", "tab-other-device")
+        )
+        device_ct = ContentType.objects.get_for_model(Device)
+
+        cls.zones = SecurityZone.objects.bulk_create(
+            SecurityZone(name=f"tab-zone-{index:02}") for index in range(5)
+        )
+        SecurityZoneAssignment.objects.bulk_create(
+            SecurityZoneAssignment(
+                zone=zone,
+                assigned_object_type=device_ct,
+                assigned_object_id=cls.device.pk,
+            )
+            for zone in cls.zones
+        )
+        pool = NatPool.objects.create(name="tab-pool")
+        NatPoolAssignment.objects.create(
+            pool=pool,
+            assigned_object_type=device_ct,
+            assigned_object_id=cls.other_device.pk,
+        )
+
+    def test_get_security_assignments(self):
+        superuser = get_user_model().objects.create_user(
+            username="tab-superuser", is_superuser=True
+        )
+        ContentType.objects.get_for_model(Device)
+        with self.assertNumQueries(2):
+            assignments = get_security_assignments(
+                self.device, superuser, pages={"zones": 2}, per_page=2
+            )
+
+        zones = assignments["zones"]
+        self.assertEqual(zones["count"], 5)
+        self.assertEqual(zones["num_pages"], 3)
+        self.assertEqual([row.zone for row in zones["rows"]], self.zones[2:4])
+        self.assertEqual(assignments["nat_pools"]["count"], 0)
+        self.assertEqual(assignments["nat_pools"]["rows"], [])
+
+        # Out-of-range pages show the last page.
+        assignments = get_security_assignments(
+            self.device, superuser, pages={"zones": 9}, per_page=2
+        )
+        self.assertEqual(assignments["zones"]["page"], 3)
+        self.assertEqual(
+            [row.zone for row in assignments["zones"]["rows"]], self.zones[4:]
+        )
+
+    def test_get_security_assignments_is_restricted(self):
+        user = get_user_model().objects.create_user(username="tab-user")
+        assignments = get_security_assignments(self.device, user)
+        self.assertEqual(assignments["zones"]["count"], 0)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_security_tab(self):
+        url = reverse("dcim:device_security", kwargs={"pk": self.device.pk})
+
+        response = self.client.get(url, {"per_page": 2, "zones_page": 2})
+        self.assertHttpStatus(response, 200)
+        content = response.content.decode()
+        self.assertIn("tab-zone-02", content)
+        self.assertNotIn("tab-zone-00", content)
+        self.assertNotIn("tab-pool", content)
+        self.assertIn("zones_page=3", content)
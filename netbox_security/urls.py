@@ -6,10 +6,17 @@ from utilities.urls import get_model_urls
 # URLs to be set up properly with get_model_urls().
 # -
 from .views import *  # noqa: F401
+from .views.tabs import SecurityTabBadgeView
 
 app_name = "netbox_security"
 
 urlpatterns = [
+    # Deferred Security tab badges
+    path(
+        "security-tab-badge/<str:app_label>/<str:model>/<int:pk>/",
+        SecurityTabBadgeView.as_view(),
+        name="security_tab_badge",
+    ),
     # Custom Prefixes
     path(
         "custom-prefix/",
@@ -1,3 +1,84 @@
-from .address_set_hierarchy import get_address_set_hierarchy
+from .address_aggregation import (
+    aggregate_spans,
+    clear_address_aggregation_cache,
+    get_aggregated_prefixes,
+    iter_aggregated_prefixes,
+)
+from .address_set_closure import (
+    check_address_set_closure,
+    rebuild_address_set_closure,
+    refresh_address_set_closure,
+)
+from .address_set_hierarchy import (
+    get_address_set_hierarchies,
+    get_address_set_hierarchy,
+    get_address_set_hierarchy_counts,
+    restrict_address_set_hierarchies,
+)
+from .address_set_impact import get_address_set_impact
+from .address_set_paths import get_address_set_path_offset
+from .change_feed import get_change_feed
+from .effective_addresses import (
+    get_effective_address_ids,
+    rebuild_effective_addresses,
+)
+from .export import get_export_rows, iter_ndjson
+from .nat_engine import compile_nat_engine, get_nat_engine
+from .nat_pool_analysis import get_nat_pool_analysis
+from .policy_analysis import get_policy_analysis
+from .policy_context_cache import (
+    clear_policy_context_cache,
+    get_cached_address_set_hierarchy,
+    get_cached_address_set_hierarchy_counts,
+    get_policy_context_cache_stats,
+)
+from .policy_engine import compile_policy_engine, get_policy_engine, get_policy_specs
+from .security_assignments import get_assigned_objects, get_security_assignments
+from .security_counters import (
+    check_security_counters,
+    get_security_counter,
+    rebuild_security_counters,
+)
+from .zone_policy_matrix import (
+    clear_zone_policy_matrix_cache,
+    get_zone_policy_matrix,
+)
 
-__all__ = ("get_address_set_hierarchy",)
+__all__ = (
+    "aggregate_spans",
+    "check_address_set_closure",
+    "check_security_counters",
+    "clear_address_aggregation_cache",
+    "clear_policy_context_cache",
+    "clear_zone_policy_matrix_cache",
+    "compile_nat_engine",
+    "compile_policy_engine",
+    "get_address_set_hierarchies",
+    "get_address_set_hierarchy",
+    "get_address_set_hierarchy_counts",
+    "get_address_set_impact",
+    "get_address_set_path_offset",
+    "get_aggregated_prefixes",
+    "get_assigned_objects",
+    "get_cached_address_set_hierarchy",
+    "get_cached_address_set_hierarchy_counts",
+    "get_change_feed",
+    "get_effective_address_ids",
+    "get_export_rows",
+    "get_nat_engine",
+    "get_nat_pool_analysis",
+    "get_policy_analysis",
+    "get_policy_context_cache_stats",
+    "get_policy_engine",
+    "get_policy_specs",
+    "get_security_assignments",
+    "get_security_counter",
+    "get_zone_policy_matrix",
+    "iter_aggregated_prefixes",
+    "iter_ndjson",
+    "rebuild_address_set_closure",
+    "rebuild_effective_addresses",
+    "rebuild_security_counters",
+    "refresh_address_set_closure",
+    "restrict_address_set_hierarchies",
+)
@@ -0,0 +1,240 @@
+import ipaddress
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from netbox.plugins import get_plugin_config
+
+from netbox_security.models import Address, AddressList, AddressSet
+from netbox_security.utilities.address_set_closure import (
+    get_address_membership_model,
+    get_address_set_descendants,
+)
+from netbox_security.utilities.address_set_hierarchy import get_address_set_parent_map
+from netbox_security.utilities.export import ExportJSONEncoder
+from netbox_security.utilities.generations import bump_generations, get_generations
+from netbox_security.utilities.spans import (
+    ADDRESS_BITS,
+    merge_intervals,
+    span_to_cidrs,
+)
+
+__all__ = (
+    "aggregate_spans",
+    "bump_address_aggregation_generations",
+    "clear_address_aggregation_cache",
+    "get_address_aggregation_keys",
+    "get_aggregated_prefixes",
+    "iter_aggregated_prefixes",
+)
+
+CACHE_PREFIX = "netbox_security:address_aggregation"
+GENERATION_KEY = f"{CACHE_PREFIX}:gen"
+
+NETWORK_CLASSES = {4: ipaddress.IPv4Network, 6: ipaddress.IPv6Network}
+
+
+def _get_timeout():
+    return get_plugin_config("netbox_security", "address_aggregation_cache_timeout")
+
+
+def _object_generation_key(model, object_id):
+    return f"{CACHE_PREFIX}:gen:{model._meta.model_name}:{object_id}"
+
+
+def aggregate_spans(spans):
+    """Return the minimal CIDR lists covering (version, start, end) address spans.
+
+    The spans of each IP version are merged into disjoint integer intervals, and
+    every interval is split into the fewest aligned blocks covering it exactly.
+    Returns {"ipv4": [...], "ipv6": [...]}, both sorted by address.
+    """
+    intervals = defaultdict(list)
+    for version, start, end in spans:
+        intervals[version].append((int(start), int(end)))
+    prefixes = {}
+    for version, bits in ADDRESS_BITS.items():
+        network_class = NETWORK_CLASSES[version]
+        prefixes[f"ipv{version}"] = [
+            str(network_class((network, prefix_length)))
+            for start, end in merge_intervals(intervals[version])
+            for network, prefix_length in span_to_cidrs(start, end, bits)
+        ]
+    return prefixes
+
+
+def _get_address_ids(model, object_ids):
+    """Return {object ID: {Address IDs}} of the given AddressSets or AddressLists."""
+    address_ids = {object_id: set() for object_id in object_ids}
+    if model is AddressList:
+        address_type = ContentType.objects.get_for_model(Address)
+        address_set_type = ContentType.objects.get_for_model(AddressSet)
+        list_sets = {}
+        for list_id, content_type_id, object_id in AddressList.objects.filter(
+            pk__in=list(object_ids)
+        ).values_list("pk", "assigned_object_type_id", "assigned_object_id"):
+            if content_type_id == address_type.pk:
+                address_ids[list_id].add(object_id)
+            elif content_type_id == address_set_type.pk:
+                list_sets[list_id] = object_id
+        set_address_ids = _get_address_ids(AddressSet, set(list_sets.values()))
+        for list_id, address_set_id in list_sets.items():
+            address_ids[list_id] |= set_address_ids[address_set_id]
+        return address_ids
+
+    if not address_ids:
+        return address_ids
+    descendants = get_address_set_descendants(address_ids)
+    through_model, address_set_column, address_column = get_address_membership_model()
+    members = defaultdict(set)
+    for address_set_id, address_id in through_model.objects.filter(
+        **{f"{address_set_column}__in": list(set().union(*descendants.values()))}
+    ).values_list(address_set_column, address_column):
+        members[address_set_id].add(address_id)
+    for address_set_id, nested_ids in descendants.items():
+        for nested_id in nested_ids:
+            address_ids[address_set_id] |= members.get(nested_id, set())
+    return address_ids
+
+
+def _build_aggregated_prefixes(model, object_ids):
+    address_ids = _get_address_ids(model, object_ids)
+    spans = {
+        address_id: span
+        for address_id, *span in Address.objects.filter(
+            pk__in=list(set().union(*address_ids.values())),
+            span_version__isnull=False,
+        ).values_list("pk", "span_version", "span_start", "span_end")
+    }
+    return {
+        object_id: aggregate_spans(
+            spans[address_id] for address_id in ids if address_id in spans
+        )
+        for object_id, ids in address_ids.items()
+    }
+
+
+def get_aggregated_prefixes(model, object_ids):
+    """Return the minimal covering CIDR lists of AddressSets or AddressLists.
+
+    model is AddressSet or AddressList. The Addresses of each object are
+    resolved through every nested Address Set, their Prefix, IP Range, IP
+    Address or Custom Prefix spans merged and aggregated by aggregate_spans();
+    Addresses without a span, e.g. DNS names, are left out. Returns {object ID:
+    {"ipv4": [...], "ipv6": [...]}}, reading all objects with a fixed number of
+    queries.
+
+    The result of each object is cached for the address_aggregation_cache_timeout
+    plugin setting, under a generation token of its own that is replaced when a
+    member of the object, at any nesting depth, changes.
+    """
+    object_ids = list(dict.fromkeys(object_ids))
+    timeout = _get_timeout()
+    if not timeout or not object_ids:
+        return _build_aggregated_prefixes(model, object_ids)
+
+    generations = get_generations(
+        [GENERATION_KEY]
+        + [_object_generation_key(model, object_id) for object_id in object_ids]
+    )
+    keys = {
+        object_id: f"{CACHE_PREFIX}:{model._meta.model_name}:{object_id}:"
+        f"{generations[0]}:{generation}"
+        for object_id, generation in zip(object_ids, generations[1:])
+    }
+    cached = cache.get_many(list(keys.values()))
+    prefixes = {
+        object_id: cached[key] for object_id, key in keys.items() if key in cached
+    }
+    missing = [object_id for object_id in object_ids if object_id not in prefixes]
+    if missing:
+        built = _build_aggregated_prefixes(model, missing)
+        cache.set_many(
+            {keys[object_id]: built[object_id] for object_id in missing},
+            timeout=timeout,
+        )
+        prefixes.update(built)
+    return prefixes
+
+
+def iter_aggregated_prefixes(queryset, chunk_size=None):
+    """Yield the aggregated prefixes of every object of queryset as NDJSON, by ID.
+
+    Each line holds the "id" and "name" of an AddressSet or AddressList and its
+    "ipv4" and "ipv6" prefixes; objects are aggregated chunk_size at a time,
+    defaulting to the export_chunk_size plugin setting.
+    """
+    if chunk_size is None:
+        chunk_size = get_plugin_config("netbox_security", "export_chunk_size")
+    encoder = ExportJSONEncoder()
+    rows = (
+        queryset.select_related(None)
+        .prefetch_related(None)
+        .order_by("pk")
+        .values_list("pk", "name")
+        .iterator(chunk_size=chunk_size)
+    )
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield from _encode_chunk(encoder, queryset.model, chunk)
+            chunk = []
+    if chunk:
+        yield from _encode_chunk(encoder, queryset.model, chunk)
+
+
+def _encode_chunk(encoder, model, chunk):
+    prefixes = get_aggregated_prefixes(model, [object_id for object_id, _ in chunk])
+    for object_id, name in chunk:
+        yield encoder.encode({"id": object_id, "name": name, **prefixes[object_id]})
+        yield "\n"
+
+
+def get_address_aggregation_keys(
+    address_set_ids=(), address_ids=(), address_list_ids=()
+):
+    """Return the generation keys of every aggregation containing the given objects.
+
+    These are the given AddressSets and AddressLists, the sets any of the sets or
+    Addresses is nested in, at any depth, and the AddressLists assigned to any of
+    these sets or Addresses.
+    """
+    address_set_ids = set(address_set_ids)
+    address_ids = set(address_ids)
+    if address_ids:
+        through_model, address_set_column, address_column = (
+            get_address_membership_model()
+        )
+        address_set_ids |= set(
+            through_model.objects.filter(
+                **{f"{address_column}__in": list(address_ids)}
+            ).values_list(address_set_column, flat=True)
+        )
+    if address_set_ids:
+        address_set_ids, _ = get_address_set_parent_map(address_set_ids)
+
+    list_ids = set(address_list_ids)
+    for model, ids in ((Address, address_ids), (AddressSet, address_set_ids)):
+        if ids:
+            list_ids |= set(
+                AddressList.objects.filter(
+                    assigned_object_type=ContentType.objects.get_for_model(model),
+                    assigned_object_id__in=list(ids),
+                ).values_list("pk", flat=True)
+            )
+    return [
+        _object_generation_key(AddressSet, address_set_id)
+        for address_set_id in address_set_ids
+    ] + [_object_generation_key(AddressList, list_id) for list_id in list_ids]
+
+
+def bump_address_aggregation_generations(*keys):
+    """Invalidate the cached aggregations of the given generation keys."""
+    if keys:
+        bump_generations(*keys)
+
+
+def clear_address_aggregation_cache():
+    """Invalidate every cached aggregation."""
+    bump_generations(GENERATION_KEY)
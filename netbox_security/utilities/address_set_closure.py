@@ -0,0 +1,233 @@
+from collections import defaultdict, deque
+
+from django.db import transaction
+from netbox.plugins import get_plugin_config
+
+from netbox_security.models import AddressSet, AddressSetClosure
+
+__all__ = (
+    "check_address_set_closure",
+    "compute_address_set_closure",
+    "get_address_membership_model",
+    "get_address_set_ancestor_ids",
+    "get_address_set_descendant_ids",
+    "get_address_set_descendants",
+    "get_address_set_edges_model",
+    "rebuild_address_set_closure",
+    "refresh_address_set_closure",
+)
+
+
+def get_address_set_edges_model():
+    """Return (through_model, parent_column, child_column) for AddressSet.address_sets."""
+    relation_field = AddressSet._meta.get_field("address_sets")
+    return (
+        relation_field.remote_field.through,
+        f"{relation_field.m2m_field_name()}_id",
+        f"{relation_field.m2m_reverse_field_name()}_id",
+    )
+
+
+def get_address_membership_model():
+    """Return (through_model, address_set_column, address_column) for AddressSet.addresses."""
+    relation_field = AddressSet._meta.get_field("addresses")
+    return (
+        relation_field.remote_field.through,
+        f"{relation_field.m2m_field_name()}_id",
+        f"{relation_field.m2m_reverse_field_name()}_id",
+    )
+
+
+def _load_edges(child_ids=None):
+    through_model, parent_column, child_column = get_address_set_edges_model()
+    edges = through_model.objects.all()
+    if child_ids is not None:
+        edges = edges.filter(**{f"{child_column}__in": list(child_ids)})
+    return edges.values_list(parent_column, child_column)
+
+
+def compute_address_set_closure(address_set_ids, edges):
+    """Return {(ancestor_id, descendant_id): depth} for the given sets and edges.
+
+    Each set is its own ancestor at depth 0. Depth is the length of the shortest
+    nesting chain between the two sets; membership cycles are tolerated.
+    """
+    parent_map = defaultdict(set)
+    for parent_id, child_id in edges:
+        parent_map[child_id].add(parent_id)
+
+    closure = {}
+    for address_set_id in address_set_ids:
+        closure[(address_set_id, address_set_id)] = 0
+        seen = {address_set_id}
+        queue = deque([(address_set_id, 0)])
+        while queue:
+            current_id, depth = queue.popleft()
+            for parent_id in parent_map.get(current_id, ()):
+                if parent_id in seen:
+                    continue
+                seen.add(parent_id)
+                closure[(parent_id, address_set_id)] = depth + 1
+                queue.append((parent_id, depth + 1))
+    return closure
+
+
+def get_address_set_ancestor_ids(address_set_ids, include_self=True):
+    """Return every AddressSet ID that (transitively) contains one of the given sets."""
+    rows = AddressSetClosure.objects.filter(descendant_id__in=list(address_set_ids))
+    if not include_self:
+        rows = rows.exclude(depth=0)
+    return set(rows.values_list("ancestor_id", flat=True))
+
+
+def get_address_set_descendant_ids(address_set_ids, include_self=True):
+    """Return every AddressSet ID (transitively) nested inside one of the given sets."""
+    rows = AddressSetClosure.objects.filter(ancestor_id__in=list(address_set_ids))
+    if not include_self:
+        rows = rows.exclude(depth=0)
+    return set(rows.values_list("descendant_id", flat=True))
+
+
+def get_address_set_descendants(address_set_ids):
+    """Return {AddressSet ID: {the set and every set nested below it}}.
+
+    Read from the closure table with a single query when the
+    address_set_closure plugin setting is enabled, otherwise by walking the
+    nesting edges with one query per level.
+    """
+    descendants = {
+        address_set_id: {address_set_id} for address_set_id in address_set_ids
+    }
+    if get_plugin_config("netbox_security", "address_set_closure"):
+        for ancestor_id, descendant_id in AddressSetClosure.objects.filter(
+            ancestor_id__in=list(address_set_ids)
+        ).values_list("ancestor_id", "descendant_id"):
+            descendants[ancestor_id].add(descendant_id)
+        return descendants
+
+    through_model, parent_column, child_column = get_address_set_edges_model()
+    children = defaultdict(set)
+    seen = set(address_set_ids)
+    frontier = set(address_set_ids)
+    while frontier:
+        rows = through_model.objects.filter(
+            **{f"{parent_column}__in": list(frontier)}
+        ).values_list(parent_column, child_column)
+        frontier = set()
+        for parent_id, child_id in rows:
+            children[parent_id].add(child_id)
+            if child_id not in seen:
+                seen.add(child_id)
+                frontier.add(child_id)
+    for address_set_id, nested_ids in descendants.items():
+        stack = [address_set_id]
+        while stack:
+            for child_id in children.get(stack.pop(), ()):
+                if child_id not in nested_ids:
+                    nested_ids.add(child_id)
+                    stack.append(child_id)
+    return descendants
+
+
+def refresh_address_set_closure(address_set_ids):
+    """Recompute closure rows for the given sets and every set nested below them.
+
+    Nesting changes only alter the ancestors of the child side of an edge and of
+    everything below it, so rows for all other sets are reused as they are.
+    """
+    address_set_ids = set(address_set_ids)
+    if not address_set_ids:
+        return
+
+    affected_ids = get_address_set_descendant_ids(address_set_ids) | set(
+        AddressSet.objects.filter(pk__in=address_set_ids).values_list("pk", flat=True)
+    )
+    if not affected_ids:
+        return
+
+    edges = list(_load_edges(affected_ids))
+    parent_map = defaultdict(set)
+    for parent_id, child_id in edges:
+        parent_map[child_id].add(parent_id)
+
+    # Ancestors of untouched parents are still valid and seed the recomputation.
+    external_parent_ids = {
+        parent_id for parent_id, _ in edges if parent_id not in affected_ids
+    }
+    ancestors = defaultdict(dict)
+    for ancestor_id, descendant_id, depth in AddressSetClosure.objects.filter(
+        descendant_id__in=external_parent_ids
+    ).values_list("ancestor_id", "descendant_id", "depth"):
+        ancestors[descendant_id][ancestor_id] = depth
+    for parent_id in external_parent_ids:
+        ancestors[parent_id].setdefault(parent_id, 0)
+    for address_set_id in affected_ids:
+        ancestors[address_set_id] = {address_set_id: 0}
+
+    changed = True
+    while changed:
+        changed = False
+        for address_set_id in affected_ids:
+            current = ancestors[address_set_id]
+            for parent_id in parent_map.get(address_set_id, ()):
+                for ancestor_id, depth in list(ancestors[parent_id].items()):
+                    if depth + 1 < current.get(ancestor_id, depth + 2):
+                        current[ancestor_id] = depth + 1
+                        changed = True
+
+    with transaction.atomic():
+        AddressSetClosure.objects.filter(descendant_id__in=affected_ids).delete()
+        AddressSetClosure.objects.bulk_create(
+            AddressSetClosure(
+                ancestor_id=ancestor_id,
+                descendant_id=address_set_id,
+                depth=depth,
+            )
+            for address_set_id in affected_ids
+            for ancestor_id, depth in ancestors[address_set_id].items()
+        )
+
+
+def rebuild_address_set_closure():
+    """Rebuild the whole closure table from the AddressSet.address_sets relation."""
+    address_set_ids = list(AddressSet.objects.values_list("pk", flat=True))
+    closure = compute_address_set_closure(address_set_ids, _load_edges())
+    with transaction.atomic():
+        AddressSetClosure.objects.all().delete()
+        AddressSetClosure.objects.bulk_create(
+            (
+                AddressSetClosure(
+                    ancestor_id=ancestor_id,
+                    descendant_id=descendant_id,
+                    depth=depth,
+                )
+                for (ancestor_id, descendant_id), depth in closure.items()
+            ),
+            batch_size=5000,
+        )
+    return len(closure)
+
+
+def check_address_set_closure():
+    """Compare the stored closure table against a fresh computation.
+
+    Returns a dict with lists of missing, stale and wrong-depth
+    (ancestor_id, descendant_id) pairs.
+    """
+    address_set_ids = list(AddressSet.objects.values_list("pk", flat=True))
+    expected = compute_address_set_closure(address_set_ids, _load_edges())
+    stored = {
+        (ancestor_id, descendant_id): depth
+        for ancestor_id, descendant_id, depth in AddressSetClosure.objects.values_list(
+            "ancestor_id", "descendant_id", "depth"
+        )
+    }
+    return {
+        "missing": sorted(set(expected) - set(stored)),
+        "stale": sorted(set(stored) - set(expected)),
+        "wrong_depth": sorted(
+            pair
+            for pair in set(expected) & set(stored)
+            if expected[pair] != stored[pair]
+        ),
+    }
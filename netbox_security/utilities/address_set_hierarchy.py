@@ -1,129 +1,78 @@
 from collections import defaultdict
 
 from django.contrib.contenttypes.models import ContentType
+from django.db.backends.postgresql.psycopg_any import NumericRange
+from django.db.models import Q
+from netbox.plugins import get_plugin_config
+
+from netbox_security.models import (
+    Address,
+    AddressList,
+    AddressSet,
+    EffectiveAddress,
+    SecurityZone,
+    SecurityZonePolicy,
+)
+from netbox_security.models.address import span_range
+from netbox_security.utilities.address_set_closure import (
+    get_address_membership_model,
+    get_address_set_ancestor_ids,
+    get_address_set_edges_model,
+)
+from netbox_security.utilities.address_set_paths import (
+    build_address_set_dag,
+    count_address_set_paths,
+    get_address_set_path_page,
+)
+from netbox_security.utilities.spans import (
+    SPAN_MODELS,
+    find_containing_spans,
+    get_object_span,
+)
+
+# Target spans matched by one query of _get_span_address_rows().
+SPAN_QUERY_CHUNK = 500
+
+
+def _get_containing_address_ids(target_object, assigned_models):
+    """Return IDs of Addresses whose assigned object span contains target_object.
+
+    Uses the GiST index on the span_range() of Address, so a single index scan
+    replaces loading every address-bearing object.
+    """
+    target_span = get_object_span(target_object)
+    if not target_span:
+        return []
 
-from netbox_security.models import Address, AddressList, AddressSet, SecurityZonePolicy
-
-
-def _get_object_span(obj):
-    """Return (start, end, version) for IP-bearing objects, else None."""
-    model_name = obj._meta.model_name
-
-    if model_name in ("prefix", "customprefix"):
-        return int(obj.prefix.first), int(obj.prefix.last), int(obj.prefix.version)
-
-    if model_name == "ipaddress":
-        ip = int(obj.address.ip)
-        return ip, ip, int(obj.address.version)
-
-    if model_name == "iprange":
-        return (
-            int(obj.start_address.ip),
-            int(obj.end_address.ip),
-            int(obj.start_address.version),
+    start, end, version = target_span
+    content_type_ids = [
+        ContentType.objects.get_by_natural_key(app_label, model_name).pk
+        for app_label, model_name in assigned_models
+    ]
+    return list(
+        Address.objects.alias(span=span_range())
+        .filter(
+            assigned_object_type_id__in=content_type_ids,
+            span_version=version,
+            span__contains=NumericRange(start, end, "[]"),
         )
-
-    return None
-
-
-def _span_contains(parent_span, child_span):
-    if not parent_span or not child_span:
-        return False
-
-    parent_start, parent_end, parent_version = parent_span
-    child_start, child_end, child_version = child_span
-    if parent_version != child_version:
-        return False
-
-    return parent_start <= child_start and parent_end >= child_end
+        .values_list("id", flat=True)
+    )
 
 
 def _get_parent_customprefix_address_ids(target_object):
     """Return address IDs assigned to CustomPrefixes that contain target_object."""
-    from netbox_security.models import CustomPrefix
-
-    target_span = _get_object_span(target_object)
-    if not target_span:
-        return []
-
-    address_rows = list(
-        Address.objects.filter(
-            assigned_object_type__app_label="netbox_security",
-            assigned_object_type__model="customprefix",
-        ).values_list("id", "assigned_object_id")
+    return _get_containing_address_ids(
+        target_object, (("netbox_security", "customprefix"),)
     )
-    if not address_rows:
-        return []
-
-    custom_prefixes = {
-        obj.pk: obj
-        for obj in CustomPrefix.objects.filter(
-            pk__in={assigned_object_id for _, assigned_object_id in address_rows}
-        )
-    }
-
-    inherited_ids = []
-    for address_id, assigned_object_id in address_rows:
-        custom_prefix = custom_prefixes.get(assigned_object_id)
-        if not custom_prefix:
-            continue
-        if _span_contains(_get_object_span(custom_prefix), target_span):
-            inherited_ids.append(address_id)
-
-    return inherited_ids
 
 
 def _get_parent_ipam_address_ids(target_object):
     """Return address IDs assigned to IPAM objects that contain target_object."""
-    from ipam.models import IPAddress, IPRange, Prefix
-
-    target_span = _get_object_span(target_object)
-    if not target_span:
-        return []
-
-    address_rows = list(
-        Address.objects.filter(
-            assigned_object_type__app_label="ipam",
-            assigned_object_type__model__in=("prefix", "ipaddress", "iprange"),
-        ).values_list("id", "assigned_object_type__model", "assigned_object_id")
+    return _get_containing_address_ids(
+        target_object,
+        (("ipam", "prefix"), ("ipam", "ipaddress"), ("ipam", "iprange")),
     )
-    if not address_rows:
-        return []
-
-    object_ids_by_model = defaultdict(set)
-    for _, model_name, object_id in address_rows:
-        object_ids_by_model[model_name].add(object_id)
-
-    model_objects = {
-        "prefix": {
-            obj.pk: obj
-            for obj in Prefix.objects.filter(
-                pk__in=object_ids_by_model.get("prefix", set())
-            )
-        },
-        "ipaddress": {
-            obj.pk: obj
-            for obj in IPAddress.objects.filter(
-                pk__in=object_ids_by_model.get("ipaddress", set())
-            )
-        },
-        "iprange": {
-            obj.pk: obj
-            for obj in IPRange.objects.filter(
-                pk__in=object_ids_by_model.get("iprange", set())
-            )
-        },
-    }
-
-    inherited_ids = []
-    for address_id, model_name, object_id in address_rows:
-        parent_object = model_objects.get(model_name, {}).get(object_id)
-        if not parent_object:
-            continue
-        if _span_contains(_get_object_span(parent_object), target_span):
-            inherited_ids.append(address_id)
-
-    return inherited_ids
 
 
 def _get_inherited_address_ids(target_object, direct_address_ids):
@@ -246,92 +195,209 @@ def _get_inherited_address_ids(target_object, direct_address_ids):
     ]
 
 
-def get_address_set_hierarchy(*, app_label, model, object_id):
-    """Return transitive security context for an assigned IPAM object.
+def _get_span_address_rows(assigned_models, target_spans):
+    """Return (address_id, assigned_object_id, span) rows containing a target span.
 
-    Traversal:
-    assigned object -> Address -> AddressSet (direct + parent hierarchy) ->
-    AddressList -> SecurityZonePolicy (source/destination)
+    Every distinct target span is matched through the GiST index on span_range(),
+    SPAN_QUERY_CHUNK spans per query, so only the containing Addresses are read.
     """
-    content_type = ContentType.objects.filter(app_label=app_label, model=model).first()
-    if not content_type:
-        return {
-            "assigned_object_id": None,
-            "address_ids": [],
-            "address_objects": [],
-            "inherited_address_ids": [],
-            "inherited_address_objects": [],
-            "direct_address_set_ids": [],
-            "all_address_set_ids": [],
-            "address_set_paths": [],
-            "address_set_object_paths": [],
-            "address_set_hierarchy_rows": [],
-            "address_set_name_paths": [],
-            "address_list_ids": [],
-            "address_list_names": [],
-            "policy_paths": [],
-        }
-
-    address_ids = list(
-        Address.objects.filter(
-            assigned_object_type=content_type,
-            assigned_object_id=object_id,
-        ).values_list("id", flat=True)
+    content_type_ids = [
+        ContentType.objects.get_by_natural_key(app_label, model_name).pk
+        for app_label, model_name in assigned_models
+    ]
+    spans = sorted(
+        {(version, start, end) for start, end, version in target_spans.values()}
     )
+    rows = {}
+    for offset in range(0, len(spans), SPAN_QUERY_CHUNK):
+        query = Q()
+        for version, start, end in spans[offset : offset + SPAN_QUERY_CHUNK]:
+            query |= Q(
+                span_version=version, span__contains=NumericRange(start, end, "[]")
+            )
+        for address_id, object_id, start, end, version in (
+            Address.objects.alias(span=span_range())
+            .filter(query, assigned_object_type_id__in=content_type_ids)
+            .values_list(
+                "id", "assigned_object_id", "span_start", "span_end", "span_version"
+            )
+        ):
+            rows[address_id] = (
+                address_id,
+                object_id,
+                (int(start), int(end), int(version)),
+            )
+    return list(rows.values())
 
-    # Get inherited addresses for IPAM child objects and CustomPrefix
-    inherited_address_ids = []
-    target_object = content_type.model_class().objects.filter(pk=object_id).first()
-    if target_object:
-        inherited_address_ids = _get_inherited_address_ids(target_object, address_ids)
 
-    # Combine direct and inherited addresses for hierarchy computation
-    effective_address_ids = sorted(set(address_ids) | set(inherited_address_ids))
+def get_inherited_address_ids_bulk(target_objects, direct_address_ids_by_object):
+    """Batch counterpart of _get_inherited_address_ids for objects of one model.
 
-    if not effective_address_ids:
-        return {
-            "assigned_object_id": object_id,
-            "address_ids": [],
-            "address_objects": [],
-            "inherited_address_ids": [],
-            "inherited_address_objects": [],
-            "direct_address_set_ids": [],
-            "all_address_set_ids": [],
-            "address_set_paths": [],
-            "address_set_object_paths": [],
-            "address_set_hierarchy_rows": [],
-            "address_set_name_paths": [],
-            "address_list_ids": [],
-            "address_list_names": [],
-            "policy_paths": [],
-        }
+    Applies the same inheritance rules (VRF-aware parent prefixes, cross-model
+    CustomPrefix inheritance) using a fixed number of queries for the whole batch
+    and a sweep over the Address span columns instead of per-object lookups.
+    Returns {object_id: [address_id, ...]}.
+    """
+    from ipam.models import Prefix
 
-    direct_address_set_ids = set(
-        AddressSet.objects.filter(addresses__id__in=address_ids)
-        .values_list("id", flat=True)
-        .distinct()
-    )
+    inherited = {object_id: [] for object_id in target_objects}
+    target_spans = {
+        object_id: span
+        for object_id, span in (
+            (object_id, get_object_span(obj))
+            for object_id, obj in target_objects.items()
+        )
+        if span
+    }
+    if not target_spans:
+        return inherited
 
-    # Also get address sets from inherited addresses
-    inherited_address_set_ids = set(
-        AddressSet.objects.filter(addresses__id__in=inherited_address_ids)
-        .values_list("id", flat=True)
-        .distinct()
+    model_name = next(iter(target_objects.values()))._meta.model_name
+
+    if model_name in ("prefix", "iprange", "ipaddress"):
+        # Parent prefixes must share the VRF of the target. Prefix and IPAddress
+        # targets need strict containment, mirroring net_contains in the ORM path.
+        prefix_rows = _get_span_address_rows((("ipam", "prefix"),), target_spans)
+        prefix_vrf_ids = dict(
+            Prefix.objects.filter(
+                pk__in={object_id for _, object_id, _ in prefix_rows}
+            ).values_list("pk", "vrf_id")
+        )
+        matches = find_containing_spans(
+            (
+                (
+                    (span[2], prefix_vrf_ids[object_id]),
+                    span[0],
+                    span[1],
+                    (address_id, span),
+                )
+                for address_id, object_id, span in prefix_rows
+                if object_id in prefix_vrf_ids
+            ),
+            (
+                (
+                    (span[2], target_objects[object_id].vrf_id),
+                    span[0],
+                    span[1],
+                    object_id,
+                )
+                for object_id, span in target_spans.items()
+            ),
+        )
+        strict = model_name in ("prefix", "ipaddress")
+        for object_id, parents in matches.items():
+            for address_id, parent_span in parents:
+                if strict and parent_span == target_spans[object_id]:
+                    continue
+                inherited[object_id].append(address_id)
+
+        parent_models = (("netbox_security", "customprefix"),)
+    elif model_name == "customprefix":
+        customprefix_rows = _get_span_address_rows(
+            (("netbox_security", "customprefix"),), target_spans
+        )
+        matches = find_containing_spans(
+            (
+                (span[2], span[0], span[1], (address_id, object_id))
+                for address_id, object_id, span in customprefix_rows
+            ),
+            (
+                (span[2], span[0], span[1], object_id)
+                for object_id, span in target_spans.items()
+            ),
+        )
+        for object_id, parents in matches.items():
+            inherited[object_id].extend(
+                address_id
+                for address_id, parent_object_id in parents
+                if parent_object_id != object_id
+            )
+
+        parent_models = (("ipam", "prefix"), ("ipam", "ipaddress"), ("ipam", "iprange"))
+    else:
+        return inherited
+
+    # Cross-model inheritance uses plain containment without VRF awareness.
+    matches = find_containing_spans(
+        (
+            (span[2], span[0], span[1], address_id)
+            for address_id, _, span in _get_span_address_rows(
+                parent_models, target_spans
+            )
+        ),
+        (
+            (span[2], span[0], span[1], object_id)
+            for object_id, span in target_spans.items()
+        ),
+    )
+    for object_id, address_ids in matches.items():
+        inherited[object_id].extend(address_ids)
+
+    for object_id, address_ids in inherited.items():
+        direct_address_ids = set(direct_address_ids_by_object.get(object_id, ()))
+        inherited[object_id] = [
+            address_id
+            for address_id in address_ids
+            if address_id not in direct_address_ids
+        ]
+    return inherited
+
+
+def _use_effective_address_table(app_label, model):
+    return (app_label, model) in SPAN_MODELS and get_plugin_config(
+        "netbox_security", "effective_address_table"
     )
 
-    relation_field = AddressSet._meta.get_field("address_sets")
-    parent_field = relation_field.m2m_field_name()
-    child_field = relation_field.m2m_reverse_field_name()
-    through_model = relation_field.remote_field.through
 
+def get_stored_effective_address_ids(content_type, object_ids):
+    """Return direct and inherited address IDs per object from EffectiveAddress.
+
+    A single indexed lookup on (assigned_object_type, assigned_object_id)
+    replaces resolving inheritance at read time.
+    """
+    direct_by_object = defaultdict(list)
+    inherited_by_object = defaultdict(list)
+    for object_id, address_id, inherited in EffectiveAddress.objects.filter(
+        assigned_object_type=content_type,
+        assigned_object_id__in=object_ids,
+    ).values_list("assigned_object_id", "address_id", "inherited"):
+        if inherited:
+            inherited_by_object[object_id].append(address_id)
+        else:
+            direct_by_object[object_id].append(address_id)
+    return direct_by_object, inherited_by_object
+
+
+def get_address_set_parent_map(address_set_ids, use_closure=None):
+    """Return (all_address_set_ids, parent_map) for the given sets and their ancestors.
+
+    With the closure table every ancestor is fetched in a single indexed query and
+    the nesting edges between them in a second one. Without it the
+    AddressSet.address_sets through-table is walked one nesting level at a time.
+    """
+    if use_closure is None:
+        use_closure = get_plugin_config("netbox_security", "address_set_closure")
+
+    through_model, parent_column, child_column = get_address_set_edges_model()
     parent_map = defaultdict(set)
-    all_address_set_ids = set(direct_address_set_ids) | inherited_address_set_ids
-    frontier = all_address_set_ids.copy()
+    all_address_set_ids = set(address_set_ids)
+
+    if use_closure:
+        if all_address_set_ids:
+            all_address_set_ids |= get_address_set_ancestor_ids(all_address_set_ids)
+            relation_rows = through_model.objects.filter(
+                **{f"{child_column}__in": list(all_address_set_ids)}
+            ).values_list(parent_column, child_column)
+            for parent_id, child_id in relation_rows:
+                parent_map[child_id].add(parent_id)
+                all_address_set_ids.add(parent_id)
+        return all_address_set_ids, parent_map
 
+    frontier = all_address_set_ids.copy()
     while frontier:
         relation_rows = through_model.objects.filter(
-            **{f"{child_field}_id__in": list(frontier)}
-        ).values_list(f"{parent_field}_id", f"{child_field}_id")
+            **{f"{child_column}__in": list(frontier)}
+        ).values_list(parent_column, child_column)
 
         new_frontier = set()
         for parent_id, child_id in relation_rows:
@@ -342,276 +408,823 @@ def get_address_set_hierarchy(*, app_label, model, object_id):
 
         frontier = new_frontier
 
-    def build_addressset_paths(child_id, trail=None):
-        if trail is None:
-            trail = set()
-        if child_id in trail:
-            return []
-
-        parents = sorted(parent_map.get(child_id, ()))
-        if not parents:
-            return [[child_id]]
-
-        paths = []
-        for parent_id in parents:
-            for parent_path in build_addressset_paths(parent_id, trail | {child_id}):
-                paths.append([*parent_path, child_id])
-        return paths
-
-    addressset_paths = []
-    paths_by_direct_set = {}
-    for direct_id in sorted(direct_address_set_ids | inherited_address_set_ids):
-        direct_paths = build_addressset_paths(direct_id)
-        paths_by_direct_set[direct_id] = direct_paths
-        addressset_paths.extend(direct_paths)
-    unique_addressset_paths = sorted({tuple(path) for path in addressset_paths})
-    direct_memberships = (
-        AddressSet.objects.filter(addresses__id__in=address_ids)
-        .values_list("addresses__id", "id")
-        .distinct()
-    )
-    # Also get memberships from inherited addresses
-    inherited_memberships = (
-        AddressSet.objects.filter(addresses__id__in=inherited_address_ids)
-        .values_list("addresses__id", "id")
-        .distinct()
-    )
+    return all_address_set_ids, parent_map
+
+
+def _get_address_object_map(address_ids):
+    # Ordered once by (name, pk) in the database so per-object lists keep the
+    # same ordering as a direct query would.
+    return {
+        obj.pk: obj
+        for obj in Address.objects.filter(id__in=address_ids)
+        .prefetch_related("assigned_object")
+        .order_by("name", "pk")
+    }
+
+
+def _set_address_list_assigned_objects(
+    address_lists, address_object_map, address_set_object_map
+):
+    # Reuse the instances already loaded instead of resolving the generic
+    # foreign key again, one query per Address List.
+    address_ct = ContentType.objects.get_for_model(Address)
+    for address_list in address_lists:
+        if address_list.assigned_object_type_id == address_ct.pk:
+            assigned_object = address_object_map.get(address_list.assigned_object_id)
+        else:
+            assigned_object = address_set_object_map.get(
+                address_list.assigned_object_id
+            )
+        if assigned_object is not None:
+            address_list.assigned_object = assigned_object
+
+
+def _get_path_page(path_offset, path_limit, path_count, row_count):
+    """Describe the window of paths and hierarchy rows included in a result."""
+    number = path_offset // path_limit + 1 if path_limit else 1
+    return {
+        "offset": path_offset,
+        "limit": path_limit,
+        "number": number,
+        "path_count": path_count,
+        "row_count": row_count,
+        "has_previous": path_offset > 0,
+        # Every path ends in a set holding at least one Address, so there are
+        # never fewer hierarchy rows than paths.
+        "has_next": path_offset + path_limit < row_count,
+        "previous_number": max(number - 1, 1),
+        "next_number": number + 1,
+    }
+
+
+def _empty_address_set_hierarchy(object_id):
+    return {
+        "assigned_object_id": object_id,
+        "address_ids": [],
+        "address_objects": [],
+        "inherited_address_ids": [],
+        "inherited_address_objects": [],
+        "direct_address_set_ids": [],
+        "all_address_set_ids": [],
+        "address_set_paths": [],
+        "address_set_object_paths": [],
+        "address_set_hierarchy_rows": [],
+        "address_set_name_paths": [],
+        "address_set_graph": {"nodes": [], "edges": []},
+        "address_set_path_page": _get_path_page(0, 0, 0, 0),
+        "address_list_ids": [],
+        "address_list_objects": [],
+        "address_list_names": [],
+        "policy_paths": [],
+    }
 
-    direct_sets_by_address = defaultdict(set)
-    for address_id, address_set_id in direct_memberships:
-        direct_sets_by_address[address_id].add(address_set_id)
-    for address_id, address_set_id in inherited_memberships:
-        direct_sets_by_address[address_id].add(address_set_id)
 
-    address_object_map = {
-        obj.pk: obj for obj in Address.objects.filter(id__in=effective_address_ids)
+def _build_address_set_hierarchies(
+    object_ids,
+    address_ids_by_object,
+    inherited_ids_by_object,
+    use_closure=None,
+    path_offset=0,
+    path_limit=None,
+):
+    """Resolve the security context for many objects with set-based queries.
+
+    Every query below covers the whole batch; the per-object results are then
+    assembled in memory, so the number of queries does not depend on the number
+    of objects or on the size of their hierarchies. Related objects the results
+    expose (zones, content types, generic assigned objects) are loaded up front
+    so that reading them, e.g. while rendering, does not query either. Only the
+    level-by-level walk used without the closure table grows with nesting depth.
+    Address Set paths and hierarchy rows are limited to the window given by
+    path_offset and path_limit.
+    """
+    results = {}
+    effective_ids_by_object = {
+        object_id: sorted(
+            set(address_ids_by_object.get(object_id, ()))
+            | set(inherited_ids_by_object.get(object_id, ()))
+        )
+        for object_id in object_ids
+    }
+    all_effective_address_ids = set().union(*effective_ids_by_object.values())
+    if not all_effective_address_ids:
+        return {
+            object_id: _empty_address_set_hierarchy(object_id)
+            for object_id in object_ids
+        }
+
+    through_model, address_set_column, address_column = get_address_membership_model()
+    sets_by_address = defaultdict(set)
+    for address_set_id, address_id in through_model.objects.filter(
+        **{f"{address_column}__in": list(all_effective_address_ids)}
+    ).values_list(address_set_column, address_column):
+        sets_by_address[address_id].add(address_set_id)
+
+    all_address_set_ids, parent_map = get_address_set_parent_map(
+        set().union(*sets_by_address.values()), use_closure=use_closure
+    )
+
+    address_object_map = _get_address_object_map(all_effective_address_ids)
+    address_order = {
+        address_id: rank for rank, address_id in enumerate(address_object_map)
     }
     address_set_object_map = {
         obj.pk: obj for obj in AddressSet.objects.filter(id__in=all_address_set_ids)
     }
 
-    hierarchy_rows = set()
-    for address_id in sorted(effective_address_ids):
-        for direct_set_id in sorted(direct_sets_by_address.get(address_id, ())):
-            for path in paths_by_direct_set.get(direct_set_id, [[direct_set_id]]):
-                hierarchy_rows.add((tuple(path), address_id))
-    sorted_hierarchy_rows = sorted(hierarchy_rows)
-
     address_ct = ContentType.objects.get_for_model(Address)
     address_set_ct = ContentType.objects.get_for_model(AddressSet)
-
-    address_list_ids = set(
-        AddressList.objects.filter(
-            assigned_object_type=address_ct,
-            assigned_object_id__in=effective_address_ids,
-        ).values_list("id", flat=True)
-    )
-    if all_address_set_ids:
-        address_list_ids.update(
-            AddressList.objects.filter(
+    address_list_object_map = {
+        obj.pk: obj
+        for obj in AddressList.objects.filter(
+            Q(
+                assigned_object_type=address_ct,
+                assigned_object_id__in=all_effective_address_ids,
+            )
+            | Q(
                 assigned_object_type=address_set_ct,
                 assigned_object_id__in=all_address_set_ids,
-            ).values_list("id", flat=True)
-        )
-    address_list_object_map = {
-        obj.pk: obj for obj in AddressList.objects.filter(id__in=address_list_ids)
+            )
+        ).select_related("assigned_object_type")
     }
+    _set_address_list_assigned_objects(
+        address_list_object_map.values(), address_object_map, address_set_object_map
+    )
+    address_lists_by_address = defaultdict(set)
+    address_lists_by_address_set = defaultdict(set)
+    for address_list in address_list_object_map.values():
+        if address_list.assigned_object_type_id == address_ct.pk:
+            address_lists_by_address[address_list.assigned_object_id].add(
+                address_list.pk
+            )
+        else:
+            address_lists_by_address_set[address_list.assigned_object_id].add(
+                address_list.pk
+            )
 
-    policy_rows = []
+    policy_links_by_address_list = defaultdict(list)
     policy_object_map = {}
-    if address_list_ids:
-        source_policies = SecurityZonePolicy.objects.filter(
-            source_address__id__in=address_list_ids
-        ).distinct()
-        destination_policies = SecurityZonePolicy.objects.filter(
-            destination_address__id__in=address_list_ids
-        ).distinct()
-
-        source_policy_ids = set(source_policies.values_list("id", flat=True))
-        destination_policy_ids = set(destination_policies.values_list("id", flat=True))
-
-        for policy in source_policies:
-            policy_object_map[policy.pk] = policy
-        for policy in destination_policies:
-            policy_object_map[policy.pk] = policy
-
-        source_links = SecurityZonePolicy.source_address.through.objects.filter(
-            securityzonepolicy_id__in=source_policy_ids,
-            addresslist_id__in=address_list_ids,
-        ).values_list("securityzonepolicy_id", "addresslist_id")
-        destination_links = (
-            SecurityZonePolicy.destination_address.through.objects.filter(
-                securityzonepolicy_id__in=destination_policy_ids,
-                addresslist_id__in=address_list_ids,
-            ).values_list("securityzonepolicy_id", "addresslist_id")
+    if address_list_object_map:
+        for direction, relation in (
+            ("source", SecurityZonePolicy.source_address),
+            ("destination", SecurityZonePolicy.destination_address),
+        ):
+            for policy_id, address_list_id in relation.through.objects.filter(
+                addresslist_id__in=list(address_list_object_map)
+            ).values_list("securityzonepolicy_id", "addresslist_id"):
+                policy_links_by_address_list[address_list_id].append(
+                    (policy_id, direction)
+                )
+        policy_object_map = {
+            obj.pk: obj
+            for obj in SecurityZonePolicy.objects.filter(
+                pk__in={
+                    policy_id
+                    for links in policy_links_by_address_list.values()
+                    for policy_id, _ in links
+                }
+            ).select_related("source_zone", "destination_zone")
+        }
+
+    if path_limit is None:
+        path_limit = get_plugin_config("netbox_security", "address_set_path_limit")
+    path_offset = max(path_offset, 0)
+
+    for object_id in object_ids:
+        effective_address_ids = effective_ids_by_object[object_id]
+        if not effective_address_ids:
+            results[object_id] = _empty_address_set_hierarchy(object_id)
+            continue
+
+        address_ids = sorted(set(address_ids_by_object.get(object_id, ())))
+        inherited_address_ids = sorted(inherited_ids_by_object.get(object_id, ()))
+
+        direct_address_set_ids = {
+            address_set_id
+            for address_id in address_ids
+            for address_set_id in sets_by_address.get(address_id, ())
+        }
+        member_address_set_ids = {
+            address_set_id
+            for address_id in effective_address_ids
+            for address_set_id in sets_by_address.get(address_id, ())
+        }
+
+        # Hierarchy rows are produced from the nesting DAG one page at a time;
+        # listing them all is exponential when sets are shared by many parents.
+        dag = build_address_set_dag(member_address_set_ids, parent_map)
+        object_address_set_ids = set(dag["parents"])
+
+        addresses_by_member = defaultdict(list)
+        for address_id in effective_address_ids:
+            for address_set_id in sets_by_address.get(address_id, ()):
+                addresses_by_member[address_set_id].append(address_id)
+        row_weights = {
+            address_set_id: len(member_address_ids)
+            for address_set_id, member_address_ids in addresses_by_member.items()
+        }
+        page_hierarchy_rows = [
+            (path, addresses_by_member[path[-1]][item_index])
+            for path, item_index in get_address_set_path_page(
+                dag, offset=path_offset, limit=path_limit, weights=row_weights
+            )
+        ]
+        # The paths of a page are those of its hierarchy rows, so both are paged
+        # by the same row count.
+        page_paths = list(dict.fromkeys(path for path, _ in page_hierarchy_rows))
+        path_count = count_address_set_paths(dag)
+        row_count = count_address_set_paths(dag, weights=row_weights)
+
+        address_list_ids = set()
+        for address_id in effective_address_ids:
+            address_list_ids |= address_lists_by_address.get(address_id, set())
+        for address_set_id in object_address_set_ids:
+            address_list_ids |= address_lists_by_address_set.get(address_set_id, set())
+
+        policy_rows = set()
+        for address_list_id in address_list_ids:
+            address_list = address_list_object_map[address_list_id]
+            for policy_id, direction in policy_links_by_address_list.get(
+                address_list_id, ()
+            ):
+                policy = policy_object_map.get(policy_id)
+                if not policy:
+                    continue
+                policy_rows.add(
+                    (
+                        policy.pk,
+                        policy.name,
+                        policy.index,
+                        tuple(policy.policy_actions or []),
+                        direction,
+                        policy.source_zone_id,
+                        policy.destination_zone_id,
+                        policy.source_zone.name,
+                        policy.destination_zone.name,
+                        address_list_id,
+                        address_list.name,
+                        (
+                            address_list.assigned_object_type.model
+                            if address_list.assigned_object_type_id
+                            else ""
+                        ),
+                        address_list.assigned_object_id or 0,
+                    )
+                )
+        unique_policy_rows = sorted(
+            policy_rows, key=lambda row: (row[2], row[0], row[4], row[9])
         )
 
-        for policy_id, address_list_id in source_links:
-            policy = policy_object_map.get(policy_id)
-            address_list = address_list_object_map.get(address_list_id)
-            if not policy:
-                continue
-            policy_rows.append(
+        results[object_id] = {
+            "assigned_object_id": object_id,
+            "address_ids": address_ids,
+            "address_objects": [
+                address_object_map[address_id]
+                for address_id in sorted(address_ids, key=address_order.get)
+            ],
+            "inherited_address_ids": inherited_address_ids,
+            "inherited_address_objects": [
+                address_object_map[address_id]
+                for address_id in sorted(
+                    set(inherited_address_ids), key=address_order.get
+                )
+            ],
+            "direct_address_set_ids": sorted(direct_address_set_ids),
+            "all_address_set_ids": sorted(object_address_set_ids),
+            "address_set_paths": [list(path) for path in page_paths],
+            "address_set_object_paths": [
+                [address_set_object_map.get(address_set_id) for address_set_id in path]
+                for path in page_paths
+            ],
+            "address_set_hierarchy_rows": [
                 {
-                    "policy_id": policy.pk,
-                    "policy_name": policy.name,
-                    "policy_index": policy.index,
-                    "policy_actions": list(policy.policy_actions or []),
-                    "direction": "source",
-                    "source_zone_id": policy.source_zone_id,
-                    "destination_zone_id": policy.destination_zone_id,
-                    "source_zone_name": policy.source_zone.name,
-                    "destination_zone_name": policy.destination_zone.name,
-                    "address_list_id": address_list_id,
-                    "address_list_name": address_list.name if address_list else "",
-                    "context_model": (
-                        address_list.assigned_object_type.model
-                        if address_list and address_list.assigned_object_type_id
-                        else ""
-                    ),
-                    "context_object_id": (
-                        address_list.assigned_object_id
-                        if address_list and address_list.assigned_object_id
-                        else 0
-                    ),
+                    "path": [
+                        address_set_object_map.get(address_set_id)
+                        for address_set_id in path
+                    ],
+                    "address": address_object_map.get(address_id),
                 }
-            )
-
-        for policy_id, address_list_id in destination_links:
-            policy = policy_object_map.get(policy_id)
-            address_list = address_list_object_map.get(address_list_id)
-            if not policy:
-                continue
-            policy_rows.append(
+                for path, address_id in page_hierarchy_rows
+            ],
+            "address_set_name_paths": [
+                [
+                    (
+                        address_set_object_map[address_set_id].name
+                        if address_set_id in address_set_object_map
+                        else str(address_set_id)
+                    )
+                    for address_set_id in path
+                ]
+                for path in page_paths
+            ],
+            "address_set_graph": {
+                "nodes": [
+                    {
+                        "id": address_set_id,
+                        "name": (
+                            address_set_object_map[address_set_id].name
+                            if address_set_id in address_set_object_map
+                            else str(address_set_id)
+                        ),
+                        "path_count": dag["path_counts"][address_set_id],
+                        "address_ids": addresses_by_member.get(address_set_id, []),
+                    }
+                    for address_set_id in sorted(dag["parents"])
+                ],
+                "edges": [
+                    [parent_id, child_id]
+                    for child_id in sorted(dag["parents"])
+                    for parent_id in dag["parents"][child_id]
+                ],
+            },
+            "address_set_path_page": _get_path_page(
+                path_offset, path_limit, path_count, row_count
+            ),
+            "address_list_ids": sorted(address_list_ids),
+            "address_list_objects": [
+                address_list_object_map[address_list_id]
+                for address_list_id in sorted(address_list_ids)
+            ],
+            "address_list_names": [
+                address_list_object_map[address_list_id].name
+                for address_list_id in sorted(address_list_ids)
+            ],
+            "policy_paths": [
                 {
-                    "policy_id": policy.pk,
-                    "policy_name": policy.name,
-                    "policy_index": policy.index,
-                    "policy_actions": list(policy.policy_actions or []),
-                    "direction": "destination",
-                    "source_zone_id": policy.source_zone_id,
-                    "destination_zone_id": policy.destination_zone_id,
-                    "source_zone_name": policy.source_zone.name,
-                    "destination_zone_name": policy.destination_zone.name,
-                    "address_list_id": address_list_id,
-                    "address_list_name": address_list.name if address_list else "",
-                    "context_model": (
-                        address_list.assigned_object_type.model
-                        if address_list and address_list.assigned_object_type_id
-                        else ""
-                    ),
-                    "context_object_id": (
-                        address_list.assigned_object_id
-                        if address_list and address_list.assigned_object_id
-                        else 0
-                    ),
+                    "policy_id": row[0],
+                    "policy_name": row[1],
+                    "policy_index": row[2],
+                    "policy_actions": list(row[3]),
+                    "direction": row[4],
+                    "source_zone_id": row[5],
+                    "destination_zone_id": row[6],
+                    "source_zone_name": row[7],
+                    "destination_zone_name": row[8],
+                    "address_list_id": row[9],
+                    "address_list_name": row[10],
+                    "address_list": address_list_object_map[row[9]],
+                    "context_model": row[11],
+                    "context_object_id": row[12],
+                    "context_object": address_list_object_map[row[9]].assigned_object,
+                    "policy": policy_object_map[row[0]],
+                    "source_zone": policy_object_map[row[0]].source_zone,
+                    "destination_zone": policy_object_map[row[0]].destination_zone,
                 }
-            )
+                for row in unique_policy_rows
+            ],
+        }
+
+    return results
 
-    unique_policy_rows = sorted(
+
+def _get_permitted_ids(model, object_ids, user):
+    if not object_ids:
+        return set()
+    return set(
+        model.objects.restrict(user, "view")
+        .filter(pk__in=list(object_ids))
+        .values_list("pk", flat=True)
+    )
+
+
+def restrict_address_set_hierarchies(hierarchies, user):
+    """Return the results of get_address_set_hierarchies() without what user cannot view.
+
+    Addresses, Address Sets, Address Lists, Security Zone Policies and Security
+    Zones are checked against their restricted querysets, one query per model for
+    the whole batch. Address Set paths, hierarchy rows and graph edges passing
+    through a hidden Address Set are dropped, as are policy paths whose policy,
+    Address List or zones are hidden; the path page totals still count them.
+    """
+    address_ids = set()
+    address_set_ids = set()
+    address_list_ids = set()
+    policy_ids = set()
+    zone_ids = set()
+    for result in hierarchies.values():
+        address_ids.update(result["address_ids"], result["inherited_address_ids"])
+        address_set_ids.update(result["all_address_set_ids"])
+        address_list_ids.update(result["address_list_ids"])
+        for path in result["policy_paths"]:
+            policy_ids.add(path["policy_id"])
+            zone_ids.update((path["source_zone_id"], path["destination_zone_id"]))
+
+    addresses = _get_permitted_ids(Address, address_ids, user)
+    address_sets = _get_permitted_ids(AddressSet, address_set_ids, user)
+    address_lists = _get_permitted_ids(AddressList, address_list_ids, user)
+    policies = _get_permitted_ids(SecurityZonePolicy, policy_ids, user)
+    zones = _get_permitted_ids(SecurityZone, zone_ids, user)
+
+    restricted = {}
+    for object_id, result in hierarchies.items():
+        visible_paths = [
+            position
+            for position, path in enumerate(result["address_set_paths"])
+            if address_sets.issuperset(path)
+        ]
+        visible_lists = [
+            position
+            for position, address_list_id in enumerate(result["address_list_ids"])
+            if address_list_id in address_lists
+        ]
+        restricted[object_id] = {
+            **result,
+            "address_ids": [
+                address_id
+                for address_id in result["address_ids"]
+                if address_id in addresses
+            ],
+            "address_objects": [
+                address
+                for address in result["address_objects"]
+                if address.pk in addresses
+            ],
+            "inherited_address_ids": [
+                address_id
+                for address_id in result["inherited_address_ids"]
+                if address_id in addresses
+            ],
+            "inherited_address_objects": [
+                address
+                for address in result["inherited_address_objects"]
+                if address.pk in addresses
+            ],
+            "direct_address_set_ids": [
+                address_set_id
+                for address_set_id in result["direct_address_set_ids"]
+                if address_set_id in address_sets
+            ],
+            "all_address_set_ids": [
+                address_set_id
+                for address_set_id in result["all_address_set_ids"]
+                if address_set_id in address_sets
+            ],
+            **{
+                key: [result[key][position] for position in visible_paths]
+                for key in (
+                    "address_set_paths",
+                    "address_set_object_paths",
+                    "address_set_name_paths",
+                )
+            },
+            "address_set_hierarchy_rows": [
+                row
+                for row in result["address_set_hierarchy_rows"]
+                if row["address"] is not None
+                and row["address"].pk in addresses
+                and all(
+                    address_set is not None and address_set.pk in address_sets
+                    for address_set in row["path"]
+                )
+            ],
+            "address_set_graph": {
+                "nodes": [
+                    {
+                        **node,
+                        "address_ids": [
+                            address_id
+                            for address_id in node["address_ids"]
+                            if address_id in addresses
+                        ],
+                    }
+                    for node in result["address_set_graph"]["nodes"]
+                    if node["id"] in address_sets
+                ],
+                "edges": [
+                    edge
+                    for edge in result["address_set_graph"]["edges"]
+                    if address_sets.issuperset(edge)
+                ],
+            },
+            **{
+                key: [result[key][position] for position in visible_lists]
+                for key in (
+                    "address_list_ids",
+                    "address_list_objects",
+                    "address_list_names",
+                )
+            },
+            "policy_paths": [
+                path
+                for path in result["policy_paths"]
+                if path["policy_id"] in policies
+                and path["address_list_id"] in address_lists
+                and path["source_zone_id"] in zones
+                and path["destination_zone_id"] in zones
+            ],
+        }
+    return restricted
+
+
+# Keys of a hierarchy, and of its policy paths, holding model instances.
+HIERARCHY_OBJECT_KEYS = (
+    "address_objects",
+    "inherited_address_objects",
+    "address_set_object_paths",
+    "address_list_objects",
+)
+POLICY_PATH_OBJECT_KEYS = (
+    "address_list",
+    "context_object",
+    "policy",
+    "source_zone",
+    "destination_zone",
+)
+
+
+def dehydrate_address_set_hierarchy(hierarchy):
+    """Return a copy of a hierarchy holding only IDs and plain values.
+
+    hydrate_address_set_hierarchy() loads the model instances back, so the copy
+    can be cached without pickling them.
+    """
+    dehydrated = {
+        key: value
+        for key, value in hierarchy.items()
+        if key not in HIERARCHY_OBJECT_KEYS
+    }
+    dehydrated["address_set_hierarchy_rows"] = [
         {
-            (
-                row["policy_id"],
-                row["policy_name"],
-                row["policy_index"],
-                tuple(row["policy_actions"]),
-                row["direction"],
-                row["source_zone_id"],
-                row["destination_zone_id"],
-                row["source_zone_name"],
-                row["destination_zone_name"],
-                row["address_list_id"],
-                row["address_list_name"],
-                row["context_model"],
-                row["context_object_id"],
-            )
-            for row in policy_rows
-        },
-        key=lambda row: (row[2], row[0], row[4], row[9]),
+            "path": [getattr(address_set, "pk", None) for address_set in row["path"]],
+            "address": getattr(row["address"], "pk", None),
+        }
+        for row in hierarchy["address_set_hierarchy_rows"]
+    ]
+    dehydrated["policy_paths"] = [
+        {
+            key: value
+            for key, value in path.items()
+            if key not in POLICY_PATH_OBJECT_KEYS
+        }
+        for path in hierarchy["policy_paths"]
+    ]
+    return dehydrated
+
+
+def hydrate_address_set_hierarchy(hierarchy):
+    """Return a hierarchy from dehydrate_address_set_hierarchy() with its objects.
+
+    The Addresses, Address Sets, Address Lists and policies are loaded with one
+    query per model, whatever the size of the hierarchy.
+    """
+    if not hierarchy["address_ids"] and not hierarchy["inherited_address_ids"]:
+        return _empty_address_set_hierarchy(hierarchy["assigned_object_id"])
+
+    address_object_map = _get_address_object_map(
+        set(hierarchy["address_ids"]) | set(hierarchy["inherited_address_ids"])
     )
+    address_order = {
+        address_id: rank for rank, address_id in enumerate(address_object_map)
+    }
+    address_set_object_map = AddressSet.objects.in_bulk(
+        hierarchy["all_address_set_ids"]
+    )
+    address_list_object_map = AddressList.objects.select_related(
+        "assigned_object_type"
+    ).in_bulk(hierarchy["address_list_ids"])
+    _set_address_list_assigned_objects(
+        address_list_object_map.values(), address_object_map, address_set_object_map
+    )
+    policy_object_map = SecurityZonePolicy.objects.select_related(
+        "source_zone", "destination_zone"
+    ).in_bulk({path["policy_id"] for path in hierarchy["policy_paths"]})
+
+    def get_address_objects(address_ids):
+        return [
+            address_object_map[address_id]
+            for address_id in sorted(
+                set(address_ids) & set(address_object_map), key=address_order.get
+            )
+        ]
+
+    policy_paths = []
+    for path in hierarchy["policy_paths"]:
+        address_list = address_list_object_map.get(path["address_list_id"])
+        policy = policy_object_map.get(path["policy_id"])
+        if address_list is None or policy is None:
+            continue
+        policy_paths.append(
+            {
+                **path,
+                "address_list": address_list,
+                "context_object": address_list.assigned_object,
+                "policy": policy,
+                "source_zone": policy.source_zone,
+                "destination_zone": policy.destination_zone,
+            }
+        )
 
     return {
-        "assigned_object_id": object_id,
-        "address_ids": sorted(address_ids),
-        "address_objects": list(
-            Address.objects.filter(id__in=address_ids).order_by("name", "pk")
-        ),
-        "inherited_address_ids": sorted(inherited_address_ids),
-        "inherited_address_objects": list(
-            Address.objects.filter(id__in=inherited_address_ids).order_by("name", "pk")
+        **hierarchy,
+        "address_objects": get_address_objects(hierarchy["address_ids"]),
+        "inherited_address_objects": get_address_objects(
+            hierarchy["inherited_address_ids"]
         ),
-        "direct_address_set_ids": sorted(direct_address_set_ids),
-        "all_address_set_ids": sorted(all_address_set_ids),
-        "address_set_paths": [list(path) for path in unique_addressset_paths],
         "address_set_object_paths": [
             [address_set_object_map.get(address_set_id) for address_set_id in path]
-            for path in unique_addressset_paths
+            for path in hierarchy["address_set_paths"]
         ],
         "address_set_hierarchy_rows": [
             {
                 "path": [
                     address_set_object_map.get(address_set_id)
-                    for address_set_id in path
+                    for address_set_id in row["path"]
                 ],
-                "address": address_object_map.get(address_id),
+                "address": address_object_map.get(row["address"]),
             }
-            for path, address_id in sorted_hierarchy_rows
+            for row in hierarchy["address_set_hierarchy_rows"]
         ],
-        "address_set_name_paths": [
-            [
-                (
-                    address_set_object_map.get(address_set_id).name
-                    if address_set_object_map.get(address_set_id)
-                    else str(address_set_id)
-                )
-                for address_set_id in path
-            ]
-            for path in unique_addressset_paths
-        ],
-        "address_list_ids": sorted(address_list_ids),
         "address_list_objects": [
             address_list_object_map[address_list_id]
-            for address_list_id in sorted(address_list_ids)
-            if address_list_id in address_list_object_map
-        ],
-        "address_list_names": [
-            address_list_object_map[address_list_id].name
-            for address_list_id in sorted(address_list_ids)
+            for address_list_id in hierarchy["address_list_ids"]
             if address_list_id in address_list_object_map
         ],
-        "policy_paths": [
-            {
-                "policy_id": row[0],
-                "policy_name": row[1],
-                "policy_index": row[2],
-                "policy_actions": list(row[3]),
-                "direction": row[4],
-                "source_zone_id": row[5],
-                "destination_zone_id": row[6],
-                "source_zone_name": row[7],
-                "destination_zone_name": row[8],
-                "address_list_id": row[9],
-                "address_list_name": row[10],
-                "address_list": address_list_object_map.get(row[9]),
-                "context_model": row[11],
-                "context_object_id": row[12],
-                "context_object": (
-                    address_list_object_map.get(row[9]).assigned_object
-                    if address_list_object_map.get(row[9])
-                    else None
-                ),
-                "policy": policy_object_map.get(row[0]),
-                "source_zone": (
-                    policy_object_map.get(row[0]).source_zone
-                    if policy_object_map.get(row[0])
-                    else None
-                ),
-                "destination_zone": (
-                    policy_object_map.get(row[0]).destination_zone
-                    if policy_object_map.get(row[0])
-                    else None
-                ),
-            }
-            for row in unique_policy_rows
-        ],
+        "policy_paths": policy_paths,
     }
+
+
+def get_address_set_hierarchies(
+    app_label, model, object_ids, use_closure=None, path_offset=0, path_limit=None
+):
+    """Return the transitive security context for many objects of one model.
+
+    Runs a constant number of set-based queries for the whole batch and returns
+    {object_id: result}, each result in the same shape as get_address_set_hierarchy.
+    """
+    object_ids = list(dict.fromkeys(object_ids))
+    content_type = ContentType.objects.filter(app_label=app_label, model=model).first()
+    model_class = content_type.model_class() if content_type else None
+    if not model_class:
+        return {
+            object_id: _empty_address_set_hierarchy(None) for object_id in object_ids
+        }
+
+    if _use_effective_address_table(app_label, model):
+        address_ids_by_object, inherited_ids_by_object = (
+            get_stored_effective_address_ids(content_type, object_ids)
+        )
+    else:
+        address_ids_by_object = defaultdict(list)
+        for address_id, object_id in Address.objects.filter(
+            assigned_object_type=content_type,
+            assigned_object_id__in=object_ids,
+        ).values_list("id", "assigned_object_id"):
+            address_ids_by_object[object_id].append(address_id)
+
+        inherited_ids_by_object = get_inherited_address_ids_bulk(
+            model_class.objects.in_bulk(object_ids), address_ids_by_object
+        )
+
+    return _build_address_set_hierarchies(
+        object_ids,
+        address_ids_by_object,
+        inherited_ids_by_object,
+        use_closure=use_closure,
+        path_offset=path_offset,
+        path_limit=path_limit,
+    )
+
+
+def get_address_set_hierarchy(
+    *, app_label, model, object_id, use_closure=None, path_offset=0, path_limit=None
+):
+    """Return transitive security context for an assigned IPAM object.
+
+    Traversal:
+    assigned object -> Address -> AddressSet (direct + parent hierarchy) ->
+    AddressList -> SecurityZonePolicy (source/destination)
+
+    Set use_closure to force (True) or bypass (False) the AddressSetClosure
+    table; by default the address_set_closure plugin setting decides. With the
+    effective_address_table setting enabled, direct and inherited Addresses are
+    read from the EffectiveAddress table instead of being resolved here.
+
+    The nesting is returned as a DAG in address_set_graph, with the number of
+    root-to-set paths per node. Hierarchy rows, one per path and Address of its
+    last set, are enumerated lazily and only the window starting at path_offset
+    is included, at most path_limit rows (the address_set_path_limit plugin
+    setting by default), with the explicit paths of those rows;
+    address_set_path_page holds the totals.
+    """
+    content_type = ContentType.objects.filter(app_label=app_label, model=model).first()
+    model_class = content_type.model_class() if content_type else None
+    if not model_class:
+        return _empty_address_set_hierarchy(None)
+
+    if _use_effective_address_table(app_label, model):
+        address_ids_by_object, inherited_ids_by_object = (
+            get_stored_effective_address_ids(content_type, [object_id])
+        )
+        address_ids = address_ids_by_object[object_id]
+        inherited_address_ids = inherited_ids_by_object[object_id]
+    else:
+        address_ids = list(
+            Address.objects.filter(
+                assigned_object_type=content_type,
+                assigned_object_id=object_id,
+            ).values_list("id", flat=True)
+        )
+
+        # Get inherited addresses for IPAM child objects and CustomPrefix
+        inherited_address_ids = []
+        target_object = model_class.objects.filter(pk=object_id).first()
+        if target_object:
+            inherited_address_ids = _get_inherited_address_ids(
+                target_object, address_ids
+            )
+
+    return _build_address_set_hierarchies(
+        [object_id],
+        {object_id: address_ids},
+        {object_id: inherited_address_ids},
+        use_closure=use_closure,
+        path_offset=path_offset,
+        path_limit=path_limit,
+    )[object_id]
+
+
+def get_address_set_hierarchy_counts(
+    *, app_label, model, object_id, instance=None, use_closure=None
+):
+    """Return the sizes of get_address_set_hierarchy() without resolving it.
+
+    Only IDs and aggregate counts are read from the database; no Address,
+    AddressSet, AddressList or SecurityZonePolicy instances are built and no paths
+    are assembled. policy_path_count matches len(policy_paths) of the full result.
+    Pass instance when the assigned object is already loaded to save a query.
+    """
+    counts = {
+        "address_count": 0,
+        "inherited_address_count": 0,
+        "policy_path_count": 0,
+    }
+
+    content_type = ContentType.objects.filter(app_label=app_label, model=model).first()
+    model_class = content_type.model_class() if content_type else None
+    if not model_class:
+        return counts
+
+    if _use_effective_address_table(app_label, model):
+        address_ids_by_object, inherited_ids_by_object = (
+            get_stored_effective_address_ids(content_type, [object_id])
+        )
+        address_ids = address_ids_by_object[object_id]
+        inherited_address_ids = set(inherited_ids_by_object[object_id])
+    else:
+        address_ids = list(
+            Address.objects.filter(
+                assigned_object_type=content_type,
+                assigned_object_id=object_id,
+            ).values_list("id", flat=True)
+        )
+
+        if instance is None:
+            instance = model_class.objects.filter(pk=object_id).first()
+        inherited_address_ids = (
+            set(_get_inherited_address_ids(instance, address_ids))
+            if instance
+            else set()
+        )
+
+    effective_address_ids = set(address_ids) | inherited_address_ids
+    counts["address_count"] = len(address_ids)
+    counts["inherited_address_count"] = len(inherited_address_ids)
+    if not effective_address_ids:
+        return counts
+
+    through_model, address_set_column, address_column = get_address_membership_model()
+    member_address_set_ids = set(
+        through_model.objects.filter(
+            **{f"{address_column}__in": list(effective_address_ids)}
+        ).values_list(address_set_column, flat=True)
+    )
+    if use_closure is None:
+        use_closure = get_plugin_config("netbox_security", "address_set_closure")
+    if use_closure and member_address_set_ids:
+        all_address_set_ids = get_address_set_ancestor_ids(member_address_set_ids)
+    else:
+        all_address_set_ids, _ = get_address_set_parent_map(
+            member_address_set_ids, use_closure=False
+        )
+
+    address_lists = AddressList.objects.filter(
+        Q(
+            assigned_object_type=ContentType.objects.get_for_model(Address),
+            assigned_object_id__in=effective_address_ids,
+        )
+        | Q(
+            assigned_object_type=ContentType.objects.get_for_model(AddressSet),
+            assigned_object_id__in=all_address_set_ids,
+        )
+    ).values("pk")
+
+    # Each through row is a distinct (policy, address list) pair, which is exactly
+    # one policy path per direction.
+    counts["policy_path_count"] = sum(
+        relation.through.objects.filter(addresslist_id__in=address_lists).count()
+        for relation in (
+            SecurityZonePolicy.source_address,
+            SecurityZonePolicy.destination_address,
+        )
+    )
+    return counts
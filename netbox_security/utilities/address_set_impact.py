@@ -0,0 +1,322 @@
+from collections import defaultdict
+
+from dcim.models import Device, Interface, VirtualDeviceContext
+from django.contrib.contenttypes.models import ContentType
+from netbox.plugins import get_plugin_config
+from virtualization.models import VirtualMachine
+
+from netbox_security.models import (
+    Address,
+    AddressList,
+    AddressListAssignment,
+    AddressSet,
+    AddressSetAssignment,
+    EffectiveAddress,
+    SecurityZone,
+    SecurityZoneAssignment,
+    SecurityZonePolicy,
+)
+from netbox_security.utilities.address_set_closure import (
+    get_address_membership_model,
+    get_address_set_descendant_ids,
+    get_address_set_edges_model,
+)
+from netbox_security.utilities.address_set_hierarchy import (
+    get_address_set_parent_map,
+    get_inherited_address_ids_bulk,
+)
+from netbox_security.utilities.effective_addresses import (
+    BATCH_SIZE,
+    effective_address_table_enabled,
+    get_object_ids_within_spans,
+)
+
+__all__ = ("get_address_set_impact",)
+
+# Assigned object models that are, or belong to, a device.
+DEVICE_MODELS = {
+    ("dcim", "device"): "device_ids",
+    ("dcim", "virtualdevicecontext"): "virtual_device_context_ids",
+    ("virtualization", "virtualmachine"): "virtual_machine_ids",
+}
+DEVICE_ID_MODELS = {
+    "device_ids": Device,
+    "virtual_device_context_ids": VirtualDeviceContext,
+    "virtual_machine_ids": VirtualMachine,
+}
+
+# Fields the hierarchy resolver reads from the candidates for inheritance.
+SPAN_OBJECT_FIELDS = {
+    "prefix": ("prefix", "vrf"),
+    "ipaddress": ("address", "vrf"),
+    "iprange": ("start_address", "end_address", "vrf"),
+    "customprefix": ("prefix",),
+}
+
+
+def _get_descendant_ids(address_set_id, use_closure):
+    """Return the given set and every set nested below it."""
+    if use_closure:
+        return get_address_set_descendant_ids([address_set_id]) | {address_set_id}
+
+    through_model, parent_column, child_column = get_address_set_edges_model()
+    descendant_ids = {address_set_id}
+    frontier = {address_set_id}
+    while frontier:
+        child_ids = set(
+            through_model.objects.filter(
+                **{f"{parent_column}__in": list(frontier)}
+            ).values_list(child_column, flat=True)
+        )
+        frontier = child_ids - descendant_ids
+        descendant_ids |= frontier
+    return descendant_ids
+
+
+def _group_assigned_objects(rows):
+    """Group (content_type_id, object_id) rows into {(app_label, model): {IDs}}."""
+    grouped = defaultdict(set)
+    for content_type_id, object_id in rows:
+        if content_type_id and object_id:
+            content_type = ContentType.objects.get_for_id(content_type_id)
+            grouped[(content_type.app_label, content_type.model)].add(object_id)
+    return grouped
+
+
+def _get_inherited_object_ids(addresses):
+    """Return ({(app_label, model): {object IDs}}, complete) inheriting the Addresses.
+
+    Reads the EffectiveAddress table when it is enabled. Otherwise every object
+    starting inside one of the Address spans is a candidate, and the inheritance
+    rules of the hierarchy resolver decide which of them really inherit. Only
+    the fields spanning the candidates are loaded, a batch at a time, and at most
+    the address_set_impact_object_limit plugin setting of them are checked;
+    complete is False when more candidates were left out.
+    """
+    address_ids = {address["id"] for address in addresses}
+    inherited = defaultdict(set)
+
+    if effective_address_table_enabled():
+        return (
+            _group_assigned_objects(
+                EffectiveAddress.objects.filter(
+                    address_id__in=address_ids, inherited=True
+                )
+                .values_list("assigned_object_type_id", "assigned_object_id")
+                .distinct()
+            ),
+            True,
+        )
+
+    spans = {
+        (address["span_start"], address["span_end"], address["span_version"])
+        for address in addresses
+        if address["span_version"] is not None
+    }
+    remaining = get_plugin_config("netbox_security", "address_set_impact_object_limit")
+    complete = True
+    for (app_label, model_name), object_ids in get_object_ids_within_spans(
+        spans
+    ).items():
+        object_ids = sorted(object_ids)
+        if len(object_ids) > remaining:
+            object_ids = object_ids[:remaining]
+            complete = False
+        remaining -= len(object_ids)
+
+        content_type = ContentType.objects.get_by_natural_key(app_label, model_name)
+        queryset = content_type.model_class().objects.only(
+            *SPAN_OBJECT_FIELDS[model_name]
+        )
+        for index in range(0, len(object_ids), BATCH_SIZE):
+            target_objects = queryset.in_bulk(object_ids[index : index + BATCH_SIZE])
+            for object_id, inherited_ids in get_inherited_address_ids_bulk(
+                target_objects, {}
+            ).items():
+                if address_ids.intersection(inherited_ids):
+                    inherited[(app_label, model_name)].add(object_id)
+    return inherited, complete
+
+
+def _restrict_ids(model, object_ids, user):
+    """Return the object_ids of model the user may view; all of them without a user."""
+    if user is None or not object_ids:
+        return set(object_ids)
+    return set(
+        model.objects.restrict(user, "view")
+        .filter(pk__in=object_ids)
+        .values_list("pk", flat=True)
+    )
+
+
+def _format_object_ids(grouped, user=None):
+    formatted = {}
+    for (app_label, model_name), object_ids in sorted(grouped.items()):
+        model = ContentType.objects.get_by_natural_key(
+            app_label, model_name
+        ).model_class()
+        object_ids = _restrict_ids(model, object_ids, user)
+        if object_ids:
+            formatted[f"{app_label}.{model_name}"] = sorted(object_ids)
+    return formatted
+
+
+def get_address_set_impact(address_set_id, use_closure=None, user=None):
+    """Return everything affected by a change to the given Address Set.
+
+    Walks down from the set to its nested sets, their Addresses and the IPAM
+    objects those Addresses are assigned to or inherited by, and up to the sets
+    containing it, the Address Lists referencing any of those sets, the policies
+    using the lists and the Devices, Virtual Device Contexts and Virtual Machines
+    the sets, lists or policy zones are assigned to (directly or via an
+    Interface). Every step is a set-based query, so the number of queries does not
+    grow with the size of the result. inherited_object_ids_complete is False when
+    the inheriting objects were cut off at address_set_impact_object_limit, which
+    only applies without the effective_address_table setting. Given a user, the
+    whole graph is still walked, but only the objects the user may view are
+    returned.
+    """
+    if use_closure is None:
+        use_closure = get_plugin_config("netbox_security", "address_set_closure")
+
+    if not AddressSet.objects.filter(pk=address_set_id).exists():
+        return None
+
+    descendant_ids = _get_descendant_ids(address_set_id, use_closure)
+    ancestor_ids, _ = get_address_set_parent_map([address_set_id], use_closure)
+
+    membership_model, address_set_column, address_column = (
+        get_address_membership_model()
+    )
+    addresses = list(
+        Address.objects.filter(
+            pk__in=membership_model.objects.filter(
+                **{f"{address_set_column}__in": list(descendant_ids)}
+            ).values(address_column)
+        ).values(
+            "id",
+            "assigned_object_type_id",
+            "assigned_object_id",
+            "span_start",
+            "span_end",
+            "span_version",
+        )
+    )
+    direct_objects = _group_assigned_objects(
+        (address["assigned_object_type_id"], address["assigned_object_id"])
+        for address in addresses
+    )
+    inherited_objects, inherited_complete = _get_inherited_object_ids(addresses)
+    for key, object_ids in direct_objects.items():
+        if key in inherited_objects:
+            inherited_objects[key] -= object_ids
+
+    address_set_ct = ContentType.objects.get_for_model(AddressSet)
+    address_list_ids = set(
+        AddressList.objects.filter(
+            assigned_object_type=address_set_ct,
+            assigned_object_id__in=ancestor_ids,
+        ).values_list("pk", flat=True)
+    )
+
+    policy_links = []
+    zone_ids = set()
+    for direction, field_name in (
+        ("source", "source_address"),
+        ("destination", "destination_address"),
+    ):
+        relation_field = SecurityZonePolicy._meta.get_field(field_name)
+        through_model = relation_field.remote_field.through
+        policy_column = f"{relation_field.m2m_field_name()}_id"
+        address_list_column = f"{relation_field.m2m_reverse_field_name()}_id"
+        for (
+            policy_id,
+            address_list_id,
+            source_zone_id,
+            destination_zone_id,
+        ) in through_model.objects.filter(
+            **{f"{address_list_column}__in": address_list_ids}
+        ).values_list(
+            policy_column,
+            address_list_column,
+            f"{relation_field.m2m_field_name()}__source_zone_id",
+            f"{relation_field.m2m_field_name()}__destination_zone_id",
+        ):
+            policy_links.append(
+                {
+                    "policy_id": policy_id,
+                    "address_list_id": address_list_id,
+                    "direction": direction,
+                }
+            )
+            zone_ids.update(
+                zone_id for zone_id in (source_zone_id, destination_zone_id) if zone_id
+            )
+    policy_links.sort(
+        key=lambda link: (link["policy_id"], link["direction"], link["address_list_id"])
+    )
+
+    assignments = _group_assigned_objects(
+        [
+            *AddressSetAssignment.objects.filter(
+                address_set_id__in=ancestor_ids
+            ).values_list("assigned_object_type_id", "assigned_object_id"),
+            *AddressListAssignment.objects.filter(
+                address_list_id__in=address_list_ids
+            ).values_list("assigned_object_type_id", "assigned_object_id"),
+        ]
+    )
+    zone_ids |= assignments.pop(("netbox_security", "securityzone"), set())
+    for key, object_ids in _group_assigned_objects(
+        SecurityZoneAssignment.objects.filter(zone_id__in=zone_ids).values_list(
+            "assigned_object_type_id", "assigned_object_id"
+        )
+    ).items():
+        assignments[key] |= object_ids
+
+    devices = {key: set() for key in DEVICE_MODELS.values()}
+    for key, object_ids in assignments.items():
+        if key in DEVICE_MODELS:
+            devices[DEVICE_MODELS[key]] |= object_ids
+    interface_ids = assignments.get(("dcim", "interface"))
+    if interface_ids:
+        devices["device_ids"].update(
+            Interface.objects.filter(pk__in=interface_ids).values_list(
+                "device_id", flat=True
+            )
+        )
+
+    visible_list_ids = _restrict_ids(AddressList, address_list_ids, user)
+    visible_policy_ids = _restrict_ids(
+        SecurityZonePolicy, {link["policy_id"] for link in policy_links}, user
+    )
+    address_set_ids = _restrict_ids(
+        AddressSet, (ancestor_ids | descendant_ids) - {address_set_id}, user
+    )
+
+    return {
+        "address_set_id": address_set_id,
+        "ancestor_address_set_ids": sorted(address_set_ids & ancestor_ids),
+        "descendant_address_set_ids": sorted(address_set_ids & descendant_ids),
+        "address_ids": sorted(
+            _restrict_ids(Address, {address["id"] for address in addresses}, user)
+        ),
+        "assigned_object_ids": _format_object_ids(direct_objects, user),
+        "inherited_object_ids": _format_object_ids(
+            {key: ids for key, ids in inherited_objects.items() if ids}, user
+        ),
+        "inherited_object_ids_complete": inherited_complete,
+        "address_list_ids": sorted(visible_list_ids),
+        "policy_ids": sorted(visible_policy_ids),
+        "policy_links": [
+            link
+            for link in policy_links
+            if link["policy_id"] in visible_policy_ids
+            and link["address_list_id"] in visible_list_ids
+        ],
+        "security_zone_ids": sorted(_restrict_ids(SecurityZone, zone_ids, user)),
+        **{
+            key: sorted(_restrict_ids(DEVICE_ID_MODELS[key], object_ids, user))
+            for key, object_ids in devices.items()
+        },
+    }
@@ -0,0 +1,155 @@
+from itertools import islice
+
+from netbox.plugins import get_plugin_config
+
+__all__ = (
+    "build_address_set_dag",
+    "count_address_set_paths",
+    "get_address_set_path_offset",
+    "get_address_set_path_page",
+    "iter_address_set_paths",
+)
+
+
+def build_address_set_dag(member_ids, parent_map):
+    """Return the nesting graph above the given Address Sets as a DAG.
+
+    member_ids are the Address Sets that directly hold an Address; parent_map maps
+    a set ID to the IDs of the sets it is nested in. Only sets reachable upwards
+    from a member are kept. Nesting cycles are broken at the edge that closes
+    them, so every set appears at most once on a path.
+
+    The DAG is a plain dict so that it can be cached or pickled:
+    members, roots and order (topological, roots first) are sorted ID lists,
+    parents/children map IDs to sorted ID lists, and path_counts holds the number
+    of distinct root-to-set paths for every set.
+    """
+    members = sorted(set(member_ids))
+    parents = {}
+    order = []
+    state = {}
+
+    # Iterative DFS upwards; a parent that is still on the stack closes a cycle.
+    for member_id in members:
+        if member_id in state:
+            continue
+        state[member_id] = "open"
+        stack = [(member_id, iter(sorted(parent_map.get(member_id, ()))))]
+        parents[member_id] = []
+        while stack:
+            node_id, pending = stack[-1]
+            for parent_id in pending:
+                if state.get(parent_id) == "open":
+                    continue
+                parents[node_id].append(parent_id)
+                if parent_id not in state:
+                    state[parent_id] = "open"
+                    parents[parent_id] = []
+                    stack.append(
+                        (parent_id, iter(sorted(parent_map.get(parent_id, ()))))
+                    )
+                    break
+            else:
+                stack.pop()
+                state[node_id] = "done"
+                order.append(node_id)
+
+    children = {node_id: [] for node_id in parents}
+    for node_id, parent_ids in parents.items():
+        for parent_id in parent_ids:
+            children[parent_id].append(node_id)
+    for child_ids in children.values():
+        child_ids.sort()
+
+    path_counts = {}
+    for node_id in order:
+        path_counts[node_id] = (
+            sum(path_counts[parent_id] for parent_id in parents[node_id])
+            if parents[node_id]
+            else 1
+        )
+
+    return {
+        "members": members,
+        "roots": sorted(
+            node_id for node_id, parent_ids in parents.items() if not parent_ids
+        ),
+        "order": order,
+        "parents": parents,
+        "children": children,
+        "path_counts": path_counts,
+    }
+
+
+def _get_subtree_counts(dag, weights):
+    """Return how many items end in or below every set, for the given member weights."""
+    subtree_counts = {}
+    for node_id in reversed(dag["order"]):
+        subtree_counts[node_id] = weights.get(node_id, 0) + sum(
+            subtree_counts[child_id] for child_id in dag["children"][node_id]
+        )
+    return subtree_counts
+
+
+def count_address_set_paths(dag, weights=None):
+    """Return the number of root-to-member paths, each counted weights[member] times."""
+    if weights is None:
+        return sum(dag["path_counts"][member_id] for member_id in dag["members"])
+    return sum(
+        dag["path_counts"][member_id] * weights.get(member_id, 0)
+        for member_id in dag["members"]
+    )
+
+
+def iter_address_set_paths(dag, offset=0, weights=None):
+    """Lazily yield (path, item_index) pairs in lexicographic path order.
+
+    Every path runs from a root set down to a member set and is yielded once per
+    item held by that member (weights[member], one by default); item_index counts
+    from zero within the member. The first offset items are skipped using the
+    per-set counts, without walking the skipped paths.
+    """
+    if weights is None:
+        weights = dict.fromkeys(dag["members"], 1)
+    subtree_counts = _get_subtree_counts(dag, weights)
+    children = dag["children"]
+
+    def walk(node_id, path, skip):
+        path = (*path, node_id)
+        weight = weights.get(node_id, 0)
+        if skip >= weight:
+            skip -= weight
+        else:
+            for item_index in range(skip, weight):
+                yield path, item_index
+            skip = 0
+        for child_id in children[node_id]:
+            if skip >= subtree_counts[child_id]:
+                skip -= subtree_counts[child_id]
+                continue
+            yield from walk(child_id, path, skip)
+            skip = 0
+
+    skip = max(offset, 0)
+    for root_id in dag["roots"]:
+        if skip >= subtree_counts[root_id]:
+            skip -= subtree_counts[root_id]
+            continue
+        yield from walk(root_id, (), skip)
+        skip = 0
+
+
+def get_address_set_path_page(dag, offset=0, limit=None, weights=None):
+    """Return at most limit items of iter_address_set_paths() starting at offset."""
+    if limit is None:
+        limit = get_plugin_config("netbox_security", "address_set_path_limit")
+    return list(islice(iter_address_set_paths(dag, offset, weights), limit))
+
+
+def get_address_set_path_offset(page):
+    """Convert a 1-based page number (e.g. a query parameter) into a path offset."""
+    try:
+        page = max(int(page), 1)
+    except (TypeError, ValueError):
+        page = 1
+    return (page - 1) * get_plugin_config("netbox_security", "address_set_path_limit")
@@ -0,0 +1,332 @@
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from dcim.models import Device, VirtualDeviceContext
+from ipam.models import IPAddress, IPRange, Prefix
+from netbox_security.models import (
+    Address,
+    AddressList,
+    AddressSet,
+    CustomPrefix,
+    FirewallFilterRule,
+    NatRule,
+    NatRuleSet,
+    SecurityZone,
+    SecurityZonePolicy,
+)
+from netbox_security.utilities.address_set_hierarchy import get_address_set_hierarchy
+from netbox_security.utilities.policy_analysis import analyze_zone_pair
+from netbox_security.utilities.policy_context_cache import (
+    get_cached_address_set_hierarchy,
+)
+from netbox_security.version import __version__
+from utilities.views import get_viewname
+from virtualization.models import VirtualMachine
+
+__all__ = (
+    "BENCHMARK_GROUPS",
+    "compare_benchmark_results",
+    "run_security_benchmarks",
+)
+
+BENCHMARK_GROUPS = ("hierarchy", "tabs", "lists", "api", "memory", "analysis")
+
+# Models whose list views and API list endpoints are benchmarked.
+LIST_MODELS = (
+    CustomPrefix,
+    Address,
+    AddressSet,
+    AddressList,
+    SecurityZone,
+    SecurityZonePolicy,
+    NatRuleSet,
+    NatRule,
+    FirewallFilterRule,
+)
+
+# Policies of the synthetic zone pairs whose policies all overlap each other.
+OVERLAPPING_POLICY_COUNTS = (100, 500)
+
+# Models with a Security tab; CustomPrefix shows its context on the detail view.
+TAB_MODELS = (Prefix, IPRange, IPAddress, Device, VirtualDeviceContext, VirtualMachine)
+
+
+def _measure(function, iterations, trace_memory=False):
+    """Call function iterations times and return timing and query statistics.
+
+    With trace_memory, the highest memory peak of the runs is recorded as well;
+    tracing slows the runs down, so their times are not comparable with those of
+    untraced benchmarks.
+    """
+    durations = []
+    query_counts = []
+    peaks = []
+    for _ in range(iterations):
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                function()
+                durations.append((time.perf_counter() - start) * 1000)
+            if trace_memory:
+                peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+        query_counts.append(len(queries))
+    result = {
+        "iterations": iterations,
+        "min_ms": round(min(durations), 3),
+        "median_ms": round(statistics.median(durations), 3),
+        "max_ms": round(max(durations), 3),
+        "queries": max(query_counts),
+    }
+    if trace_memory:
+        result["peak_kib"] = round(max(peaks) / 1024, 1)
+    return result
+
+
+def _get_sample_ids(model, sample_size):
+    """Return the first IDs of model, preferring objects that carry Addresses."""
+    if model in (Prefix, IPRange, IPAddress, CustomPrefix):
+        content_type = ContentType.objects.get_for_model(model)
+        object_ids = list(
+            Address.objects.filter(assigned_object_type=content_type)
+            .order_by("assigned_object_id")
+            .values_list("assigned_object_id", flat=True)
+            .distinct()[:sample_size]
+        )
+        if object_ids:
+            return object_ids
+    return list(model.objects.order_by("pk").values_list("pk", flat=True)[:sample_size])
+
+
+def _get_client(user):
+    client = Client(
+        HTTP_HOST=next(
+            (host for host in settings.ALLOWED_HOSTS if host not in ("*", "")),
+            "localhost",
+        )
+    )
+    client.force_login(user)
+    return client
+
+
+def _request(client, url, **extra):
+    def function():
+        response = client.get(url, **extra)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} returned {response.status_code}")
+
+    return function
+
+
+def _hierarchy_benchmarks(sample_size):
+    for model in (Prefix, IPRange, IPAddress, CustomPrefix):
+        app_label, model_name = model._meta.app_label, model._meta.model_name
+        for index, object_id in enumerate(_get_sample_ids(model, sample_size)):
+            kwargs = {
+                "app_label": app_label,
+                "model": model_name,
+                "object_id": object_id,
+            }
+            yield (
+                f"hierarchy:{app_label}.{model_name}:{index}",
+                "hierarchy",
+                lambda kwargs=kwargs: get_address_set_hierarchy(**kwargs),
+            )
+
+            # Measures cache hits, as every benchmark is warmed up first.
+            yield (
+                f"hierarchy_cached:{app_label}.{model_name}:{index}",
+                "hierarchy",
+                lambda kwargs=kwargs: get_cached_address_set_hierarchy(**kwargs),
+            )
+
+
+def _tab_benchmarks(client, sample_size):
+    for model in TAB_MODELS:
+        for index, object_id in enumerate(_get_sample_ids(model, sample_size)):
+            url = reverse(get_viewname(model, "security"), kwargs={"pk": object_id})
+            yield f"tab:{model._meta.label_lower}:{index}", "tabs", _request(
+                client, url
+            )
+    for index, object_id in enumerate(_get_sample_ids(CustomPrefix, sample_size)):
+        url = reverse(get_viewname(CustomPrefix), kwargs={"pk": object_id})
+        yield f"detail:{CustomPrefix._meta.label_lower}:{index}", "tabs", _request(
+            client, url
+        )
+
+
+def _list_benchmarks(client):
+    for model in LIST_MODELS:
+        url = reverse(get_viewname(model, "list"))
+        yield f"list:{model._meta.label_lower}", "lists", _request(
+            client, url, data={"per_page": 50}
+        )
+
+
+def _api_benchmarks(client):
+    for model in LIST_MODELS:
+        url = reverse(get_viewname(model, "list", rest_api=True))
+        yield f"api:{model._meta.label_lower}", "api", _request(
+            client, url, data={"limit": 50}, HTTP_ACCEPT="application/json"
+        )
+
+
+def _memory_benchmarks(client):
+    # Zone pages used to load every policy of the listed zones, so their memory
+    # grew with the number of policies rather than with the page size.
+    yield "memory:list:netbox_security.securityzone", "memory", _request(
+        client,
+        reverse(get_viewname(SecurityZone, "list")),
+        data={"per_page": 50},
+    )
+    yield "memory:api:netbox_security.securityzone", "memory", _request(
+        client,
+        reverse(get_viewname(SecurityZone, "list", rest_api=True)),
+        data={"limit": 50},
+        HTTP_ACCEPT="application/json",
+    )
+    zone = (
+        SecurityZone.annotated_queryset().order_by("-source_policy_count", "pk").first()
+    )
+    if zone is not None:
+        yield "memory:detail:netbox_security.securityzone", "memory", _request(
+            client, reverse(get_viewname(SecurityZone), kwargs={"pk": zone.pk})
+        )
+
+
+def _get_overlapping_policies(count):
+    """Return the specs of count policies of one zone pair, all overlapping each other.
+
+    Every source span is shifted by one address from the previous one, but is
+    longer than count, so each pair of policies shares addresses without either
+    covering the other; alternating actions make every other pair correlated.
+    """
+    return [
+        {
+            "id": position,
+            "name": f"overlapping-{position}",
+            "index": position,
+            "actions": ["permit" if position % 2 else "deny"],
+            "sources": [(4, position, position + count)],
+            "destinations": None,
+            "terms": None,
+        }
+        for position in range(count)
+    ]
+
+
+def _analysis_benchmarks(client):
+    # Broad overlapping policies are the worst case of the policy analysis, as
+    # every pair of them is compared and may be reported.
+    for count in OVERLAPPING_POLICY_COUNTS:
+        policies = _get_overlapping_policies(count)
+        yield f"analysis:overlapping:{count}", "analysis", (
+            lambda policies=policies: list(analyze_zone_pair(policies))
+        )
+    yield "analysis:view:netbox_security.securityzonepolicy", "analysis", _request(
+        client,
+        reverse("plugins:netbox_security:securityzonepolicy_analysis"),
+        data={"per_page": 50},
+    )
+
+
+def run_security_benchmarks(user, groups=BENCHMARK_GROUPS, sample_size=3, iterations=5):
+    """Time the plugin's hot paths and return machine-readable results.
+
+    Benchmarks are named after the object's position in the sample rather than its
+    ID, so results of two runs against the same generated dataset line up. Each
+    benchmark runs once to warm caches and is then measured iterations times;
+    the result records min/median/max wall time in milliseconds and the number of
+    database queries of the slowest run. The memory group also records the peak
+    memory allocated by a single request in KiB. The analysis group times the
+    policy analysis of synthetic zone pairs of broadly overlapping policies, and
+    the paginated analysis view. Views and API endpoints are requested through
+    Django's test client as the given user.
+    """
+    client = _get_client(user)
+    benchmarks = []
+    if "hierarchy" in groups:
+        benchmarks.extend(_hierarchy_benchmarks(sample_size))
+    if "tabs" in groups:
+        benchmarks.extend(_tab_benchmarks(client, sample_size))
+    if "lists" in groups:
+        benchmarks.extend(_list_benchmarks(client))
+    if "api" in groups:
+        benchmarks.extend(_api_benchmarks(client))
+    if "memory" in groups:
+        benchmarks.extend(_memory_benchmarks(client))
+    if "analysis" in groups:
+        benchmarks.extend(_analysis_benchmarks(client))
+
+    results = {}
+    for name, group, function in benchmarks:
+        function()
+        results[name] = {
+            "group": group,
+            **_measure(function, iterations, trace_memory=group == "memory"),
+        }
+
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "netbox_security_version": __version__,
+        "netbox_version": settings.RELEASE.version,
+        "python_version": platform.python_version(),
+        "database_vendor": connection.vendor,
+        "object_counts": {
+            model._meta.label_lower: model.objects.count()
+            for model in (*LIST_MODELS, Prefix)
+        },
+        "results": results,
+    }
+
+
+def compare_benchmark_results(baseline, current, threshold=1.25):
+    """Compare two run_security_benchmarks() results.
+
+    Returns a list of (name, baseline_ms, current_ms, ratio, baseline_queries,
+    current_queries, regressed) tuples for the benchmarks present in both, where
+    regressed means the median time or the peak memory grew by more than
+    threshold or the query count grew at all.
+    """
+    comparison = []
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        ratio = (
+            result["median_ms"] / previous["median_ms"]
+            if previous["median_ms"]
+            else 1.0
+        )
+        comparison.append(
+            (
+                name,
+                previous["median_ms"],
+                result["median_ms"],
+                round(ratio, 3),
+                previous["queries"],
+                result["queries"],
+                ratio > threshold
+                or result["queries"] > previous["queries"]
+                or (
+                    "peak_kib" in result
+                    and "peak_kib" in previous
+                    and result["peak_kib"] > previous["peak_kib"] * threshold
+                ),
+            )
+        )
+    return comparison
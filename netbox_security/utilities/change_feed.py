@@ -0,0 +1,191 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Max
+from django.urls import NoReverseMatch, reverse
+from django.utils import timezone
+from netbox.models.features import ChangeLoggingMixin
+from netbox.plugins import get_plugin_config
+
+from core.choices import ObjectChangeActionChoices
+from core.models import ObjectChange
+
+__all__ = ("get_change_feed",)
+
+
+def _get_change_logged_models():
+    """Return {content type ID: model} of every change-logged plugin model."""
+    models = [
+        model
+        for model in apps.get_app_config("netbox_security").get_models()
+        if issubclass(model, ChangeLoggingMixin)
+    ]
+    return {
+        content_type.pk: model
+        for model, content_type in ContentType.objects.get_for_models(*models).items()
+    }
+
+
+def _get_list_url(model):
+    try:
+        return reverse(f"plugins-api:netbox_security-api:{model._meta.model_name}-list")
+    except NoReverseMatch:
+        return None
+
+
+def _can_view_all(user, model):
+    # has_perm() without an object is also true for a constrained permission;
+    # restrict() only leaves the queryset unfiltered when nothing is hidden.
+    return not model.objects.restrict(user, "view").query.where
+
+
+def _get_updated_object_ids(models, since_time, limit):
+    """Return {content type ID: [IDs]} of the objects updated after since_time.
+
+    Raises ValueError when there are more than limit of them.
+    """
+    object_ids = {}
+    remaining = limit
+    for content_type_id, model in models.items():
+        object_ids[content_type_id] = list(
+            model.objects.filter(last_updated__gt=since_time)
+            .order_by("pk")
+            .values_list("pk", flat=True)[: remaining + 1]
+        )
+        remaining -= len(object_ids[content_type_id])
+        if remaining < 0:
+            raise ValueError(
+                f"More than {limit} objects changed since {since_time.isoformat()} "
+                "beyond the changelog retention; fetch them from the list endpoints "
+                "and continue from the current cursor."
+            )
+    return object_ids
+
+
+def _apply_change(states, object_id, action):
+    """Fold one logged action into the net change of an object since the cursor."""
+    state = states.get(object_id)
+    if action == ObjectChangeActionChoices.ACTION_CREATE:
+        states[object_id] = "created" if state is None else "updated"
+    elif action == ObjectChangeActionChoices.ACTION_UPDATE:
+        states[object_id] = state or "updated"
+    elif state == "created":
+        # Created and deleted since the cursor: the client never saw it.
+        states[object_id] = None
+    else:
+        states[object_id] = "deleted"
+
+
+def get_change_feed(user, since=None, since_time=None, limit=1000, lag=None):
+    """Return the plugin objects created, updated or deleted since a cursor.
+
+    since is the ID of the last ObjectChange already processed by the client and
+    since_time a timestamp, for the first request of a client without a cursor.
+    At most limit changelog entries are read, in order; the result holds the
+    cursor to resume from, "next", and whether more changes are waiting,
+    "has_more". The changes of every object are folded into their net effect, so
+    an object created and then updated is only reported as created, and one
+    created and deleted within the window is not reported at all.
+
+    Changelog IDs are assigned when a transaction writes its entries, not when it
+    commits, so an entry of a slow transaction can appear below the cursor after
+    a client moved past it. Entries younger than lag seconds, by default the
+    change_feed_lag plugin setting, are therefore left for a later request.
+
+    When since_time predates the oldest changelog entry, e.g. because it has been
+    pruned by CHANGELOG_RETENTION, objects whose last_updated is more recent are
+    reported as updated as well. ValueError is raised when there are more than
+    limit of them.
+
+    Created and updated objects are restricted to those user may view; deleted
+    objects are only reported when user may view every object of their model.
+    Returns {"since", "next", "has_more", "changes"}, where changes holds one
+    entry per model with changes, giving its app_label, model, REST API list url,
+    which accepts id filters and brief=true, and its created, updated and deleted
+    object IDs.
+    """
+    if lag is None:
+        lag = get_plugin_config("netbox_security", "change_feed_lag")
+    models = _get_change_logged_models()
+    logged = ObjectChange.objects.filter(
+        changed_object_type_id__in=models,
+        time__lte=timezone.now() - timedelta(seconds=lag),
+    )
+    changes = logged
+    if since is not None:
+        changes = changes.filter(pk__gt=since)
+    if since_time is not None:
+        changes = changes.filter(time__gt=since_time)
+
+    entries = list(
+        changes.order_by("pk").values_list(
+            "pk", "changed_object_type_id", "changed_object_id", "action"
+        )[: limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if entries:
+        cursor = entries[-1][0]
+    elif since is not None:
+        cursor = since
+    else:
+        cursor = logged.aggregate(cursor=Max("pk"))["cursor"] or 0
+
+    states = {content_type_id: {} for content_type_id in models}
+    for _, content_type_id, object_id, action in entries:
+        _apply_change(states[content_type_id], object_id, action)
+
+    if since_time is not None:
+        oldest_time = (
+            ObjectChange.objects.filter(changed_object_type_id__in=models)
+            .order_by("pk")
+            .values_list("time", flat=True)
+            .first()
+        )
+        if oldest_time is None or oldest_time > since_time:
+            for content_type_id, object_ids in _get_updated_object_ids(
+                models, since_time, limit
+            ).items():
+                for object_id in object_ids:
+                    states[content_type_id].setdefault(object_id, "updated")
+
+    results = []
+    for content_type_id, model in models.items():
+        model_states = states[content_type_id]
+        if not any(model_states.values()):
+            continue
+        opts = model._meta
+        changed = {"created": [], "updated": [], "deleted": []}
+        for object_id, state in model_states.items():
+            if state:
+                changed[state].append(object_id)
+
+        if changed["created"] or changed["updated"]:
+            visible = set(
+                model.objects.restrict(user, "view")
+                .filter(pk__in=changed["created"] + changed["updated"])
+                .values_list("pk", flat=True)
+            )
+            for state in ("created", "updated"):
+                changed[state] = [pk for pk in changed[state] if pk in visible]
+        if changed["deleted"] and not _can_view_all(user, model):
+            changed["deleted"] = []
+        if not any(changed.values()):
+            continue
+
+        results.append(
+            {
+                "app_label": opts.app_label,
+                "model": opts.model_name,
+                "url": _get_list_url(model),
+                **{state: sorted(ids) for state, ids in changed.items()},
+            }
+        )
+
+    return {
+        "since": since,
+        "next": cursor,
+        "has_more": has_more,
+        "changes": sorted(results, key=lambda result: result["model"]),
+    }
@@ -0,0 +1,419 @@
+import random
+from itertools import islice
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils.text import slugify
+from netaddr import IPNetwork
+
+from extras.models import Tag, TaggedItem
+from ipam.models import Prefix
+from ipam.utils import rebuild_prefixes
+from netbox_security.models import (
+    Address,
+    AddressList,
+    AddressSet,
+    CustomPrefix,
+    FirewallFilter,
+    FirewallFilterRule,
+    NatRule,
+    NatRuleSet,
+    SecurityZone,
+    SecurityZonePolicy,
+)
+from netbox_security.utilities.address_set_closure import (
+    get_address_membership_model,
+    get_address_set_edges_model,
+    rebuild_address_set_closure,
+)
+from netbox_security.utilities.effective_addresses import (
+    effective_address_table_enabled,
+    rebuild_effective_addresses,
+)
+from netbox_security.utilities.policy_context_cache import clear_policy_context_cache
+from netbox_security.utilities.security_counters import rebuild_security_counters
+from netbox_security.utilities.spans import get_object_span
+
+__all__ = (
+    "DATASET_DEFAULTS",
+    "delete_security_dataset",
+    "generate_security_dataset",
+)
+
+# Object volumes generated by default, roughly a mid-sized production install.
+DATASET_DEFAULTS = {
+    "prefixes": 5000,
+    "custom_prefixes": 1000,
+    "addresses": 20000,
+    "address_sets": 2000,
+    "nesting_depth": 4,
+    "address_lists": 2000,
+    "zones": 50,
+    "policies": 10000,
+    "nat_rule_sets": 50,
+    "nat_rules": 5000,
+    "firewall_filter_rules": 5000,
+}
+
+# Generated /24 Prefixes are grouped below a parent /16 so that Addresses on the
+# parent are inherited by its children.
+PREFIX_NETWORK = IPNetwork("10.0.0.0/8")
+CUSTOM_PREFIX_NETWORK = IPNetwork("100.64.0.0/10")
+FIREWALL_FILTER_RULES_PER_FILTER = 100
+BATCH_SIZE = 1000
+
+
+def _get_dataset_tag(tag, create=False):
+    """Return the Tag marking the objects of the dataset generated with tag."""
+    slug = f"{slugify(tag)}-dataset"
+    if create:
+        return Tag.objects.get_or_create(
+            slug=slug, defaults={"name": f"{tag} dataset"}
+        )[0]
+    return Tag.objects.filter(slug=slug).first()
+
+
+def _tag_objects(dataset_tag, objects):
+    TaggedItem.objects.bulk_create(
+        [
+            TaggedItem(
+                tag=dataset_tag,
+                content_type=ContentType.objects.get_for_model(obj),
+                object_id=obj.pk,
+            )
+            for obj in objects
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def _subnets(network, prefixlen, count):
+    subnets = list(islice(network.subnet(prefixlen), count))
+    if len(subnets) < count:
+        raise ValueError(f"{network} holds fewer than {count} /{prefixlen} networks")
+    return subnets
+
+
+def _create_prefixes(tag, count):
+    description = f"{tag} dataset"
+    parents = _subnets(PREFIX_NETWORK, 16, max(count // 256, 1))
+    children = _subnets(PREFIX_NETWORK, 24, count)
+    prefixes = Prefix.objects.bulk_create(
+        [
+            Prefix(prefix=network, description=description)
+            for network in (*parents, *children)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    # Bulk creation skips the depth and children bookkeeping of Prefix.save().
+    rebuild_prefixes(None)
+    return prefixes
+
+
+def _create_addresses(tag, count, assigned_objects):
+    addresses = []
+    for index in range(count):
+        assigned_object = assigned_objects[index % len(assigned_objects)]
+        span = get_object_span(assigned_object) or (None, None, None)
+        addresses.append(
+            Address(
+                name=f"{tag}-address-{index}",
+                assigned_object_type=ContentType.objects.get_for_model(assigned_object),
+                assigned_object_id=assigned_object.pk,
+                span_start=span[0],
+                span_end=span[1],
+                span_version=span[2],
+            )
+        )
+    return Address.objects.bulk_create(addresses, batch_size=BATCH_SIZE)
+
+
+def _create_address_sets(tag, count, nesting_depth, addresses, rng):
+    """Create count sets spread over nesting_depth levels, leaves holding the Addresses."""
+    nesting_depth = max(min(nesting_depth, count), 1)
+    address_sets = AddressSet.objects.bulk_create(
+        [AddressSet(name=f"{tag}-address-set-{index}") for index in range(count)],
+        batch_size=BATCH_SIZE,
+    )
+    levels = [address_sets[level::nesting_depth] for level in range(nesting_depth)]
+
+    membership_model, address_set_column, address_column = (
+        get_address_membership_model()
+    )
+    leaves = levels[0]
+    membership_model.objects.bulk_create(
+        [
+            membership_model(
+                **{
+                    address_set_column: leaves[index % len(leaves)].pk,
+                    address_column: address.pk,
+                }
+            )
+            for index, address in enumerate(addresses)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    # Every set above the leaves nests a few sets of the level below, so shared
+    # sets appear on several paths.
+    through_model, parent_column, child_column = get_address_set_edges_model()
+    edges = set()
+    for children, parents in zip(levels, levels[1:]):
+        for index, child in enumerate(children):
+            edges.add((parents[index % len(parents)].pk, child.pk))
+            edges.add((rng.choice(parents).pk, child.pk))
+    through_model.objects.bulk_create(
+        [
+            through_model(**{parent_column: parent_id, child_column: child_id})
+            for parent_id, child_id in sorted(edges)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    return levels
+
+
+def _create_address_lists(tag, count, levels, addresses):
+    """Create Address Lists on the outermost sets, and on Addresses for the rest."""
+    address_set_ct = ContentType.objects.get_for_model(AddressSet)
+    address_ct = ContentType.objects.get_for_model(Address)
+    targets = [(address_set_ct, address_set) for address_set in levels[-1]]
+    targets += [(address_ct, address) for address in addresses]
+    return AddressList.objects.bulk_create(
+        [
+            AddressList(
+                name=f"{tag}-address-list-{index}",
+                assigned_object_type=content_type,
+                assigned_object_id=target.pk,
+            )
+            for index, (content_type, target) in enumerate(targets[:count])
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def _create_policies(tag, count, zones, address_lists, rng):
+    policies = SecurityZonePolicy.objects.bulk_create(
+        [
+            SecurityZonePolicy(
+                name=f"{tag}-policy-{index}",
+                index=index,
+                source_zone=rng.choice(zones),
+                destination_zone=rng.choice(zones),
+                policy_actions=["permit"],
+            )
+            for index in range(count)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    if address_lists:
+        for field_name in ("source_address", "destination_address"):
+            through_model = getattr(SecurityZonePolicy, field_name).through
+            through_model.objects.bulk_create(
+                [
+                    through_model(
+                        securityzonepolicy_id=policy.pk,
+                        addresslist_id=rng.choice(address_lists).pk,
+                    )
+                    for policy in policies
+                ],
+                batch_size=BATCH_SIZE,
+            )
+    return policies
+
+
+def _create_nat_rules(tag, rule_set_count, rule_count, zones, prefixes, rng):
+    rule_sets = NatRuleSet.objects.bulk_create(
+        [
+            NatRuleSet(name=f"{tag}-nat-rule-set-{index}")
+            for index in range(rule_set_count)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    for field_name in ("source_zones", "destination_zones"):
+        through_model = getattr(NatRuleSet, field_name).through
+        through_model.objects.bulk_create(
+            [
+                through_model(
+                    natruleset_id=rule_set.pk, securityzone_id=rng.choice(zones).pk
+                )
+                for rule_set in rule_sets
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+    if not rule_sets:
+        return rule_sets, []
+    rules = NatRule.objects.bulk_create(
+        [
+            NatRule(
+                name=f"{tag}-nat-rule-{index}",
+                rule_set=rule_sets[index % len(rule_sets)],
+            )
+            for index in range(rule_count)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    if prefixes:
+        for field_name in ("source_prefixes", "destination_prefixes"):
+            through_model = getattr(NatRule, field_name).through
+            through_model.objects.bulk_create(
+                [
+                    through_model(natrule_id=rule.pk, prefix_id=rng.choice(prefixes).pk)
+                    for rule in rules
+                ],
+                batch_size=BATCH_SIZE,
+            )
+    return rule_sets, rules
+
+
+def _create_firewall_filter_rules(tag, count):
+    filter_count = -(-count // FIREWALL_FILTER_RULES_PER_FILTER)
+    firewall_filters = FirewallFilter.objects.bulk_create(
+        [
+            FirewallFilter(name=f"{tag}-firewall-filter-{index}")
+            for index in range(filter_count)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    return firewall_filters, FirewallFilterRule.objects.bulk_create(
+        [
+            FirewallFilterRule(
+                name=f"{tag}-firewall-filter-rule-{index}",
+                firewall_filter=firewall_filters[
+                    index // FIREWALL_FILTER_RULES_PER_FILTER
+                ],
+                index=index % FIREWALL_FILTER_RULES_PER_FILTER,
+            )
+            for index in range(count)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+@transaction.atomic
+def generate_security_dataset(tag="benchmark", seed=0, **volumes):
+    """Bulk create a synthetic dataset and return the number of objects per model.
+
+    Volumes not given fall back to DATASET_DEFAULTS. Every object is named after
+    tag and carries the "<tag>-dataset" Tag, so that delete_security_dataset()
+    removes exactly the generated objects again. Objects are bulk created,
+    bypassing signals and the change log, so the Address Set closure table, the
+    effective Address table, the security counters and the policy context cache
+    are rebuilt afterwards.
+    """
+    volumes = {**DATASET_DEFAULTS, **volumes}
+    rng = random.Random(seed)
+
+    prefixes = _create_prefixes(tag, volumes["prefixes"])
+    custom_prefixes = CustomPrefix.objects.bulk_create(
+        [
+            CustomPrefix(prefix=network, description=f"{tag} dataset")
+            for network in _subnets(
+                CUSTOM_PREFIX_NETWORK, 26, volumes["custom_prefixes"]
+            )
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    addresses = _create_addresses(
+        tag, volumes["addresses"], [*prefixes, *custom_prefixes]
+    )
+    levels = (
+        _create_address_sets(
+            tag, volumes["address_sets"], volumes["nesting_depth"], addresses, rng
+        )
+        if volumes["address_sets"]
+        else [[]]
+    )
+    address_lists = _create_address_lists(
+        tag, volumes["address_lists"], levels, addresses
+    )
+    zones = SecurityZone.objects.bulk_create(
+        [
+            SecurityZone(name=f"{tag}-zone-{index}")
+            for index in range(max(volumes["zones"], 1))
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    policies = _create_policies(tag, volumes["policies"], zones, address_lists, rng)
+    rule_sets, rules = _create_nat_rules(
+        tag, volumes["nat_rule_sets"], volumes["nat_rules"], zones, prefixes, rng
+    )
+    firewall_filters, firewall_filter_rules = _create_firewall_filter_rules(
+        tag, volumes["firewall_filter_rules"]
+    )
+
+    dataset_tag = _get_dataset_tag(tag, create=True)
+    for objects in (
+        prefixes,
+        custom_prefixes,
+        addresses,
+        *levels,
+        address_lists,
+        zones,
+        policies,
+        rule_sets,
+        rules,
+        firewall_filters,
+        firewall_filter_rules,
+    ):
+        _tag_objects(dataset_tag, objects)
+
+    rebuild_address_set_closure()
+    if effective_address_table_enabled():
+        rebuild_effective_addresses()
+    rebuild_security_counters()
+    clear_policy_context_cache()
+
+    return {
+        "prefixes": len(prefixes),
+        "custom_prefixes": len(custom_prefixes),
+        "addresses": len(addresses),
+        "address_sets": sum(len(level) for level in levels),
+        "address_lists": len(address_lists),
+        "zones": len(zones),
+        "policies": len(policies),
+        "nat_rule_sets": len(rule_sets),
+        "nat_rules": len(rules),
+        "firewall_filters": len(firewall_filters),
+        "firewall_filter_rules": len(firewall_filter_rules),
+    }
+
+
+@transaction.atomic
+def delete_security_dataset(tag="benchmark"):
+    """Delete every object created by generate_security_dataset() with the given tag.
+
+    Objects are selected by the "<tag>-dataset" Tag rather than by name, so
+    objects that merely share the name prefix are kept. The Tag is deleted last.
+    """
+    dataset_tag = _get_dataset_tag(tag)
+    deleted = {}
+    # Rules go before the rule sets and filters that would cascade them.
+    for key, model in (
+        ("firewall_filter_rules", FirewallFilterRule),
+        ("firewall_filters", FirewallFilter),
+        ("nat_rules", NatRule),
+        ("nat_rule_sets", NatRuleSet),
+        ("policies", SecurityZonePolicy),
+        ("zones", SecurityZone),
+        ("address_lists", AddressList),
+        ("address_sets", AddressSet),
+        ("addresses", Address),
+        ("custom_prefixes", CustomPrefix),
+        ("prefixes", Prefix),
+    ):
+        if dataset_tag is None:
+            deleted[key] = 0
+            continue
+        queryset = model.objects.filter(tags=dataset_tag)
+        deleted[key] = queryset.count()
+        queryset.delete()
+    if dataset_tag is not None:
+        dataset_tag.delete()
+
+    rebuild_address_set_closure()
+    if effective_address_table_enabled():
+        rebuild_effective_addresses()
+    rebuild_security_counters()
+    clear_policy_context_cache()
+    return deleted
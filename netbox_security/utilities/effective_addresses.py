@@ -0,0 +1,160 @@
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Q
+from netaddr import IPAddress as NetAddress, cidr_merge, iprange_to_cidrs
+from netbox.plugins import get_plugin_config
+
+from netbox_security.models import Address, EffectiveAddress
+from netbox_security.utilities.address_set_hierarchy import (
+    get_stored_effective_address_ids,
+    get_inherited_address_ids_bulk,
+)
+from netbox_security.utilities.spans import SPAN_MODELS
+
+__all__ = (
+    "effective_address_table_enabled",
+    "get_effective_address_ids",
+    "get_object_ids_within_spans",
+    "rebuild_effective_addresses",
+    "refresh_effective_addresses",
+    "refresh_effective_addresses_within_spans",
+)
+
+# Lookups selecting the objects of each span model that start inside a CIDR.
+# IP Ranges only need their start address inside, which may select a few
+# extra ranges; those are recomputed to the same rows.
+CONTAINED_LOOKUPS = {
+    "prefix": "prefix__net_contained_or_equal",
+    "customprefix": "prefix__net_contained_or_equal",
+    "ipaddress": "address__net_host_contained",
+    "iprange": "start_address__net_host_contained",
+}
+
+BATCH_SIZE = 1000
+
+
+def effective_address_table_enabled():
+    return get_plugin_config("netbox_security", "effective_address_table")
+
+
+def _compute_effective_address_ids(content_type, object_ids):
+    direct_by_object = defaultdict(list)
+    for address_id, object_id in Address.objects.filter(
+        assigned_object_type=content_type,
+        assigned_object_id__in=object_ids,
+    ).values_list("id", "assigned_object_id"):
+        direct_by_object[object_id].append(address_id)
+
+    target_objects = content_type.model_class().objects.in_bulk(object_ids)
+    inherited_by_object = (
+        get_inherited_address_ids_bulk(target_objects, direct_by_object)
+        if target_objects
+        else {}
+    )
+    return direct_by_object, inherited_by_object
+
+
+def get_effective_address_ids(app_label, model, object_ids):
+    """Return ({object_id: [direct address IDs]}, {object_id: [inherited address IDs]}).
+
+    Reads the EffectiveAddress table when the effective_address_table plugin
+    setting is enabled, otherwise resolves inheritance on the fly.
+    """
+    content_type = ContentType.objects.get_by_natural_key(app_label, model)
+    object_ids = list(object_ids)
+    if effective_address_table_enabled():
+        return get_stored_effective_address_ids(content_type, object_ids)
+    return _compute_effective_address_ids(content_type, object_ids)
+
+
+def refresh_effective_addresses(content_type, object_ids):
+    """Recompute the EffectiveAddress rows of the given objects of one model."""
+    object_ids = sorted(set(object_ids))
+    for index in range(0, len(object_ids), BATCH_SIZE):
+        batch_ids = object_ids[index : index + BATCH_SIZE]
+        direct_by_object, inherited_by_object = _compute_effective_address_ids(
+            content_type, batch_ids
+        )
+        rows = [
+            EffectiveAddress(
+                assigned_object_type=content_type,
+                assigned_object_id=object_id,
+                address_id=address_id,
+                inherited=inherited,
+            )
+            for inherited, ids_by_object in (
+                (False, direct_by_object),
+                (True, inherited_by_object),
+            )
+            for object_id, address_ids in ids_by_object.items()
+            for address_id in set(address_ids)
+        ]
+        with transaction.atomic():
+            EffectiveAddress.objects.filter(
+                assigned_object_type=content_type,
+                assigned_object_id__in=batch_ids,
+            ).delete()
+            EffectiveAddress.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+
+
+def get_object_ids_within_spans(spans):
+    """Return {(app_label, model): [object IDs]} for span objects inside the given spans.
+
+    Every object that can inherit an Address starts inside the span of the
+    Address' assigned object, so this selects all candidates for inheritance.
+    """
+    cidrs = []
+    for span in spans:
+        if span:
+            start, end, version = (int(value) for value in span)
+            cidrs.extend(
+                iprange_to_cidrs(NetAddress(start, version), NetAddress(end, version))
+            )
+    object_ids = {}
+    if not cidrs:
+        return object_ids
+
+    cidrs = [str(cidr) for cidr in cidr_merge(cidrs)]
+    for app_label, model_name in SPAN_MODELS:
+        content_type = ContentType.objects.get_by_natural_key(app_label, model_name)
+        lookup = CONTAINED_LOOKUPS[model_name]
+        query = Q()
+        for cidr in cidrs:
+            query |= Q(**{lookup: cidr})
+        model_object_ids = list(
+            content_type.model_class()
+            .objects.filter(query)
+            .values_list("pk", flat=True)
+        )
+        if model_object_ids:
+            object_ids[(app_label, model_name)] = model_object_ids
+    return object_ids
+
+
+def refresh_effective_addresses_within_spans(spans):
+    """Recompute the rows of every object that lies inside one of the given spans.
+
+    Used when an Address carrying one of the spans is added, moved or removed, as
+    every object that can inherit it starts inside its span.
+    """
+    for (app_label, model_name), object_ids in get_object_ids_within_spans(
+        spans
+    ).items():
+        refresh_effective_addresses(
+            ContentType.objects.get_by_natural_key(app_label, model_name), object_ids
+        )
+
+
+def rebuild_effective_addresses():
+    """Recompute the EffectiveAddress table from scratch and return its row count."""
+    with transaction.atomic():
+        EffectiveAddress.objects.all().delete()
+        for app_label, model_name in SPAN_MODELS:
+            content_type = ContentType.objects.get_by_natural_key(app_label, model_name)
+            refresh_effective_addresses(
+                content_type,
+                content_type.model_class().objects.values_list("pk", flat=True),
+            )
+    return EffectiveAddress.objects.count()
@@ -0,0 +1,77 @@
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.expressions import ArraySubquery
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import ManyToManyField, OuterRef
+from netbox.plugins import get_plugin_config
+
+from extras.models import TaggedItem
+
+__all__ = (
+    "get_export_rows",
+    "iter_ndjson",
+)
+
+
+class ExportJSONEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder which writes any other value, e.g. IPNetwork, as a string."""
+
+    def default(self, o):
+        try:
+            return super().default(o)
+        except TypeError:
+            return str(o)
+
+
+def get_export_rows(queryset, chunk_size=None):
+    """Yield every object of queryset as a flat dict, ordered by ID.
+
+    Each dict holds the concrete fields of the model, foreign keys as their
+    "<name>_id" column, plus the sorted primary keys of every many-to-many field
+    and of the tags. The related keys are read by correlated subqueries of the
+    same query, and the rows are streamed with iterator() in batches of
+    chunk_size, defaulting to the export_chunk_size plugin setting, so memory
+    use does not grow with the size of the queryset.
+    """
+    model = queryset.model
+    fields = [field.attname for field in model._meta.concrete_fields]
+    related = {
+        field.name: ArraySubquery(
+            field.remote_field.through.objects.filter(
+                **{field.m2m_field_name(): OuterRef("pk")}
+            )
+            .order_by(f"{field.m2m_reverse_field_name()}_id")
+            .values(f"{field.m2m_reverse_field_name()}_id")
+        )
+        for field in model._meta.many_to_many
+        if isinstance(field, ManyToManyField)
+    }
+    related["tags"] = ArraySubquery(
+        TaggedItem.objects.filter(
+            content_type=ContentType.objects.get_for_model(model),
+            object_id=OuterRef("pk"),
+        )
+        .order_by("tag_id")
+        .values("tag_id")
+    )
+    if chunk_size is None:
+        chunk_size = get_plugin_config("netbox_security", "export_chunk_size")
+
+    # Annotations may not shadow the model's own fields, so they are aliased.
+    aliases = {f"export_{name}": name for name in related}
+    for row in (
+        queryset.select_related(None)
+        .prefetch_related(None)
+        .order_by("pk")
+        .values(*fields, **{alias: related[name] for alias, name in aliases.items()})
+        .iterator(chunk_size=chunk_size)
+    ):
+        for alias, name in aliases.items():
+            row[name] = row.pop(alias)
+        yield row
+
+
+def iter_ndjson(queryset, chunk_size=None):
+    """Yield the rows of get_export_rows() as newline-delimited JSON."""
+    encoder = ExportJSONEncoder()
+    for row in get_export_rows(queryset, chunk_size=chunk_size):
+        yield encoder.encode(row) + "\n"
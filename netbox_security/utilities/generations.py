@@ -0,0 +1,26 @@
+from uuid import uuid4
+
+from django.core.cache import cache
+
+__all__ = (
+    "bump_generations",
+    "get_generations",
+)
+
+
+def bump_generations(*keys):
+    """Replace the generation tokens of the given cache keys."""
+    # A new random token rather than an increment: a generation key that is
+    # evicted and recreated can then never match an older cached entry.
+    cache.set_many({key: uuid4().hex for key in keys}, timeout=None)
+
+
+def get_generations(keys):
+    """Return the generation token of every key, creating the missing ones."""
+    generations = cache.get_many(keys)
+    missing = [key for key in keys if key not in generations]
+    for key in missing:
+        cache.add(key, uuid4().hex, timeout=None)
+    if missing:
+        generations.update(cache.get_many(missing))
+    return [generations.get(key, "") for key in keys]
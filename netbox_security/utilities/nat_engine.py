@@ -0,0 +1,566 @@
+import ipaddress
+from bisect import bisect_right
+
+from ipam.choices import IPAddressStatusChoices
+from ipam.models import IPAddress, IPRange, Prefix
+
+from netbox_security.choices import (
+    CustomInterfaceChoices,
+    NatTypeChoices,
+    PoolTypeChoices,
+    RuleStatusChoices,
+)
+from netbox_security.models import NatPool, NatPoolMember, NatRule, NatRuleSet
+from netbox_security.utilities.generations import bump_generations, get_generations
+from netbox_security.utilities.policy_engine import (
+    AddressMatcher,
+    ServiceMatcher,
+    get_m2m_targets,
+)
+from netbox_security.utilities.spans import iter_bits, merge_spans, ports_to_intervals
+
+__all__ = (
+    "NatEngine",
+    "bump_nat_engine_generation",
+    "compile_nat_engine",
+    "get_ipam_spans",
+    "get_nat_engine",
+    "get_nat_engine_generation",
+    "get_rule_specs",
+)
+
+GENERATION_KEY = "netbox_security:nat_engine:generation"
+
+STAGE_DESTINATION = "destination"
+STAGE_SOURCE = "source"
+
+# Static and destination NAT translate the destination before the source NAT
+# rule sets are evaluated against the translated flow.
+STAGE_NAT_TYPES = {
+    STAGE_DESTINATION: (NatTypeChoices.TYPE_STATIC, NatTypeChoices.TYPE_DESTINATION),
+    STAGE_SOURCE: (
+        NatTypeChoices.TYPE_SOURCE,
+        NatTypeChoices.TYPE_NAT64,
+        NatTypeChoices.TYPE_NPTV6,
+    ),
+}
+STAGE_POOL_FIELDS = {
+    STAGE_DESTINATION: "destination_pool_id",
+    STAGE_SOURCE: "source_pool_id",
+}
+
+# Rule sets mapping the matched address onto the pool one to one, keeping its
+# offset within the matched span, rather than onto the first pool address.
+OFFSET_NAT_TYPES = {NatTypeChoices.TYPE_STATIC, NatTypeChoices.TYPE_NPTV6}
+
+NETWORK_VERSIONS = {4: ipaddress.IPv4Address, 6: ipaddress.IPv6Address}
+
+
+def _get_rule_set_spans(rule_set, field):
+    """Return the spans of every rule of a rule set, or None when one matches any address."""
+    spans = []
+    for rule in rule_set.rules:
+        if rule[field] is None:
+            return None
+        spans.extend(rule[field])
+    return spans
+
+
+class NatPoolTranslator:
+    """Translates addresses into the active members of one NatPool.
+
+    The member spans are laid end to end, so an offset selects the address at
+    that position of the pool, wrapping around its total size.
+    """
+
+    __slots__ = ("pool", "offset_mapping", "members", "offsets", "size")
+
+    def __init__(self, pool, members):
+        """members is a list of (version, start, end, source ports, destination ports)."""
+        self.pool = {key: pool[key] for key in ("id", "name")}
+        self.offset_mapping = pool["pool_type"] == PoolTypeChoices.HOST_ADDRESS_BASE
+        self.members = members
+        self.offsets = []
+        self.size = 0
+        for _, start, end, _, _ in members:
+            self.offsets.append(self.size)
+            self.size += end - start + 1
+
+    def translate(self, offset=None):
+        """Return (address, source ports, destination ports) at offset, or of the first address."""
+        if not self.members:
+            return None
+        offset = 0 if offset is None else offset % self.size
+        position = bisect_right(self.offsets, offset) - 1
+        version, start, _, source_ports, destination_ports = self.members[position]
+        address = NETWORK_VERSIONS[version](start + offset - self.offsets[position])
+        return address, source_ports, destination_ports
+
+
+class CompiledRuleSet:
+    """The compiled, ordered active NatRules of one NatRuleSet."""
+
+    __slots__ = (
+        "rule_set",
+        "source_zones",
+        "destination_zones",
+        "rules",
+        "spans",
+        "sources",
+        "destinations",
+        "ports",
+    )
+
+    def __init__(self, rule_set, source_zones, destination_zones, rules):
+        self.rule_set = {
+            key: rule_set[key] for key in ("id", "name", "nat_type", "direction")
+        }
+        self.source_zones = frozenset(source_zones)
+        self.destination_zones = frozenset(destination_zones)
+        self.rules = rules
+        # Merged, sorted spans per rule, to find the offset of a translated address.
+        self.spans = [
+            {
+                field: merge_spans(rule[field]) if rule[field] is not None else None
+                for field in ("sources", "destinations")
+            }
+            for rule in rules
+        ]
+        self.sources = AddressMatcher([rule["sources"] for rule in rules])
+        self.destinations = AddressMatcher([rule["destinations"] for rule in rules])
+        self.ports = ServiceMatcher(
+            [
+                (
+                    [(None, rule["source_ports"], rule["destination_ports"])]
+                    if rule["source_ports"] or rule["destination_ports"]
+                    else None
+                )
+                for rule in rules
+            ]
+        )
+
+    def matches_zones(self, source_zone_id, destination_zone_id, direction):
+        if direction is not None and direction != self.rule_set["direction"]:
+            return False
+        if self.source_zones and source_zone_id not in self.source_zones:
+            return False
+        return (
+            not self.destination_zones or destination_zone_id in self.destination_zones
+        )
+
+    def match(self, source, destination, source_port, destination_port):
+        """Return the position of the first rule matching the flow, or None."""
+        mask = self.sources.lookup(source)
+        if mask:
+            mask &= self.destinations.lookup(destination)
+        if mask:
+            mask &= self.ports.lookup(None, source_port, destination_port)
+        if not mask:
+            return None
+        return (mask & -mask).bit_length() - 1
+
+    def get_offset(self, position, field, address):
+        """Return the offset of address within the matched span of a rule."""
+        value = int(address)
+        spans = self.spans[position][field]
+        if spans:
+            index = bisect_right(spans, (address.version, value, float("inf"))) - 1
+            if index >= 0:
+                version, start, end = spans[index]
+                if version == address.version and start <= value <= end:
+                    return value - start
+        return value
+
+
+class NatEngine:
+    """Simulates the NAT translation of flows.
+
+    Built by compile_nat_engine(); holds the compiled rule sets of each stage,
+    in name order, and a NatPoolTranslator per pool.
+    """
+
+    def __init__(self, stages, pools):
+        self.stages = stages
+        self.pools = pools
+        # Per stage, the rule sets that can match a source or destination address.
+        self.indexes = {
+            stage: tuple(
+                AddressMatcher(
+                    [_get_rule_set_spans(rule_set, field) for rule_set in rule_sets]
+                )
+                for field in ("sources", "destinations")
+            )
+            for stage, rule_sets in stages.items()
+        }
+        # The rule sets of each stage applying to a zone pair and direction.
+        self.candidates = {}
+
+    @property
+    def rule_count(self):
+        return sum(
+            len(rule_set.rules)
+            for rule_sets in self.stages.values()
+            for rule_set in rule_sets
+        )
+
+    def _get_candidates(self, stage, source_zone_id, destination_zone_id, direction):
+        key = (stage, source_zone_id, destination_zone_id, direction)
+        mask = self.candidates.get(key)
+        if mask is None:
+            mask = self.candidates[key] = sum(
+                1 << position
+                for position, rule_set in enumerate(self.stages[stage])
+                if rule_set.matches_zones(
+                    source_zone_id, destination_zone_id, direction
+                )
+            )
+        return mask
+
+    def _apply_stage(self, stage, flow, source_zone_id, destination_zone_id, direction):
+        mask = self._get_candidates(
+            stage, source_zone_id, destination_zone_id, direction
+        )
+        if mask:
+            sources, destinations = self.indexes[stage]
+            mask &= sources.lookup(flow["source"])
+            mask &= destinations.lookup(flow["destination"])
+        for bit in iter_bits(mask):
+            rule_set = self.stages[stage][bit]
+            if flow["source"].version != flow["destination"].version:
+                # Only NAT64 rule sets match flows between IP versions.
+                if rule_set.rule_set["nat_type"] != NatTypeChoices.TYPE_NAT64:
+                    continue
+            position = rule_set.match(
+                flow["source"],
+                flow["destination"],
+                flow["source_port"],
+                flow["destination_port"],
+            )
+            if position is None:
+                continue
+
+            rule = rule_set.rules[position]
+            translator = self.pools.get(
+                rule[STAGE_POOL_FIELDS[stage]] or rule["pool_id"]
+            )
+            translation = {
+                "stage": stage,
+                "rule_set": rule_set.rule_set,
+                "rule": {"id": rule["id"], "name": rule["name"]},
+                "pool": translator.pool if translator else None,
+                "interface": rule["custom_interface"]
+                == CustomInterfaceChoices.INTERFACE,
+                "translated": False,
+            }
+            if (
+                rule["custom_interface"] == CustomInterfaceChoices.NAT_OFF
+                or translator is None
+            ):
+                return translation
+
+            address_key, port_key = (
+                ("destination", "destination_port")
+                if stage == STAGE_DESTINATION
+                else ("source", "source_port")
+            )
+            offset = None
+            if (
+                translator.offset_mapping
+                or rule_set.rule_set["nat_type"] in OFFSET_NAT_TYPES
+            ):
+                offset = rule_set.get_offset(
+                    position,
+                    "destinations" if stage == STAGE_DESTINATION else "sources",
+                    flow[address_key],
+                )
+            result = translator.translate(offset)
+            if result is None:
+                return translation
+            address, source_ports, destination_ports = result
+            flow[address_key] = address
+            ports = destination_ports if stage == STAGE_DESTINATION else source_ports
+            if ports:
+                flow[port_key] = ports[0]
+            translation["translated"] = True
+            return translation
+        return None
+
+    def simulate(
+        self,
+        source,
+        destination,
+        source_port=None,
+        destination_port=None,
+        source_zone_id=None,
+        destination_zone_id=None,
+        direction=None,
+    ):
+        """Return the post-NAT flow of a pre-NAT flow.
+
+        source and destination are IP address strings or ipaddress objects. The
+        first active rule of the first matching rule set of each stage applies:
+        static and destination NAT translate the destination address and port,
+        then source, NAT64 and NPTv6 rule sets are matched against the
+        translated flow and translate its source. Rule sets restricted to zones
+        only match flows from and to those zones, and, when direction is given,
+        rule sets of the other direction are skipped. Ports left out only match
+        rules not restricting them.
+
+        Returns {"source", "destination", "source_port", "destination_port",
+        "translations"}, translations listing the rule applied by each stage.
+        """
+        flow = {
+            "source": ipaddress.ip_address(source),
+            "destination": ipaddress.ip_address(destination),
+            "source_port": source_port,
+            "destination_port": destination_port,
+        }
+        translations = []
+        for stage in (STAGE_DESTINATION, STAGE_SOURCE):
+            translation = self._apply_stage(
+                stage, flow, source_zone_id, destination_zone_id, direction
+            )
+            if translation is not None:
+                translations.append(translation)
+        return {
+            "source": str(flow["source"]),
+            "destination": str(flow["destination"]),
+            "source_port": flow["source_port"],
+            "destination_port": flow["destination_port"],
+            "translations": translations,
+        }
+
+    def simulate_many(self, flows):
+        """Return simulate() of every flow, given as dicts of its keyword arguments."""
+        return [self.simulate(**flow) for flow in flows]
+
+
+def get_ipam_spans(address_ids=(), prefix_ids=(), range_ids=()):
+    """Return {(model, ID): (version, start, end)} of the given IPAM objects."""
+    spans = {}
+    if address_ids:
+        for pk, address in IPAddress.objects.filter(
+            pk__in=list(address_ids)
+        ).values_list("pk", "address"):
+            spans[(IPAddress, pk)] = (
+                address.version,
+                int(address.ip),
+                int(address.ip),
+            )
+    if prefix_ids:
+        for pk, prefix in Prefix.objects.filter(pk__in=list(prefix_ids)).values_list(
+            "pk", "prefix"
+        ):
+            spans[(Prefix, pk)] = (prefix.version, int(prefix.first), int(prefix.last))
+    if range_ids:
+        for pk, start, end in IPRange.objects.filter(
+            pk__in=list(range_ids)
+        ).values_list("pk", "start_address", "end_address"):
+            spans[(IPRange, pk)] = (start.version, int(start.ip), int(end.ip))
+    return spans
+
+
+def get_rule_specs(queryset):
+    """Return {NatRuleSet ID: [rule]} of the active rules of queryset, ordered by name."""
+    rules = list(
+        queryset.filter(rule_set__isnull=False, status=RuleStatusChoices.STATUS_ACTIVE)
+        .prefetch_related(None)
+        .order_by("rule_set", "name", "pk")
+        .values(
+            "pk",
+            "name",
+            "rule_set_id",
+            "pool_id",
+            "source_pool_id",
+            "destination_pool_id",
+            "custom_interface",
+            "source_ports",
+            "destination_ports",
+        )
+    )
+    rule_ids = [rule["pk"] for rule in rules]
+    members = {}
+    for direction in ("source", "destination"):
+        for field_name, model in (
+            (f"{direction}_addresses", IPAddress),
+            (f"{direction}_prefixes", Prefix),
+            (f"{direction}_ranges", IPRange),
+        ):
+            members[field_name] = (
+                model,
+                get_m2m_targets(NatRule._meta.get_field(field_name), rule_ids),
+            )
+
+    object_ids = {IPAddress: set(), Prefix: set(), IPRange: set()}
+    for model, targets in members.values():
+        object_ids[model].update(*targets.values())
+    spans = get_ipam_spans(
+        object_ids[IPAddress], object_ids[Prefix], object_ids[IPRange]
+    )
+
+    rule_sets = {}
+    for rule in rules:
+        spec = {
+            "id": rule["pk"],
+            "name": rule["name"],
+            "pool_id": rule["pool_id"],
+            "source_pool_id": rule["source_pool_id"],
+            "destination_pool_id": rule["destination_pool_id"],
+            "custom_interface": rule["custom_interface"],
+            "source_ports": (
+                ports_to_intervals(rule["source_ports"])
+                if rule["source_ports"]
+                else None
+            ),
+            "destination_ports": (
+                ports_to_intervals(rule["destination_ports"])
+                if rule["destination_ports"]
+                else None
+            ),
+        }
+        for direction in ("source", "destination"):
+            rule_spans = [
+                spans[(model, object_id)]
+                for field_name in (
+                    f"{direction}_addresses",
+                    f"{direction}_prefixes",
+                    f"{direction}_ranges",
+                )
+                for model, targets in (members[field_name],)
+                for object_id in targets.get(rule["pk"], ())
+                if (model, object_id) in spans
+            ]
+            has_members = any(
+                members[field_name][1].get(rule["pk"])
+                for field_name in (
+                    f"{direction}_addresses",
+                    f"{direction}_prefixes",
+                    f"{direction}_ranges",
+                )
+            )
+            spec[f"{direction}s"] = rule_spans if has_members else None
+        rule_sets.setdefault(rule["rule_set_id"], []).append(spec)
+    return rule_sets
+
+
+def _get_pool_translators():
+    """Return {NatPool ID: NatPoolTranslator} of every pool and its active members."""
+    pools = {
+        pool["id"]: pool for pool in NatPool.objects.values("id", "name", "pool_type")
+    }
+    # Inactive pools, and pools without active members, translate nothing.
+    members = list(
+        NatPoolMember.objects.filter(
+            status=IPAddressStatusChoices.STATUS_ACTIVE,
+            pool__status=IPAddressStatusChoices.STATUS_ACTIVE,
+        )
+        .order_by("pool", "name", "pk")
+        .values_list(
+            "pool_id",
+            "address_id",
+            "prefix_id",
+            "address_range_id",
+            "source_ports",
+            "destination_ports",
+        )
+    )
+    spans = get_ipam_spans(
+        {member[1] for member in members if member[1]},
+        {member[2] for member in members if member[2]},
+        {member[3] for member in members if member[3]},
+    )
+    pool_members = {pool_id: [] for pool_id in pools}
+    for (
+        pool_id,
+        address_id,
+        prefix_id,
+        range_id,
+        source_ports,
+        destination_ports,
+    ) in members:
+        for model, object_id in (
+            (IPAddress, address_id),
+            (Prefix, prefix_id),
+            (IPRange, range_id),
+        ):
+            span = spans.get((model, object_id)) if object_id else None
+            if span is not None:
+                pool_members[pool_id].append(
+                    (*span, sorted(source_ports or ()), sorted(destination_ports or ()))
+                )
+                break
+    return {
+        pool_id: NatPoolTranslator(pool, pool_members[pool_id])
+        for pool_id, pool in pools.items()
+    }
+
+
+def compile_nat_engine(queryset=None):
+    """Compile the given NatRules, by default all of them, into a NatEngine.
+
+    Every NatRuleSet with active rules is compiled into radix tries of the
+    IP Address, Prefix and IP Range members of its rules and interval maps of
+    their source and destination ports, so that each rule set is matched with
+    a few bitmask operations. Rules without source or destination members
+    match any address, and rules without ports any port. The whole rule base
+    is read with a fixed number of queries.
+    """
+    if queryset is None:
+        queryset = NatRule.objects.all()
+    rule_specs = get_rule_specs(queryset)
+    source_zones = get_m2m_targets(
+        NatRuleSet._meta.get_field("source_zones"), list(rule_specs)
+    )
+    destination_zones = get_m2m_targets(
+        NatRuleSet._meta.get_field("destination_zones"), list(rule_specs)
+    )
+    stages = {stage: [] for stage in STAGE_NAT_TYPES}
+    for rule_set in (
+        NatRuleSet.objects.filter(pk__in=list(rule_specs))
+        .order_by("name", "pk")
+        .values("id", "name", "nat_type", "direction")
+    ):
+        for stage, nat_types in STAGE_NAT_TYPES.items():
+            if rule_set["nat_type"] in nat_types:
+                stages[stage].append(
+                    CompiledRuleSet(
+                        rule_set,
+                        source_zones.get(rule_set["id"], ()),
+                        destination_zones.get(rule_set["id"], ()),
+                        rule_specs[rule_set["id"]],
+                    )
+                )
+    return NatEngine(stages, _get_pool_translators())
+
+
+# The compiled engine of every rule, with the generation it was compiled at.
+_engine = (None, None)
+
+
+def get_nat_engine_generation():
+    """Return the token identifying the current state of the NAT rules and pools."""
+    return get_generations([GENERATION_KEY])[0]
+
+
+def bump_nat_engine_generation():
+    """Make every process compile the NAT engine again on its next use."""
+    bump_generations(GENERATION_KEY)
+
+
+def get_nat_engine(queryset=None):
+    """Return the NatEngine of queryset, by default every NatRule.
+
+    As with get_policy_engine(), the engine of all rules is kept in process
+    memory until a rule, rule set, pool or referenced IPAM object changes;
+    engines of filtered or permission-restricted querysets are always compiled.
+    """
+    global _engine
+    if queryset is not None and queryset.query.where:
+        return compile_nat_engine(queryset)
+
+    generation = get_nat_engine_generation()
+    engine_generation, engine = _engine
+    if engine is None or engine_generation != generation:
+        engine = compile_nat_engine()
+        _engine = (generation, engine)
+    return engine
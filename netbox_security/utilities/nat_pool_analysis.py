@@ -0,0 +1,359 @@
+import heapq
+
+from django.core.cache import cache
+from django.db.models import Q
+from ipam.choices import IPAddressStatusChoices
+from ipam.models import IPAddress, IPRange, Prefix
+from netbox.plugins import get_plugin_config
+
+from netbox_security.choices import CustomInterfaceChoices, PoolTypeChoices
+from netbox_security.models import NatPool, NatPoolMember, NatRule, NatRuleSet
+from netbox_security.utilities.nat_engine import (
+    NETWORK_VERSIONS,
+    OFFSET_NAT_TYPES,
+    STAGE_DESTINATION,
+    STAGE_NAT_TYPES,
+    STAGE_POOL_FIELDS,
+    get_ipam_spans,
+    get_nat_engine_generation,
+    get_rule_specs,
+)
+from netbox_security.utilities.spans import merge_spans
+
+__all__ = (
+    "OVERLAP_BETWEEN_POOLS",
+    "OVERLAP_WITHIN_POOL",
+    "REASON_EMPTY",
+    "REASON_INACTIVE",
+    "get_nat_pool_analysis",
+)
+
+CACHE_PREFIX = "netbox_security:nat_pool_analysis"
+
+OVERLAP_WITHIN_POOL = "within_pool"
+OVERLAP_BETWEEN_POOLS = "between_pools"
+
+REASON_INACTIVE = "inactive"
+REASON_EMPTY = "empty"
+
+POOL_FIELDS = ("pool", "source_pool", "destination_pool")
+
+# Ports available for port address translation on each address of a member not
+# restricting its source ports: every port above the well-known ones.
+PAT_PORT_COUNT = 65535 - 1024 + 1
+
+
+def _find_overlaps(members):
+    """Yield (first, second, version, start, end) of every pair of overlapping members.
+
+    members is a list of (version, start, end, member); the spans are swept in
+    start order, keeping the spans still open in a heap by end address.
+    """
+    open_spans = []
+    current_version = None
+    for position, (version, start, end, member) in enumerate(
+        sorted(members, key=lambda member: member[:3])
+    ):
+        if version != current_version:
+            open_spans = []
+            current_version = version
+        while open_spans and open_spans[0][0] < start:
+            heapq.heappop(open_spans)
+        for other_end, _, other in open_spans:
+            yield other, member, version, start, min(end, other_end)
+        heapq.heappush(open_spans, (end, position, member))
+
+
+def _count_addresses(spans):
+    return sum(end - start + 1 for _, start, end in merge_spans(spans))
+
+
+def _get_stage(nat_type):
+    for stage, nat_types in STAGE_NAT_TYPES.items():
+        if nat_type in nat_types:
+            return stage
+    return None
+
+
+def _restrict(model, user):
+    if user is None:
+        return model.objects.all()
+    return model.objects.restrict(user, "view")
+
+
+def _get_member_spans(pool_ids, user=None):
+    """Return [(version, start, end, member)] of the active members of pool_ids."""
+    members = _restrict(NatPoolMember, user).filter(
+        status=IPAddressStatusChoices.STATUS_ACTIVE
+    )
+    if pool_ids is not None:
+        members = members.filter(pool__in=pool_ids)
+    members = list(
+        members.order_by("pool", "name", "pk").values_list(
+            "id",
+            "name",
+            "pool_id",
+            "address_id",
+            "prefix_id",
+            "address_range_id",
+            "source_ports",
+        )
+    )
+    spans = get_ipam_spans(
+        {member[3] for member in members if member[3]},
+        {member[4] for member in members if member[4]},
+        {member[5] for member in members if member[5]},
+    )
+    member_spans = []
+    for pk, name, pool_id, address_id, prefix_id, range_id, source_ports in members:
+        for model, object_id in (
+            (IPAddress, address_id),
+            (Prefix, prefix_id),
+            (IPRange, range_id),
+        ):
+            span = spans.get((model, object_id)) if object_id else None
+            if span is not None:
+                member = {
+                    "id": pk,
+                    "name": name,
+                    "pool_id": pool_id,
+                    "port_count": len(set(source_ports or ())) or PAT_PORT_COUNT,
+                }
+                member_spans.append((*span, member))
+                break
+    return member_spans
+
+
+def _get_rule_usage(pool_ids, user=None):
+    """Return the active rules of a rule set using pool_ids, and the NatRuleSets."""
+    if pool_ids is None:
+        query = Q(pool__isnull=False)
+        for field in POOL_FIELDS[1:]:
+            query |= Q(**{f"{field}__isnull": False})
+    else:
+        query = Q(pool__in=pool_ids)
+        for field in POOL_FIELDS[1:]:
+            query |= Q(**{f"{field}__in": pool_ids})
+    rule_specs = get_rule_specs(_restrict(NatRule, user).filter(query))
+    rule_sets = {
+        rule_set["id"]: rule_set
+        for rule_set in _restrict(NatRuleSet, user)
+        .filter(pk__in=list(rule_specs))
+        .values("id", "name", "nat_type")
+    }
+    # Rules of a rule set the user cannot view are left out with it.
+    return {
+        rule_set_id: specs
+        for rule_set_id, specs in rule_specs.items()
+        if rule_set_id in rule_sets
+    }, rule_sets
+
+
+def _build_nat_pool_analysis(queryset, user=None):
+    if queryset is None:
+        queryset = NatPool.objects.all()
+    pools = {
+        pool["id"]: pool
+        for pool in queryset.prefetch_related(None)
+        .order_by("name", "pk")
+        .values("id", "name", "pool_type", "status")
+    }
+    pool_ids = list(pools) if queryset.query.where else None
+
+    member_spans = _get_member_spans(pool_ids, user)
+    pool_spans = {pool_id: [] for pool_id in pools}
+    # Addresses of each pool per number of source ports, to count them only once.
+    port_spans = {pool_id: {} for pool_id in pools}
+    for version, start, end, member in member_spans:
+        pool_spans[member["pool_id"]].append((version, start, end))
+        port_spans[member["pool_id"]].setdefault(member["port_count"], []).append(
+            (version, start, end)
+        )
+
+    def get_pool(pool_id):
+        return {key: pools[pool_id][key] for key in ("id", "name")}
+
+    counts = dict.fromkeys(
+        (
+            OVERLAP_WITHIN_POOL,
+            OVERLAP_BETWEEN_POOLS,
+            REASON_EMPTY,
+            REASON_INACTIVE,
+            "exhausted",
+        ),
+        0,
+    )
+    overlaps = []
+    for first, second, version, start, end in _find_overlaps(member_spans):
+        overlap = (
+            OVERLAP_WITHIN_POOL
+            if first["pool_id"] == second["pool_id"]
+            else OVERLAP_BETWEEN_POOLS
+        )
+        counts[overlap] += 1
+        overlaps.append(
+            {
+                "type": overlap,
+                "member": {
+                    "id": first["id"],
+                    "name": first["name"],
+                    "pool": get_pool(first["pool_id"]),
+                },
+                "other_member": {
+                    "id": second["id"],
+                    "name": second["name"],
+                    "pool": get_pool(second["pool_id"]),
+                },
+                "start": str(NETWORK_VERSIONS[version](start)),
+                "end": str(NETWORK_VERSIONS[version](end)),
+            }
+        )
+
+    rule_specs, rule_sets = _get_rule_usage(pool_ids, user)
+    rule_counts = dict.fromkeys(pools, 0)
+    rules = []
+    # (pool ID, stage, rule set, spans) of the addresses each active rule translates.
+    usage = []
+    for rule_set_id, specs in rule_specs.items():
+        rule_set = rule_sets[rule_set_id]
+        stage = _get_stage(rule_set["nat_type"])
+        for rule in specs:
+            for pool_id in {rule[f"{field}_id"] for field in POOL_FIELDS}:
+                if pool_id in rule_counts:
+                    rule_counts[pool_id] += 1
+            for field in POOL_FIELDS:
+                pool_id = rule[f"{field}_id"]
+                if pool_id not in pools:
+                    continue
+                if pools[pool_id]["status"] != IPAddressStatusChoices.STATUS_ACTIVE:
+                    reason = REASON_INACTIVE
+                elif not pool_spans[pool_id]:
+                    reason = REASON_EMPTY
+                else:
+                    continue
+                rules.append(
+                    {
+                        "reason": reason,
+                        "rule": {"id": rule["id"], "name": rule["name"]},
+                        "rule_set": {key: rule_set[key] for key in ("id", "name")},
+                        "field": field,
+                        "pool": get_pool(pool_id),
+                    }
+                )
+
+            nat_off = rule["custom_interface"] == CustomInterfaceChoices.NAT_OFF
+            if stage is None or nat_off:
+                continue
+            pool_id = rule[STAGE_POOL_FIELDS[stage]] or rule["pool_id"]
+            if pool_id in pools:
+                field = "destinations" if stage == STAGE_DESTINATION else "sources"
+                usage.append((pool_id, stage, rule_set, rule[field]))
+
+    # Pools mapping each translated address onto an address of its own.
+    one_to_one = {
+        pool_id
+        for pool_id, pool in pools.items()
+        if pool["pool_type"] == PoolTypeChoices.HOST_ADDRESS_BASE
+    }
+    one_to_one.update(
+        pool_id
+        for pool_id, _, rule_set, _ in usage
+        if rule_set["nat_type"] in OFFSET_NAT_TYPES
+    )
+    # Addresses each pool translates to distinct addresses or ports, or None once
+    # a rule translates any address.
+    demand = {pool_id: [] for pool_id in pools}
+    for pool_id, stage, rule_set, spans in usage:
+        # Destination NAT onto the first pool address needs that address only.
+        if stage == STAGE_DESTINATION and pool_id not in one_to_one:
+            continue
+        if spans is None:
+            demand[pool_id] = None
+        elif demand[pool_id] is not None:
+            demand[pool_id].extend(spans)
+
+    pool_results = []
+    for pool_id, pool in pools.items():
+        address_count = _count_addresses(pool_spans[pool_id])
+        port_capacity = sum(
+            _count_addresses(spans) * port_count
+            for port_count, spans in port_spans[pool_id].items()
+        )
+        translated_address_count = (
+            _count_addresses(demand[pool_id]) if demand[pool_id] is not None else None
+        )
+        exhausted = translated_address_count is not None and (
+            translated_address_count
+            > (address_count if pool_id in one_to_one else port_capacity)
+        )
+        if pool["status"] != IPAddressStatusChoices.STATUS_ACTIVE:
+            counts[REASON_INACTIVE] += 1
+        if not address_count:
+            counts[REASON_EMPTY] += 1
+        if exhausted:
+            counts["exhausted"] += 1
+        pool_results.append(
+            {
+                **pool,
+                "member_count": len(pool_spans[pool_id]),
+                "address_count": address_count,
+                "port_capacity": port_capacity,
+                "rule_count": rule_counts[pool_id],
+                "translated_address_count": translated_address_count,
+                "exhausted": exhausted,
+            }
+        )
+
+    return {
+        "pool_count": len(pools),
+        "member_count": len(member_spans),
+        "counts": counts,
+        "pools": pool_results,
+        "overlaps": overlaps,
+        "rules": rules,
+    }
+
+
+def get_nat_pool_analysis(queryset=None, user=None):
+    """Return the overlaps, capacity and dangling rule references of NatPools.
+
+    The spans of the active members of the given pools, by default all of them,
+    are swept in address order to find every pair of members sharing addresses,
+    within one pool or between two pools, in O(n log n) plus the number of
+    overlaps. For every pool it gives:
+
+    * address_count: the addresses of its active members, counted once.
+    * rule_count: the active rules using it.
+    * port_capacity: those addresses times the source ports of their members,
+      or every port above 1023 when a member does not restrict them.
+    * translated_address_count: the addresses its active rules translate to
+      distinct pool addresses or ports, or None when a rule matches any
+      address. The pool is exhausted when they outnumber its addresses, for
+      static, NPTv6 and host address base mappings, or its port capacity.
+
+    Active rules pointing at an inactive pool, or at a pool without active
+    members, are listed too. Given a user, only the pool members, rules and
+    rule sets the user can view are taken into account.
+
+    Returns {"pool_count", "member_count", "counts", "pools", "overlaps",
+    "rules"}. The analysis of all pools is cached for the
+    nat_pool_analysis_cache_timeout plugin setting, and recomputed once a NAT
+    rule, pool or member changes; analyses of filtered querysets, or for users
+    with constrained view permissions, are always computed.
+    """
+    timeout = get_plugin_config("netbox_security", "nat_pool_analysis_cache_timeout")
+    restricted = queryset is not None and queryset.query.where
+    if user is not None:
+        restricted = restricted or any(
+            _restrict(model, user).query.where
+            for model in (NatPoolMember, NatRule, NatRuleSet)
+        )
+    if not timeout or restricted:
+        return _build_nat_pool_analysis(queryset, user)
+
+    key = f"{CACHE_PREFIX}:{get_nat_engine_generation()}"
+    analysis = cache.get(key)
+    if analysis is None:
+        analysis = _build_nat_pool_analysis(queryset)
+        cache.set(key, analysis, timeout=timeout)
+    return analysis
@@ -0,0 +1,408 @@
+from bisect import bisect_left, bisect_right
+
+from django.core.cache import cache
+from netbox.plugins import get_plugin_config
+
+from netbox_security.choices import ActionChoices
+from netbox_security.utilities.policy_engine import (
+    IntervalMap,
+    get_policy_engine_generation,
+    get_policy_specs,
+)
+from netbox_security.utilities.spans import ADDRESS_BITS, iter_bits, merge_intervals
+
+__all__ = (
+    "FINDING_CORRELATED",
+    "FINDING_REDUNDANT",
+    "FINDING_SHADOWED",
+    "analyze_zone_pair",
+    "get_policy_analysis",
+)
+
+CACHE_PREFIX = "netbox_security:policy_analysis"
+
+FINDING_SHADOWED = "shadowed"
+FINDING_REDUNDANT = "redundant"
+FINDING_CORRELATED = "correlated"
+
+# IPv6 addresses are placed after the IPv4 ones, so both fit on one integer line.
+ADDRESS_OFFSETS = {4: 0, 6: 1 << ADDRESS_BITS[4]}
+ANY_ADDRESS = (
+    (0, (1 << ADDRESS_BITS[4]) - 1),
+    (ADDRESS_OFFSETS[6], ADDRESS_OFFSETS[6] + (1 << ADDRESS_BITS[6]) - 1),
+)
+PORT_MAX = 65535
+ANY_PORT = ((0, PORT_MAX),)
+# Protocol key standing for every protocol not named by any policy of a zone pair.
+OTHER_PROTOCOLS = ""
+
+# Actions deciding the fate of a flow; log and count do not.
+DECISIVE_ACTIONS = {ActionChoices.PERMIT, ActionChoices.DENY, ActionChoices.REJECT}
+
+
+def _contains(outer, inner):
+    """Whether the merged interval set outer contains inner."""
+    position = 0
+    for low, high in inner:
+        while position < len(outer) and outer[position][1] < low:
+            position += 1
+        if (
+            position == len(outer)
+            or outer[position][0] > low
+            or outer[position][1] < high
+        ):
+            return False
+    return True
+
+
+def _intersects(first, second):
+    """Whether two merged interval sets share a value."""
+    i = j = 0
+    while i < len(first) and j < len(second):
+        if first[i][1] < second[j][0]:
+            i += 1
+        elif second[j][1] < first[i][0]:
+            j += 1
+        else:
+            return True
+    return False
+
+
+def _get_slabs(boxes):
+    """Return the union of (source ports, destination ports) boxes as sorted slabs.
+
+    Each slab is (low, high, destination ports): a source port range, all of
+    whose ports allow the same merged destination port set. Equal sets of
+    boxes give equal slabs.
+    """
+    points = sorted(
+        {low for source, _ in boxes for low, _ in source}
+        | {high + 1 for source, _ in boxes for _, high in source}
+    )
+    slabs = []
+    for low, following in zip(points, points[1:]):
+        high = following - 1
+        destination = merge_intervals(
+            interval
+            for source, destination in boxes
+            if any(start <= low and high <= end for start, end in source)
+            for interval in destination
+        )
+        if not destination:
+            continue
+        if slabs and slabs[-1][1] == low - 1 and slabs[-1][2] == destination:
+            slabs[-1] = (slabs[-1][0], high, destination)
+        else:
+            slabs.append((low, high, destination))
+    return tuple(slabs)
+
+
+def _slabs_contain(outer, inner):
+    for low, high, destination in inner:
+        position = low
+        for outer_low, outer_high, outer_destination in outer:
+            if outer_high < position or outer_low > high:
+                continue
+            if outer_low > position or not _contains(outer_destination, destination):
+                return False
+            position = outer_high + 1
+            if position > high:
+                break
+        if position <= high:
+            return False
+    return True
+
+
+def _slabs_intersect(first, second):
+    return any(
+        low <= other_high
+        and other_low <= high
+        and _intersects(destination, other_destination)
+        for low, high, destination in first
+        for other_low, other_high, other_destination in second
+    )
+
+
+def _service_contains(outer, inner):
+    outer = dict(outer)
+    return all(
+        key in outer and _slabs_contain(outer[key], slabs) for key, slabs in inner
+    )
+
+
+def _service_intersects(first, second):
+    second = dict(second)
+    return any(
+        key in second and _slabs_intersect(slabs, second[key]) for key, slabs in first
+    )
+
+
+def _get_address_space(spans):
+    if spans is None:
+        return ANY_ADDRESS
+    return merge_intervals(
+        (start + ADDRESS_OFFSETS[version], end + ADDRESS_OFFSETS[version])
+        for version, start, end in spans
+    )
+
+
+def _get_service_space(terms, protocol_keys):
+    """Return the services of a policy as a sorted tuple of (protocol key, slabs)."""
+    if terms is None:
+        terms = [(None, None, None)]
+    boxes = {key: [] for key in protocol_keys}
+    for protocols, source_ports, destination_ports in terms:
+        box = (source_ports or ANY_PORT, destination_ports or ANY_PORT)
+        for key in protocol_keys if protocols is None else protocols:
+            boxes[key].append(box)
+    return tuple(
+        (key, slabs)
+        for key, slabs in ((key, _get_slabs(boxes[key])) for key in protocol_keys)
+        if slabs
+    )
+
+
+class OverlapIndex:
+    """Finds, for every policy of a zone pair, the policies overlapping it in one dimension.
+
+    spaces holds the merged interval set of every policy. The policies covering
+    a value come from an IntervalMap, and those with an interval starting within
+    a range from a segment tree of OR-ed masks over the sorted interval starts,
+    so overlaps() costs O(log n) bitmask operations per interval.
+    """
+
+    def __init__(self, spaces):
+        self.covering = IntervalMap(
+            (low, high, position)
+            for position, space in enumerate(spaces)
+            for low, high in space
+        )
+        starts = sorted(
+            (low, position) for position, space in enumerate(spaces) for low, _ in space
+        )
+        self.starts = [low for low, _ in starts]
+        self.size = 1
+        while self.size < len(starts):
+            self.size *= 2
+        self.tree = [0] * (2 * self.size)
+        for offset, (_, position) in enumerate(starts):
+            self.tree[self.size + offset] = 1 << position
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = self.tree[2 * node] | self.tree[2 * node + 1]
+
+    def _starting_within(self, low, high):
+        mask = 0
+        left = bisect_left(self.starts, low) + self.size
+        right = bisect_right(self.starts, high) + self.size
+        while left < right:
+            if left & 1:
+                mask |= self.tree[left]
+                left += 1
+            if right & 1:
+                right -= 1
+                mask |= self.tree[right]
+            left //= 2
+            right //= 2
+        return mask
+
+    def overlaps(self, space):
+        mask = 0
+        for low, high in space:
+            mask |= self.covering.lookup(low) | self._starting_within(low, high)
+        return mask
+
+
+def _relation(first, second, contains, intersects):
+    """Return (first contains second, second contains first, they intersect)."""
+    if first is second or first == second:
+        return True, True, True
+    if not intersects(first, second):
+        return False, False, False
+    return contains(first, second), contains(second, first), True
+
+
+def _get_decision(actions):
+    return frozenset(actions) & DECISIVE_ACTIONS
+
+
+def analyze_zone_pair(policies):
+    """Yield (finding, policy position, related policy position) for one zone pair.
+
+    policies are the ordered policy specs of the pair, as returned by
+    get_policy_specs().
+    """
+    protocol_keys = sorted(
+        {
+            protocol
+            for policy in policies
+            for protocols, _, _ in policy["terms"] or ()
+            if protocols is not None
+            for protocol in protocols
+        }
+    ) + [OTHER_PROTOCOLS]
+    protocol_offsets = {key: index << 16 for index, key in enumerate(protocol_keys)}
+
+    # Policies often share their Address Lists and Applications; interning equal
+    # spaces lets the relation of every pair of them be computed only once.
+    interned = {}
+    sources = []
+    destinations = []
+    services = []
+    for policy in policies:
+        for spaces, space in (
+            (sources, _get_address_space(policy["sources"])),
+            (destinations, _get_address_space(policy["destinations"])),
+            (services, _get_service_space(policy["terms"], protocol_keys)),
+        ):
+            spaces.append(interned.setdefault(space, space))
+    # Services are indexed by protocol and destination port only, which is enough
+    # to rule out most pairs; the exact check below handles source ports.
+    service_lines = [
+        merge_intervals(
+            (protocol_offsets[key] + low, protocol_offsets[key] + high)
+            for key, slabs in service
+            for _, _, destination in slabs
+            for low, high in destination
+        )
+        for service in services
+    ]
+
+    candidates = []
+    for lines in (sources, destinations, service_lines):
+        index = OverlapIndex(lines)
+        candidates.append([index.overlaps(line) for line in lines])
+
+    decisions = [_get_decision(policy["actions"]) for policy in policies]
+    decision_masks = {}
+    for position, decision in enumerate(decisions):
+        decision_masks[decision] = decision_masks.get(decision, 0) | 1 << position
+
+    relations = {}
+
+    def relation(spaces, first, second, contains, intersects):
+        key = (id(spaces[first]), id(spaces[second]))
+        result = relations.get(key)
+        if result is None:
+            result = relations[key] = _relation(
+                spaces[first], spaces[second], contains, intersects
+            )
+        return result
+
+    redundant = set()
+    for later in range(len(policies)):
+        earlier_mask = (
+            candidates[0][later]
+            & candidates[1][later]
+            & candidates[2][later]
+            & ((1 << later) - 1)
+        )
+        for earlier in iter_bits(earlier_mask):
+            covers = [True, True]
+            disjoint = False
+            for spaces, contains, intersects in (
+                (sources, _contains, _intersects),
+                (destinations, _contains, _intersects),
+                (services, _service_contains, _service_intersects),
+            ):
+                earlier_covers, later_covers, intersect = relation(
+                    spaces, earlier, later, contains, intersects
+                )
+                if not intersect:
+                    disjoint = True
+                    break
+                covers[0] &= earlier_covers
+                covers[1] &= later_covers
+            if disjoint:
+                continue
+
+            same_decision = decisions[earlier] == decisions[later]
+            if covers[0]:
+                # Every flow of the later policy is decided by the earlier one.
+                yield (
+                    FINDING_REDUNDANT if same_decision else FINDING_SHADOWED,
+                    later,
+                    earlier,
+                )
+                break
+            if covers[1] and same_decision:
+                # The earlier policy is redundant when removing it changes no
+                # flow, i.e. no policy in between decides its flows differently.
+                between = ((1 << later) - 1) & ~((1 << (earlier + 1)) - 1)
+                conflicting = (
+                    between
+                    & candidates[0][earlier]
+                    & candidates[1][earlier]
+                    & candidates[2][earlier]
+                    & ~decision_masks[decisions[earlier]]
+                )
+                if not conflicting and earlier not in redundant:
+                    redundant.add(earlier)
+                    yield FINDING_REDUNDANT, earlier, later
+            elif not same_decision:
+                yield FINDING_CORRELATED, later, earlier
+
+
+def _build_policy_analysis(queryset):
+    findings = []
+    counts = dict.fromkeys((FINDING_SHADOWED, FINDING_REDUNDANT, FINDING_CORRELATED), 0)
+    policy_count = 0
+    for (source_zone_id, destination_zone_id), policies in sorted(
+        get_policy_specs(queryset).items()
+    ):
+        policy_count += len(policies)
+        for finding, position, related_position in analyze_zone_pair(policies):
+            counts[finding] += 1
+            findings.append(
+                {
+                    "type": finding,
+                    "source_zone_id": source_zone_id,
+                    "destination_zone_id": destination_zone_id,
+                    "policy": {
+                        key: policies[position][key]
+                        for key in ("id", "name", "index", "actions")
+                    },
+                    "related_policy": {
+                        key: policies[related_position][key]
+                        for key in ("id", "name", "index", "actions")
+                    },
+                }
+            )
+    return {"policy_count": policy_count, "counts": counts, "findings": findings}
+
+
+def get_policy_analysis(queryset=None):
+    """Return the shadowed, redundant and correlated SecurityZonePolicies.
+
+    Within every source and destination zone pair, each policy is compared with
+    the earlier ones, by index, that overlap it in its source addresses,
+    destination addresses and services, flattened by get_policy_specs() into
+    integer interval sets:
+
+    * shadowed: an earlier policy with a different action matches all of its
+      flows, so it never applies.
+    * redundant: an earlier policy with the same action matches all of its
+      flows; or a later policy with the same action matches all of them and no
+      policy in between decides any of them differently, so it can be removed.
+    * correlated: an earlier policy with a different action matches some, but
+      not all, of its flows, so their order matters.
+
+    Only the permit, deny and reject actions count; a policy is shadowed by a
+    single earlier policy, not by several together. Candidate pairs come from an
+    OverlapIndex per dimension, so only overlapping policies are compared.
+
+    Returns {"policy_count", "counts", "findings"}; findings list {"type",
+    "source_zone_id", "destination_zone_id", "policy", "related_policy"}. The
+    analysis of all policies is cached for the policy_analysis_cache_timeout
+    plugin setting, and recomputed once a policy, address or application
+    object changes; analyses of filtered querysets are always computed.
+    """
+    timeout = get_plugin_config("netbox_security", "policy_analysis_cache_timeout")
+    if not timeout or (queryset is not None and queryset.query.where):
+        return _build_policy_analysis(queryset)
+
+    key = f"{CACHE_PREFIX}:{get_policy_engine_generation()}"
+    analysis = cache.get(key)
+    if analysis is None:
+        analysis = _build_policy_analysis(queryset)
+        cache.set(key, analysis, timeout=timeout)
+    return analysis
@@ -0,0 +1,225 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from netbox.plugins import get_plugin_config
+
+from netbox_security.utilities.address_set_hierarchy import (
+    dehydrate_address_set_hierarchy,
+    get_address_set_hierarchy,
+    get_address_set_hierarchy_counts,
+    hydrate_address_set_hierarchy,
+)
+from netbox_security.utilities.generations import bump_generations, get_generations
+from netbox_security.utilities.spans import get_object_span
+
+__all__ = (
+    "bump_policy_context_graph_generation",
+    "bump_policy_context_object_generation",
+    "bump_policy_context_span_generations",
+    "clear_policy_context_cache",
+    "get_cached_address_set_hierarchy",
+    "get_cached_address_set_hierarchy_counts",
+    "get_policy_context_cache_stats",
+    "reset_policy_context_cache_stats",
+)
+
+CACHE_PREFIX = "netbox_security:policy_context"
+
+# Spans are bucketed by their leading bits (/8 for IPv4, /16 for IPv6). A change
+# to an Address spanning more buckets than this bumps the global span generation
+# instead of every bucket.
+SPAN_BUCKET_SHIFT = {4: 24, 6: 112}
+SPAN_BUCKET_LIMIT = 32
+
+HITS_KEY = f"{CACHE_PREFIX}:hits"
+MISSES_KEY = f"{CACHE_PREFIX}:misses"
+GRAPH_GENERATION_KEY = f"{CACHE_PREFIX}:gen:graph"
+SPAN_GENERATION_KEY = f"{CACHE_PREFIX}:gen:span"
+
+
+def _get_timeout():
+    return get_plugin_config("netbox_security", "policy_context_cache_timeout")
+
+
+def _object_generation_key(content_type_id, object_id):
+    return f"{CACHE_PREFIX}:gen:object:{content_type_id}:{object_id}"
+
+
+def _span_bucket_generation_key(version, bucket):
+    return f"{CACHE_PREFIX}:gen:span:{version}:{bucket}"
+
+
+def _incr(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def bump_policy_context_graph_generation():
+    """Invalidate every cached context, when the changed objects are unknown."""
+    bump_generations(GRAPH_GENERATION_KEY)
+
+
+def bump_policy_context_object_generation(content_type_id, object_id):
+    """Invalidate the cached contexts of a single object."""
+    if content_type_id and object_id:
+        bump_generations(_object_generation_key(content_type_id, object_id))
+
+
+def bump_policy_context_span_generations(*spans):
+    """Invalidate cached contexts of objects that may be contained in the spans.
+
+    Every object inheriting from an Address whose span contains it starts inside
+    that span, so bumping the buckets a span covers reaches all of them.
+    """
+    keys = set()
+    for span in spans:
+        if not span or span[2] not in SPAN_BUCKET_SHIFT:
+            continue
+        start, end, version = (int(value) for value in span)
+        shift = SPAN_BUCKET_SHIFT[version]
+        first_bucket, last_bucket = start >> shift, end >> shift
+        if last_bucket - first_bucket >= SPAN_BUCKET_LIMIT:
+            keys.add(SPAN_GENERATION_KEY)
+            continue
+        keys.update(
+            _span_bucket_generation_key(version, bucket)
+            for bucket in range(first_bucket, last_bucket + 1)
+        )
+    if keys:
+        bump_generations(*keys)
+
+
+def clear_policy_context_cache():
+    """Invalidate every cached context and reset the hit and miss counters."""
+    bump_generations(GRAPH_GENERATION_KEY, SPAN_GENERATION_KEY)
+    reset_policy_context_cache_stats()
+
+
+def get_policy_context_cache_stats():
+    """Return the hit and miss counters for the policy context cache."""
+    counters = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = counters.get(HITS_KEY, 0)
+    misses = counters.get(MISSES_KEY, 0)
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+    }
+
+
+def reset_policy_context_cache_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
+
+
+def _get_entry_key(kind, content_type, object_id, instance, *parts):
+    """Return the cache key of an entry together with the generations it depends on."""
+    if instance is None:
+        instance = content_type.model_class().objects.filter(pk=object_id).first()
+
+    generation_keys = [
+        GRAPH_GENERATION_KEY,
+        SPAN_GENERATION_KEY,
+        _object_generation_key(content_type.pk, object_id),
+    ]
+    span = get_object_span(instance)
+    if span and span[2] in SPAN_BUCKET_SHIFT:
+        generation_keys.append(
+            _span_bucket_generation_key(span[2], span[0] >> SPAN_BUCKET_SHIFT[span[2]])
+        )
+
+    return ":".join(
+        (
+            CACHE_PREFIX,
+            kind,
+            str(content_type.pk),
+            str(object_id),
+            *(str(part) for part in parts),
+            *get_generations(generation_keys),
+        )
+    )
+
+
+def get_cached_address_set_hierarchy(
+    *, app_label, model, object_id, instance=None, path_offset=0, path_limit=None
+):
+    """Return get_address_set_hierarchy() through Django's cache framework.
+
+    Entries are keyed by content type, object ID and path window together with
+    the generations they depend on: the global hierarchy/policy generation, the
+    generation of the object itself and those of the span bucket it starts in.
+    Signal receivers bump the generations, so stale entries are simply never read
+    again and expire on their own. Entries hold IDs and plain values only; the
+    model instances are loaded again on every hit, one query per model. Set the
+    policy_context_cache_timeout plugin setting to 0 to bypass the cache.
+    """
+    timeout = _get_timeout()
+    if not timeout:
+        return get_address_set_hierarchy(
+            app_label=app_label,
+            model=model,
+            object_id=object_id,
+            path_offset=path_offset,
+            path_limit=path_limit,
+        )
+
+    if path_limit is None:
+        path_limit = get_plugin_config("netbox_security", "address_set_path_limit")
+    key = _get_entry_key(
+        "entry",
+        ContentType.objects.get_by_natural_key(app_label, model),
+        object_id,
+        instance,
+        path_offset,
+        path_limit,
+    )
+
+    policy_context = cache.get(key)
+    if policy_context is not None:
+        _incr(HITS_KEY)
+        return hydrate_address_set_hierarchy(policy_context)
+
+    _incr(MISSES_KEY)
+    policy_context = get_address_set_hierarchy(
+        app_label=app_label,
+        model=model,
+        object_id=object_id,
+        path_offset=path_offset,
+        path_limit=path_limit,
+    )
+    cache.set(key, dehydrate_address_set_hierarchy(policy_context), timeout=timeout)
+    return policy_context
+
+
+def get_cached_address_set_hierarchy_counts(
+    *, app_label, model, object_id, instance=None
+):
+    """Return get_address_set_hierarchy_counts() through Django's cache framework.
+
+    Shares the generations of get_cached_address_set_hierarchy(), so the counts
+    are invalidated by the same changes.
+    """
+    timeout = _get_timeout()
+    if not timeout:
+        return get_address_set_hierarchy_counts(
+            app_label=app_label, model=model, object_id=object_id, instance=instance
+        )
+
+    key = _get_entry_key(
+        "counts",
+        ContentType.objects.get_by_natural_key(app_label, model),
+        object_id,
+        instance,
+    )
+    counts = cache.get(key)
+    if counts is not None:
+        _incr(HITS_KEY)
+        return counts
+
+    _incr(MISSES_KEY)
+    counts = get_address_set_hierarchy_counts(
+        app_label=app_label, model=model, object_id=object_id, instance=instance
+    )
+    cache.set(key, counts, timeout=timeout)
+    return counts
@@ -0,0 +1,577 @@
+import copy
+import ipaddress
+from bisect import bisect_right
+from collections import defaultdict, deque
+
+from django.contrib.contenttypes.models import ContentType
+
+from netbox_security.choices import ActionChoices, ProtocolChoices
+from netbox_security.models import (
+    Address,
+    AddressList,
+    AddressSet,
+    Application,
+    ApplicationItem,
+    ApplicationSet,
+    SecurityZonePolicy,
+)
+from netbox_security.utilities.address_set_closure import get_address_set_descendants
+from netbox_security.utilities.generations import bump_generations, get_generations
+from netbox_security.utilities.spans import (
+    ADDRESS_BITS,
+    iter_bits,
+    ports_to_intervals,
+    span_to_cidrs,
+)
+
+__all__ = (
+    "PolicyEngine",
+    "bump_policy_engine_generation",
+    "compile_policy_engine",
+    "get_m2m_targets",
+    "get_policy_engine",
+    "get_policy_engine_generation",
+    "get_policy_specs",
+)
+
+GENERATION_KEY = "netbox_security:policy_engine:generation"
+
+# Protocols matching traffic of every protocol.
+ANY_PROTOCOLS = {ProtocolChoices.ALL, ProtocolChoices.IP}
+
+
+class PrefixTrie:
+    """Binary radix trie mapping the prefixes of one IP version to bitmasks.
+
+    lookup() returns the union of the masks of every inserted prefix containing
+    an address, walking at most one node per address bit.
+    """
+
+    __slots__ = ("bits", "root")
+
+    def __init__(self, bits):
+        self.bits = bits
+        # Nodes are [zero child, one child, mask] lists.
+        self.root = [None, None, 0]
+
+    def insert(self, network, prefix_length, mask):
+        node = self.root
+        shift = self.bits - 1
+        for _ in range(prefix_length):
+            bit = (network >> shift) & 1
+            child = node[bit]
+            if child is None:
+                child = node[bit] = [None, None, 0]
+            node = child
+            shift -= 1
+        node[2] |= mask
+
+    def lookup(self, address):
+        node = self.root
+        mask = node[2]
+        shift = self.bits - 1
+        while shift >= 0:
+            node = node[(address >> shift) & 1]
+            if node is None:
+                break
+            mask |= node[2]
+            shift -= 1
+        return mask
+
+
+class IntervalMap:
+    """Piecewise-constant map of integers to the bitmasks of the intervals holding them."""
+
+    __slots__ = ("starts", "masks")
+
+    def __init__(self, intervals):
+        """intervals is an iterable of (low, high, bit); intervals of one bit must not overlap."""
+        toggles = defaultdict(int)
+        for low, high, bit in intervals:
+            toggles[low] ^= 1 << bit
+            toggles[high + 1] ^= 1 << bit
+        self.starts = []
+        self.masks = []
+        mask = 0
+        for start in sorted(toggles):
+            mask ^= toggles[start]
+            self.starts.append(start)
+            self.masks.append(mask)
+
+    def lookup(self, value):
+        position = bisect_right(self.starts, value) - 1
+        return self.masks[position] if position >= 0 else 0
+
+
+class AddressMatcher:
+    """Matches IP addresses against the address lists of the policies of a zone pair."""
+
+    __slots__ = ("any_mask", "tries")
+
+    def __init__(self, policy_spans):
+        """policy_spans holds, per policy position, its (version, start, end) spans or None for any."""
+        self.any_mask = 0
+        self.tries = {
+            version: PrefixTrie(bits) for version, bits in ADDRESS_BITS.items()
+        }
+        for position, spans in enumerate(policy_spans):
+            if spans is None:
+                self.any_mask |= 1 << position
+                continue
+            for version, start, end in spans:
+                trie = self.tries[version]
+                for network, prefix_length in span_to_cidrs(start, end, trie.bits):
+                    trie.insert(network, prefix_length, 1 << position)
+
+    def lookup(self, address):
+        return self.any_mask | self.tries[address.version].lookup(int(address))
+
+
+class ServiceMatcher:
+    """Matches protocol and ports against the applications of the policies of a zone pair.
+
+    Every policy is flattened into terms, each holding a set of protocols, source
+    ports and destination ports; a term matches when all three do, and a policy
+    when any of its terms does.
+    """
+
+    __slots__ = (
+        "any_mask",
+        "term_policies",
+        "protocols",
+        "any_protocol",
+        "source_ports",
+        "any_source_port",
+        "destination_ports",
+        "any_destination_port",
+    )
+
+    def __init__(self, policy_terms):
+        """policy_terms holds, per policy position, its terms or None for any service."""
+        self.any_mask = 0
+        self.term_policies = []
+        self.protocols = defaultdict(int)
+        self.any_protocol = 0
+        self.any_source_port = 0
+        self.any_destination_port = 0
+        source_ports = []
+        destination_ports = []
+        for position, terms in enumerate(policy_terms):
+            if terms is None:
+                self.any_mask |= 1 << position
+                continue
+            for protocols, source_intervals, destination_intervals in terms:
+                bit = len(self.term_policies)
+                self.term_policies.append(1 << position)
+                if protocols is None:
+                    self.any_protocol |= 1 << bit
+                else:
+                    for protocol in protocols:
+                        self.protocols[protocol] |= 1 << bit
+                if source_intervals is None:
+                    self.any_source_port |= 1 << bit
+                else:
+                    source_ports.extend(
+                        (low, high, bit) for low, high in source_intervals
+                    )
+                if destination_intervals is None:
+                    self.any_destination_port |= 1 << bit
+                else:
+                    destination_ports.extend(
+                        (low, high, bit) for low, high in destination_intervals
+                    )
+        self.protocols = dict(self.protocols)
+        self.source_ports = IntervalMap(source_ports)
+        self.destination_ports = IntervalMap(destination_ports)
+
+    def lookup(self, protocol, source_port, destination_port):
+        terms = self.any_protocol
+        if protocol is not None:
+            terms |= self.protocols.get(protocol, 0)
+        ports = self.any_source_port
+        if source_port is not None:
+            ports |= self.source_ports.lookup(source_port)
+        terms &= ports
+        ports = self.any_destination_port
+        if destination_port is not None:
+            ports |= self.destination_ports.lookup(destination_port)
+        terms &= ports
+
+        mask = self.any_mask
+        for bit in iter_bits(terms):
+            mask |= self.term_policies[bit]
+        return mask
+
+
+class ZonePairPolicies:
+    """The compiled, ordered policies from one Security Zone to another."""
+
+    __slots__ = ("policies", "sources", "destinations", "services", "allowed")
+
+    def __init__(self, policies):
+        self.policies = [
+            {key: policy[key] for key in ("id", "name", "index", "actions")}
+            for policy in policies
+        ]
+        self.sources = AddressMatcher([policy["sources"] for policy in policies])
+        self.destinations = AddressMatcher(
+            [policy["destinations"] for policy in policies]
+        )
+        self.services = ServiceMatcher([policy["terms"] for policy in policies])
+        # The policy positions taking part in matching.
+        self.allowed = (1 << len(self.policies)) - 1
+
+    def restrict(self, policy_ids):
+        """Return a copy sharing the matchers, matching only the given policies."""
+        pair = copy.copy(self)
+        pair.allowed = 0
+        for position, policy in enumerate(self.policies):
+            if policy["id"] in policy_ids:
+                pair.allowed |= 1 << position
+        return pair
+
+    def match(self, source, destination, protocol, source_port, destination_port):
+        if source.version != destination.version:
+            return None
+        mask = self.sources.lookup(source) & self.allowed
+        if mask:
+            mask &= self.destinations.lookup(destination)
+        if mask:
+            mask &= self.services.lookup(protocol, source_port, destination_port)
+        if not mask:
+            return None
+        return self.policies[(mask & -mask).bit_length() - 1]
+
+
+class PolicyEngine:
+    """First-match lookup of the SecurityZonePolicy applying to a flow.
+
+    Built by compile_policy_engine(); holds one ZonePairPolicies per source and
+    destination zone pair, with its policies ordered by index.
+    """
+
+    def __init__(self, zone_pairs):
+        self.zone_pairs = zone_pairs
+
+    @property
+    def policy_count(self):
+        return sum(pair.allowed.bit_count() for pair in self.zone_pairs.values())
+
+    def restrict(self, policy_ids):
+        """Return an engine matching only the policies with the given IDs.
+
+        The compiled matchers are shared with this engine; the other policies are
+        masked out, so the first matching permitted policy is returned.
+        """
+        zone_pairs = {}
+        for zone_pair, pair in self.zone_pairs.items():
+            pair = pair.restrict(policy_ids)
+            if pair.allowed:
+                zone_pairs[zone_pair] = pair
+        return PolicyEngine(zone_pairs)
+
+    def lookup(
+        self,
+        source_zone_id,
+        destination_zone_id,
+        source,
+        destination,
+        protocol=None,
+        source_port=None,
+        destination_port=None,
+    ):
+        """Return the result of the first policy matching the flow.
+
+        source and destination are IP address strings or ipaddress objects and
+        protocol one of ProtocolChoices, in any case. Ports left out only match
+        policies not restricting them. Returns {"policy", "actions", "permitted"};
+        policy is None, and permitted False, when no policy matches.
+        """
+        pair = self.zone_pairs.get((source_zone_id, destination_zone_id))
+        policy = None
+        if pair is not None:
+            policy = pair.match(
+                ipaddress.ip_address(source),
+                ipaddress.ip_address(destination),
+                protocol.upper() if protocol else None,
+                source_port,
+                destination_port,
+            )
+        actions = policy["actions"] if policy else []
+        return {
+            "policy": policy,
+            "actions": actions,
+            "permitted": ActionChoices.PERMIT in actions,
+        }
+
+    def lookup_many(self, flows):
+        """Return lookup() of every flow, given as dicts of its keyword arguments."""
+        return [self.lookup(**flow) for flow in flows]
+
+
+def get_m2m_targets(field, source_ids=None):
+    """Return {source ID: [target IDs]} of a many-to-many field."""
+    through = field.remote_field.through
+    source_column = f"{field.m2m_field_name()}_id"
+    target_column = f"{field.m2m_reverse_field_name()}_id"
+    rows = through.objects.all()
+    if source_ids is not None:
+        rows = rows.filter(**{f"{source_column}__in": source_ids})
+    targets = defaultdict(list)
+    for source_id, target_id in rows.values_list(source_column, target_column):
+        targets[source_id].append(target_id)
+    return targets
+
+
+def _get_descendants(roots, children):
+    """Return {root: {root and every node nested below it}} of a membership graph."""
+    descendants = {}
+    for root in roots:
+        seen = {root}
+        queue = deque([root])
+        while queue:
+            for child in children.get(queue.popleft(), ()):
+                if child not in seen:
+                    seen.add(child)
+                    queue.append(child)
+        descendants[root] = seen
+    return descendants
+
+
+def _get_address_list_spans(address_list_ids):
+    """Return {AddressList ID: [(version, start, end)]} of the given lists."""
+    address_type = ContentType.objects.get_for_model(Address)
+    address_set_type = ContentType.objects.get_for_model(AddressSet)
+    lists = AddressList.objects.filter(pk__in=address_list_ids).values_list(
+        "pk", "assigned_object_type_id", "assigned_object_id"
+    )
+    list_addresses = defaultdict(set)
+    list_sets = {}
+    for list_id, content_type_id, object_id in lists:
+        if content_type_id == address_type.pk:
+            list_addresses[list_id].add(object_id)
+        elif content_type_id == address_set_type.pk:
+            list_sets[list_id] = object_id
+
+    if list_sets:
+        descendants = get_address_set_descendants(set(list_sets.values()))
+        set_addresses = get_m2m_targets(
+            AddressSet._meta.get_field("addresses"),
+            list(set().union(*descendants.values())),
+        )
+        for list_id, address_set_id in list_sets.items():
+            for descendant_id in descendants[address_set_id]:
+                list_addresses[list_id].update(set_addresses.get(descendant_id, ()))
+
+    spans = {
+        address_id: (version, int(start), int(end))
+        for address_id, version, start, end in Address.objects.filter(
+            pk__in=list(set().union(*list_addresses.values())),
+            span_version__isnull=False,
+        ).values_list("pk", "span_version", "span_start", "span_end")
+    }
+    return {
+        list_id: [
+            spans[address_id] for address_id in address_ids if address_id in spans
+        ]
+        for list_id, address_ids in list_addresses.items()
+    }
+
+
+def _get_term(protocols, source_ports, destination_ports):
+    protocols = {protocol.upper() for protocol in protocols or () if protocol}
+    return (
+        None if not protocols or protocols & ANY_PROTOCOLS else frozenset(protocols),
+        ports_to_intervals(source_ports) if source_ports else None,
+        ports_to_intervals(destination_ports) if destination_ports else None,
+    )
+
+
+def _get_application_terms(application_ids):
+    """Return {Application ID: [terms]} from the applications and their items."""
+    application_items = get_m2m_targets(
+        Application._meta.get_field("application_items"), application_ids
+    )
+    items = {
+        item_id: _get_term(protocols, source_ports, destination_ports)
+        for item_id, protocols, source_ports, destination_ports in (
+            ApplicationItem.objects.filter(
+                pk__in=list(set().union(*application_items.values()))
+            ).values_list("pk", "protocol", "source_ports", "destination_ports")
+        )
+    }
+    terms = {}
+    for (
+        application_id,
+        protocols,
+        source_ports,
+        destination_ports,
+    ) in Application.objects.filter(pk__in=application_ids).values_list(
+        "pk", "protocol", "source_ports", "destination_ports"
+    ):
+        application_terms = [
+            items[item_id]
+            for item_id in application_items.get(application_id, ())
+            if item_id in items
+        ]
+        if protocols or source_ports or destination_ports or not application_terms:
+            application_terms.append(
+                _get_term(protocols, source_ports, destination_ports)
+            )
+        terms[application_id] = application_terms
+    return terms
+
+
+def get_policy_specs(queryset=None):
+    """Return the flattened match criteria of the given SecurityZonePolicies.
+
+    Returns {(source_zone_id, destination_zone_id): [policy]}, the policies of
+    each zone pair ordered by index and given as {"id", "name", "index",
+    "actions", "sources", "destinations", "terms"}. sources and destinations are
+    lists of (version, start, end) address spans, resolved from the Address
+    Lists through nested Address Sets; Addresses without a span, e.g. DNS names,
+    are left out. terms are the (protocols, source port intervals, destination
+    port intervals) of the Applications and Application Sets, including
+    Application Items, None standing for any protocol or port. sources,
+    destinations and terms are None for a policy not restricting them. The
+    whole policy set is read with a fixed number of queries.
+    """
+    if queryset is None:
+        queryset = SecurityZonePolicy.objects.all()
+    policies = list(
+        queryset.prefetch_related(None)
+        .order_by("index", "name", "pk")
+        .values_list(
+            "pk",
+            "name",
+            "index",
+            "source_zone_id",
+            "destination_zone_id",
+            "policy_actions",
+        )
+    )
+    policy_ids = [policy[0] for policy in policies]
+
+    sources = get_m2m_targets(
+        SecurityZonePolicy._meta.get_field("source_address"), policy_ids
+    )
+    destinations = get_m2m_targets(
+        SecurityZonePolicy._meta.get_field("destination_address"), policy_ids
+    )
+    list_spans = _get_address_list_spans(
+        list(set().union(*sources.values(), *destinations.values()))
+    )
+
+    applications = get_m2m_targets(
+        SecurityZonePolicy._meta.get_field("applications"), policy_ids
+    )
+    application_sets = get_m2m_targets(
+        SecurityZonePolicy._meta.get_field("application_sets"), policy_ids
+    )
+    set_descendants = _get_descendants(
+        set().union(*application_sets.values()),
+        get_m2m_targets(ApplicationSet._meta.get_field("application_sets")),
+    )
+    set_applications = get_m2m_targets(
+        ApplicationSet._meta.get_field("applications"),
+        list(set().union(*set_descendants.values())),
+    )
+    policy_applications = defaultdict(set)
+    for policy_id in policy_ids:
+        policy_applications[policy_id].update(applications.get(policy_id, ()))
+        for application_set_id in application_sets.get(policy_id, ()):
+            for descendant_id in set_descendants[application_set_id]:
+                policy_applications[policy_id].update(
+                    set_applications.get(descendant_id, ())
+                )
+    application_terms = _get_application_terms(
+        list(set().union(*policy_applications.values()))
+    )
+
+    def _spans(list_ids):
+        if not list_ids:
+            return None
+        return [span for list_id in list_ids for span in list_spans.get(list_id, ())]
+
+    def _terms(policy_id):
+        if not applications.get(policy_id) and not application_sets.get(policy_id):
+            return None
+        return [
+            term
+            for application_id in policy_applications[policy_id]
+            for term in application_terms.get(application_id, ())
+        ]
+
+    pairs = defaultdict(list)
+    for (
+        policy_id,
+        name,
+        index,
+        source_zone_id,
+        destination_zone_id,
+        actions,
+    ) in policies:
+        pairs[(source_zone_id, destination_zone_id)].append(
+            {
+                "id": policy_id,
+                "name": name,
+                "index": index,
+                "actions": [action for action in actions or () if action],
+                "sources": _spans(sources.get(policy_id)),
+                "destinations": _spans(destinations.get(policy_id)),
+                "terms": _terms(policy_id),
+            }
+        )
+    return dict(pairs)
+
+
+def compile_policy_engine(queryset=None):
+    """Compile the given SecurityZonePolicies, by default all of them, into a PolicyEngine.
+
+    The spans of the policies of every zone pair, as returned by
+    get_policy_specs(), are inserted into a radix trie per IP version, and their
+    terms into protocol and port interval maps. Addresses without a span never
+    match; a policy without source or destination addresses matches any
+    address, and one without applications any service.
+    """
+    return PolicyEngine(
+        {
+            zone_pair: ZonePairPolicies(policies)
+            for zone_pair, policies in get_policy_specs(queryset).items()
+        }
+    )
+
+
+# The compiled engine of every policy, with the generation it was compiled at.
+_engine = (None, None)
+
+
+def get_policy_engine_generation():
+    """Return the token identifying the current state of the compiled policies."""
+    return get_generations([GENERATION_KEY])[0]
+
+
+def bump_policy_engine_generation():
+    """Make every process compile the policy engine again on its next use."""
+    bump_generations(GENERATION_KEY)
+
+
+def get_policy_engine(queryset=None):
+    """Return the PolicyEngine of queryset, by default every SecurityZonePolicy.
+
+    The engine of all policies is kept in process memory and compiled again
+    once any policy, address or application object changed in any process, as
+    recorded by a generation token in the Django cache. Filtered or
+    permission-restricted querysets reuse it, masked to the IDs of the
+    policies they return.
+    """
+    global _engine
+    generation = get_policy_engine_generation()
+    engine_generation, engine = _engine
+    if engine is None or engine_generation != generation:
+        engine = compile_policy_engine()
+        _engine = (generation, engine)
+
+    if queryset is not None and queryset.query.where:
+        return engine.restrict(set(queryset.values_list("pk", flat=True)))
+    return engine
@@ -0,0 +1,157 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import CharField, Count, Value
+
+from dcim.models import Device, Interface, VirtualDeviceContext
+from netbox_security.models import (
+    AddressAssignment,
+    AddressListAssignment,
+    AddressSetAssignment,
+    ApplicationAssignment,
+    ApplicationSetAssignment,
+    FirewallFilterAssignment,
+    NatPoolAssignment,
+    NatRuleSetAssignment,
+    PolicerAssignment,
+    SecurityZone,
+    SecurityZoneAssignment,
+)
+from virtualization.models import VirtualMachine
+
+__all__ = (
+    "SECURITY_ASSIGNMENT_SECTIONS",
+    "get_assigned_objects",
+    "get_security_assignments",
+)
+
+# Security tab section name -> (assignment model, field of the assigned object).
+SECURITY_ASSIGNMENT_SECTIONS = {
+    "zones": (SecurityZoneAssignment, "zone"),
+    "address_lists": (AddressListAssignment, "address_list"),
+    "nat_pools": (NatPoolAssignment, "pool"),
+    "nat_rulesets": (NatRuleSetAssignment, "ruleset"),
+    "applications": (ApplicationAssignment, "application"),
+    "application_sets": (ApplicationSetAssignment, "application_set"),
+    "addresses": (AddressAssignment, "address"),
+    "address_sets": (AddressSetAssignment, "address_set"),
+    "firewall_filters": (FirewallFilterAssignment, "firewall_filter"),
+    "policers": (PolicerAssignment, "policer"),
+}
+
+# Relations shown by the default columns of each assigned object's table.
+ASSIGNED_OBJECT_RELATIONS = {
+    Device: (
+        "device_type__manufacturer",
+        "location",
+        "primary_ip4",
+        "primary_ip6",
+        "rack",
+        "role",
+        "site",
+        "tenant",
+    ),
+    VirtualDeviceContext: ("device", "primary_ip4", "primary_ip6", "tenant"),
+    VirtualMachine: (
+        "cluster",
+        "primary_ip4",
+        "primary_ip6",
+        "role",
+        "site",
+        "tenant",
+    ),
+    Interface: ("device", "module"),
+    SecurityZone: ("tenant",),
+}
+
+
+def _get_page_number(page):
+    try:
+        return max(int(page), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def get_security_assignments(instance, user, pages=None, per_page=50):
+    """Return one page of every kind of security assignment of instance.
+
+    Returns {section: {"count", "page", "num_pages", "rows"}} for every entry of
+    SECURITY_ASSIGNMENT_SECTIONS. pages maps section names to 1-based page
+    numbers; out-of-range pages are clamped. The counts of all sections are
+    fetched with a single UNION query, and only sections with assignments run a
+    second query for their rows, which come with the assigned object already
+    set to instance. Assignments are restricted to those user may view.
+    """
+    pages = pages or {}
+    content_type = ContentType.objects.get_for_model(instance)
+    querysets = {
+        section: model.objects.restrict(user, "view").filter(
+            assigned_object_type=content_type, assigned_object_id=instance.pk
+        )
+        for section, (model, _) in SECURITY_ASSIGNMENT_SECTIONS.items()
+    }
+
+    count_querysets = [
+        queryset.values("assigned_object_type")
+        .annotate(section=Value(section, output_field=CharField()), count=Count("pk"))
+        .values_list("section", "count")
+        .order_by()
+        for section, queryset in querysets.items()
+    ]
+    counts = dict(count_querysets[0].union(*count_querysets[1:], all=True))
+
+    assignments = {}
+    for section, queryset in querysets.items():
+        count = counts.get(section, 0)
+        num_pages = max((count + per_page - 1) // per_page, 1)
+        page = min(_get_page_number(pages.get(section)), num_pages)
+        rows = []
+        if count:
+            field_name = SECURITY_ASSIGNMENT_SECTIONS[section][1]
+            offset = (page - 1) * per_page
+            rows = list(
+                queryset.select_related(field_name).order_by(field_name, "pk")[
+                    offset : offset + per_page
+                ]
+            )
+            for row in rows:
+                row.assigned_object = instance
+        assignments[section] = {
+            "count": count,
+            "page": page,
+            "num_pages": num_pages,
+            "rows": rows,
+        }
+    return assignments
+
+
+def get_assigned_objects(assignment_model, field_name, value, user=None):
+    """Return {model: queryset} of the objects value is assigned to.
+
+    assignment_model is one of the *Assignment models and field_name its field
+    pointing at value, e.g. (AddressSetAssignment, "address_set", address_set).
+    One query finds the assigned content types; each queryset then selects its
+    objects through a subquery on the assignments, ordered by the model's own
+    ordering in the database and restricted to those user may view when given.
+    Nothing else is loaded until a queryset is evaluated, so a paginated table
+    only reads the objects of its page.
+    """
+    assignments = assignment_model.objects.filter(**{field_name: value})
+    assigned_objects = {}
+    for content_type_id in (
+        assignments.values_list("assigned_object_type_id", flat=True)
+        .order_by()
+        .distinct()
+    ):
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is None:
+            continue
+        queryset = model.objects.select_related(
+            *ASSIGNED_OBJECT_RELATIONS.get(model, ())
+        ).filter(
+            pk__in=assignments.filter(assigned_object_type_id=content_type_id).values(
+                "assigned_object_id"
+            )
+        )
+        if user is not None:
+            queryset = queryset.restrict(user, "view")
+        assigned_objects[model] = queryset
+    return assigned_objects
@@ -0,0 +1,191 @@
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count
+
+from netbox_security.models import (
+    Address,
+    AddressAssignment,
+    NatPoolMember,
+    NatRule,
+    SecurityCounter,
+    SecurityZone,
+)
+
+__all__ = (
+    "COUNTER_FIELDS",
+    "COUNTER_MODELS",
+    "check_security_counters",
+    "get_security_counter",
+    "rebuild_security_counters",
+    "refresh_security_counters",
+)
+
+COUNTER_FIELDS = (
+    "nat_pool_member_count",
+    "nat_rule_count",
+    "address_count",
+    "security_zone_count",
+)
+
+# IPAM models with counters, and the NatPoolMember field and NatRule relations
+# pointing at each of them.
+COUNTER_MODELS = {
+    ("ipam", "ipaddress"): ("address", "source_addresses", "destination_addresses"),
+    ("ipam", "prefix"): ("prefix", "source_prefixes", "destination_prefixes"),
+    ("ipam", "iprange"): ("address_range", "source_ranges", "destination_ranges"),
+}
+
+BATCH_SIZE = 1000
+
+
+def _get_nat_rule_relation(field_name):
+    """Return (through_model, rule_column, object_column) for a NatRule M2M field."""
+    relation_field = NatRule._meta.get_field(field_name)
+    return (
+        relation_field.remote_field.through,
+        f"{relation_field.m2m_field_name()}_id",
+        f"{relation_field.m2m_reverse_field_name()}_id",
+    )
+
+
+def _compute_security_counters(content_type, object_ids=None):
+    """Return {object_id: {counter field: count}} for one IPAM model.
+
+    Each counter is a single grouped query over the whole batch (or the whole
+    table when object_ids is None). Objects without related objects are omitted.
+    """
+    nat_pool_member_field, *nat_rule_fields = COUNTER_MODELS[
+        (content_type.app_label, content_type.model)
+    ]
+    counters = defaultdict(dict.fromkeys(COUNTER_FIELDS, 0).copy)
+
+    def restrict(queryset, field_name):
+        if object_ids is None:
+            return queryset.filter(**{f"{field_name}__isnull": False})
+        return queryset.filter(**{f"{field_name}__in": object_ids})
+
+    for object_id, count in (
+        restrict(NatPoolMember.objects.all(), f"{nat_pool_member_field}_id")
+        .values_list(f"{nat_pool_member_field}_id")
+        .annotate(count=Count("pk"))
+        .order_by()
+    ):
+        counters[object_id]["nat_pool_member_count"] = count
+
+    # A rule using the object as both source and destination counts once.
+    nat_rules = defaultdict(set)
+    for field_name in nat_rule_fields:
+        through_model, rule_column, object_column = _get_nat_rule_relation(field_name)
+        for rule_id, object_id in restrict(
+            through_model.objects.all(), object_column
+        ).values_list(rule_column, object_column):
+            nat_rules[object_id].add(rule_id)
+    for object_id, rule_ids in nat_rules.items():
+        counters[object_id]["nat_rule_count"] = len(rule_ids)
+
+    addresses = Address.objects.filter(assigned_object_type=content_type)
+    for object_id, count in (
+        restrict(addresses, "assigned_object_id")
+        .values_list("assigned_object_id")
+        .annotate(count=Count("pk"))
+        .order_by()
+    ):
+        counters[object_id]["address_count"] = count
+
+    zone_assignments = AddressAssignment.objects.filter(
+        assigned_object_type=ContentType.objects.get_for_model(SecurityZone),
+        address__assigned_object_type=content_type,
+    )
+    for object_id, count in (
+        restrict(zone_assignments, "address__assigned_object_id")
+        .values_list("address__assigned_object_id")
+        .annotate(count=Count("assigned_object_id", distinct=True))
+        .order_by()
+    ):
+        counters[object_id]["security_zone_count"] = count
+
+    return counters
+
+
+def _write_security_counters(content_type, counters):
+    SecurityCounter.objects.bulk_create(
+        [
+            SecurityCounter(
+                assigned_object_type=content_type,
+                assigned_object_id=object_id,
+                **values,
+            )
+            for object_id, values in counters.items()
+        ],
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=("assigned_object_type", "assigned_object_id"),
+        update_fields=COUNTER_FIELDS,
+    )
+
+
+def get_security_counter(obj):
+    """Return the SecurityCounter of an IPAM object, or an unsaved one holding zeros."""
+    content_type = ContentType.objects.get_for_model(obj)
+    counter = SecurityCounter.objects.filter(
+        assigned_object_type=content_type, assigned_object_id=obj.pk
+    ).first()
+    if counter is None:
+        counter = SecurityCounter(
+            assigned_object_type=content_type, assigned_object_id=obj.pk
+        )
+    return counter
+
+
+def refresh_security_counters(app_label, model, object_ids):
+    """Recompute the counters of the given objects of one IPAM model."""
+    object_ids = sorted({object_id for object_id in object_ids if object_id})
+    if not object_ids or (app_label, model) not in COUNTER_MODELS:
+        return
+    content_type = ContentType.objects.get_by_natural_key(app_label, model)
+    for index in range(0, len(object_ids), BATCH_SIZE):
+        batch_ids = object_ids[index : index + BATCH_SIZE]
+        counters = _compute_security_counters(content_type, batch_ids)
+        with transaction.atomic():
+            SecurityCounter.objects.filter(
+                assigned_object_type=content_type,
+                assigned_object_id__in=set(batch_ids) - set(counters),
+            ).delete()
+            _write_security_counters(content_type, counters)
+
+
+def rebuild_security_counters():
+    """Recompute every counter from scratch and return the number of rows written."""
+    with transaction.atomic():
+        SecurityCounter.objects.all().delete()
+        for app_label, model in COUNTER_MODELS:
+            content_type = ContentType.objects.get_by_natural_key(app_label, model)
+            _write_security_counters(
+                content_type, _compute_security_counters(content_type)
+            )
+    return SecurityCounter.objects.count()
+
+
+def check_security_counters():
+    """Return {(app_label, model): [object IDs]} whose stored counters are wrong."""
+    drift = {}
+    for app_label, model in COUNTER_MODELS:
+        content_type = ContentType.objects.get_by_natural_key(app_label, model)
+        expected = {
+            object_id: tuple(values[field] for field in COUNTER_FIELDS)
+            for object_id, values in _compute_security_counters(content_type).items()
+        }
+        stored = {
+            object_id: tuple(values)
+            for object_id, *values in SecurityCounter.objects.filter(
+                assigned_object_type=content_type
+            ).values_list("assigned_object_id", *COUNTER_FIELDS)
+        }
+        drift[(app_label, model)] = sorted(
+            object_id
+            for object_id in expected.keys() | stored.keys()
+            if expected.get(object_id) != stored.get(object_id)
+        )
+    return drift
@@ -0,0 +1,166 @@
+import heapq
+from collections import defaultdict
+
+__all__ = (
+    "ADDRESS_BITS",
+    "SPAN_MODELS",
+    "find_containing_spans",
+    "get_object_span",
+    "iter_bits",
+    "merge_intervals",
+    "merge_spans",
+    "ports_to_intervals",
+    "span_contains",
+    "span_to_cidrs",
+)
+
+ADDRESS_BITS = {4: 32, 6: 128}
+
+
+# Models whose instances cover an IP span and can therefore carry inherited Addresses.
+SPAN_MODELS = (
+    ("ipam", "prefix"),
+    ("ipam", "iprange"),
+    ("ipam", "ipaddress"),
+    ("netbox_security", "customprefix"),
+)
+
+
+def get_object_span(obj):
+    """Return (start, end, version) for IP-bearing objects, else None."""
+    if obj is None or not hasattr(obj, "_meta"):
+        return None
+
+    model_name = obj._meta.model_name
+
+    if model_name in ("prefix", "customprefix"):
+        return int(obj.prefix.first), int(obj.prefix.last), int(obj.prefix.version)
+
+    if model_name == "ipaddress":
+        ip = int(obj.address.ip)
+        return ip, ip, int(obj.address.version)
+
+    if model_name == "iprange":
+        return (
+            int(obj.start_address.ip),
+            int(obj.end_address.ip),
+            int(obj.start_address.version),
+        )
+
+    return None
+
+
+def span_contains(parent_span, child_span):
+    if not parent_span or not child_span:
+        return False
+
+    parent_start, parent_end, parent_version = parent_span
+    child_start, child_end, child_version = child_span
+    if parent_version != child_version:
+        return False
+
+    return parent_start <= child_start and parent_end >= child_end
+
+
+def merge_intervals(intervals):
+    """Return intervals as a sorted tuple of disjoint, non-adjacent (low, high)."""
+    merged = []
+    for low, high in sorted(intervals):
+        if merged and low <= merged[-1][1] + 1:
+            if high > merged[-1][1]:
+                merged[-1] = (merged[-1][0], high)
+        else:
+            merged.append((low, high))
+    return tuple(merged)
+
+
+def merge_spans(spans):
+    """Return (version, start, end) spans sorted and merged per IP version."""
+    merged = []
+    for version, start, end in sorted(spans):
+        if merged and merged[-1][0] == version and start <= merged[-1][2] + 1:
+            if end > merged[-1][2]:
+                merged[-1] = (version, merged[-1][1], end)
+        else:
+            merged.append((version, start, end))
+    return merged
+
+
+def ports_to_intervals(ports):
+    """Merge port numbers into sorted, non-overlapping (low, high) intervals."""
+    intervals = []
+    for port in sorted(set(ports)):
+        if intervals and intervals[-1][1] == port - 1:
+            intervals[-1][1] = port
+        else:
+            intervals.append([port, port])
+    return [tuple(interval) for interval in intervals]
+
+
+def iter_bits(mask):
+    """Yield the positions of the set bits of mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def span_to_cidrs(start, end, bits):
+    """Yield the (network, prefix length) blocks exactly covering start..end."""
+    while start <= end:
+        size = (start & -start).bit_length() - 1 if start else bits
+        while start + (1 << size) - 1 > end:
+            size -= 1
+        yield start, bits - size
+        start += 1 << size
+
+
+def find_containing_spans(parents, targets):
+    """Match every target span against the parent spans that contain it.
+
+    Both arguments are iterables of (group, start, end, payload) tuples; spans only
+    match within the same group (e.g. IP version, or (version, vrf_id)). Returns
+    {target_payload: [parent_payload, ...]}.
+
+    A single sweep over both lists sorted by start keeps the parents that have
+    started in a heap by end, dropping those ending before the current target
+    in O(log n) each; every target then checks the parents still open at its
+    start. The cost is O((n + m) log(n + m)) plus, per target, the parents open
+    at its start. Prefixes either nest or are disjoint, so for them nearly every
+    open parent contains the target and the total stays close to the k matches.
+    """
+    parents_by_group = defaultdict(list)
+    for group, start, end, payload in parents:
+        parents_by_group[group].append((start, end, payload))
+    targets_by_group = defaultdict(list)
+    for group, start, end, payload in targets:
+        targets_by_group[group].append((start, end, payload))
+
+    matches = defaultdict(list)
+    for group, group_targets in targets_by_group.items():
+        group_parents = sorted(
+            parents_by_group.get(group, ()), key=lambda item: item[0]
+        )
+        if not group_parents:
+            continue
+
+        active = []
+        index = 0
+        for start, end, target_payload in sorted(
+            group_targets, key=lambda item: item[0]
+        ):
+            while index < len(group_parents) and group_parents[index][0] <= start:
+                _, parent_end, parent_payload = group_parents[index]
+                heapq.heappush(active, (parent_end, index, parent_payload))
+                index += 1
+            # Parents ending before this target starts cannot contain it, nor
+            # any later target.
+            while active and active[0][0] < start:
+                heapq.heappop(active)
+            matches[target_payload].extend(
+                parent_payload
+                for parent_end, _, parent_payload in active
+                if parent_end >= end
+            )
+
+    return matches
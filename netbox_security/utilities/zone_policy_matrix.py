@@ -0,0 +1,99 @@
+from django.core.cache import cache
+from django.db.models import Count
+from netbox.plugins import get_plugin_config
+
+from netbox_security.choices import ActionChoices
+from netbox_security.models import SecurityZonePolicy
+
+__all__ = (
+    "clear_zone_policy_matrix_cache",
+    "get_zone_policy_matrix",
+)
+
+CACHE_KEY = "netbox_security:zone_policy_matrix"
+
+
+def _build_zone_policy_matrix(queryset):
+    zones = {}
+    cells = {}
+    # A single GROUP BY over the zone pair and the action list; the zone names
+    # are grouped along with their IDs, so no further queries are needed.
+    for (
+        source_zone_id,
+        source_zone_name,
+        destination_zone_id,
+        destination_zone_name,
+        policy_actions,
+        count,
+    ) in (
+        queryset.prefetch_related(None)
+        .values_list(
+            "source_zone_id",
+            "source_zone__name",
+            "destination_zone_id",
+            "destination_zone__name",
+            "policy_actions",
+        )
+        .annotate(count=Count("pk"))
+        .order_by()
+    ):
+        zones[source_zone_id] = source_zone_name
+        zones[destination_zone_id] = destination_zone_name
+        cell = cells.get((source_zone_id, destination_zone_id))
+        if cell is None:
+            cell = cells[(source_zone_id, destination_zone_id)] = {
+                "source_zone_id": source_zone_id,
+                "destination_zone_id": destination_zone_id,
+                "count": 0,
+                "actions": dict.fromkeys(ActionChoices.values(), 0),
+            }
+        cell["count"] += count
+        for policy_action in set(policy_actions or ()):
+            if policy_action:
+                cell["actions"][policy_action] = (
+                    cell["actions"].get(policy_action, 0) + count
+                )
+
+    return {
+        "zones": [
+            {"id": zone_id, "name": name}
+            for zone_id, name in sorted(
+                zones.items(), key=lambda zone: (zone[1], zone[0])
+            )
+        ],
+        "cells": [cells[key] for key in sorted(cells)],
+        "policy_count": sum(cell["count"] for cell in cells.values()),
+        "max_count": max((cell["count"] for cell in cells.values()), default=0),
+    }
+
+
+def get_zone_policy_matrix(queryset=None):
+    """Return SecurityZonePolicy counts for every source and destination zone pair.
+
+    Returns {"zones", "cells", "policy_count", "max_count"}: zones lists the
+    zones having policies ordered by name, and cells holds one entry per pair
+    with policies, giving its count and the number of policies per action (a
+    policy with several actions counts towards each of them). Pairs without
+    policies are omitted.
+
+    queryset defaults to all policies. The result is cached for the
+    zone_policy_matrix_cache_timeout plugin setting whenever queryset is not
+    filtered, and is invalidated when a policy or zone changes; matrices of
+    filtered or permission-restricted querysets are always computed.
+    """
+    if queryset is None:
+        queryset = SecurityZonePolicy.objects.all()
+    timeout = get_plugin_config("netbox_security", "zone_policy_matrix_cache_timeout")
+    if not timeout or queryset.query.where:
+        return _build_zone_policy_matrix(queryset)
+
+    matrix = cache.get(CACHE_KEY)
+    if matrix is None:
+        matrix = _build_zone_policy_matrix(queryset)
+        cache.set(CACHE_KEY, matrix, timeout=timeout)
+    return matrix
+
+
+def clear_zone_policy_matrix_cache():
+    """Drop the cached matrix, so it is computed again on its next use."""
+    cache.delete(CACHE_KEY)
@@ -5,14 +5,11 @@ from netbox.views import generic
 from utilities.views import register_model_view
 
 from dcim.models import Device, VirtualDeviceContext
-from dcim.tables import DeviceTable, VirtualDeviceContextTable
 from virtualization.models import VirtualMachine
-from virtualization.tables import VirtualMachineTable
 
 from netbox_security.tables import (
     AddressTable,
     AddressAssignmentTable,
-    SecurityZoneTable,
 )
 from netbox_security.filtersets import AddressFilterSet, AddressAssignmentFilterSet
 
@@ -25,6 +22,7 @@ from netbox_security.forms import (
     AddressImportForm,
     AddressAssignmentFilterForm,
 )
+from netbox_security.views.mixins import AssignedObjectTablesMixin
 
 __all__ = (
     "AddressView",
@@ -42,37 +40,17 @@ __all__ = (
 
 
 @register_model_view(Address)
-class AddressView(generic.ObjectView):
+class AddressView(AssignedObjectTablesMixin, generic.ObjectView):
     queryset = Address.objects.all()
     template_name = "netbox_security/address.html"
-
-    def get_extra_context(self, request, instance):
-        device_assignments_table = DeviceTable(
-            Device.objects.filter(addresses__address=instance),
-            orderable=False,
-        )
-        device_assignments_table.configure(request)
-        virtual_device_assignments_table = VirtualDeviceContextTable(
-            VirtualDeviceContext.objects.filter(addresses__address=instance),
-            orderable=False,
-        )
-        virtual_device_assignments_table.configure(request)
-        virtual_machine_assignments_table = VirtualMachineTable(
-            VirtualMachine.objects.filter(addresses__address=instance),
-            orderable=False,
-        )
-        virtual_machine_assignments_table.configure(request)
-        zone_assignments_table = SecurityZoneTable(
-            SecurityZone.objects.filter(addresses__address=instance),
-            orderable=False,
-        )
-        zone_assignments_table.configure(request)
-        return {
-            "device_assignments_table": device_assignments_table,
-            "virtual_device_assignments_table": virtual_device_assignments_table,
-            "virtual_machine_assignments_table": virtual_machine_assignments_table,
-            "zone_assignments_table": zone_assignments_table,
-        }
+    assignment_model = AddressAssignment
+    assignment_field = "address"
+    assigned_object_models = (
+        Device,
+        VirtualDeviceContext,
+        VirtualMachine,
+        SecurityZone,
+    )
 
 
 @register_model_view(Address, "list", path="", detail=False)
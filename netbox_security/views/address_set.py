@@ -5,14 +5,11 @@ from netbox.views import generic
 from utilities.views import register_model_view
 
 from dcim.models import Device, VirtualDeviceContext
-from dcim.tables import DeviceTable, VirtualDeviceContextTable
 from virtualization.models import VirtualMachine
-from virtualization.tables import VirtualMachineTable
 
 from netbox_security.tables import (
     AddressSetTable,
     AddressSetAssignmentTable,
-    SecurityZoneTable,
 )
 from netbox_security.filtersets import (
     AddressSetFilterSet,
@@ -28,6 +25,7 @@ from netbox_security.forms import (
     AddressSetImportForm,
     AddressSetAssignmentFilterForm,
 )
+from netbox_security.views.mixins import AssignedObjectTablesMixin
 
 __all__ = (
     "AddressSetView",
@@ -45,37 +43,17 @@ __all__ = (
 
 
 @register_model_view(AddressSet)
-class AddressSetView(generic.ObjectView):
+class AddressSetView(AssignedObjectTablesMixin, generic.ObjectView):
     queryset = AddressSet.objects.all()
     template_name = "netbox_security/addressset.html"
-
-    def get_extra_context(self, request, instance):
-        device_assignments_table = DeviceTable(
-            Device.objects.filter(address_sets__address_set=instance),
-            orderable=False,
-        )
-        device_assignments_table.configure(request)
-        virtual_device_assignments_table = VirtualDeviceContextTable(
-            VirtualDeviceContext.objects.filter(address_sets__address_set=instance),
-            orderable=False,
-        )
-        virtual_device_assignments_table.configure(request)
-        virtual_machine_assignments_table = VirtualMachineTable(
-            VirtualMachine.objects.filter(address_sets__address_set=instance),
-            orderable=False,
-        )
-        virtual_machine_assignments_table.configure(request)
-        zone_assignments_table = SecurityZoneTable(
-            SecurityZone.objects.filter(address_sets__address_set=instance),
-            orderable=False,
-        )
-        zone_assignments_table.configure(request)
-        return {
-            "device_assignments_table": device_assignments_table,
-            "virtual_device_assignments_table": virtual_device_assignments_table,
-            "virtual_machine_assignments_table": virtual_machine_assignments_table,
-            "zone_assignments_table": zone_assignments_table,
-        }
+    assignment_model = AddressSetAssignment
+    assignment_field = "address_set"
+    assigned_object_models = (
+        Device,
+        VirtualDeviceContext,
+        VirtualMachine,
+        SecurityZone,
+    )
 
 
 @register_model_view(AddressSet, "list", path="", detail=False)
@@ -4,10 +4,6 @@ from django.shortcuts import get_object_or_404
 from netbox.views import generic
 from utilities.views import register_model_view
 
-from dcim.models import Device, VirtualDeviceContext
-from dcim.tables import DeviceTable, VirtualDeviceContextTable
-from virtualization.models import VirtualMachine
-from virtualization.tables import VirtualMachineTable
 
 from netbox_security.tables import ApplicationTable, ApplicationAssignmentTable
 from netbox_security.filtersets import (
@@ -24,6 +20,7 @@ from netbox_security.forms import (
     ApplicationImportForm,
     ApplicationAssignmentFilterForm,
 )
+from netbox_security.views.mixins import AssignedObjectTablesMixin
 
 __all__ = (
     "ApplicationView",
@@ -41,31 +38,11 @@ __all__ = (
 
 
 @register_model_view(Application)
-class ApplicationView(generic.ObjectView):
+class ApplicationView(AssignedObjectTablesMixin, generic.ObjectView):
     queryset = Application.objects.all()
     template_name = "netbox_security/application.html"
-
-    def get_extra_context(self, request, instance):
-        device_assignments_table = DeviceTable(
-            Device.objects.filter(applications__application=instance),
-            orderable=False,
-        )
-        device_assignments_table.configure(request)
-        virtual_device_assignments_table = VirtualDeviceContextTable(
-            VirtualDeviceContext.objects.filter(applications__application=instance),
-            orderable=False,
-        )
-        virtual_device_assignments_table.configure(request)
-        virtual_machine_assignments_table = VirtualMachineTable(
-            VirtualMachine.objects.filter(applications__application=instance),
-            orderable=False,
-        )
-        virtual_machine_assignments_table.configure(request)
-        return {
-            "device_assignments_table": device_assignments_table,
-            "virtual_device_assignments_table": virtual_device_assignments_table,
-            "virtual_machine_assignments_table": virtual_machine_assignments_table,
-        }
+    assignment_model = ApplicationAssignment
+    assignment_field = "application"
 
 
 @register_model_view(Application, "list", path="", detail=False)
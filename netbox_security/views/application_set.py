@@ -4,10 +4,6 @@ from django.shortcuts import get_object_or_404
 from netbox.views import generic
 from utilities.views import register_model_view
 
-from dcim.models import Device, VirtualDeviceContext
-from dcim.tables import DeviceTable, VirtualDeviceContextTable
-from virtualization.models import VirtualMachine
-from virtualization.tables import VirtualMachineTable
 
 from netbox_security.tables import ApplicationSetTable, ApplicationSetAssignmentTable
 from netbox_security.filtersets import (
@@ -24,6 +20,7 @@ from netbox_security.forms import (
     ApplicationSetImportForm,
     ApplicationSetAssignmentFilterForm,
 )
+from netbox_security.views.mixins import AssignedObjectTablesMixin
 
 __all__ = (
     "ApplicationSetView",
@@ -41,33 +38,11 @@ __all__ = (
 
 
 @register_model_view(ApplicationSet)
-class ApplicationSetView(generic.ObjectView):
+class ApplicationSetView(AssignedObjectTablesMixin, generic.ObjectView):
     queryset = ApplicationSet.objects.all()
     template_name = "netbox_security/applicationset.html"
-
-    def get_extra_context(self, request, instance):
-        device_assignments_table = DeviceTable(
-            Device.objects.filter(application_sets__application_set=instance),
-            orderable=False,
-        )
-        device_assignments_table.configure(request)
-        virtual_device_assignments_table = VirtualDeviceContextTable(
-            VirtualDeviceContext.objects.filter(
-                application_sets__application_set=instance
-            ),
-            orderable=False,
-        )
-        virtual_device_assignments_table.configure(request)
-        virtual_machine_assignments_table = VirtualMachineTable(
-            VirtualMachine.objects.filter(application_sets__application_set=instance),
-            orderable=False,
-        )
-        virtual_machine_assignments_table.configure(request)
-        return {
-            "device_assignments_table": device_assignments_table,
-            "virtual_device_assignments_table": virtual_device_assignments_table,
-            "virtual_machine_assignments_table": virtual_machine_assignments_table,
-        }
+    assignment_model = ApplicationSetAssignment
+    assignment_field = "application_set"
 
 
 @register_model_view(ApplicationSet, "list", path="", detail=False)
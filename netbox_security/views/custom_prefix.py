@@ -7,7 +7,10 @@ from netbox_security.tables import (
 from netbox_security.filtersets import CustomPrefixFilterSet
 
 from netbox_security.models import CustomPrefix, Address
-from netbox_security.utilities import get_address_set_hierarchy
+from netbox_security.utilities import (
+    get_address_set_path_offset,
+    get_cached_address_set_hierarchy,
+)
 from netbox_security.forms import (
     CustomPrefixFilterForm,
     CustomPrefixForm,
@@ -33,10 +36,12 @@ class CustomPrefixView(generic.ObjectView):
 
     def get_extra_context(self, request, instance):
         return {
-            "policy_context": get_address_set_hierarchy(
+            "policy_context": get_cached_address_set_hierarchy(
                 app_label="netbox_security",
                 model="customprefix",
                 object_id=instance.pk,
+                instance=instance,
+                path_offset=get_address_set_path_offset(request.GET.get("path_page")),
             ),
         }
 
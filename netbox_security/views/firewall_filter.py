@@ -5,10 +5,6 @@ from django.db.models import Count
 from netbox.views import generic
 from utilities.views import register_model_view
 
-from dcim.models import Device, VirtualDeviceContext
-from dcim.tables import DeviceTable, VirtualDeviceContextTable
-from virtualization.models import VirtualMachine
-from virtualization.tables import VirtualMachineTable
 
 from netbox_security.tables import FirewallFilterTable, FirewallFilterAssignmentTable
 from netbox_security.filtersets import (
@@ -28,6 +24,7 @@ from netbox_security.forms import (
     FirewallFilterImportForm,
     FirewallFilterAssignmentFilterForm,
 )
+from netbox_security.views.mixins import AssignedObjectTablesMixin
 
 __all__ = (
     "FirewallFilterView",
@@ -45,35 +42,13 @@ __all__ = (
 
 
 @register_model_view(FirewallFilter)
-class FirewallFilterView(generic.ObjectView):
+class FirewallFilterView(AssignedObjectTablesMixin, generic.ObjectView):
     queryset = FirewallFilter.objects.annotate(
         rule_count=Count("firewallfilterrule_rules")
     )
     template_name = "netbox_security/firewallfilter.html"
-
-    def get_extra_context(self, request, instance):
-        device_assignments_table = DeviceTable(
-            Device.objects.filter(firewall_filter__firewall_filter=instance),
-            orderable=False,
-        )
-        device_assignments_table.configure(request)
-        virtual_device_assignments_table = VirtualDeviceContextTable(
-            VirtualDeviceContext.objects.filter(
-                firewall_filter__firewall_filter=instance
-            ),
-            orderable=False,
-        )
-        virtual_device_assignments_table.configure(request)
-        virtual_machine_assignments_table = VirtualMachineTable(
-            VirtualMachine.objects.filter(firewall_filter__firewall_filter=instance),
-            orderable=False,
-        )
-        virtual_machine_assignments_table.configure(request)
-        return {
-            "device_assignments_table": device_assignments_table,
-            "virtual_device_assignments_table": virtual_device_assignments_table,
-            "virtual_machine_assignments_table": virtual_machine_assignments_table,
-        }
+    assignment_model = FirewallFilterAssignment
+    assignment_field = "firewall_filter"
 
 
 @register_model_view(FirewallFilter, "list", path="", detail=False)
@@ -0,0 +1,52 @@
+from dcim.models import Device, Interface, VirtualDeviceContext
+from dcim.tables import DeviceTable, InterfaceTable, VirtualDeviceContextTable
+from virtualization.models import VirtualMachine
+from virtualization.tables import VirtualMachineTable
+
+from netbox_security.models import SecurityZone
+from netbox_security.tables import SecurityZoneTable
+from netbox_security.utilities import get_assigned_objects
+
+__all__ = ("AssignedObjectTablesMixin",)
+
+# Assigned object model -> (table, context variable).
+ASSIGNED_OBJECT_TABLES = {
+    Device: (DeviceTable, "device_assignments_table"),
+    VirtualDeviceContext: (
+        VirtualDeviceContextTable,
+        "virtual_device_assignments_table",
+    ),
+    VirtualMachine: (VirtualMachineTable, "virtual_machine_assignments_table"),
+    SecurityZone: (SecurityZoneTable, "zone_assignments_table"),
+    Interface: (InterfaceTable, "interface_assignments_table"),
+}
+
+
+class AssignedObjectTablesMixin:
+    """
+    Add a paginated table per assigned object model to an object view's context.
+
+    Each table is built from a queryset of the objects assigned through
+    assignment_model and paged in the database through its own "<model>_page"
+    query parameter.
+    """
+
+    assignment_model = None
+    assignment_field = None
+    assigned_object_models = (Device, VirtualDeviceContext, VirtualMachine)
+
+    def get_extra_context(self, request, instance):
+        assigned_objects = get_assigned_objects(
+            self.assignment_model, self.assignment_field, instance, request.user
+        )
+        context = {}
+        for model in self.assigned_object_models:
+            table_class, context_name = ASSIGNED_OBJECT_TABLES[model]
+            table = table_class(
+                assigned_objects.get(model, model.objects.none()),
+                orderable=False,
+                prefix=f"{model._meta.model_name}_",
+            )
+            table.configure(request)
+            context[context_name] = table
+        return context
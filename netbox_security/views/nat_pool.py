@@ -1,16 +1,16 @@
 from django.utils.translation import gettext_lazy as _
 from django.db.models import Count
 from django.contrib.contenttypes.models import ContentType
-from django.shortcuts import get_object_or_404
+from django.shortcuts import get_object_or_404, render
+from django.views import View
 
 from netbox.views import generic
-from utilities.views import register_model_view, ViewTab
-
-from dcim.models import Device, VirtualDeviceContext
-from virtualization.models import VirtualMachine
+from utilities.views import (
+    ContentTypePermissionRequiredMixin,
+    register_model_view,
+    ViewTab,
+)
 
-from dcim.tables import DeviceTable, VirtualDeviceContextTable
-from virtualization.tables import VirtualMachineTable
 
 from netbox_security.models import NatPool, NatPoolMember, NatPoolAssignment
 
@@ -32,6 +32,8 @@ from netbox_security.tables import (
     NatPoolMemberTable,
     NatPoolAssignmentTable,
 )
+from netbox_security.utilities import get_nat_pool_analysis
+from netbox_security.views.mixins import AssignedObjectTablesMixin
 
 __all__ = (
     "NatPoolView",
@@ -41,6 +43,7 @@ __all__ = (
     "NatPoolBulkEditView",
     "NatPoolBulkDeleteView",
     "NatPoolBulkImportView",
+    "NatPoolAnalysisView",
     "NatPoolNatPoolMembersView",
     "NatPoolAssignmentEditView",
     "NatPoolAssignmentDeleteView",
@@ -50,31 +53,11 @@ __all__ = (
 
 
 @register_model_view(NatPool)
-class NatPoolView(generic.ObjectView):
+class NatPoolView(AssignedObjectTablesMixin, generic.ObjectView):
     queryset = NatPool.objects.annotate(member_count=Count("natpoolmember_pools"))
     template_name = "netbox_security/natpool.html"
-
-    def get_extra_context(self, request, instance):
-        device_assignments_table = DeviceTable(
-            Device.objects.filter(nat_pools__pool=instance),
-            orderable=False,
-        )
-        device_assignments_table.configure(request)
-        virtual_device_assignments_table = VirtualDeviceContextTable(
-            VirtualDeviceContext.objects.filter(nat_pools__pool=instance),
-            orderable=False,
-        )
-        virtual_device_assignments_table.configure(request)
-        virtual_machine_assignments_table = VirtualMachineTable(
-            VirtualMachine.objects.filter(nat_pools__pool=instance),
-            orderable=False,
-        )
-        virtual_machine_assignments_table.configure(request)
-        return {
-            "device_assignments_table": device_assignments_table,
-            "virtual_device_assignments_table": virtual_device_assignments_table,
-            "virtual_machine_assignments_table": virtual_machine_assignments_table,
-        }
+    assignment_model = NatPoolAssignment
+    assignment_field = "pool"
 
 
 @register_model_view(NatPool, "list", path="", detail=False)
@@ -117,6 +100,24 @@ class NatPoolBulkDeleteView(generic.BulkDeleteView):
     table = NatPoolTable
 
 
+@register_model_view(NatPool, "analysis", path="analysis", detail=False)
+class NatPoolAnalysisView(ContentTypePermissionRequiredMixin, View):
+    """Report of the overlapping, exhausted and dangling NAT Pools."""
+
+    def get_required_permission(self):
+        return "netbox_security.view_natpool"
+
+    def get(self, request):
+        analysis = get_nat_pool_analysis(
+            NatPool.objects.restrict(request.user, "view"), user=request.user
+        )
+        return render(
+            request,
+            "netbox_security/natpool_analysis.html",
+            {"analysis": analysis},
+        )
+
+
 @register_model_view(NatPool, name="members")
 class NatPoolNatPoolMembersView(generic.ObjectChildrenView):
     template_name = "netbox_security/natpool_members.html"
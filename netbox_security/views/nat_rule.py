@@ -5,9 +5,7 @@ from netbox.views import generic
 from utilities.views import register_model_view
 
 from dcim.models import Interface
-
-from dcim.tables import InterfaceTable
-from ipam.tables import PrefixTable, IPAddressTable, IPRangeTable
+from ipam.models import IPAddress, IPRange, Prefix
 
 from netbox_security.models import NatRule, NatRuleAssignment
 
@@ -26,10 +24,21 @@ from netbox_security.filtersets import (
 from netbox_security.tables import (
     NatRuleTable,
     NatRuleAssignmentTable,
+    NatRuleIPAddressTable,
+    NatRuleInterfaceTable,
+    NatRuleIPRangeTable,
+    NatRulePrefixTable,
 )
 
 __all__ = (
     "NatRuleView",
+    "NatRuleSourceAddressesView",
+    "NatRuleDestinationAddressesView",
+    "NatRuleSourcePrefixesView",
+    "NatRuleDestinationPrefixesView",
+    "NatRuleSourceRangesView",
+    "NatRuleDestinationRangesView",
+    "NatRuleInterfacesView",
     "NatRuleListView",
     "NatRuleEditView",
     "NatRuleDeleteView",
@@ -48,88 +57,79 @@ class NatRuleView(generic.ObjectView):
     queryset = NatRule.objects.all()
     template_name = "netbox_security/natrule.html"
 
-    def get_extra_context(self, request, instance):
-        source_addresses_table = IPAddressTable(
-            instance.source_addresses.all(),
-            orderable=False,
-            exclude=(
-                "created",
-                "last_updated",
-            ),
-        )
-        destination_addresses_table = IPAddressTable(
-            instance.destination_addresses.all(),
-            orderable=False,
-            exclude=(
-                "created",
-                "last_updated",
-            ),
-        )
-        source_prefixes_table = PrefixTable(
-            instance.source_prefixes.all(),
-            orderable=False,
-            exclude=(
-                "prefix_flat",
-                "vlan_group",
-                "utilization",
-                "tenant_group",
-                "scope",
-                "scope_type",
-                "depth",
-                "mark_utilized",
-                "children",
-                "created",
-                "last_updated",
-            ),
-        )
-        destination_prefixes_table = PrefixTable(
-            instance.destination_prefixes.all(),
-            orderable=False,
-            exclude=(
-                "prefix_flat",
-                "vlan_group",
-                "utilization",
-                "tenant_group",
-                "scope",
-                "scope_type",
-                "depth",
-                "mark_utilized",
-                "children",
-                "created",
-                "last_updated",
-            ),
-        )
-        source_ranges_table = IPRangeTable(
-            instance.source_ranges.all(),
-            orderable=False,
-            exclude=(
-                "created",
-                "last_updated",
-            ),
-        )
-        destination_ranges_table = IPRangeTable(
-            instance.destination_ranges.all(),
-            orderable=False,
-            exclude=(
-                "created",
-                "last_updated",
-            ),
-        )
-        interface_assignments_table = InterfaceTable(
-            Interface.objects.filter(natrules__rule=instance),
-            orderable=False,
+
+class NatRuleMembersView(generic.ObjectChildrenView):
+    """
+    Base view of the objects a NAT Rule matches on. The NAT Rule view loads each
+    of them through htmx, so its size no longer depends on the size of the rule.
+    """
+
+    template_name = "netbox_security/natrule_members.html"
+    queryset = NatRule.objects.all()
+    actions = {}
+    relation = None
+
+    def get_children(self, request, parent):
+        return (
+            getattr(parent, self.relation)
+            .restrict(request.user, "view")
+            .select_related("vrf", "tenant")
         )
-        interface_assignments_table.configure(request)
 
-        return {
-            "source_addresses_table": source_addresses_table,
-            "destination_addresses_table": destination_addresses_table,
-            "source_prefixes_table": source_prefixes_table,
-            "destination_prefixes_table": destination_prefixes_table,
-            "source_ranges_table": source_ranges_table,
-            "destination_ranges_table": destination_ranges_table,
-            "interface_assignments_table": interface_assignments_table,
-        }
+
+@register_model_view(NatRule, "source_addresses", path="source-addresses")
+class NatRuleSourceAddressesView(NatRuleMembersView):
+    child_model = IPAddress
+    table = NatRuleIPAddressTable
+    relation = "source_addresses"
+
+
+@register_model_view(NatRule, "destination_addresses", path="destination-addresses")
+class NatRuleDestinationAddressesView(NatRuleMembersView):
+    child_model = IPAddress
+    table = NatRuleIPAddressTable
+    relation = "destination_addresses"
+
+
+@register_model_view(NatRule, "source_prefixes", path="source-prefixes")
+class NatRuleSourcePrefixesView(NatRuleMembersView):
+    child_model = Prefix
+    table = NatRulePrefixTable
+    relation = "source_prefixes"
+
+
+@register_model_view(NatRule, "destination_prefixes", path="destination-prefixes")
+class NatRuleDestinationPrefixesView(NatRuleMembersView):
+    child_model = Prefix
+    table = NatRulePrefixTable
+    relation = "destination_prefixes"
+
+
+@register_model_view(NatRule, "source_ranges", path="source-ranges")
+class NatRuleSourceRangesView(NatRuleMembersView):
+    child_model = IPRange
+    table = NatRuleIPRangeTable
+    relation = "source_ranges"
+
+
+@register_model_view(NatRule, "destination_ranges", path="destination-ranges")
+class NatRuleDestinationRangesView(NatRuleMembersView):
+    child_model = IPRange
+    table = NatRuleIPRangeTable
+    relation = "destination_ranges"
+
+
+@register_model_view(NatRule, "interfaces")
+class NatRuleInterfacesView(NatRuleMembersView):
+    child_model = Interface
+    table = NatRuleInterfaceTable
+
+    def get_children(self, request, parent):
+        return (
+            Interface.objects.restrict(request.user, "view")
+            .filter(natrules__rule=parent)
+            .select_related("device")
+        )
 
 
 @register_model_view(NatRule, "list", path="", detail=False)
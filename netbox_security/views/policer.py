@@ -3,10 +3,6 @@ from utilities.views import register_model_view
 from django.contrib.contenttypes.models import ContentType
 from django.shortcuts import get_object_or_404
 
-from dcim.models import Device, VirtualDeviceContext
-from dcim.tables import DeviceTable, VirtualDeviceContextTable
-from virtualization.models import VirtualMachine
-from virtualization.tables import VirtualMachineTable
 
 from netbox_security.tables import PolicerTable, PolicerAssignmentTable
 from netbox_security.filtersets import PolicerFilterSet, PolicerAssignmentFilterSet
@@ -20,6 +16,7 @@ from netbox_security.forms import (
     PolicerAssignmentForm,
     PolicerAssignmentFilterForm,
 )
+from netbox_security.views.mixins import AssignedObjectTablesMixin
 
 __all__ = (
     "PolicerView",
@@ -35,31 +32,11 @@ __all__ = (
 
 
 @register_model_view(Policer)
-class PolicerView(generic.ObjectView):
+class PolicerView(AssignedObjectTablesMixin, generic.ObjectView):
     queryset = Policer.objects.all()
     template_name = "netbox_security/policer.html"
-
-    def get_extra_context(self, request, instance):
-        device_assignments_table = DeviceTable(
-            Device.objects.filter(policers__policer=instance),
-            orderable=False,
-        )
-        device_assignments_table.configure(request)
-        virtual_device_assignments_table = VirtualDeviceContextTable(
-            VirtualDeviceContext.objects.filter(policers__policer=instance),
-            orderable=False,
-        )
-        virtual_device_assignments_table.configure(request)
-        virtual_machine_assignments_table = VirtualMachineTable(
-            VirtualMachine.objects.filter(policers__policer=instance),
-            orderable=False,
-        )
-        virtual_machine_assignments_table.configure(request)
-        return {
-            "device_assignments_table": device_assignments_table,
-            "virtual_device_assignments_table": virtual_device_assignments_table,
-            "virtual_machine_assignments_table": virtual_machine_assignments_table,
-        }
+    assignment_model = PolicerAssignment
+    assignment_field = "policer"
 
 
 @register_model_view(Policer, "list", path="", detail=False)
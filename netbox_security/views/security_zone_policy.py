@@ -1,5 +1,10 @@
+from django.shortcuts import render
+from django.urls import reverse
+from django.views import View
+
 from netbox.views import generic
-from utilities.views import register_model_view
+from utilities.paginator import EnhancedPaginator, get_paginate_count
+from utilities.views import ContentTypePermissionRequiredMixin, register_model_view
 
 from netbox_security.tables import (
     SecurityZonePolicyTable,
@@ -7,6 +12,7 @@ from netbox_security.tables import (
 from netbox_security.filtersets import SecurityZonePolicyFilterSet
 
 from netbox_security.models import (
+    SecurityZone,
     SecurityZonePolicy,
 )
 from netbox_security.forms import (
@@ -15,6 +21,7 @@ from netbox_security.forms import (
     SecurityZonePolicyBulkEditForm,
     SecurityZonePolicyImportForm,
 )
+from netbox_security.utilities import get_policy_analysis, get_zone_policy_matrix
 
 __all__ = (
     "SecurityZonePolicyView",
@@ -24,6 +31,8 @@ __all__ = (
     "SecurityZonePolicyBulkEditView",
     "SecurityZonePolicyBulkDeleteView",
     "SecurityZonePolicyBulkImportView",
+    "SecurityZonePolicyMatrixView",
+    "SecurityZonePolicyAnalysisView",
 )
 
 
@@ -35,7 +44,17 @@ class SecurityZonePolicyView(generic.ObjectView):
 
 @register_model_view(SecurityZonePolicy, "list", path="", detail=False)
 class SecurityZonePolicyListView(generic.ObjectListView):
-    queryset = SecurityZonePolicy.objects.all()
+    # Also renders the paginated policy tables of the Security Zone view, so the
+    # related objects are fetched for the current page only.
+    queryset = SecurityZonePolicy.objects.select_related(
+        "source_zone", "destination_zone"
+    ).prefetch_related(
+        "source_address",
+        "destination_address",
+        "applications",
+        "application_sets",
+        "tags",
+    )
     filterset = SecurityZonePolicyFilterSet
     filterset_form = SecurityZonePolicyFilterForm
     table = SecurityZonePolicyTable
@@ -71,3 +90,108 @@ class SecurityZonePolicyBulkDeleteView(generic.BulkDeleteView):
 class SecurityZonePolicyBulkImportView(generic.BulkImportView):
     queryset = SecurityZonePolicy.objects.all()
     model_form = SecurityZonePolicyImportForm
+
+
+def _get_heatmap_rows(matrix):
+    """Return a row per source zone with a cell, or None, per destination zone.
+
+    Everything the template would otherwise compute per cell, such as the colour
+    intensity and the link, is prepared here, as a matrix of a few hundred zones
+    has tens of thousands of cells.
+    """
+    cells = {
+        (cell["source_zone_id"], cell["destination_zone_id"]): cell
+        for cell in matrix["cells"]
+    }
+    list_url = reverse("plugins:netbox_security:securityzonepolicy_list")
+    max_count = matrix["max_count"] or 1
+    rows = []
+    for source_zone in matrix["zones"]:
+        row = []
+        for destination_zone in matrix["zones"]:
+            cell = cells.get((source_zone["id"], destination_zone["id"]))
+            if cell is None:
+                row.append(None)
+                continue
+            row.append(
+                {
+                    "destination_zone": destination_zone,
+                    "count": cell["count"],
+                    "opacity": f"{0.15 + 0.7 * cell['count'] / max_count:.2f}",
+                    "actions": ", ".join(
+                        f"{action} {count}"
+                        for action, count in cell["actions"].items()
+                        if count
+                    ),
+                    "url": f"{list_url}?source_zone_id={source_zone['id']}"
+                    f"&destination_zone_id={destination_zone['id']}",
+                }
+            )
+        rows.append({"source_zone": source_zone, "cells": row})
+    return rows
+
+
+@register_model_view(SecurityZonePolicy, "matrix", path="matrix", detail=False)
+class SecurityZonePolicyMatrixView(ContentTypePermissionRequiredMixin, View):
+    """Heatmap of the number of policies between every pair of Security Zones."""
+
+    def get_required_permission(self):
+        return "netbox_security.view_securityzonepolicy"
+
+    def get(self, request):
+        matrix = get_zone_policy_matrix(
+            SecurityZonePolicy.objects.restrict(request.user, "view")
+        )
+        return render(
+            request,
+            "netbox_security/securityzonepolicy_matrix.html",
+            {
+                "matrix": matrix,
+                "heatmap_rows": _get_heatmap_rows(matrix),
+            },
+        )
+
+
+@register_model_view(SecurityZonePolicy, "analysis", path="analysis", detail=False)
+class SecurityZonePolicyAnalysisView(ContentTypePermissionRequiredMixin, View):
+    """Report of the shadowed, redundant and correlated Security Zone Policies."""
+
+    def get_required_permission(self):
+        return "netbox_security.view_securityzonepolicy"
+
+    def get(self, request):
+        analysis = get_policy_analysis(
+            SecurityZonePolicy.objects.restrict(request.user, "view")
+        )
+        # Broad overlapping policies can produce a finding per pair of policies,
+        # so only one page of them is rendered.
+        page = EnhancedPaginator(
+            analysis["findings"], get_paginate_count(request)
+        ).get_page(request.GET.get("page"))
+        zones = SecurityZone.objects.restrict(request.user, "view").in_bulk(
+            {
+                zone_id
+                for finding in page
+                for zone_id in (
+                    finding["source_zone_id"],
+                    finding["destination_zone_id"],
+                )
+            }
+        )
+        findings = [
+            {
+                **finding,
+                "source_zone": zones.get(finding["source_zone_id"]),
+                "destination_zone": zones.get(finding["destination_zone_id"]),
+            }
+            for finding in page
+        ]
+        return render(
+            request,
+            "netbox_security/securityzonepolicy_analysis.html",
+            {
+                "analysis": analysis,
+                "findings": findings,
+                "page": page,
+            },
+        )
@@ -7,11 +7,8 @@ from utilities.views import register_model_view
 from dcim.models import Device, VirtualDeviceContext
 from virtualization.models import VirtualMachine
 
-from dcim.tables import DeviceTable, VirtualDeviceContextTable
 from dcim.models import Interface
 
-from dcim.tables import InterfaceTable
-from virtualization.tables import VirtualMachineTable
 
 from netbox_security.tables import SecurityZoneTable, SecurityZoneAssignmentTable
 from netbox_security.filtersets import (
@@ -28,6 +25,7 @@ from netbox_security.forms import (
     SecurityZoneImportForm,
     SecurityZoneAssignmentFilterForm,
 )
+from netbox_security.views.mixins import AssignedObjectTablesMixin
 
 __all__ = (
     "SecurityZoneView",
@@ -45,37 +43,12 @@ __all__ = (
 
 
 @register_model_view(SecurityZone)
-class SecurityZoneView(generic.ObjectView):
+class SecurityZoneView(AssignedObjectTablesMixin, generic.ObjectView):
     queryset = SecurityZone.annotated_queryset()
     template_name = "netbox_security/securityzone.html"
-
-    def get_extra_context(self, request, instance):
-        device_assignments_table = DeviceTable(
-            Device.objects.filter(security_zones__zone=instance),
-            orderable=False,
-        )
-        device_assignments_table.configure(request)
-        virtual_device_assignments_table = VirtualDeviceContextTable(
-            VirtualDeviceContext.objects.filter(security_zones__zone=instance),
-            orderable=False,
-        )
-        virtual_device_assignments_table.configure(request)
-        virtual_machine_assignments_table = VirtualMachineTable(
-            VirtualMachine.objects.filter(security_zones__zone=instance),
-            orderable=False,
-        )
-        virtual_machine_assignments_table.configure(request)
-        interface_assignments_table = InterfaceTable(
-            Interface.objects.filter(security_zones__zone=instance),
-            orderable=False,
-        )
-        interface_assignments_table.configure(request)
-        return {
-            "device_assignments_table": device_assignments_table,
-            "virtual_device_assignments_table": virtual_device_assignments_table,
-            "virtual_machine_assignments_table": virtual_machine_assignments_table,
-            "interface_assignments_table": interface_assignments_table,
-        }
+    assignment_model = SecurityZoneAssignment
+    assignment_field = "zone"
+    assigned_object_models = (Device, VirtualDeviceContext, VirtualMachine, Interface)
 
 
 @register_model_view(SecurityZone, "list", path="", detail=False)
@@ -1,167 +1,178 @@
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
-from django.db.models.functions import Coalesce
+from django.views import View
 
 from ipam.models import IPAddress, IPRange, Prefix
 from dcim.models import Device, VirtualDeviceContext
 from virtualization.models import VirtualMachine
-from netbox_security.models import (
-    Address,
-    NatPoolMember,
-    NatRule,
-    SecurityZone,
+from netbox_security.tables import (
+    AddressAssignmentTable,
+    AddressListAssignmentTable,
+    AddressSetAssignmentTable,
+    ApplicationAssignmentTable,
+    ApplicationSetAssignmentTable,
+    FirewallFilterAssignmentTable,
+    NatPoolAssignmentTable,
+    NatRuleSetAssignmentTable,
+    PolicerAssignmentTable,
+    SecurityZoneAssignmentTable,
+)
+from netbox_security.utilities import (
+    get_address_set_path_offset,
+    get_cached_address_set_hierarchy,
+    get_cached_address_set_hierarchy_counts,
+    get_security_assignments,
+    get_security_counter,
 )
-from netbox_security.utilities import get_address_set_hierarchy
 
+from netbox.plugins import get_plugin_config
 from netbox.views import generic
-from utilities.views import register_model_view, ViewTab
-
-
-def _count_subquery(qs):
-    return Coalesce(
-        Subquery(
-            qs.order_by()
-            .annotate(_group=Value(1))
-            .values("_group")
-            .annotate(c=Count("pk", distinct=True))
-            .values("c")[:1]
-        ),
-        Value(0),
-        output_field=IntegerField(),
-    )
+from utilities.paginator import get_paginate_count
+from utilities.views import ConditionalLoginRequiredMixin, register_model_view, ViewTab
 
 
-def _annotate_ipam_security_queryset(
-    queryset,
-    *,
-    assigned_object_model,
-    nat_pool_member_field,
-    nat_rule_source_field,
-    nat_rule_destination_field,
-):
-    nat_pool_member_filter = {f"{nat_pool_member_field}_id": OuterRef("pk")}
-    nat_rule_source_filter = {nat_rule_source_field: OuterRef("pk")}
-    nat_rule_destination_filter = {nat_rule_destination_field: OuterRef("pk")}
-
-    return queryset.annotate(
-        nat_pool_member_count=_count_subquery(
-            NatPoolMember.objects.filter(**nat_pool_member_filter)
-        ),
-        nat_rule_count=_count_subquery(
-            NatRule.objects.filter(
-                Q(**nat_rule_source_filter) | Q(**nat_rule_destination_filter)
-            )
-        ),
-        address_count=_count_subquery(
-            Address.objects.filter(
-                assigned_object_type__app_label="ipam",
-                assigned_object_type__model=assigned_object_model,
-                assigned_object_id=OuterRef("pk"),
-            )
-        ),
-        security_zone_count=_count_subquery(
-            SecurityZone.objects.filter(
-                addresses__address__assigned_object_type__app_label="ipam",
-                addresses__address__assigned_object_type__model=assigned_object_model,
-                addresses__address__assigned_object_id=OuterRef("pk"),
-            ).distinct()
-        ),
-    ).annotate(
-        related_total_count=(
-            F("nat_pool_member_count")
-            + F("nat_rule_count")
-            + F("address_count")
-            + F("security_zone_count")
-        )
-    )
+def _related_total_count(obj):
+    # Tabs are rendered from the base object views, so read the maintained
+    # counters rather than relying on an annotated queryset.
+    return get_security_counter(obj).related_total_count
 
 
-def _annotate_ipaddress_queryset(queryset):
-    return _annotate_ipam_security_queryset(
-        queryset,
-        assigned_object_model="ipaddress",
-        nat_pool_member_field="address",
-        nat_rule_source_field="source_addresses",
-        nat_rule_destination_field="destination_addresses",
+def _security_tab_count(obj, app_label, model):
+    return max(
+        _related_total_count(obj),
+        _policy_context_related_total_count(obj, app_label, model),
     )
 
 
-def _annotate_prefix_queryset(queryset):
-    return _annotate_ipam_security_queryset(
-        queryset,
-        assigned_object_model="prefix",
-        nat_pool_member_field="prefix",
-        nat_rule_source_field="source_prefixes",
-        nat_rule_destination_field="destination_prefixes",
-    )
+def _security_tab_badge(app_label, model):
+    """Return the Security tab badge callable for one IPAM model.
 
+    With the security_tab_badge plugin setting set to "deferred" the badge is an
+    htmx placeholder that fetches the count once the page has loaded, so object
+    pages do not compute it while rendering. Such tabs are always shown, as
+    whether they are empty is only known afterwards.
+    """
 
-def _annotate_iprange_queryset(queryset):
-    return _annotate_ipam_security_queryset(
-        queryset,
-        assigned_object_model="iprange",
-        nat_pool_member_field="address_range",
-        nat_rule_source_field="source_ranges",
-        nat_rule_destination_field="destination_ranges",
-    )
-
+    def badge(obj):
+        if get_plugin_config("netbox_security", "security_tab_badge") == "deferred":
+            return format_html(
+                '<span hx-get="{}" hx-trigger="load" hx-swap="outerHTML">&hellip;</span>',
+                reverse(
+                    "plugins:netbox_security:security_tab_badge",
+                    kwargs={"app_label": app_label, "model": model, "pk": obj.pk},
+                ),
+            )
+        return _security_tab_count(obj, app_label, model)
 
-def _related_total_count(obj, model, annotate_queryset):
-    # Tabs are rendered from the base IPAddress object view; ensure the badge works even if the instance isn't annotated.
-    if hasattr(obj, "related_total_count"):
-        return obj.related_total_count
-    return (
-        annotate_queryset(model.objects.filter(pk=obj.pk))
-        .values_list("related_total_count", flat=True)
-        .first()
-        or 0
-    )
+    return badge
 
 
-def _ipaddress_related_total_count(obj):
-    return max(
-        _related_total_count(obj, IPAddress, _annotate_ipaddress_queryset),
-        _policy_context_related_total_count("ipam", "ipaddress", obj.pk),
-    )
+# The tab badge and the tab body are rendered from the same instance within a
+# request, so the resolved context is kept on the instance and shared by both.
+POLICY_CONTEXT_ATTR = "_netbox_security_policy_context"
 
 
-def _prefix_related_total_count(obj):
-    return max(
-        _related_total_count(obj, Prefix, _annotate_prefix_queryset),
-        _policy_context_related_total_count("ipam", "prefix", obj.pk),
-    )
+def _policy_context(obj, app_label, model, path_offset=0):
+    policy_context = getattr(obj, POLICY_CONTEXT_ATTR, None)
+    if policy_context is None:
+        policy_context = get_cached_address_set_hierarchy(
+            app_label=app_label,
+            model=model,
+            object_id=obj.pk,
+            instance=obj,
+            path_offset=path_offset,
+        )
+        setattr(obj, POLICY_CONTEXT_ATTR, policy_context)
+    return policy_context
 
 
-def _iprange_related_total_count(obj):
-    return max(
-        _related_total_count(obj, IPRange, _annotate_iprange_queryset),
-        _policy_context_related_total_count("ipam", "iprange", obj.pk),
-    )
-
+def _policy_context_related_total_count(obj, app_label, model):
+    """Count total security context items including inherited addresses."""
+    policy_context = getattr(obj, POLICY_CONTEXT_ATTR, None)
+    if policy_context is not None:
+        # Count all relevant items: direct addresses, inherited addresses, and policy paths
+        return (
+            len(policy_context.get("address_objects", []))
+            + len(policy_context.get("inherited_address_objects", []))
+            + len(policy_context.get("policy_paths", []))
+        )
 
-def _policy_context(app_label, model, object_id):
-    return get_address_set_hierarchy(
+    # Other tabs only need the number, so skip resolving the full context.
+    counts = get_cached_address_set_hierarchy_counts(
         app_label=app_label,
         model=model,
-        object_id=object_id,
+        object_id=obj.pk,
+        instance=obj,
+    )
+    return (
+        counts["address_count"]
+        + counts["inherited_address_count"]
+        + counts["policy_path_count"]
     )
 
 
-def _policy_context_related_total_count(app_label, model, object_id):
-    """Count total security context items including inherited addresses."""
-    policy_context = _policy_context(app_label, model, object_id)
+SECURITY_ASSIGNMENT_TABLES = {
+    "zones": SecurityZoneAssignmentTable,
+    "address_lists": AddressListAssignmentTable,
+    "nat_pools": NatPoolAssignmentTable,
+    "nat_rulesets": NatRuleSetAssignmentTable,
+    "applications": ApplicationAssignmentTable,
+    "application_sets": ApplicationSetAssignmentTable,
+    "addresses": AddressAssignmentTable,
+    "address_sets": AddressSetAssignmentTable,
+    "firewall_filters": FirewallFilterAssignmentTable,
+    "policers": PolicerAssignmentTable,
+}
 
-    # Count all relevant items: direct addresses, inherited addresses, and policy paths
-    count = (
-        len(policy_context.get("address_objects", []))
-        + len(policy_context.get("inherited_address_objects", []))
-        + len(policy_context.get("policy_paths", []))
-    )
-    return count
+
+def _get_page_url(request, section, page):
+    query = request.GET.copy()
+    query[f"{section}_page"] = page
+    return f"?{query.urlencode()}"
+
+
+class SecurityAssignmentsMixin:
+    """Render every assignment card of the Security tab within one request.
+
+    Each section is paged on its own through a "<section>_page" query
+    parameter, so paging one card keeps the position of the others.
+    """
+
+    def get_extra_context(self, request, instance):
+        assignments = get_security_assignments(
+            instance,
+            request.user,
+            pages={
+                section: request.GET.get(f"{section}_page")
+                for section in SECURITY_ASSIGNMENT_TABLES
+            },
+            per_page=get_paginate_count(request),
+        )
+        security_sections = {}
+        for section, table_class in SECURITY_ASSIGNMENT_TABLES.items():
+            assignment = assignments[section]
+            page = assignment["page"]
+            security_sections[section] = {
+                "table": table_class(assignment["rows"], orderable=False),
+                "count": assignment["count"],
+                "page": page,
+                "num_pages": assignment["num_pages"],
+                "previous_url": (
+                    _get_page_url(request, section, page - 1) if page > 1 else None
+                ),
+                "next_url": (
+                    _get_page_url(request, section, page + 1)
+                    if page < assignment["num_pages"]
+                    else None
+                ),
+            }
+        return {"security_sections": security_sections}
 
 
 @register_model_view(Device, name="security")
-class DeviceSecurityView(generic.ObjectView):
+class DeviceSecurityView(SecurityAssignmentsMixin, generic.ObjectView):
     queryset = Device.objects.all()
     template_name = "netbox_security/device/security.html"
     tab = ViewTab(
@@ -171,7 +182,7 @@ class DeviceSecurityView(generic.ObjectView):
 
 
 @register_model_view(VirtualDeviceContext, name="security")
-class VirtualDeviceContextSecurityView(generic.ObjectView):
+class VirtualDeviceContextSecurityView(SecurityAssignmentsMixin, generic.ObjectView):
     queryset = VirtualDeviceContext.objects.all()
     template_name = "netbox_security/virtual_device_context/security.html"
     tab = ViewTab(
@@ -181,7 +192,7 @@ class VirtualDeviceContextSecurityView(generic.ObjectView):
 
 
 @register_model_view(VirtualMachine, name="security")
-class VirtualMachineSecurityView(generic.ObjectView):
+class VirtualMachineSecurityView(SecurityAssignmentsMixin, generic.ObjectView):
     queryset = VirtualMachine.objects.all()
     template_name = "netbox_security/virtualmachine/security.html"
     tab = ViewTab(
@@ -192,47 +203,82 @@ class VirtualMachineSecurityView(generic.ObjectView):
 
 @register_model_view(IPAddress, name="security")
 class IPAddressSecurityView(generic.ObjectView):
-    queryset = _annotate_ipaddress_queryset(IPAddress.objects.all())
+    queryset = IPAddress.objects.all()
     template_name = "netbox_security/ipaddress/security.html"
     tab = ViewTab(
         label=_("Security"),
-        badge=_ipaddress_related_total_count,
+        badge=_security_tab_badge("ipam", "ipaddress"),
         hide_if_empty=True,
     )
 
     def get_extra_context(self, request, instance):
         return {
-            "policy_context": _policy_context("ipam", "ipaddress", instance.pk),
+            "policy_context": _policy_context(
+                instance,
+                "ipam",
+                "ipaddress",
+                path_offset=get_address_set_path_offset(request.GET.get("path_page")),
+            ),
         }
 
 
 @register_model_view(Prefix, name="security")
 class PrefixSecurityView(generic.ObjectView):
-    queryset = _annotate_prefix_queryset(Prefix.objects.all())
+    queryset = Prefix.objects.all()
     template_name = "netbox_security/prefix/security.html"
     tab = ViewTab(
         label=_("Security"),
-        badge=_prefix_related_total_count,
+        badge=_security_tab_badge("ipam", "prefix"),
         hide_if_empty=True,
     )
 
     def get_extra_context(self, request, instance):
         return {
-            "policy_context": _policy_context("ipam", "prefix", instance.pk),
+            "policy_context": _policy_context(
+                instance,
+                "ipam",
+                "prefix",
+                path_offset=get_address_set_path_offset(request.GET.get("path_page")),
+            ),
         }
 
 
 @register_model_view(IPRange, name="security")
 class IPRangeSecurityView(generic.ObjectView):
-    queryset = _annotate_iprange_queryset(IPRange.objects.all())
+    queryset = IPRange.objects.all()
     template_name = "netbox_security/iprange/security.html"
     tab = ViewTab(
         label=_("Security"),
-        badge=_iprange_related_total_count,
+        badge=_security_tab_badge("ipam", "iprange"),
         hide_if_empty=True,
     )
 
     def get_extra_context(self, request, instance):
         return {
-            "policy_context": _policy_context("ipam", "iprange", instance.pk),
+            "policy_context": _policy_context(
+                instance,
+                "ipam",
+                "iprange",
+                path_offset=get_address_set_path_offset(request.GET.get("path_page")),
+            ),
         }
+
+
+SECURITY_TAB_MODELS = {
+    ("ipam", "ipaddress"): IPAddress,
+    ("ipam", "prefix"): Prefix,
+    ("ipam", "iprange"): IPRange,
+}
+
+
+class SecurityTabBadgeView(ConditionalLoginRequiredMixin, View):
+    """Return the Security tab count of one object for deferred tab badges."""
+
+    def get(self, request, app_label, model, pk):
+        model_class = SECURITY_TAB_MODELS.get((app_label, model))
+        if model_class is None:
+            raise Http404
+        obj = model_class.objects.restrict(request.user, "view").filter(pk=pk).first()
+        if obj is None:
+            raise Http404
+        return HttpResponse(str(_security_tab_count(obj, app_label, model)))